@@ -238,11 +238,10 @@ class Base(object):
         """Executes the cli ``command`` on the server via ssh"""
         user, password = cls._get_username_password(user, password)
 
-        # add time to measure hammer performance
+        # time hammer on the server to measure its performance
         perf_test = conf.properties.get('performance.test.foreman.perf', '0')
-        cmd = u'LANG={0} {1} hammer -v -u {2} -p {3} {4} {5}'.format(
+        cmd = u'LANG={0} hammer -v -u {1} -p {2} {3} {4}'.format(
             conf.properties['main.locale'],
-            u'time -p' if perf_test == '1' else '',
             user,
             password,
             u'--output={0}'.format(output_format) if output_format else u'',
@@ -252,6 +251,7 @@ class Base(object):
             cmd.encode('utf-8'),
             output_format=output_format,
             timeout=timeout,
+            time_remote=perf_test == '1',
         )
         if return_raw_response:
             return response
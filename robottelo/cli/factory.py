@@ -60,7 +60,6 @@ from robottelo.constants import (
 )
 from robottelo.decorators import cacheable
 from robottelo.helpers import update_dictionary
-from robottelo.ssh import upload_file
 from tempfile import mkstemp
 
 logger = logging.getLogger(__name__)
@@ -1864,9 +1863,8 @@ def setup_org_for_a_rh_repo(options=None):
         env_id = make_lifecycle_environment({u'organization-id': org_id})['id']
     else:
         env_id = options['lifecycle-environment-id']
-    # Clone manifest and upload it
-    manifest = manifests.clone()
-    upload_file(manifest, remote_file=manifest)
+    # Take a cloned manifest already uploaded to the server
+    manifest = manifests.get_manifest_pool().take()
     try:
         Subscription.upload({
             u'file': manifest,
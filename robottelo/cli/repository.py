@@ -19,7 +19,13 @@ Subcommands::
     update                        Update a repository
     upload-content                Upload content into the repository
 """
-from robottelo.cli.base import Base
+import re
+
+from robottelo.cli.base import Base, CLIReturnCodeError
+
+#: Matches the foreman task id printed by asynchronous commands
+TASK_ID_REGEX = re.compile(
+    r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
 
 
 class Repository(Base):
@@ -63,6 +69,33 @@ class Repository(Base):
             return_raw_response=return_raw_response,
         )
 
+    @classmethod
+    def synchronize_async(cls, options):
+        """Triggers a repository synchronization without waiting for it.
+
+        :return: The id of the foreman task synchronizing the repository.
+        :rtype: str
+
+        """
+        cls.command_sub = 'synchronize'
+        options = dict(options)
+        options['async'] = True
+        response = cls.execute(
+            cls._construct_command(options),
+            return_raw_response=True,
+        )
+        match = None
+        if response.return_code == 0:
+            match = TASK_ID_REGEX.search(u'\n'.join(response.stdout or []))
+        if match is None:
+            raise CLIReturnCodeError(
+                response.return_code,
+                response.stderr,
+                u'Failed to trigger the synchronization: {0}'.format(
+                    response.stderr or response.stdout)
+            )
+        return match.group(0)
+
     @classmethod
     def upload_content(cls, options):
         """Upload content to repository."""
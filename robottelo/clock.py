@@ -0,0 +1,67 @@
+"""Utilities for measuring time
+
+Durations and timestamps taken by robottelo, such as the phases of SSH
+commands and the samples of the performance utilities, come from the
+system-wide monotonic clock, so they are not affected by wall clock
+adjustments and timestamps taken by different threads and processes of the
+same host can be compared.
+
+"""
+import ctypes
+import ctypes.util
+import time
+
+#: ``CLOCK_MONOTONIC`` clock id of ``clock_gettime(2)``
+CLOCK_MONOTONIC = 1
+
+
+class _Timespec(ctypes.Structure):
+    """``struct timespec`` of ``clock_gettime(2)``"""
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+
+def _get_clock_gettime():
+    """Return ``clock_gettime(2)`` or ``None`` if it is not available"""
+    for library in (ctypes.util.find_library('rt'), 'libc.so.6'):
+        try:
+            return ctypes.CDLL(library, use_errno=True).clock_gettime
+        except (OSError, AttributeError, TypeError):
+            continue
+    return None
+
+
+_CLOCK_GETTIME = _get_clock_gettime()
+
+
+def monotonic():
+    """Return the time of the system-wide monotonic clock, in seconds
+
+    Python 2 has no ``time.monotonic``, so ``clock_gettime(2)`` is called
+    directly. The wall clock time is returned where it is not available.
+
+    """
+    if _CLOCK_GETTIME is None:
+        return time.time()
+    timespec = _Timespec()
+    if _CLOCK_GETTIME(CLOCK_MONOTONIC, ctypes.byref(timespec)) != 0:
+        return time.time()
+    return timespec.tv_sec + timespec.tv_nsec * 1e-9
+
+
+class Clock(object):
+    """Timestamps of a scenario run, aligned to one monotonic reference
+
+    The wall clock time when the clock is created is taken as reference and
+    the time elapsed since then is read from the system-wide monotonic
+    clock, so timestamps taken by different threads and processes of the
+    same host can be merged and are not affected by wall clock adjustments.
+
+    """
+
+    def __init__(self):
+        self.reference = time.time()
+        self.monotonic_reference = monotonic()
+
+    def now(self):
+        """Return the current time, in seconds since the epoch"""
+        return self.reference + monotonic() - self.monotonic_reference
@@ -3,19 +3,47 @@
 Implements Manifest functions
 """
 
+import fcntl
+import hashlib
 import json
+import logging
+import multiprocessing
 import os
 import requests
 import shutil
 import tempfile
+import threading
 import uuid
 import zipfile
 
+from contextlib import contextmanager
+from io import BytesIO
+from Crypto import Random
 from Crypto.Hash import SHA256
 from Crypto.PublicKey import RSA
 from Crypto.Signature import PKCS1_v1_5
+from robottelo import ssh
 from robottelo.config import conf
 
+logger = logging.getLogger(__name__)
+
+# Downloaded manifest template, parsed signing key and other shared objects,
+# kept for the process lifetime so that every clone does not have to create
+# them again.
+_CACHE = {}
+_CACHE_LOCK = threading.RLock()
+
+
+def _get_cached(name, factory):
+    """Return the cached value for ``name``, creating it with ``factory`` on
+    first access.
+
+    """
+    with _CACHE_LOCK:
+        if name not in _CACHE:
+            _CACHE[name] = factory()
+        return _CACHE[name]
+
 
 def get_tempfile():
     """Creates a temporary file.
@@ -29,17 +57,162 @@ def get_tempfile():
     return tempname
 
 
+class DownloadCache(object):
+    """Content-addressed cache of downloaded files.
+
+    Each downloaded file is stored on ``directory`` named after the sha256 of
+    its contents, together with the ``ETag`` and ``Last-Modified`` headers
+    returned for its URL. Those are sent back on the next download of the
+    same URL, so the file is downloaded again only if it has changed.
+
+    When the files on the cache take more than ``max_size`` bytes, the least
+    recently used ones are removed.
+
+    """
+
+    def __init__(self, directory=None, max_size=None):
+        if directory is None:
+            directory = conf.properties.get(
+                'main.manifest.cache_dir',
+                os.path.join(tempfile.gettempdir(), 'robottelo-cache')
+            )
+        self.directory = directory
+        if max_size is None:
+            max_size = int(conf.properties.get(
+                'main.manifest.cache_size', '100')) * 1024 * 1024
+        self.max_size = max_size
+        for subdir in ('blobs', 'urls'):
+            path = os.path.join(self.directory, subdir)
+            if not os.path.isdir(path):
+                try:
+                    os.makedirs(path)
+                except OSError:
+                    # Other process may have created it in the meantime
+                    if not os.path.isdir(path):
+                        raise
+
+    def _blob_path(self, digest):
+        """Return the path of the cached file with sha256 ``digest``."""
+        return os.path.join(self.directory, 'blobs', digest)
+
+    def _metadata_path(self, url):
+        """Return the path of the metadata file of ``url``."""
+        return os.path.join(
+            self.directory, 'urls', hashlib.sha256(url).hexdigest() + '.json')
+
+    def _write(self, path, content):
+        """Atomically write ``content`` to ``path``."""
+        fd, tempname = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(content)
+        os.rename(tempname, path)
+
+    def fetch(self, url):
+        """Return the path of the cached copy of ``url``.
+
+        The URL is requested with ``If-None-Match`` and
+        ``If-Modified-Since`` headers if it is already cached and its content
+        is downloaded only if it has changed.
+
+        :param str url: The URL to fetch.
+        :return: The path of the cached file. It must not be changed or
+            removed.
+        :rtype: str
+
+        """
+        metadata = {}
+        try:
+            with open(self._metadata_path(url)) as handle:
+                metadata = json.load(handle)
+        except (IOError, ValueError):
+            pass
+        cached = metadata.get('digest')
+        if cached is not None and not os.path.isfile(self._blob_path(cached)):
+            cached = None
+
+        headers = {}
+        if cached is not None:
+            if metadata.get('etag'):
+                headers['If-None-Match'] = metadata['etag']
+            if metadata.get('last_modified'):
+                headers['If-Modified-Since'] = metadata['last_modified']
+        response = requests.get(url, headers=headers)
+
+        if cached is not None and (
+                response.status_code == 304 or not response.ok):
+            if not response.ok:
+                logger.warning(
+                    u'Failed to revalidate %s (HTTP %s), using cached copy',
+                    url, response.status_code
+                )
+            path = self._blob_path(cached)
+            os.utime(path, None)
+            return path
+
+        response.raise_for_status()
+        digest = hashlib.sha256(response.content).hexdigest()
+        path = self._blob_path(digest)
+        if os.path.isfile(path):
+            os.utime(path, None)
+        else:
+            self._write(path, response.content)
+        self._write(self._metadata_path(url), json.dumps({
+            'digest': digest,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'url': url,
+        }))
+        self.evict(keep=digest)
+        return path
+
+    def evict(self, keep=None):
+        """Remove the least recently used files until the cache size is not
+        bigger than ``max_size``.
+
+        :param str keep: The digest of a file that must not be removed.
+
+        """
+        blobs = []
+        total_size = 0
+        for digest in os.listdir(os.path.join(self.directory, 'blobs')):
+            try:
+                stat = os.stat(self._blob_path(digest))
+            except OSError:
+                continue
+            total_size += stat.st_size
+            blobs.append((stat.st_mtime, stat.st_size, digest))
+        for _, size, digest in sorted(blobs):
+            if total_size <= self.max_size:
+                break
+            if digest == keep:
+                continue
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                continue
+            total_size -= size
+
+
+def fetch(url):
+    """Return the path of the cached copy of ``url``.
+
+    See :meth:`DownloadCache.fetch`. The returned file is shared and must not
+    be changed or removed, use :func:`retrieve` to get a private copy.
+
+    """
+    return _get_cached('download_cache', DownloadCache).fetch(url)
+
+
 def retrieve(url):
     """Downloads contents of a URL.
 
-    Downloads content of the url and saves it to temporary file.
-    Then returns the path to the temporary file.
+    Gets the content of the url from the download cache and copies it to a
+    temporary file. Then returns the path to the temporary file, which is
+    owned by the caller.
 
     """
-    response = requests.get(url)
-    fd, tempname = tempfile.mkstemp()
-    with os.fdopen(fd, "wb") as temp_file:
-        temp_file.write(response.content)
+    tempname = get_tempfile()
+    shutil.copyfile(fetch(url), tempname)
     return tempname
 
 
@@ -62,6 +235,42 @@ def download_manifest_template():
     return retrieve(conf.properties['main.manifest.fake_url'])
 
 
+def _read_file(path):
+    """Read the binary contents of a file."""
+    with open(path, 'rb') as handle:
+        return handle.read()
+
+
+def get_signing_key():
+    """Parsed private key used to sign cloned manifests.
+
+    The key is fetched and parsed only once per process.
+
+    :return: The RSA key object.
+
+    """
+    return _get_cached(
+        'key',
+        lambda: RSA.importKey(
+            _read_file(fetch(conf.properties['main.manifest.key_url'])))
+    )
+
+
+def get_manifest_template():
+    """Contents of the manifest template used for cloning.
+
+    The template is fetched only once per process.
+
+    :return: The binary contents of the manifest template.
+    :rtype: str
+
+    """
+    return _get_cached(
+        'template',
+        lambda: _read_file(fetch(conf.properties['main.manifest.fake_url']))
+    )
+
+
 def sign(key_file, file_to_sign):
     """Performs the signing of the modified manifest file.
 
@@ -129,6 +338,32 @@ def edit_in_zip(zip_file, file_edit_functions):
         shutil.rmtree(tempdir)
 
 
+def edit_zip_data(data, file_edit_functions):
+    """Performs the editing of zip contents in memory.
+
+    Same as :func:`edit_in_zip` but takes and returns the binary contents of
+    the zip file. Only the files listed on ``file_edit_functions`` are
+    rewritten, all others are copied as they are.
+
+    :param str data: The binary contents of the zip file to edit.
+    :param dict file_edit_functions: Files & Functions are the key value pairs.
+    :return: The binary contents of the edited zip file.
+    :rtype: str
+
+    """
+    output = BytesIO()
+    with zipfile.ZipFile(BytesIO(data)) as zipread:
+        with zipfile.ZipFile(output, 'w') as zipwrite:
+            for info in zipread.infolist():
+                content = zipread.read(info)
+                edit_function = file_edit_functions.get(
+                    os.path.basename(info.filename))
+                if edit_function is not None:
+                    content = edit_function(content)
+                zipwrite.writestr(info, content)
+    return output.getvalue()
+
+
 def edit_consumer(data):
     """Takes the string-data of the consumer file and updates with new UUID.
 
@@ -142,6 +377,36 @@ def edit_consumer(data):
     return json.dumps(content_dict)
 
 
+def clone_data(key=None, template=None):
+    """Clones a RedHat-manifest in memory.
+
+    Changes the uuid in consumer.json of the ``template`` manifest and resigns
+    it with the RSA ``key``. No file is written to the disk.
+
+    :param key: The RSA key object used to sign the manifest. If ``None``,
+        :func:`get_signing_key` is used.
+    :param str template: The binary contents of the original manifest. If
+        ``None``, :func:`get_manifest_template` is used.
+    :return: The binary contents of the cloned manifest.
+    :rtype: str
+
+    """
+    if key is None:
+        key = get_signing_key()
+    if template is None:
+        template = get_manifest_template()
+    with zipfile.ZipFile(BytesIO(template)) as oldzip:
+        consumer_export = oldzip.read('consumer_export.zip')
+    consumer_export = edit_zip_data(
+        consumer_export, {'consumer.json': edit_consumer})
+    signature = PKCS1_v1_5.new(key).sign(SHA256.new(consumer_export))
+    output = BytesIO()
+    with zipfile.ZipFile(output, 'w') as newzip:
+        newzip.writestr('consumer_export.zip', consumer_export)
+        newzip.writestr('signature', signature)
+    return output.getvalue()
+
+
 def clone(key_path=None, old_path=None):
     """Clones a RedHat-manifest file.
 
@@ -150,27 +415,364 @@ def clone(key_path=None, old_path=None):
     candlepin server, it allows us to quickly create uploadable
     copies of the original manifest.
 
+    The cloning itself is done in memory by :func:`clone_data`, only the
+    resulting manifest is written to the disk.
+
     :param str key_path: This is the private-key to sign the redhat-manifest.
     :param str old_path: This is the path of the original redhat-manifest.
     :return: Return the path to the cloned redhat-manifest file.
     :rtype: str
 
     """
-    tempdir = tempfile.mkdtemp()
-    consumer_zip_file = os.path.join(tempdir, "consumer_export.zip")
+    key = template = None
+    if key_path is not None:
+        with open(key_path) as handle:
+            key = RSA.importKey(handle.read())
+    if old_path is not None:
+        with open(old_path, 'rb') as handle:
+            template = handle.read()
+    fd, new_path = tempfile.mkstemp()
+    with os.fdopen(fd, 'wb') as new_file:
+        new_file.write(clone_data(key, template))
+    return new_path
+
+
+def _init_clone_worker(key_data, template):
+    """Prepare a :func:`clone_many` worker process.
+
+    Parses the signing key and stores it, together with the manifest
+    template, on the process cache, so it is done only once per worker.
+
+    """
+    # PyCrypto requires its RNG to be re-initialized on forked processes
+    Random.atfork()
+    _CACHE['key'] = RSA.importKey(key_data)
+    _CACHE['template'] = template
+
+
+def _clone_to_file(directory):
+    """Clone a manifest and write it to a new file on ``directory``.
+
+    :return: The path of the cloned manifest.
+
+    """
+    fd, new_path = tempfile.mkstemp(suffix='.zip', dir=directory)
+    with os.fdopen(fd, 'wb') as new_file:
+        new_file.write(clone_data())
+    return new_path
+
+
+def clone_many(n, workers=None, directory=None, key_path=None,
+               old_path=None):
+    """Clones ``n`` RedHat-manifest files using a pool of processes.
+
+    The signing key and the manifest template are read once and sent to each
+    worker process when it starts, so the key is parsed only once per worker.
+
+    :param int n: The number of manifests to clone.
+    :param int workers: The number of worker processes. If ``None`` the number
+        of CPUs is used.
+    :param str directory: The directory where the cloned manifests are
+        written to. If ``None`` the default temporary directory is used.
+    :param str key_path: This is the private-key to sign the redhat-manifest.
+    :param str old_path: This is the path of the original redhat-manifest.
+    :return: A list with the paths of the cloned manifests.
+    :rtype: list
+
+    """
     if key_path is None:
-        key_path = download_signing_key()
+        key_data = get_signing_key().exportKey()
+    else:
+        with open(key_path) as handle:
+            key_data = handle.read()
     if old_path is None:
-        old_path = download_manifest_template()
-    new_path = get_tempfile()
-    shutil.copy(old_path, new_path)
-    with zipfile.ZipFile(new_path) as oldzip:
-        oldzip.extractall(tempdir)
-    edit_in_zip(consumer_zip_file, {"consumer.json": edit_consumer})
-    signature = sign(key_path, consumer_zip_file)
-    with open(os.path.join(tempdir, "signature"), "wb") as sign_file:
-        sign_file.write(signature)
-    with zipfile.ZipFile(new_path, "w") as oldzip:
-        oldzip.write(consumer_zip_file, "/consumer_export.zip")
-        oldzip.write(os.path.join(tempdir, "signature"), "/signature")
-    return new_path
+        template = get_manifest_template()
+    else:
+        with open(old_path, 'rb') as handle:
+            template = handle.read()
+    pool = multiprocessing.Pool(
+        processes=workers,
+        initializer=_init_clone_worker,
+        initargs=(key_data, template),
+    )
+    try:
+        return pool.map(_clone_to_file, [directory] * n)
+    finally:
+        pool.close()
+        pool.join()
+
+
+class ManifestPool(object):
+    """Keeps a pool of cloned manifests ready to be uploaded.
+
+    Cloned manifests are stored on ``directory`` and staged on the server,
+    using a single sftp session, under ``remote_directory``. Each manifest
+    moves between the following subdirectories of ``directory``:
+
+    * ``ready``: cloned manifests not yet uploaded to the server
+    * ``uploading``: manifests being uploaded to the server
+    * ``staged``: manifests already uploaded to the server
+    * ``taken``: manifests handed to a test
+
+    Moving a manifest from one state to another is done by renaming its file,
+    which is atomic, so the same pool directory can be shared by several test
+    processes. Filling the pool is guarded by a lock file, so only one process
+    generates manifests at a time.
+
+    The pool is kept filled up to ``depth`` manifests by a background thread
+    started on the first call to :meth:`take`. If ``depth`` is zero, the pool
+    is disabled and every manifest is cloned and uploaded when taken.
+
+    The pool directory outlives test runs, so it is reconciled with the server
+    on first use, see :meth:`reconcile`.
+
+    """
+    states = ('ready', 'uploading', 'staged', 'taken')
+
+    def __init__(self, depth=None, directory=None, remote_directory=None,
+                 hostname=None):
+        if depth is None:
+            depth = conf.properties.get('main.manifest.pool_depth', '0')
+        self.depth = int(depth)
+        if hostname is None:
+            hostname = conf.properties['main.server.hostname']
+        self.hostname = hostname
+        if directory is None:
+            directory = os.path.join(
+                tempfile.gettempdir(),
+                'robottelo-manifests-{0}'.format(hostname)
+            )
+        self.directory = directory
+        if remote_directory is None:
+            remote_directory = conf.properties.get(
+                'main.manifest.pool_remote_dir', '/tmp/robottelo-manifests')
+        self.remote_directory = remote_directory
+        for state in self.states:
+            path = os.path.join(self.directory, state)
+            if not os.path.isdir(path):
+                try:
+                    os.makedirs(path)
+                except OSError:
+                    # Other process may have created it in the meantime
+                    if not os.path.isdir(path):
+                        raise
+        self._remote_directory_created = False
+        self._reconciled = False
+        self._thread = None
+        self._wake_up = threading.Event()
+        self._stopped = threading.Event()
+
+    def _path(self, state, name):
+        """Return the local path of the manifest ``name`` on ``state``."""
+        return os.path.join(self.directory, state, name)
+
+    def _list(self, state):
+        """Return the names of all manifests on ``state``."""
+        return sorted(os.listdir(os.path.join(self.directory, state)))
+
+    def _claim(self, source, target):
+        """Move the oldest manifest from ``source`` state to ``target`` state.
+
+        :return: The name of the claimed manifest or ``None`` if there is no
+            manifest available on ``source`` state.
+
+        """
+        for name in self._list(source):
+            try:
+                os.rename(self._path(source, name), self._path(target, name))
+            except OSError:
+                # Already claimed by other process
+                continue
+            return name
+        return None
+
+    @contextmanager
+    def _locked(self):
+        """Hold the pool lock file while running the managed block."""
+        with open(os.path.join(self.directory, 'lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _remote_path(self, name):
+        """Return the path of the manifest ``name`` on the server."""
+        return u'{0}/{1}'.format(self.remote_directory, name)
+
+    def reconcile(self):
+        """Bring the pool back to a consistent state, once per pool object.
+
+        Manifests left ``uploading`` by a process which died while staging
+        them, and ``staged`` manifests missing from the server, for example
+        because it was reprovisioned or its temporary files were cleaned up,
+        are moved back to ``ready`` to be uploaded again.
+
+        """
+        if self._reconciled:
+            return
+        with self._locked():
+            self._reconcile()
+
+    def _reconcile(self):
+        """Reconcile the pool, the pool lock being held by the caller."""
+        if self._reconciled:
+            return
+        # Nothing is being uploaded while the lock is held
+        for name in self._list('uploading'):
+            self._move(name, 'uploading', 'ready')
+        staged = self._list('staged')
+        if staged:
+            result = ssh.command(
+                u'ls -1 {0}'.format(self.remote_directory),
+                hostname=self.hostname
+            )
+            remote = set()
+            if result.return_code == 0:
+                remote = set(line.strip() for line in result.stdout)
+            for name in staged:
+                if name not in remote:
+                    self._move(name, 'staged', 'ready')
+        self._reconciled = True
+
+    def _move(self, name, source, target):
+        """Move the manifest ``name`` from ``source`` to ``target`` state,
+        unless other process already moved it."""
+        try:
+            os.rename(self._path(source, name), self._path(target, name))
+        except OSError:
+            pass
+
+    def fill(self):
+        """Clone manifests until the pool has ``depth`` manifests ready or
+        staged.
+
+        :return: The number of manifests cloned.
+
+        """
+        cloned = 0
+        with self._locked():
+            missing = self.depth - (
+                len(self._list('ready')) + len(self._list('staged')))
+            for _ in range(missing):
+                name = '{0}.zip'.format(uuid.uuid4().hex)
+                fd, tempname = tempfile.mkstemp(dir=self.directory)
+                with os.fdopen(fd, 'wb') as manifest:
+                    manifest.write(clone_data())
+                os.rename(tempname, self._path('ready', name))
+                cloned += 1
+        return cloned
+
+    def stage(self):
+        """Upload all ready manifests to the server in a single sftp session.
+
+        :return: The number of manifests staged.
+
+        """
+        with self._locked():
+            self._reconcile()
+            names = []
+            name = self._claim('ready', 'uploading')
+            while name is not None:
+                names.append(name)
+                name = self._claim('ready', 'uploading')
+            if not names:
+                return 0
+            try:
+                if not self._remote_directory_created:
+                    ssh.command(
+                        u'mkdir -p {0}'.format(self.remote_directory),
+                        hostname=self.hostname
+                    )
+                    self._remote_directory_created = True
+                ssh.upload_files(
+                    [
+                        (self._path('uploading', staged), self._remote_path(
+                            staged))
+                        for staged in names
+                    ],
+                    hostname=self.hostname
+                )
+            except Exception:
+                for name in names:
+                    os.rename(
+                        self._path('uploading', name),
+                        self._path('ready', name)
+                    )
+                raise
+            for name in names:
+                os.rename(
+                    self._path('uploading', name), self._path('staged', name))
+        return len(names)
+
+    def take(self, remote=True):
+        """Take a manifest from the pool.
+
+        If the pool is empty, a manifest is cloned (and uploaded, if
+        ``remote`` is ``True``) right away. Local manifests are taken from
+        the ready ones first, then from the local copies of staged ones.
+
+        :param bool remote: Whether to return the path of a manifest already
+            uploaded to the server or of a local manifest.
+        :return: The path of the manifest on the server, if ``remote`` is
+            ``True``, or on the local machine otherwise.
+        :rtype: str
+
+        """
+        if self.depth > 0:
+            self.reconcile()
+            self.start()
+            self._wake_up.set()
+            if remote:
+                name = self._claim('staged', 'taken')
+            else:
+                name = (self._claim('ready', 'taken') or
+                        self._claim('staged', 'taken'))
+            if name is not None:
+                if remote:
+                    os.remove(self._path('taken', name))
+                    return self._remote_path(name)
+                return self._path('taken', name)
+        manifest = clone()
+        if remote:
+            ssh.upload_file(manifest, manifest, hostname=self.hostname)
+        return manifest
+
+    def _run(self, interval):
+        """Keep the pool filled and staged until :meth:`stop` is called."""
+        while not self._stopped.is_set():
+            try:
+                self.fill()
+                self.stage()
+            except Exception as err:  # pylint:disable=broad-except
+                logger.warning(u'Failed to refill manifest pool: %s', err)
+            self._wake_up.wait(interval)
+            self._wake_up.clear()
+
+    def start(self, interval=5):
+        """Start the background thread which keeps the pool filled.
+
+        :param int interval: Maximum number of seconds to wait between pool
+            refills. The pool is refilled right away when a manifest is taken.
+
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._wake_up.set()
+        self._thread.join()
+        self._thread = None
+
+
+def get_manifest_pool():
+    """Return the :class:`ManifestPool` shared by the current process."""
+    return _get_cached('pool', ManifestPool)
@@ -31,18 +31,18 @@ class Candlepin(object):
 
     @staticmethod
     def get_real_time(result):
-        """Parse stderr and extract out real time value
+        """Return the time a command ran on the server
 
-        :param str result: Standard Error
-        :return: The real timing value
+        :param result: The result of an ssh command run with ``time_remote``
+        :return: The real timing value, measured on the server. If it was not
+            reported, the time measured by the ssh client.
+        :rtype: float
 
         """
-        real_time = [
-            real
-            for real in result.split('\n')
-            if real.startswith('real')
-        ]
-        return float(real_time[0].split(' ')[1])
+        LOGGER.debug('Timing phases: {0}'.format(result.timing.as_dict()))
+        if result.timing.remote_time is None:
+            return result.timing.total
+        return result.timing.remote_time
 
     @classmethod
     def single_register_activation_key(cls, ak_name, default_org, vm_ip):
@@ -51,16 +51,17 @@ class Candlepin(object):
         # note: must create ssh keys for vm if running on local
         result = ssh.command('subscription-manager clean', hostname=vm_ip)
         result = ssh.command(
-            'time -p subscription-manager register --activationkey={0} '
+            'subscription-manager register --activationkey={0} '
             '--org={1}'.format(ak_name, default_org),
-            hostname=vm_ip
+            hostname=vm_ip,
+            time_remote=True
         )
 
         if result.return_code != 0:
             LOGGER.error('Fail to subscribe {0} by ak!'.format(vm_ip))
         else:
             LOGGER.info('Subscribe client {0} successfully'.format(vm_ip))
-        return cls.get_real_time(result.stderr)
+        return cls.get_real_time(result)
 
     @classmethod
     def single_register_attach(cls, sub_id, default_org, environment, vm_ip):
@@ -77,12 +78,13 @@ class Candlepin(object):
     def sub_mgr_register_authentication(cls, default_org, environment, vm_ip):
         """subscription-manager register -u -p --org --environment"""
         result = ssh.command(
-            'time -p subscription-manager register --username={0} '
+            'subscription-manager register --username={0} '
             '--password={1} '
             '--org={2} '
             '--environment={3}'
             .format(cls.username, cls.password, default_org, environment),
-            hostname=vm_ip
+            hostname=vm_ip,
+            time_remote=True
         )
 
         if result.return_code != 0:
@@ -91,28 +93,40 @@ class Candlepin(object):
             )
         else:
             LOGGER.info('Register client {0} successfully'.format(vm_ip))
-        return cls.get_real_time(result.stderr)
+        return cls.get_real_time(result)
 
     @classmethod
     def sub_mgr_attach(cls, pool_id, vm_ip):
         """subscription-manager attach --pool=pool_id"""
         result = ssh.command(
-            'time -p subscription-manager attach --pool={0}'.format(pool_id),
-            hostname=vm_ip
+            'subscription-manager attach --pool={0}'.format(pool_id),
+            hostname=vm_ip,
+            time_remote=True
         )
 
         if result.return_code != 0:
             LOGGER.error('Fail to attach client {0}'.format(vm_ip))
         else:
             LOGGER.info('Attach client {0} successfully'.format(vm_ip))
-        return cls.get_real_time(result.stderr)
+        return cls.get_real_time(result)
 
     @classmethod
-    def single_delete(cls, uuid, thread_id):
-        """Delete system from subscription"""
+    def single_delete(cls, uuid, thread_id, server_url=None):
+        """Delete system from subscription
+
+        :param str uuid: The uuid of the system to be deleted
+        :param thread_id: The id of the thread deleting the system
+        :param str server_url: The base URL of the server. If ``None``,
+            ``get_server_url`` is used.
+        :return: time measure for a single deletion
+        :rtype: float
+
+        """
+        if server_url is None:
+            server_url = get_server_url()
         start = time.time()
         response = requests.delete(
-            urljoin(get_server_url(), '/katello/api/systems/{0}'.format(uuid)),
+            urljoin(server_url, '/katello/api/systems/{0}'.format(uuid)),
             auth=get_server_credentials(),
             verify=False
         )
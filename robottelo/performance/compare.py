@@ -0,0 +1,230 @@
+"""Test utilities for comparing performance results of two runs
+
+Results are loaded from the raw csv files written by the performance tests or
+from a :class:`robottelo.performance.store.ResultsStore`, and are compared for
+each operation and number of concurrent threads. Latency percentiles and
+throughput deltas are flagged as regressions when they exceed the configured
+threshold and the difference between both runs is statistically significant
+according to the Mann-Whitney U test.
+
+"""
+import csv
+import math
+import numpy
+
+from robottelo.config import conf
+from robottelo.performance.store import ResultsStore
+
+#: Latency percentiles compared by :func:`compare`
+PERCENTILES = (50, 90, 99)
+
+
+def load_raw_csv(raw_file_name):
+    """Load the timing values of a raw csv file
+
+    Each test case of the file starts with its name (for example
+    ``raw-ak-10-clients``), followed by one row of timing values per thread,
+    and ends with an empty row. The row of a thread whose iterations all
+    failed is empty too, so the number of threads of the name tells where
+    the test case ends.
+
+    :param str raw_file_name: The path of the raw csv file
+    :return: The timing values of each test case, for example:
+        ``{('ak', 10): {'thread-0': [...], ...}}``
+    :rtype: dict
+
+    """
+    results = {}
+    time_result_dict = None
+    remaining = 0
+    with open(raw_file_name) as handler:
+        for row in csv.reader(handler):
+            if remaining > 0:
+                time_result_dict['thread-{0}'.format(
+                    len(time_result_dict))] = [float(value) for value in row]
+                remaining -= 1
+            elif row:
+                _, operation, num_threads, _ = row[0].split('-')
+                remaining = int(num_threads)
+                time_result_dict = results.setdefault(
+                    (operation, remaining), {})
+    return results
+
+
+def load_store(run_id, path=None):
+    """Load the timing values of a run recorded on a results store
+
+    :param str run_id: The id of the run
+    :param str path: The path of the results store database
+    :return: The timing values of each test case, with the same structure
+        returned by :func:`load_raw_csv`
+    :rtype: dict
+
+    """
+    store = ResultsStore(path)
+    try:
+        return {
+            (operation, num_threads): store.latencies(
+                run_id, operation, num_threads)
+            for operation in store.operations(run_id)
+            for num_threads in store.thread_counts(run_id, operation)
+        }
+    finally:
+        store.close()
+
+
+def throughput(time_result_dict):
+    """Return the throughput of a test case in operations per second
+
+    Each thread runs its operations one after another, so the test case
+    lasts as long as its slowest thread.
+
+    """
+    duration = max(sum(time_list) for time_list in time_result_dict.values())
+    num_operations = sum(
+        len(time_list) for time_list in time_result_dict.values())
+    return num_operations / duration if duration else float('nan')
+
+
+def mann_whitney(first, second):
+    """Run the two-sided Mann-Whitney U test on two samples
+
+    The normal approximation, corrected for ties, is used, which is suitable
+    for the hundreds of timing values of each performance test case.
+
+    :return: The p-value of the test
+    :rtype: float
+
+    """
+    first = numpy.asarray(first, dtype=float)
+    second = numpy.asarray(second, dtype=float)
+    size_1, size_2 = len(first), len(second)
+    values = numpy.concatenate((first, second))
+    # average ranks, so tied values share the same rank
+    order = values.argsort(kind='mergesort')
+    sorted_values = values[order]
+    _, first_index, counts = numpy.unique(
+        sorted_values, return_index=True, return_counts=True)
+    average_ranks = first_index + (counts + 1) / 2.0
+    ranks = numpy.empty(len(values))
+    ranks[order] = numpy.repeat(average_ranks, counts)
+
+    u_statistic = ranks[:size_1].sum() - size_1 * (size_1 + 1) / 2.0
+    mean = size_1 * size_2 / 2.0
+    total = size_1 + size_2
+    tie_correction = (counts ** 3 - counts).sum() / float(
+        total * (total - 1))
+    variance = size_1 * size_2 / 12.0 * (total + 1 - tie_correction)
+    if variance <= 0:
+        return 1.0
+    z_score = (abs(u_statistic - mean) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z_score, 0) / math.sqrt(2)))
+
+
+class Delta(object):
+    """The difference of a metric between a baseline and a current run
+
+    :param str operation: The operation, for example ``ak`` or ``sync``
+    :param int num_threads: The number of concurrent threads
+    :param str metric: The metric compared, for example ``p90`` or
+        ``throughput``
+    :param float baseline: The value of the metric on the baseline run
+    :param float current: The value of the metric on the current run
+    :param float p_value: The significance of the difference between both
+        runs
+    :param bool higher_is_better: Whether an increase of the metric is an
+        improvement
+
+    """
+
+    def __init__(
+            self,
+            operation,
+            num_threads,
+            metric,
+            baseline,
+            current,
+            p_value,
+            higher_is_better=False):
+        self.operation = operation
+        self.num_threads = num_threads
+        self.metric = metric
+        self.baseline = baseline
+        self.current = current
+        self.p_value = p_value
+        self.higher_is_better = higher_is_better
+        self.regression = False
+
+    @property
+    def change(self):
+        """The relative change of the metric, in percent"""
+        if not self.baseline:
+            return float('nan')
+        return (self.current - self.baseline) / self.baseline * 100
+
+    def is_regression(self, threshold, alpha):
+        """Check if the metric got worse by more than ``threshold`` percent
+        and the difference is significant at the ``alpha`` level
+
+        """
+        change = -self.change if self.higher_is_better else self.change
+        return change > threshold and self.p_value < alpha
+
+    def __repr__(self):
+        return '<Delta {0}-{1}-clients {2}: {3:.4f} -> {4:.4f}>'.format(
+            self.operation, self.num_threads, self.metric, self.baseline,
+            self.current)
+
+
+def compare(baseline, current, threshold=None, alpha=None):
+    """Compare the results of two runs
+
+    Only test cases present on both runs are compared.
+
+    :param dict baseline: The timing values of the baseline run, as returned
+        by :func:`load_raw_csv` or :func:`load_store`
+    :param dict current: The timing values of the current run
+    :param float threshold: The change, in percent, from which a worse
+        metric is a regression. If ``None``, ``performance.compare.threshold``
+        from the configuration file is used, defaulting to 10.
+    :param float alpha: The significance level of regressions. If ``None``,
+        ``performance.compare.alpha`` from the configuration file is used,
+        defaulting to 0.05.
+    :return: A list of :class:`Delta`, sorted by operation and number of
+        threads, with their ``regression`` attribute set
+    :rtype: list
+
+    """
+    if threshold is None:
+        threshold = float(
+            conf.properties.get('performance.compare.threshold', 10))
+    if alpha is None:
+        alpha = float(conf.properties.get('performance.compare.alpha', 0.05))
+    deltas = []
+    for operation, num_threads in sorted(set(baseline) & set(current)):
+        baseline_dict = baseline[(operation, num_threads)]
+        current_dict = current[(operation, num_threads)]
+        baseline_values = numpy.concatenate(baseline_dict.values())
+        current_values = numpy.concatenate(current_dict.values())
+        p_value = mann_whitney(baseline_values, current_values)
+        for percent in PERCENTILES:
+            deltas.append(Delta(
+                operation,
+                num_threads,
+                'p{0}'.format(percent),
+                numpy.percentile(baseline_values, percent),
+                numpy.percentile(current_values, percent),
+                p_value,
+            ))
+        deltas.append(Delta(
+            operation,
+            num_threads,
+            'throughput',
+            throughput(baseline_dict),
+            throughput(current_dict),
+            p_value,
+            higher_is_better=True,
+        ))
+    for delta in deltas:
+        delta.regression = delta.is_regression(threshold, alpha)
+    return deltas
@@ -0,0 +1,316 @@
+"""Test utilities for open-loop load generation
+
+The scenarios of :mod:`robottelo.performance.thread` are closed-loop: each
+client waits for its previous request to finish before issuing the next one,
+so when the server slows down fewer requests are issued and the time they
+would have waited to be served is never measured (coordinated omission).
+
+An :class:`OpenLoopDriver` issues requests at a target arrival rate instead,
+following a Poisson or constant schedule which does not depend on how fast
+requests are served. Each request records its intended and actual start
+times, so its latency includes the time it waited for a free worker.
+
+"""
+import logging
+import random
+import threading
+import time
+
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from Queue import Queue
+from robottelo.performance.candlepin import Candlepin
+
+LOGGER = logging.getLogger(__name__)
+
+
+def arrival_offsets(rate, count, distribution='poisson', seed=None):
+    """Return the intended start offsets of ``count`` requests
+
+    :param float rate: The target arrival rate, in requests per second
+    :param int count: The number of requests
+    :param str distribution: ``poisson`` for exponentially distributed
+        inter-arrival times or ``constant`` for evenly spaced requests
+    :param seed: The seed of the Poisson schedule, to make it reproducible
+    :return: The offsets, in seconds from the start of the run
+    :rtype: list
+
+    """
+    if rate <= 0:
+        raise ValueError('The arrival rate must be positive.')
+    if distribution == 'constant':
+        return [i / float(rate) for i in range(count)]
+    if distribution != 'poisson':
+        raise ValueError(
+            'Unknown arrival distribution: {0}'.format(distribution))
+    generator = random.Random(seed)
+    offsets = []
+    offset = 0.0
+    for _ in range(count):
+        offsets.append(offset)
+        offset += generator.expovariate(rate)
+    return offsets
+
+
+class OpenLoopSample(object):
+    """The timing of a single request issued by :class:`OpenLoopDriver`
+
+    :param int index: The position of the request on the schedule
+    :param item: The item the request was issued for
+    :param float intended: When the request was scheduled to start
+    :param float actual: When a worker actually started the request
+    :param float end: When the request finished
+    :param result: The value returned by the operation
+    :param error: The exception raised by the operation, if any
+
+    """
+
+    def __init__(self, index, item, intended, actual, end, result, error):
+        self.index = index
+        self.item = item
+        self.intended = intended
+        self.actual = actual
+        self.end = end
+        self.result = result
+        self.error = error
+
+    @property
+    def latency(self):
+        """The time from the intended start until the request finished"""
+        return self.end - self.intended
+
+    @property
+    def service_time(self):
+        """The time the request took once started"""
+        return self.end - self.actual
+
+    @property
+    def queue_delay(self):
+        """The time the request waited for a free worker"""
+        return self.actual - self.intended
+
+
+class OpenLoopDriver(object):
+    """Issue requests at a target arrival rate
+
+    A scheduler hands each request over to a pool of workers at its intended
+    start time, regardless of how many requests are still running. When all
+    workers are busy, requests wait on a queue and that wait is part of their
+    latency.
+
+    :param operation: A callable receiving the id of the worker running the
+        request and the request item. Its return value is kept on
+        :attr:`OpenLoopSample.result`.
+    :param float rate: The target arrival rate, in requests per second
+    :param str distribution: ``poisson`` or ``constant``, see
+        :func:`arrival_offsets`
+    :param int num_workers: The maximum number of concurrent requests
+    :param seed: The seed of the Poisson schedule
+
+    """
+
+    def __init__(
+            self,
+            operation,
+            rate,
+            distribution='poisson',
+            num_workers=10,
+            seed=None):
+        self.operation = operation
+        self.rate = rate
+        self.distribution = distribution
+        self.num_workers = num_workers
+        self.seed = seed
+        self.logger = LOGGER
+
+    def _work(self, worker_id, queue, samples):
+        """Run the requests of ``queue`` until a ``None`` is found"""
+        while True:
+            request = queue.get()
+            if request is None:
+                return
+            index, item, intended = request
+            actual = time.time()
+            result = error = None
+            try:
+                result = self.operation(worker_id, item)
+            except Exception as err:  # pylint:disable=broad-except
+                self.logger.error(
+                    'Request {0} on worker-{1} failed: {2}'
+                    .format(index, worker_id, err))
+                error = err
+            samples[index] = OpenLoopSample(
+                index, item, intended, actual, time.time(), result, error)
+
+    def run(self, items):
+        """Issue one request for each of ``items`` on schedule
+
+        :param list items: The items of the requests
+        :return: A list of :class:`OpenLoopSample`, in schedule order
+        :rtype: list
+
+        """
+        items = list(items)
+        offsets = arrival_offsets(
+            self.rate, len(items), self.distribution, self.seed)
+        samples = [None] * len(items)
+        queue = Queue()
+        workers = [
+            threading.Thread(target=self._work, args=(i, queue, samples))
+            for i in range(self.num_workers)
+        ]
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+
+        start = time.time()
+        for index, (item, offset) in enumerate(zip(items, offsets)):
+            intended = start + offset
+            delay = intended - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            queue.put((index, item, intended))
+        for _ in workers:
+            queue.put(None)
+        for worker in workers:
+            worker.join()
+        return samples
+
+
+def to_time_result_dict(samples):
+    """Convert open-loop samples to the dictionary used by the performance
+    tests, so they can be written to csv files and to the results store
+
+    All requests are reported on ``thread-0``, in schedule order, and
+    failed requests are left out.
+
+    """
+    return {'thread-0': [
+        sample.latency for sample in samples if sample.error is None
+    ]}
+
+
+def delete_systems(
+        uuids,
+        rate,
+        distribution='poisson',
+        num_workers=10,
+        server_url=None):
+    """Delete content hosts at a target arrival rate
+
+    :param list uuids: The uuids of the systems to be deleted
+    :param str server_url: The base URL of the server. If ``None``, the
+        configured server is used.
+    :return: A list of :class:`OpenLoopSample`
+    :rtype: list
+
+    """
+    return OpenLoopDriver(
+        lambda worker_id, uuid: Candlepin.single_delete(
+            uuid, worker_id, server_url),
+        rate,
+        distribution,
+        num_workers,
+    ).run(uuids)
+
+
+def register_activation_key(
+        ak_name,
+        default_org,
+        vm_list,
+        count,
+        rate,
+        distribution='poisson'):
+    """Register content hosts by activation key at a target arrival rate
+
+    Each virtual machine registers one host at a time, so there is one worker
+    for each virtual machine.
+
+    :param str ak_name: The name of the activation key
+    :param str default_org: The label of the organization
+    :param list vm_list: The virtual machines to register from
+    :param int count: The number of registrations
+    :return: A list of :class:`OpenLoopSample`, whose result is the real time
+        reported by ``subscription-manager``
+    :rtype: list
+
+    """
+    return OpenLoopDriver(
+        lambda worker_id, _: Candlepin.single_register_activation_key(
+            ak_name, default_org, vm_list[worker_id]),
+        rate,
+        distribution,
+        len(vm_list),
+    ).run(range(count))
+
+
+class _SystemsHandler(BaseHTTPRequestHandler):
+    """Serve ``DELETE /katello/api/systems/:uuid`` for
+    :class:`SystemsStandIn`
+
+    """
+    prefix = '/katello/api/systems/'
+
+    def do_DELETE(self):  # noqa pylint:disable=invalid-name
+        """Delete a system after the configured service time"""
+        time.sleep(self.server.service_time)
+        uuid = self.path[len(self.prefix):]
+        if not self.path.startswith(self.prefix) or not uuid:
+            self.send_response(404)
+        else:
+            self.server.deleted.append(uuid)
+            self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):  # pylint:disable=redefined-builtin
+        """Log requests on the module logger instead of stderr"""
+        LOGGER.debug(format, *args)
+
+
+class SystemsStandIn(object):
+    """A local HTTP stand-in for the ``/katello/api/systems`` endpoint
+
+    Requests are served one at a time, each taking ``service_time`` seconds,
+    which makes it easy to check how an open-loop load queues up::
+
+        with SystemsStandIn(service_time=0.05) as stand_in:
+            samples = delete_systems(uuids, 10, server_url=stand_in.url)
+
+    :param float service_time: The time taken to serve each request
+
+    """
+
+    def __init__(self, service_time=0.0):
+        self.server = HTTPServer(('127.0.0.1', 0), _SystemsHandler)
+        self.server.service_time = service_time
+        self.server.deleted = []
+        self.thread = None
+
+    @property
+    def url(self):
+        """The base URL of the stand-in"""
+        return 'http://{0}:{1}'.format(*self.server.server_address)
+
+    @property
+    def deleted(self):
+        """The uuids of the deleted systems"""
+        return self.server.deleted
+
+    def start(self):
+        """Start serving requests on a background thread"""
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Stop serving requests"""
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -2,17 +2,138 @@
 
 Part of functionalities of Pulp are defined in this module
 and have utilities of single repository synchronization, single
-sequential repository sync, sequential repository re-sync.
+sequential repository sync, sequential repository re-sync and
+asynchronous concurrent repository sync.
 
 """
+import calendar
 import logging
+import requests
+import time
 
-from robottelo import ssh
 from robottelo.cli.base import CLIReturnCodeError
 from robottelo.cli.repository import Repository
+from robottelo.clock import Clock
+from robottelo.helpers import get_server_credentials, get_server_url
+from robottelo.performance.savepoint import restore_savepoint
+from urlparse import urljoin
 
 LOGGER = logging.getLogger(__name__)
 
+#: Formats of the timestamps of foreman tasks
+TASK_TIME_FORMATS = (
+    '%Y-%m-%d %H:%M:%S UTC',
+    '%Y-%m-%dT%H:%M:%S.%fZ',
+    '%Y-%m-%dT%H:%M:%SZ',
+)
+
+
+def parse_task_time(value):
+    """Convert the timestamp of a foreman task to seconds since the epoch
+
+    :return: The timestamp or ``None`` if ``value`` is empty or unknown
+    :rtype: float
+
+    """
+    if not value:
+        return None
+    for time_format in TASK_TIME_FORMATS:
+        try:
+            return calendar.timegm(time.strptime(value, time_format))
+        except ValueError:
+            continue
+    LOGGER.warning('Unknown task timestamp format: {0}'.format(value))
+    return None
+
+
+def poll_tasks(task_ids, server_url=None):
+    """Read the status of several foreman tasks with a single API call
+
+    :param list task_ids: The ids of the tasks
+    :param str server_url: The base URL of the server. If ``None``,
+        ``get_server_url`` is used.
+    :return: The tasks, mapped by their ids
+    :rtype: dict
+
+    """
+    if server_url is None:
+        server_url = get_server_url()
+    response = requests.post(
+        urljoin(server_url, '/foreman_tasks/api/tasks/bulk_search'),
+        json={'searches': [
+            {'type': 'task', 'task_id': task_id} for task_id in task_ids
+        ]},
+        auth=get_server_credentials(),
+        verify=False,
+    )
+    response.raise_for_status()
+    return {
+        task['id']: task
+        for search in response.json()
+        for task in search['results']
+    }
+
+
+class SyncTask(object):
+    """A repository synchronization run as a foreman task
+
+    Local timestamps are taken by the performance :class:`Clock` and server
+    timestamps are read from the task, all of them in seconds since the
+    epoch.
+
+    :ivar float triggered: When the synchronization was triggered
+    :ivar float running: When the task was first seen running, ``None`` if it
+        was not seen running before it stopped
+    :ivar float started: When the task started, as reported by the server
+    :ivar float ended: When the task ended, as reported by the server
+    :ivar str state: The last state of the task
+    :ivar str result: The result of the task once stopped
+
+    """
+
+    def __init__(self, repo_id, repo_name, task_id, triggered):
+        self.repo_id = repo_id
+        self.repo_name = repo_name
+        self.task_id = task_id
+        self.triggered = triggered
+        self.running = None
+        self.started = None
+        self.ended = None
+        self.state = None
+        self.result = None
+
+    @property
+    def done(self):
+        """Whether the task is stopped"""
+        return self.state == 'stopped'
+
+    @property
+    def queue_time(self):
+        """The time from triggering the task until it was seen running
+
+        The resolution is the polling interval.
+
+        """
+        if self.running is None:
+            return None
+        return self.running - self.triggered
+
+    @property
+    def duration(self):
+        """The time from the start until the end of the task"""
+        if self.started is None or self.ended is None:
+            return None
+        return self.ended - self.started
+
+    def update(self, task, now):
+        """Update the status from the task read at ``now``"""
+        self.state = task.get('state')
+        self.result = task.get('result')
+        self.started = parse_task_time(task.get('started_at'))
+        self.ended = parse_task_time(task.get('ended_at'))
+        if self.running is None and self.state == 'running':
+            self.running = now
+
 
 class Pulp(object):
     """Performance Measurement of RH Satellite 6
@@ -50,17 +171,76 @@ class Pulp(object):
             'Sync repository {0} by thread-{1} successful!'
             .format(repo_name, thread_id)
         )
-        return cls.get_elapsed_time(result.stderr)
+        return cls.get_elapsed_time(result)
+
+    @classmethod
+    def repositories_async_sync(
+            cls,
+            repositories,
+            poll_interval=5,
+            timeout=None,
+            server_url=None):
+        """Synchronize several repositories at once and wait for them
+
+        Each synchronization is triggered by ``hammer repository synchronize
+        --async``, which returns as soon as the foreman task is created. The
+        status of all tasks is then read with a single API call every
+        ``poll_interval`` seconds, so no ssh session is kept open while the
+        repositories are synchronized.
+
+        :param list repositories: A list of ``(repo_id, repo_name)`` tuples
+        :param float poll_interval: The time between polls, in seconds
+        :param float timeout: How long to wait for all tasks, in seconds. If
+            ``None``, wait until all tasks are stopped.
+        :return: A list of :class:`SyncTask`, one for each repository
+        :rtype: list
+        :raises RuntimeError: If the tasks did not stop in time.
+
+        """
+        clock = Clock()
+        tasks = []
+        for repo_id, repo_name in repositories:
+            LOGGER.info('Trigger synchronization of {0}'.format(repo_name))
+            triggered = clock.now()
+            task_id = Repository.synchronize_async({'id': repo_id})
+            tasks.append(SyncTask(repo_id, repo_name, task_id, triggered))
+
+        deadline = None if timeout is None else clock.now() + timeout
+        pending = {task.task_id: task for task in tasks}
+        while pending:
+            time.sleep(poll_interval)
+            now = clock.now()
+            for task_id, task in poll_tasks(
+                    list(pending), server_url).items():
+                if task_id in pending:
+                    pending[task_id].update(task, now)
+            for task_id in [key for key, task in pending.items() if task.done]:
+                task = pending.pop(task_id)
+                LOGGER.info(
+                    'Synchronization of {0} {1}: queued {2}s, took {3}s'
+                    .format(task.repo_name, task.result, task.queue_time,
+                            task.duration))
+            if pending and deadline is not None and now > deadline:
+                raise RuntimeError(
+                    'Synchronization tasks did not finish in time: {0}'
+                    .format(', '.join(pending)))
+        return tasks
 
     @staticmethod
-    def get_elapsed_time(stderr):
-        """retrieve time from stderr"""
-        # should return only one time point as a single sync
-        real_time = ''
-        for line in stderr.split('\n'):
-            if line.startswith('real'):
-                real_time = line
-        return 0 if real_time == '' else float(real_time.split(' ')[1])
+    def get_elapsed_time(result):
+        """Return the time a synchronization took
+
+        :param result: The raw result of the hammer command
+        :return: The time hammer ran on the server, if it was timed by
+            setting ``performance.test.foreman.perf``. Otherwise, the time
+            measured by the ssh client.
+        :rtype: float
+
+        """
+        LOGGER.debug('Timing phases: {0}'.format(result.timing.as_dict()))
+        if result.timing.remote_time is None:
+            return result.timing.total
+        return result.timing.remote_time
 
     @staticmethod
     def get_enabled_repos(org_id):
@@ -141,8 +321,4 @@ class Pulp(object):
     @staticmethod
     def _restore_from_savepoint(savepoint):
         """Restore from savepoint"""
-        if savepoint == '':
-            LOGGER.warning('No savepoint while continuing test!')
-            return
-        LOGGER.info('Reset db from /home/backup/{0}'.format(savepoint))
-        ssh.command('./reset-db.sh /home/backup/{0}'.format(savepoint))
+        restore_savepoint(savepoint)
@@ -0,0 +1,369 @@
+"""Test utilities for generating HTML performance reports
+
+A report gathers all results of a run recorded on a
+:class:`robottelo.performance.store.ResultsStore` in a single self-contained
+HTML file, so nothing has to be re-run to look at them. For each operation,
+it charts the latency of each sample over time, the latency percentiles and
+the throughput against the number of concurrent threads, and lists the error
+rates. When a baseline run is given, its percentiles and throughput are
+charted next to the ones of the run and regressions are flagged as done by
+:func:`robottelo.performance.compare.compare`.
+
+Charts are rendered by pygal as inline SVG, with their y ranges fitted to the
+results, and without the pygal scripts, which would be loaded from the
+network.
+
+"""
+import cgi
+import codecs
+import datetime
+import numpy
+import pygal
+
+from robottelo.performance.compare import (
+    PERCENTILES,
+    compare,
+    load_store,
+    throughput,
+)
+from robottelo.performance.store import ResultsStore
+
+#: Stroke style of the baseline series
+BASELINE_STYLE = {'dasharray': '6, 3', 'width': 2}
+
+HTML_TEMPLATE = u'''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; margin: 1em 0; }}
+th, td {{ border: 1px solid #ccc; padding: 0.3em 0.6em; text-align: right; }}
+th {{ background: #eee; }}
+td.name {{ text-align: left; }}
+tr.regression td {{ background: #fdd; }}
+.chart {{ display: inline-block; width: 48%; vertical-align: top; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+{body}
+</body>
+</html>
+'''
+
+
+def _new_chart(chart_class, title, x_title, y_title, **options):
+    """Return a pygal chart to be embedded in the report"""
+    return chart_class(
+        title=title,
+        x_title=x_title,
+        y_title=y_title,
+        disable_xml_declaration=True,
+        js=[],
+        **options
+    )
+
+
+def _render(chart):
+    """Render a chart as an inline SVG element"""
+    return u'<div class="chart">{0}</div>'.format(
+        chart.render(is_unicode=True))
+
+
+def _table(head, rows, classes=None):
+    """Render an HTML table
+
+    :param list head: The column titles
+    :param list rows: The cells of each row. The first cell is a name, the
+        other cells are values.
+    :param list classes: The CSS class of each row
+
+    """
+    lines = [u'<table>', u'<tr>{0}</tr>'.format(u''.join(
+        u'<th>{0}</th>'.format(cgi.escape(title)) for title in head))]
+    for i, row in enumerate(rows):
+        css_class = classes[i] if classes else None
+        lines.append(u'<tr{0}>{1}</tr>'.format(
+            u' class="{0}"'.format(css_class) if css_class else u'',
+            u''.join(
+                u'<td{0}>{1}</td>'.format(
+                    u'' if j else u' class="name"',
+                    cgi.escape(u'{0}'.format(cell))
+                )
+                for j, cell in enumerate(row)
+            )
+        ))
+    lines.append(u'</table>')
+    return u'\n'.join(lines)
+
+
+def _format_time(timestamp):
+    """Format an epoch timestamp for the report"""
+    if timestamp is None:
+        return u''
+    return datetime.datetime.utcfromtimestamp(timestamp).strftime(
+        '%Y-%m-%d %H:%M:%S UTC')
+
+
+def _values(time_result_dict):
+    """Return all timing values of a test case as a single array"""
+    return numpy.concatenate([
+        time_list for time_list in time_result_dict.values() if time_list
+    ] or [[]])
+
+
+def percentiles(time_result_dict):
+    """Return the latency percentiles of a test case
+
+    :return: A dictionary mapping each of
+        :data:`robottelo.performance.compare.PERCENTILES` to its latency, or
+        to ``None`` if there are no timing values
+    :rtype: dict
+
+    """
+    values = _values(time_result_dict)
+    return {
+        percent: float(numpy.percentile(values, percent)) if len(values)
+        else None
+        for percent in PERCENTILES
+    }
+
+
+def latency_over_time_chart(store, run_id, operation):
+    """Chart the latency of each sample of an operation against its start
+
+    Samples recorded without a timestamp are left out.
+
+    :return: A pygal chart or ``None`` if no sample has a timestamp
+
+    """
+    samples = [
+        sample for sample in store.samples(run_id, operation)
+        if sample['timestamp'] is not None
+    ]
+    if not samples:
+        return None
+    start = min(sample['timestamp'] for sample in samples)
+    chart = _new_chart(
+        pygal.XY,
+        '{0}: latency over time'.format(operation),
+        'Time since start (s)',
+        'Time (s)',
+        stroke=False,
+    )
+    for num_threads in store.thread_counts(run_id, operation):
+        chart.add('{0}-clients'.format(num_threads), [
+            (sample['timestamp'] - start, sample['latency'])
+            for sample in samples if sample['num_threads'] == num_threads
+        ])
+    return chart
+
+
+def percentile_chart(results, operation, baseline=None):
+    """Chart the latency percentiles of an operation against concurrency
+
+    :param dict results: The timing values of each test case of the run, as
+        returned by :func:`robottelo.performance.compare.load_store`
+    :param str operation: The operation to chart
+    :param dict baseline: The timing values of the baseline run, if any
+    :return: A pygal chart
+
+    """
+    thread_counts = sorted(
+        num_threads for name, num_threads in results if name == operation)
+    chart = _new_chart(
+        pygal.Line,
+        '{0}: latency percentiles'.format(operation),
+        'Concurrent threads',
+        'Time (s)',
+    )
+    chart.x_labels = [str(num_threads) for num_threads in thread_counts]
+    for run_results, suffix, options in (
+            (results, '', {}),
+            (baseline, ' (baseline)', {'stroke_style': BASELINE_STYLE})):
+        if run_results is None:
+            continue
+        run_percentiles = [
+            percentiles(run_results[(operation, num_threads)])
+            if (operation, num_threads) in run_results else {}
+            for num_threads in thread_counts
+        ]
+        for percent in PERCENTILES:
+            chart.add(
+                'p{0}{1}'.format(percent, suffix),
+                [values.get(percent) for values in run_percentiles],
+                **options
+            )
+    return chart
+
+
+def throughput_chart(results, operation, baseline=None):
+    """Chart the throughput of an operation against concurrency
+
+    :param dict results: The timing values of each test case of the run, as
+        returned by :func:`robottelo.performance.compare.load_store`
+    :param str operation: The operation to chart
+    :param dict baseline: The timing values of the baseline run, if any
+    :return: A pygal chart
+
+    """
+    thread_counts = sorted(
+        num_threads for name, num_threads in results if name == operation)
+    chart = _new_chart(
+        pygal.Bar,
+        '{0}: throughput'.format(operation),
+        'Concurrent threads',
+        'Operations per second',
+    )
+    chart.x_labels = [str(num_threads) for num_threads in thread_counts]
+    for run_results, title in ((results, 'run'), (baseline, 'baseline')):
+        if run_results is None:
+            continue
+        chart.add(title, [
+            throughput(run_results[(operation, num_threads)])
+            if (operation, num_threads) in run_results else None
+            for num_threads in thread_counts
+        ])
+    return chart
+
+
+def error_rates(store, run_id, results):
+    """Return the error rate of each test case of a run
+
+    :param store: The :class:`robottelo.performance.store.ResultsStore` the
+        run is recorded on
+    :param str run_id: The id of the run
+    :param dict results: The timing values of each test case of the run
+    :return: A list of ``(operation, num_threads, num_samples, num_errors,
+        error_rate)`` tuples, sorted by operation and number of threads, where
+        the error rate is in percent
+    :rtype: list
+
+    """
+    num_errors = {}
+    for error in store.errors(run_id):
+        key = (error['operation'], error['num_threads'])
+        num_errors[key] = num_errors.get(key, 0) + 1
+    rates = []
+    for key in sorted(set(results) | set(num_errors)):
+        num_samples = len(_values(results.get(key, {})))
+        total = num_samples + num_errors.get(key, 0)
+        rates.append(key + (
+            num_samples,
+            num_errors.get(key, 0),
+            100.0 * num_errors.get(key, 0) / total if total else 0.0,
+        ))
+    return rates
+
+
+def build_report(
+        run_id,
+        baseline_run_id=None,
+        path=None,
+        threshold=None,
+        alpha=None):
+    """Build the HTML report of a run recorded on a results store
+
+    :param str run_id: The id of the run
+    :param str baseline_run_id: The id of a run to compare against, recorded
+        on the same results store
+    :param str path: The path of the results store database. If ``None``,
+        ``performance.results.db`` from the configuration file is used.
+    :param float threshold: The regression threshold passed to
+        :func:`robottelo.performance.compare.compare`
+    :param float alpha: The significance level passed to
+        :func:`robottelo.performance.compare.compare`
+    :return: The HTML report
+    :rtype: unicode
+
+    """
+    store = ResultsStore(path)
+    try:
+        runs = {run['run_id']: run for run in store.runs()}
+        for wanted in (run_id, baseline_run_id):
+            if wanted is not None and wanted not in runs:
+                raise ValueError('Unknown run: {0}'.format(wanted))
+        results = load_store(run_id, store.path)
+        baseline = None
+        if baseline_run_id is not None:
+            baseline = load_store(baseline_run_id, store.path)
+
+        body = [_table(
+            ['', 'run id', 'started', 'git revision', 'satellite version',
+             'description'],
+            [
+                [name, run['run_id'], _format_time(run['started']),
+                 run['git_revision'] or u'', run['satellite_version'] or u'',
+                 run['description'] or u'']
+                for name, run in (
+                    ('run', runs[run_id]),
+                    ('baseline', runs.get(baseline_run_id)))
+                if run is not None
+            ]
+        )]
+
+        body.append(u'<h2>Error rates</h2>')
+        body.append(_table(
+            ['test case', 'samples', 'errors', 'error rate (%)'],
+            [
+                ['{0}-{1}-clients'.format(operation, num_threads),
+                 num_samples, num_errors, '{0:.2f}'.format(rate)]
+                for operation, num_threads, num_samples, num_errors, rate
+                in error_rates(store, run_id, results)
+            ]
+        ))
+
+        if baseline is not None:
+            deltas = compare(baseline, results, threshold, alpha)
+            body.append(u'<h2>Comparison to baseline</h2>')
+            body.append(_table(
+                ['test case', 'metric', 'baseline', 'run', 'change (%)',
+                 'p-value'],
+                [
+                    ['{0}-{1}-clients'.format(
+                        delta.operation, delta.num_threads),
+                     delta.metric,
+                     '{0:.4f}'.format(delta.baseline),
+                     '{0:.4f}'.format(delta.current),
+                     '{0:.1f}'.format(delta.change),
+                     '{0:.4f}'.format(delta.p_value)]
+                    for delta in deltas
+                ],
+                ['regression' if delta.regression else None
+                 for delta in deltas]
+            ))
+            body.append(u'<p>{0} regression(s) found</p>'.format(
+                len([delta for delta in deltas if delta.regression])))
+
+        for operation in store.operations(run_id):
+            body.append(u'<h2>{0}</h2>'.format(cgi.escape(operation)))
+            charts = [
+                latency_over_time_chart(store, run_id, operation),
+                percentile_chart(results, operation, baseline),
+                throughput_chart(results, operation, baseline),
+            ]
+            body.extend(_render(chart) for chart in charts if chart)
+    finally:
+        store.close()
+
+    return HTML_TEMPLATE.format(
+        title=cgi.escape(u'Performance report of run {0}'.format(run_id)),
+        body=u'\n'.join(body),
+    )
+
+
+def write_report(report_file_name, run_id, baseline_run_id=None, **kwargs):
+    """Write the HTML report of a run to a file
+
+    The remaining keyword arguments are passed to :func:`build_report`.
+
+    :param str report_file_name: The path of the HTML file
+    :param str run_id: The id of the run
+    :param str baseline_run_id: The id of a run to compare against
+
+    """
+    report = build_report(run_id, baseline_run_id, **kwargs)
+    with codecs.open(report_file_name, 'w', encoding='utf-8') as handler:
+        handler.write(report)
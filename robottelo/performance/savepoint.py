@@ -0,0 +1,400 @@
+"""Test utilities for creating and restoring database savepoints
+
+Performance tests restore the databases of the server to a known state, a
+savepoint, before each test case or iteration. A savepoint is a directory on
+the server, ``performance.savepoint.directory``/``<name>``, holding:
+
+1. ``postgres/<database>.dump``: a ``pg_dump`` custom format archive of each
+   Postgres database, restored by parallel ``pg_restore`` jobs,
+2. ``mongo/<database>``: a ``mongodump`` of each Mongo database,
+3. ``MD5SUMS``: the checksums of all dump files, used to verify them,
+4. ``checksum``: a checksum of the content of all databases when the
+   savepoint was created.
+
+All databases are dumped and restored at the same time, and the restore is
+skipped when the checksum of the current content of the databases matches the
+one of the savepoint. Savepoints without ``MD5SUMS``, created before this
+module existed, are restored by the ``reset-db.sh`` script of the server.
+
+"""
+import logging
+import pipes
+
+from concurrent.futures import ThreadPoolExecutor
+from robottelo import ssh
+from robottelo.config import conf
+
+LOGGER = logging.getLogger(__name__)
+
+#: Query generating one query per table, which returns the table name, its
+#: number of rows and the sum of a hash of each row
+TABLE_CHECKSUM_QUERY = (
+    "SELECT format('SELECT %L || '':'' || count(*) || '':'' || "
+    "coalesce(sum((''x'' || substr(md5(t::text), 1, 16))::bit(64)::bigint), "
+    "0) FROM %I.%I t;', schemaname || '.' || tablename, schemaname, "
+    "tablename) FROM pg_tables "
+    "WHERE schemaname NOT IN ('pg_catalog', 'information_schema') "
+    "ORDER BY schemaname, tablename"
+)
+
+
+class SavepointError(Exception):
+    """Indicates that a savepoint could not be created or restored"""
+
+
+class RestoreReport(object):
+    """The outcome of :meth:`SavepointManager.restore`
+
+    :param str name: The name of the savepoint
+    :param bool skipped: Whether the restore was skipped because the
+        databases already matched the savepoint
+    :param dict timings: The time, in seconds, taken by each step of the
+        restore, for example ``{'checksum': 2.1, 'postgres foreman': 30.5}``
+
+    """
+
+    def __init__(self, name, skipped, timings):
+        self.name = name
+        self.skipped = skipped
+        self.timings = timings
+
+    @property
+    def total(self):
+        """The time taken by the slowest step of each phase
+
+        Databases are restored at the same time, so the total is the time of
+        the checksum, of stopping and starting services, and of the slowest
+        database restore.
+
+        """
+        restores = [
+            value for step, value in self.timings.items()
+            if step.startswith(('postgres ', 'mongo '))
+        ]
+        return sum(
+            value for step, value in self.timings.items()
+            if not step.startswith(('postgres ', 'mongo '))
+        ) + max(restores or [0])
+
+    def __repr__(self):
+        return '<RestoreReport {0} skipped={1} total={2:.2f}s>'.format(
+            self.name, self.skipped, self.total)
+
+
+def _as_list(value):
+    """Split a comma separated configuration value"""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class SavepointManager(object):
+    """Create, list, verify and restore savepoints on the server
+
+    All settings are read from the ``performance.savepoint.*`` options of
+    the configuration file when not given.
+
+    :param str directory: The directory of the savepoints on the server
+    :param list postgres_databases: The Postgres databases to save
+    :param list mongo_databases: The Mongo databases to save
+    :param int jobs: The number of parallel jobs of each ``pg_restore``
+    :param bool skip_unchanged: Whether to skip restores when the databases
+        already match the savepoint
+    :param int timeout: The timeout, in seconds, of each command
+    :param str hostname: The server. If ``None``, the configured server is
+        used.
+
+    """
+
+    def __init__(
+            self,
+            directory=None,
+            postgres_databases=None,
+            mongo_databases=None,
+            jobs=None,
+            skip_unchanged=None,
+            timeout=None,
+            hostname=None):
+        properties = conf.properties
+        if directory is None:
+            directory = properties.get(
+                'performance.savepoint.directory', '/home/backup')
+        if postgres_databases is None:
+            postgres_databases = _as_list(properties.get(
+                'performance.savepoint.postgres_databases',
+                'foreman,candlepin'))
+        if mongo_databases is None:
+            mongo_databases = _as_list(properties.get(
+                'performance.savepoint.mongo_databases', 'pulp_database'))
+        if jobs is None:
+            jobs = int(properties.get('performance.savepoint.jobs', 4))
+        if skip_unchanged is None:
+            skip_unchanged = properties.get(
+                'performance.savepoint.skip_unchanged', '1') == '1'
+        if timeout is None:
+            timeout = int(
+                properties.get('performance.savepoint.timeout', 3600))
+        self.directory = directory.rstrip('/')
+        self.postgres_databases = postgres_databases
+        self.mongo_databases = mongo_databases
+        self.jobs = jobs
+        self.skip_unchanged = skip_unchanged
+        self.timeout = timeout
+        self.hostname = hostname
+        self.stop_command = properties.get(
+            'performance.savepoint.stop_command',
+            'katello-service stop --exclude postgresql,mongod')
+        self.start_command = properties.get(
+            'performance.savepoint.start_command', 'katello-service start')
+        self.legacy_command = properties.get(
+            'performance.savepoint.legacy_command', './reset-db.sh')
+        self.logger = LOGGER
+
+    def path(self, name):
+        """Return the directory of a savepoint on the server"""
+        if not name or '/' in name or name.startswith('.'):
+            raise SavepointError('Invalid savepoint name: {0!r}'.format(name))
+        return '{0}/{1}'.format(self.directory, name)
+
+    def _run(self, cmd, step=None):
+        """Run a command on the server, raising :class:`SavepointError` if
+        it fails
+
+        :param str step: The name the command is logged with
+        :return: The :class:`robottelo.ssh.SSHCommandResult` of the command
+
+        """
+        result = ssh.command(
+            cmd,
+            hostname=self.hostname,
+            timeout=self.timeout,
+            time_remote=True,
+        )
+        if result.return_code != 0:
+            raise SavepointError('{0} failed with {1}: {2}'.format(
+                step or cmd, result.return_code, result.stderr))
+        return result
+
+    @staticmethod
+    def _elapsed(result):
+        """Return the time a command ran on the server"""
+        timing = result.timing
+        if timing.remote_time is not None:
+            return timing.remote_time
+        return timing.total
+
+    def _timed(self, cmd, step):
+        """Run a command and return the time it ran on the server"""
+        return self._elapsed(self._run(cmd, step))
+
+    def _run_steps(self, steps):
+        """Run commands on the server at the same time
+
+        :param dict steps: The command of each step
+        :return: The time, in seconds, each step ran on the server
+        :rtype: dict
+
+        """
+        if not steps:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+            futures = {
+                step: executor.submit(self._run, cmd, step)
+                for step, cmd in steps.items()
+            }
+        return {
+            step: self._elapsed(future.result())
+            for step, future in futures.items()
+        }
+
+    @staticmethod
+    def _as_postgres(cmd):
+        """Run a command as the postgres user"""
+        return 'runuser -u postgres -- {0}'.format(cmd)
+
+    def _checksum_command(self):
+        """Return the command printing the checksum of all databases"""
+        parts = []
+        for database in self.postgres_databases:
+            psql = self._as_postgres(
+                'psql -At -d {0}'.format(pipes.quote(database)))
+            parts.append('echo postgres {0}; {1} -c {2} | {1}'.format(
+                pipes.quote(database), psql,
+                pipes.quote(TABLE_CHECKSUM_QUERY)))
+        for database in self.mongo_databases:
+            parts.append(
+                'echo mongo {0}; mongo {0} --quiet --eval {1}'.format(
+                    pipes.quote(database),
+                    pipes.quote('print(db.runCommand({dbHash: 1}).md5)')))
+        return 'set -o pipefail; {{ {0}; }} | md5sum | cut -d" " -f1'.format(
+            '; '.join(parts))
+
+    def checksum(self):
+        """Return the checksum of the current content of all databases"""
+        return self._run(self._checksum_command(), 'checksum').stdout[0]
+
+    def list(self):
+        """Return the savepoints on the server
+
+        :return: A list of dictionaries with the ``name`` of each savepoint
+            and when it was ``created``, oldest first. Savepoints not created
+            by this class are not listed.
+        :rtype: list
+
+        """
+        result = self._run(
+            'find {0} -mindepth 2 -maxdepth 2 -name MD5SUMS '
+            '-printf "%T@ %h\\n"'.format(pipes.quote(self.directory)),
+            'list'
+        )
+        savepoints = []
+        for line in result.stdout:
+            if not line.strip():
+                continue
+            created, path = line.split(' ', 1)
+            savepoints.append({
+                'name': path.rstrip('/').rsplit('/', 1)[-1],
+                'created': float(created),
+            })
+        return sorted(savepoints, key=lambda savepoint: savepoint['created'])
+
+    def exists(self, name):
+        """Check if a savepoint was created by this class"""
+        result = ssh.command(
+            'test -f {0}/MD5SUMS'.format(pipes.quote(self.path(name))),
+            hostname=self.hostname,
+        )
+        return result.return_code == 0
+
+    def verify(self, name):
+        """Check if the dump files of a savepoint are intact"""
+        result = ssh.command(
+            'cd {0} && md5sum --check --quiet MD5SUMS'.format(
+                pipes.quote(self.path(name))),
+            hostname=self.hostname,
+            timeout=self.timeout,
+        )
+        if result.return_code != 0:
+            self.logger.warning('Savepoint {0} is corrupted: {1}'.format(
+                name, result.stdout))
+        return result.return_code == 0
+
+    def create(self, name, overwrite=False):
+        """Save the current content of all databases
+
+        Services are stopped while the databases are dumped, so the dumps are
+        consistent with each other.
+
+        :param str name: The name of the savepoint
+        :param bool overwrite: Whether to replace an existing savepoint
+        :return: The time, in seconds, taken by each step
+        :rtype: dict
+
+        """
+        path = pipes.quote(self.path(name))
+        if self.exists(name) and not overwrite:
+            raise SavepointError('Savepoint {0} already exists'.format(name))
+        self._run(
+            'rm -rf {0} && mkdir -p {0}/postgres {0}/mongo'.format(path),
+            'prepare')
+        timings = {'stop': self._timed(self.stop_command, 'stop')}
+        try:
+            steps = {}
+            for database in self.postgres_databases:
+                steps['postgres {0}'.format(database)] = (
+                    '{0} > {1}/postgres/{2}.dump'.format(
+                        self._as_postgres('pg_dump -Fc {0}'.format(
+                            pipes.quote(database))),
+                        path,
+                        pipes.quote(database),
+                    ))
+            for database in self.mongo_databases:
+                steps['mongo {0}'.format(database)] = (
+                    'mongodump --db {0} --out {1}/mongo'.format(
+                        pipes.quote(database), path))
+            timings.update(self._run_steps(steps))
+            timings['checksum'] = self._timed(
+                '{0} > {1}/checksum'.format(self._checksum_command(), path),
+                'checksum')
+            # MD5SUMS is written last, so incomplete savepoints are not listed
+            self._run(
+                'cd {0} && find postgres mongo -type f -print0 | '
+                'xargs -0 md5sum > MD5SUMS'.format(path),
+                'md5sums')
+        finally:
+            timings['start'] = self._timed(self.start_command, 'start')
+        self.logger.info('Created savepoint {0}: {1}'.format(name, timings))
+        return timings
+
+    def restore(self, name, force=False):
+        """Restore all databases to a savepoint
+
+        :param str name: The name of the savepoint
+        :param bool force: Whether to restore even if the databases already
+            match the savepoint
+        :return: A :class:`RestoreReport`
+
+        """
+        if not self.exists(name):
+            self.logger.info('Reset db from {0} by {1}'.format(
+                self.path(name), self.legacy_command))
+            timings = {'legacy': self._timed(
+                '{0} {1}'.format(self.legacy_command, self.path(name)),
+                'legacy')}
+            return RestoreReport(name, False, timings)
+
+        path = pipes.quote(self.path(name))
+        timings = {}
+        if self.skip_unchanged and not force:
+            result = self._run(
+                '{0}; cat {1}/checksum'.format(self._checksum_command(), path),
+                'checksum'
+            )
+            timings['checksum'] = self._elapsed(result)
+            current, saved = result.stdout[:2]
+            if current == saved:
+                report = RestoreReport(name, True, timings)
+                self.logger.info('Databases already match savepoint {0}, '
+                                 'skipping restore: {1}'.format(name, report))
+                return report
+
+        timings['stop'] = self._timed(self.stop_command, 'stop')
+        try:
+            steps = {}
+            for database in self.postgres_databases:
+                steps['postgres {0}'.format(database)] = (
+                    '{0} && {1}'.format(
+                        self._as_postgres('dropdb --if-exists {0}'.format(
+                            pipes.quote(database))),
+                        self._as_postgres(
+                            'pg_restore --jobs {0} --create --dbname postgres '
+                            '{1}/postgres/{2}.dump'.format(
+                                self.jobs, path, pipes.quote(database))),
+                    ))
+            for database in self.mongo_databases:
+                steps['mongo {0}'.format(database)] = (
+                    'mongorestore --drop --db {0} {1}/mongo/{0}'.format(
+                        pipes.quote(database), path))
+            timings.update(self._run_steps(steps))
+        finally:
+            timings['start'] = self._timed(self.start_command, 'start')
+        report = RestoreReport(name, False, timings)
+        self.logger.info('Restored savepoint {0}: {1}'.format(
+            name, ', '.join(
+                '{0} {1:.2f}s'.format(step, value)
+                for step, value in sorted(timings.items()))))
+        return report
+
+
+def restore_savepoint(name):
+    """Restore the databases to a savepoint, doing nothing if ``name`` is
+    empty
+
+    This is what performance test cases use between test cases and
+    iterations.
+
+    :return: A :class:`RestoreReport` or ``None``
+
+    """
+    if name == '':
+        LOGGER.warning('No savepoint while continuing test!')
+        return None
+    return SavepointManager().restore(name)
@@ -1,6 +1,419 @@
 """Test utilities for writing csv files"""
 import csv
+import logging
+import math
 import numpy
+import threading
+import time
+import warnings
+
+LOGGER = logging.getLogger(__name__)
+
+#: Header of the rows written by :func:`write_stat`
+STAT_HEADER = [
+    'bucket',
+    'min',
+    'median',
+    'mean',
+    'max',
+    'std',
+    '90%',
+    '95%',
+    '99%'
+]
+
+
+def compute_stat(samples):
+    """Compute statistics over the last axis of ``samples``
+
+    Missing samples, represented by ``numpy.nan``, are ignored. All
+    statistics are computed in one vectorized pass, so ``samples`` can hold
+    any number of series on its leading axes. For example, samples with shape
+    ``(clients, buckets, bucket_size)`` results on statistics with shape
+    ``(clients, buckets, 8)``.
+
+    :param samples: An array-like of timing values
+    :return: An array with the statistics, in the ``STAT_HEADER`` order
+        (min, median, mean, max, std, 90%, 95%, 99%), on its last axis.
+        Statistics of series without samples are ``numpy.nan``.
+    :rtype: numpy.ndarray
+
+    """
+    samples = numpy.asarray(samples, dtype=float)
+    with warnings.catch_warnings():
+        # all-nan series just result on nan statistics
+        warnings.simplefilter('ignore', RuntimeWarning)
+        percentiles = numpy.nanpercentile(
+            samples, (50, 90, 95, 99), axis=-1)
+        return numpy.stack(
+            (
+                numpy.nanmin(samples, axis=-1),
+                percentiles[0],
+                numpy.nanmean(samples, axis=-1),
+                numpy.nanmax(samples, axis=-1),
+                numpy.nanstd(samples, axis=-1),
+                percentiles[1],
+                percentiles[2],
+                percentiles[3],
+            ),
+            axis=-1
+        )
+
+
+def write_stat(writer, title, labels, stat):
+    """Write rows of statistics computed by :func:`compute_stat`
+
+    :param writer: A ``csv.writer`` object
+    :param str title: The title row written before the statistics
+    :param list labels: The label of each row of statistics
+    :param stat: The statistics, one row per label
+    :return: A dictionary mapping each row index to its (min, median, max,
+        std) tuple, used to generate charts
+    :rtype: dict
+
+    """
+    return_stat = {}
+    writer.writerow([])
+    writer.writerow(['{0}'.format(title)])
+    writer.writerow(STAT_HEADER)
+    for i, label in enumerate(labels):
+        row = [float(value) for value in stat[i]]
+        writer.writerow([label] + row)
+        return_stat.update({i: (row[0], row[1], row[3], row[4])})
+    return return_stat
+
+
+class LatencyHistogram(object):
+    """Histogram to compute percentiles of a stream of timing values
+
+    Values are counted on logarithmic bins, each bin ``precision`` wider than
+    the previous one, in the same spirit of HDR histograms. The memory used
+    is constant, no matter how many values are recorded, and the percentiles
+    have a relative error not bigger than ``precision``. Values outside the
+    ``[lowest, highest]`` range are counted on the first or last bin.
+
+    Values can be recorded from multiple threads while percentiles are read,
+    so statistics are available while a test is still running.
+
+    """
+
+    def __init__(self, lowest=0.001, highest=3600, precision=0.01):
+        self.lowest = float(lowest)
+        self.precision = float(precision)
+        self._log_base = math.log(1 + self.precision)
+        self.counts = numpy.zeros(self._bin(highest) + 1, dtype=numpy.int64)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def _bin(self, value):
+        """Return the index of the bin which counts ``value``"""
+        if value <= self.lowest:
+            return 0
+        return int(math.log(value / self.lowest) / self._log_base) + 1
+
+    def add(self, value):
+        """Record a timing value"""
+        index = min(self._bin(value), len(self.counts) - 1)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    @property
+    def mean(self):
+        """The mean of the recorded values"""
+        if self.count == 0:
+            return None
+        return self.total / self.count
+
+    def percentile(self, percent):
+        """Return the approximated ``percent`` percentile
+
+        :param float percent: The percentile to compute, between 0 and 100
+        :return: The upper bound of the bin holding the percentile, limited to
+            the recorded min and max values, or ``None`` if no value was
+            recorded
+
+        """
+        with self._lock:
+            if self.count == 0:
+                return None
+            rank = max(1, int(math.ceil(percent / 100.0 * self.count)))
+            index = int(numpy.searchsorted(numpy.cumsum(self.counts), rank))
+            value = self.lowest * (1 + self.precision) ** index
+            return min(max(value, self.min), self.max)
+
+
+class TimingSamples(object):
+    """Storage of the timing values of a concurrent test run
+
+    All timing values are stored on a single array with one row per client,
+    preallocated to ``num_iterations`` columns, so aggregating buckets,
+    clients and the whole test is done by reshaping this array instead of
+    slicing and merging lists. Missing values are ``numpy.nan``.
+
+    If ``histogram`` is ``True``, values are also recorded on a
+    :class:`LatencyHistogram`, so percentiles can be read by
+    :meth:`percentile` while the test is running.
+
+    """
+
+    def __init__(self, num_clients, num_iterations, histogram=False):
+        self.samples = numpy.full((num_clients, num_iterations), numpy.nan)
+        self.counts = numpy.zeros(num_clients, dtype=int)
+        self.histogram = LatencyHistogram() if histogram else None
+
+    @classmethod
+    def from_dict(cls, time_result_dict):
+        """Create from a dictionary of timing lists keyed by ``thread-N``
+
+        :param dict time_result_dict: The timing values of each thread. For
+            example: ``{'thread-0': [...], 'thread-1': [...]}``
+
+        """
+        time_lists = [
+            time_result_dict.get('thread-{0}'.format(i)) or []
+            for i in range(len(time_result_dict))
+        ]
+        timing_samples = cls(
+            len(time_lists),
+            max([len(time_list) for time_list in time_lists] or [0])
+        )
+        for client, time_list in enumerate(time_lists):
+            timing_samples.samples[client, :len(time_list)] = time_list
+            timing_samples.counts[client] = len(time_list)
+        return timing_samples
+
+    @property
+    def num_clients(self):
+        """Number of clients of the test run"""
+        return self.samples.shape[0]
+
+    def add(self, client, value):
+        """Record a timing value of ``client``
+
+        Each client should be recorded by a single thread.
+
+        """
+        self.samples[client, self.counts[client]] = value
+        self.counts[client] += 1
+        if self.histogram is not None:
+            self.histogram.add(value)
+
+    def percentile(self, percent):
+        """Return the approximated ``percent`` percentile of all values
+        recorded so far. Requires ``histogram`` to be enabled.
+
+        """
+        if self.histogram is None:
+            raise ValueError('Streaming percentiles require a histogram')
+        return self.histogram.percentile(percent)
+
+    def _bucketized(self, bucket_size, num_buckets):
+        """Return the samples reshaped to (clients, buckets, bucket_size)"""
+        width = bucket_size * num_buckets
+        samples = self.samples[:, :width]
+        if samples.shape[1] < width:
+            samples = numpy.pad(
+                samples,
+                ((0, 0), (0, width - samples.shape[1])),
+                'constant',
+                constant_values=numpy.nan
+            )
+        return samples.reshape(self.num_clients, num_buckets, bucket_size)
+
+    def compute(self, bucket_size, num_buckets):
+        """Compute all aggregated statistics of the test run
+
+        :param int bucket_size: The number of timing values of each bucket
+        :param int num_buckets: The number of buckets aggregated from all
+            clients for the per-test bucketized statistics
+        :return: A dictionary with the statistics, as returned by
+            :func:`compute_stat`, of:
+
+            * ``client_bucketized``: each bucket of each client, with shape
+              ``(clients, buckets, 8)``
+            * ``test_bucketized``: each bucket merged from all clients, with
+              shape ``(num_buckets, 8)``
+            * ``client``: each client, with shape ``(clients, 8)``
+            * ``test``: all values, with shape ``(8,)``
+
+            and ``test_bucketized_counts``, the number of values of each
+            merged bucket.
+        :rtype: dict
+
+        """
+        max_buckets = (
+            self.counts.max() // bucket_size
+            if bucket_size > 0 and self.num_clients > 0 else 0
+        )
+        client_buckets = self._bucketized(bucket_size, max_buckets)
+        test_buckets = self._bucketized(bucket_size, num_buckets).transpose(
+            1, 0, 2).reshape(num_buckets, -1)
+        return {
+            'client_bucketized': compute_stat(client_buckets),
+            'test_bucketized': compute_stat(test_buckets),
+            'test_bucketized_counts': numpy.count_nonzero(
+                ~numpy.isnan(test_buckets), axis=1),
+            'client': compute_stat(self.samples),
+            'test': compute_stat(self.samples.ravel()),
+        }
+
+
+class LiveStatistics(object):
+    """Log percentiles of the timing values of a test while it is running
+
+    Values are recorded on :class:`TimingSamples` with a histogram, and the
+    percentiles of all values recorded so far are logged at most once every
+    ``interval`` seconds.
+
+    :param int num_clients: The number of clients of the test run
+    :param int num_iterations: The number of values of each client
+    :param float interval: The minimum number of seconds between two logs
+
+    """
+
+    def __init__(self, num_clients, num_iterations, interval):
+        self.timing_samples = TimingSamples(
+            num_clients, num_iterations, histogram=True)
+        self.interval = interval
+        self._logged = time.time()
+        self._lock = threading.Lock()
+
+    def add(self, client, value):
+        """Record a timing value of ``client``, logging the percentiles if
+        ``interval`` seconds passed since they were last logged
+
+        Each client should be recorded by a single thread.
+
+        """
+        self.timing_samples.add(client, value)
+        now = time.time()
+        with self._lock:
+            if now - self._logged < self.interval:
+                return
+            self._logged = now
+        self.log()
+
+    def log(self):
+        """Log the percentiles of all values recorded so far"""
+        histogram = self.timing_samples.histogram
+        if histogram.count == 0:
+            return
+        LOGGER.info(
+            '%d values so far: median %.3fs, 90%% %.3fs, 95%% %.3fs, '
+            '99%% %.3fs, max %.3fs',
+            histogram.count,
+            histogram.percentile(50),
+            histogram.percentile(90),
+            histogram.percentile(95),
+            histogram.percentile(99),
+            histogram.max,
+        )
+
+
+def bucket_labels(bucket_size, num_buckets):
+    """Return the labels of ``num_buckets`` buckets of ``bucket_size``"""
+    return [
+        '{0}-{1}'.format(bucket_size * i + 1, bucket_size * (i + 1))
+        for i in range(num_buckets)
+    ]
+
+
+def write_concurrent_stat(
+        writer,
+        test_case_name,
+        time_result_dict,
+        bucket_size,
+        num_buckets):
+    """Write all statistics of a concurrent test case to a csv file
+
+    Writes, after a ``test_case_name`` row, the following sections:
+
+    1. ``stat-per-client-bucketized``: each bucket of each client
+    2. ``stat-per-test-bucketized``: each bucket merged from all clients
+    3. ``stat-per-client``: each client
+    4. ``stat-per-test``: all timing values
+
+    :param writer: A ``csv.writer`` object
+    :param str test_case_name: The name of the test case
+    :param dict time_result_dict: The timing values of each thread. For
+        example: ``{'thread-0': [...], 'thread-1': [...]}``
+    :param int bucket_size: The number of timing values of each bucket
+    :param int num_buckets: The number of merged buckets
+    :return: A dictionary with the (min, median, max, std) dictionaries,
+        as returned by :func:`write_stat`, of each section, used to generate
+        charts. ``client_bucketized`` maps each client index to its
+        dictionary.
+    :rtype: dict
+
+    """
+    # compute all statistics at once from a single array of timings
+    stat = TimingSamples.from_dict(time_result_dict).compute(
+        bucket_size, num_buckets)
+    time_lists = [
+        time_result_dict.get('thread-{0}'.format(i)) or []
+        for i in range(len(time_result_dict))
+    ]
+    stat_dicts = {'client_bucketized': {}, 'test_bucketized': {}}
+    writer.writerow([test_case_name])
+
+    # 1. each client grouped by buckets
+    writer.writerow(['stat-per-client-bucketized'])
+    for i, time_list in enumerate(time_lists):
+        stat_dicts['client_bucketized'][i] = write_stat(
+            writer,
+            'client-{0}'.format(i),
+            bucket_labels(bucket_size, len(time_list) // bucket_size),
+            stat['client_bucketized'][i],
+        )
+    writer.writerow([])
+
+    # 2. each bucket of all clients merged into a chunk
+    writer.writerow(['stat-per-test-bucketized'])
+    for i in range(num_buckets):
+        chunk_size = stat['test_bucketized_counts'][i]
+        return_stat = {}
+        if chunk_size > 0:
+            return_stat = write_stat(
+                writer,
+                'bucket-{0}'.format(i),
+                bucket_labels(chunk_size, 1),
+                stat['test_bucketized'][i:i + 1],
+            )
+        stat_dicts['test_bucketized'][i] = return_stat.get(0, (0, 0, 0, 0))
+    writer.writerow([])
+
+    # 3. full list of each client
+    writer.writerow(['stat-per-client'])
+    stat_dicts['client'] = {}
+    for i, time_list in enumerate(time_lists):
+        return_stat = write_stat(
+            writer,
+            'client-{0}'.format(i),
+            bucket_labels(len(time_list), 1),
+            stat['client'][i:i + 1],
+        )
+        stat_dicts['client'][i] = return_stat.get(0, (0, 0, 0, 0))
+    writer.writerow([])
+
+    # 4. all timing values of the test case
+    writer.writerow(['stat-per-test'])
+    stat_dicts['test'] = write_stat(
+        writer,
+        'test-{0}'.format(len(time_lists)),
+        bucket_labels(sum(len(time_list) for time_list in time_lists), 1),
+        [stat['test']],
+    )
+    writer.writerow([])
+    return stat_dicts
 
 
 def generate_stat_for_concurrent_thread(
@@ -14,55 +427,21 @@ def generate_stat_for_concurrent_thread(
     if bucket_size == 0:
         return
     else:
-        num_buckets = len(time_list)/bucket_size
+        num_buckets = len(time_list) // bucket_size
 
-    return_stat = {}
-
-    # create list of bucket series
-    buckets = ['{0}-{1}'.format(bucket_size * i + 1, bucket_size * (i + 1))
-               for i in range(num_buckets)]
+    # reshape the given time-list into buckets, one bucket per row
+    samples = numpy.asarray(
+        time_list[:bucket_size * num_buckets],
+        dtype=float
+    ).reshape(num_buckets, bucket_size)
 
     with open(stat_file_name, 'a') as handler:
-        writer = csv.writer(handler)
-        writer.writerow([])
-        writer.writerow(['{0}'.format(thread_name)])
-        writer.writerow([
-            'bucket',
-            'min',
-            'median',
-            'mean',
-            'max',
-            'std',
-            '90%',
-            '95%',
-            '99%'
-        ])
-        for i, bucket in enumerate(buckets):
-            # slice the given time-list into buckets
-            time_list_slice = time_list[bucket_size * i:bucket_size * (i + 1)]
-
-            # variables for generating graphs only
-            gmin = numpy.amin(time_list_slice)
-            gmean = numpy.mean(time_list_slice)
-            gmedian = numpy.median(time_list_slice)
-            gmax = numpy.amax(time_list_slice)
-            gstd = numpy.std(time_list_slice)
-
-            writer.writerow([
-                bucket,
-                gmin,
-                gmedian,
-                gmean,
-                gmax,
-                gstd,
-                numpy.percentile(time_list_slice, 90),
-                numpy.percentile(time_list_slice, 95),
-                numpy.percentile(time_list_slice, 99)
-            ])
-
-            # update a dictionary with key as each bucket and values as stat
-            return_stat.update({i: (gmin, gmedian, gmax, gstd)})
-        return return_stat
+        return write_stat(
+            csv.writer(handler),
+            thread_name,
+            bucket_labels(bucket_size, num_buckets),
+            compute_stat(samples),
+        )
 
 
 def generate_stat_for_pulp_sync(index, time_list, stat_file_name):
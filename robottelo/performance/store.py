@@ -0,0 +1,349 @@
+"""Test utilities for storing performance results
+
+All timing values of performance test runs are recorded on a SQLite database,
+together with information about the run, so results of different runs can be
+queried and compared. Results can also be exported to the raw and statistics
+csv files produced by the performance tests.
+
+"""
+import csv
+import logging
+import sqlite3
+import subprocess
+import time
+import uuid
+
+from robottelo import ssh
+from robottelo.config import conf, get_app_root
+from robottelo.performance.stat import write_concurrent_stat
+
+LOGGER = logging.getLogger(__name__)
+
+SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS runs (
+        run_id TEXT PRIMARY KEY,
+        started REAL NOT NULL,
+        git_revision TEXT,
+        satellite_version TEXT,
+        description TEXT
+    )''',
+    '''CREATE TABLE IF NOT EXISTS samples (
+        run_id TEXT NOT NULL REFERENCES runs(run_id),
+        operation TEXT NOT NULL,
+        num_threads INTEGER NOT NULL,
+        client INTEGER NOT NULL,
+        iteration INTEGER NOT NULL,
+        timestamp REAL,
+        latency REAL NOT NULL
+    )''',
+    '''CREATE INDEX IF NOT EXISTS samples_run_operation
+        ON samples (run_id, operation, num_threads)''',
+    '''CREATE TABLE IF NOT EXISTS errors (
+        run_id TEXT NOT NULL REFERENCES runs(run_id),
+        operation TEXT NOT NULL,
+        num_threads INTEGER NOT NULL,
+        client INTEGER NOT NULL,
+        iteration INTEGER NOT NULL,
+        timestamp REAL,
+        message TEXT
+    )''',
+)
+
+
+def get_git_revision():
+    """Return the git revision of robottelo or ``None`` if unknown"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=get_app_root(),
+            stderr=subprocess.STDOUT,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_satellite_version():
+    """Return the version of the satellite package installed on the server
+    or ``None`` if unknown
+
+    """
+    try:
+        result = ssh.command(
+            "rpm -q --queryformat '%{VERSION}-%{RELEASE}' satellite")
+    except Exception as err:  # pylint:disable=broad-except
+        LOGGER.warning('Fail to get satellite version: {0}'.format(err))
+        return None
+    if result.return_code != 0 or not result.stdout:
+        return None
+    return result.stdout[0]
+
+
+def operation_from_test_case_name(test_case_name):
+    """Extract the operation from a test case name
+
+    For example: ``raw-ak-10-clients`` is the ``ak`` operation.
+
+    """
+    return test_case_name.split('-')[1]
+
+
+class ResultsStore(object):
+    """Records the timing values of performance test runs
+
+    Each test run is identified by a ``run_id`` created by
+    :meth:`create_run`. Each timing value is recorded with its run, the
+    operation timed (``ak``, ``att``, ``reg``, ``del``, ``sync``...), the
+    number of concurrent threads, the client (thread) and iteration which
+    timed it, and, when known, the time it started.
+
+    :param str path: The path of the SQLite database file. If ``None``,
+        ``performance.results.db`` from the configuration file is used.
+
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = conf.properties.get(
+                'performance.results.db', 'perf-results.db')
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
+
+    def create_run(
+            self,
+            git_revision=None,
+            satellite_version=None,
+            description=None,
+            run_id=None):
+        """Record a new test run
+
+        :param str git_revision: The robottelo git revision. If ``None``, it
+            is read from the git repository.
+        :param str satellite_version: The version of the tested satellite
+        :param str description: Free text describing the run
+        :param str run_id: The id of the run. If ``None``, a new one is
+            generated.
+        :return: The id of the run
+        :rtype: str
+
+        """
+        if run_id is None:
+            run_id = uuid.uuid4().hex
+        if git_revision is None:
+            git_revision = get_git_revision()
+        with self.connection:
+            self.connection.execute(
+                'INSERT INTO runs VALUES (?, ?, ?, ?, ?)',
+                (run_id, time.time(), git_revision, satellite_version,
+                 description)
+            )
+        return run_id
+
+    def add_samples(
+            self,
+            run_id,
+            operation,
+            num_threads,
+            time_result_dict,
+            timestamp_dict=None):
+        """Record the timing values of a test case
+
+        :param str run_id: The id of the run
+        :param str operation: The operation timed
+        :param int num_threads: The number of concurrent threads
+        :param dict time_result_dict: The timing values of each thread. For
+            example: ``{'thread-0': [...], 'thread-1': [...]}``
+        :param dict timestamp_dict: The start time of each timing value, with
+            the same structure of ``time_result_dict``
+
+        """
+        rows = []
+        for thread_name, time_list in time_result_dict.items():
+            client = int(thread_name.split('-')[-1])
+            timestamps = (timestamp_dict or {}).get(thread_name) or []
+            for iteration, latency in enumerate(time_list):
+                rows.append((
+                    run_id,
+                    operation,
+                    num_threads,
+                    client,
+                    iteration,
+                    timestamps[iteration]
+                    if iteration < len(timestamps) else None,
+                    latency,
+                ))
+        with self.connection:
+            self.connection.executemany(
+                'INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def add_errors(self, run_id, operation, num_threads, errors):
+        """Record the failed iterations of a test case
+
+        :param str run_id: The id of the run
+        :param str operation: The operation timed
+        :param int num_threads: The number of concurrent threads
+        :param list errors: The failed iterations, as a list of
+            ``(client, iteration, timestamp, message)`` tuples
+
+        """
+        with self.connection:
+            self.connection.executemany(
+                'INSERT INTO errors VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (run_id, operation, num_threads, client, iteration,
+                     timestamp, message)
+                    for client, iteration, timestamp, message in errors
+                ]
+            )
+
+    def runs(self):
+        """Return all recorded runs, oldest first
+
+        :return: A list of dictionaries with the columns of each run
+        :rtype: list
+
+        """
+        return [
+            dict(row)
+            for row in self.connection.execute(
+                'SELECT * FROM runs ORDER BY started')
+        ]
+
+    def operations(self, run_id):
+        """Return the operations recorded for a run"""
+        return [
+            row[0]
+            for row in self.connection.execute(
+                'SELECT DISTINCT operation FROM samples WHERE run_id = ? '
+                'ORDER BY operation',
+                (run_id,)
+            )
+        ]
+
+    def thread_counts(self, run_id, operation):
+        """Return the numbers of threads an operation was recorded with"""
+        return [
+            row[0]
+            for row in self.connection.execute(
+                'SELECT DISTINCT num_threads FROM samples '
+                'WHERE run_id = ? AND operation = ? ORDER BY num_threads',
+                (run_id, operation)
+            )
+        ]
+
+    def samples(self, run_id, operation=None, num_threads=None):
+        """Return the recorded samples of a run
+
+        :param str run_id: The id of the run
+        :param str operation: Return only samples of this operation
+        :param int num_threads: Return only samples recorded with this number
+            of threads
+        :return: A list of dictionaries with the columns of each sample
+        :rtype: list
+
+        """
+        query = 'SELECT * FROM samples WHERE run_id = ?'
+        parameters = [run_id]
+        if operation is not None:
+            query += ' AND operation = ?'
+            parameters.append(operation)
+        if num_threads is not None:
+            query += ' AND num_threads = ?'
+            parameters.append(num_threads)
+        query += ' ORDER BY operation, num_threads, client, iteration'
+        return [
+            dict(row) for row in self.connection.execute(query, parameters)
+        ]
+
+    def errors(self, run_id, operation=None, num_threads=None):
+        """Return the recorded failed iterations of a run
+
+        :param str run_id: The id of the run
+        :param str operation: Return only errors of this operation
+        :param int num_threads: Return only errors recorded with this number
+            of threads
+        :return: A list of dictionaries with the columns of each error
+        :rtype: list
+
+        """
+        query = 'SELECT * FROM errors WHERE run_id = ?'
+        parameters = [run_id]
+        if operation is not None:
+            query += ' AND operation = ?'
+            parameters.append(operation)
+        if num_threads is not None:
+            query += ' AND num_threads = ?'
+            parameters.append(num_threads)
+        query += ' ORDER BY operation, num_threads, client, iteration'
+        return [
+            dict(row) for row in self.connection.execute(query, parameters)
+        ]
+
+    def latencies(self, run_id, operation, num_threads):
+        """Return the timing values of a test case
+
+        :return: The timing values of each thread, as a dictionary with the
+            same structure used by the performance tests. For example:
+            ``{'thread-0': [...], 'thread-1': [...]}``. Threads without
+            samples, as all their iterations failed, have an empty list.
+        :rtype: dict
+
+        """
+        time_result_dict = dict(
+            ('thread-{0}'.format(i), []) for i in range(num_threads))
+        for row in self.connection.execute(
+                'SELECT client, latency FROM samples '
+                'WHERE run_id = ? AND operation = ? AND num_threads = ? '
+                'ORDER BY client, iteration',
+                (run_id, operation, num_threads)):
+            time_result_dict.setdefault(
+                'thread-{0}'.format(row[0]), []).append(row[1])
+        return time_result_dict
+
+    def export_raw_csv(self, run_id, operation, raw_file_name):
+        """Append the timing values of an operation to a raw csv file
+
+        The file has the same format of the ``perf-raw-*.csv`` files written
+        by the performance tests.
+
+        """
+        with open(raw_file_name, 'a') as handler:
+            writer = csv.writer(handler)
+            for num_threads in self.thread_counts(run_id, operation):
+                time_result_dict = self.latencies(
+                    run_id, operation, num_threads)
+                writer.writerow(
+                    ['raw-{0}-{1}-clients'.format(operation, num_threads)])
+                for i in range(num_threads):
+                    writer.writerow(
+                        time_result_dict.get('thread-{0}'.format(i), []))
+                writer.writerow([])
+
+    def export_stat_csv(self, run_id, operation, stat_file_name, num_buckets):
+        """Append the statistics of an operation to a statistics csv file
+
+        The file has the same format of the ``perf-statistics-*.csv`` files
+        written by the performance tests.
+
+        """
+        with open(stat_file_name, 'a') as handler:
+            writer = csv.writer(handler)
+            for num_threads in self.thread_counts(run_id, operation):
+                time_result_dict = self.latencies(
+                    run_id, operation, num_threads)
+                num_iterations = max(
+                    len(time_list) for time_list in time_result_dict.values())
+                write_concurrent_stat(
+                    writer,
+                    'stat-{0}-{1}-clients'.format(operation, num_threads),
+                    time_result_dict,
+                    max(num_iterations // num_buckets, 1),
+                    num_buckets,
+                )
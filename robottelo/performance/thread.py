@@ -1,173 +1,540 @@
-"""Test utilities for multi-threading programming"""
+"""Test utilities for multi-threading programming
+
+All tests of concurrent subscription by activation-key/attach, concurrent
+deletion and concurrent synchronization run several clients at the same time
+to measure timing latency. :class:`ScenarioRunner` runs one callable per
+client on a pool of threads, following an :class:`IterationPlan`::
+
+    runner = ScenarioRunner()
+    result = runner.run(
+        [functools.partial(register, vm_ip) for vm_ip in vm_list],
+        IterationPlan.repeat(len(vm_list), 100, warmup=5),
+    )
+    time_result_dict = result.time_result_dict()
+
+All clients wait on a barrier, so they start issuing requests at the same
+time. Each iteration records a :class:`Sample` with its start and end
+timestamps, the timing value returned by the client callable and any
+exception it raised. :class:`ProcessScenarioRunner` runs the same scenarios
+sharding clients across several processes. Percentiles of the iterations
+measured so far can be logged while a scenario is running, see
+:class:`robottelo.performance.stat.LiveStatistics`.
+
+"""
 import logging
+import multiprocessing
+import os
 import threading
 import time
 
+from concurrent.futures import ThreadPoolExecutor
+from Queue import Empty
+from robottelo.clock import Clock, monotonic
 from robottelo.performance.candlepin import Candlepin
 from robottelo.performance.pulp import Pulp
+from robottelo.performance.stat import LiveStatistics
 
 LOGGER = logging.getLogger(__name__)
 
 
-class PerformanceThread(threading.Thread):
-    """Parent thread for all performance concurrent test
+class Barrier(object):
+    """Block a number of threads until all of them are waiting
 
-    All tests of concurrent subscription by activation-key/attach,
-    concurrent deletion, concurrent synchronization would kick off
-    multiple threads to measure timing latency.
+    :param int parties: The number of threads to wait for
+    :param float timeout: How long to wait for the other threads, in seconds
 
     """
-    def __init__(self, thread_id, thread_name, time_result_dict):
-        threading.Thread.__init__(self)
-        self.thread_id = thread_id
-        self.thread_name = thread_name
-        self.time_result_dict = time_result_dict
-        self.logger = LOGGER
 
+    def __init__(self, parties, timeout=None):
+        self.parties = parties
+        self.timeout = timeout
+        self.waiting = 0
+        self.condition = threading.Condition()
+
+    def wait(self):
+        """Wait until all threads are waiting
 
-class DeleteThread(PerformanceThread):
-    """Thread utility to support concurrent content hosts deletion"""
-    def __init__(self, thread_id, thread_name, sublist, time_result_dict):
-        super(DeleteThread, self).__init__(
-            thread_id, thread_name, time_result_dict)
-        self.sublist = sublist
-
-    def run(self):
-        time.sleep(5)
-        self.logger.debug('Start timing in thread {0}'.format(self.thread_id))
-        for idx, uuid in enumerate(self.sublist):
-            if uuid != '':
-                self.logger.debug(
-                    'deletion attempt # {0} in thread {1}-uuid: {2}'
-                    .format(idx, self.thread_id, uuid))
-                # conduct one request by the id
-                time_point = Candlepin.single_delete(uuid, self.thread_id)
-                self.time_result_dict[self.thread_name].append(time_point)
-
-
-class SubscribeAKThread(PerformanceThread):
-    """Thread utility to support concurrent subscription by activation key"""
-    def __init__(
-            self,
-            thread_id,
-            thread_name,
-            time_result_dict,
-            num_iterations,
-            ak_name,
-            default_org,
-            vm_ip):
-        super(SubscribeAKThread, self).__init__(
-            thread_id, thread_name, time_result_dict)
-        self.num_iterations = num_iterations
-        self.ak_name = ak_name
-        self.default_org = default_org
-        self.vm_ip = vm_ip
-
-    def run(self):
-        time.sleep(5)
-        for i in range(self.num_iterations):
-            self.logger.debug(
-                "{0}: register with ak {1} on {2} attempt {3}"
-                .format(self.thread_name, self.ak_name, self.vm_ip, i))
-            time_point = Candlepin.single_register_activation_key(
-                self.ak_name,
-                self.default_org,
-                self.vm_ip)
-            self.time_result_dict[self.thread_name].append(time_point)
-
-
-class SubscribeAttachThread(PerformanceThread):
-    """Thread for Subscription by register and attach
-
-    separate `time_result_dictionary` into two new dictionaries:
-    time_result_dict_register, containing timing results of register step
-    time_result_dict_attach, containing timing results of attach step
-
-    The data structure of dictionaries now is::
-
-        dict-register: {client-0: [...], ..., client-9:[...]}
-        dict-attach: {client-0: [...], ..., client-9:[...]}
+        :raises RuntimeError: If the other threads did not arrive in time.
+
+        """
+        with self.condition:
+            self.waiting += 1
+            if self.waiting >= self.parties:
+                self.condition.notify_all()
+                return
+            deadline = None
+            if self.timeout is not None:
+                deadline = time.time() + self.timeout
+            while self.waiting < self.parties:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise RuntimeError(
+                            'Timed out waiting for {0} of {1} clients.'
+                            .format(self.parties - self.waiting, self.parties)
+                        )
+                self.condition.wait(remaining)
+
+
+class IterationPlan(object):
+    """The items each client iterates over
+
+    :param list items: A list with the items of each client. The client
+        callable is called once with each of its items.
+    :param int warmup: The number of first iterations of each client which
+        are run but discarded from the results
 
     """
-    def __init__(
-            self,
-            thread_id,
-            thread_name,
-            time_result_dict,
-            time_result_dict_register,
-            time_result_dict_attach,
-            num_iterations,
-            sub_id,
-            default_org, environment,
-            vm_ip):
-        super(SubscribeAttachThread, self).__init__(
-            thread_id,
-            thread_name,
-            time_result_dict
-        )
 
-        self.time_result_dict_register = time_result_dict_register
-        self.time_result_dict_attach = time_result_dict_attach
-        self.num_iterations = num_iterations
-        self.sub_id = sub_id
-        self.default_org = default_org
-        self.environment = environment
-        self.vm_ip = vm_ip
-
-    def run(self):
-        for i in range(self.num_iterations):
-            self.logger.debug(
-                "{0}: register with subscription {1} on vm {2} attempt {3}"
-                .format(self.thread_name, self.sub_id, self.vm_ip, i))
-
-            time_points = Candlepin.single_register_attach(
-                self.sub_id,
-                self.default_org,
-                self.environment,
-                self.vm_ip)
-
-            # split original time_result_dict into two new dictionaries
-            # append each client's register timing data
-            self.time_result_dict_register.get(
-                self.thread_name, 'thread-0'
-            ).append(time_points[0])
-
-            # append each client's attach timing data
-            self.time_result_dict_attach.get(
-                self.thread_name, 'thread-0'
-            ).append(time_points[1])
-
-
-class SyncThread(PerformanceThread):
-    """Thread utility to support concurrent synchronization"""
-    def __init__(
-            self,
-            thread_id,
-            thread_name,
-            time_result_dict,
-            repository_id,
-            repository_name,
-            iteration):
-        super(SyncThread, self).__init__(
-            thread_id,
-            thread_name,
-            time_result_dict
+    def __init__(self, items, warmup=0):
+        self.items = [list(client_items) for client_items in items]
+        self.warmup = warmup
+
+    @classmethod
+    def repeat(cls, num_clients, num_iterations, warmup=0):
+        """Run ``num_iterations`` measured iterations on each client
+
+        The items are the iteration numbers, counting the warmup ones.
+
+        """
+        return cls(
+            [range(warmup + num_iterations)] * num_clients, warmup=warmup)
+
+    @classmethod
+    def split(cls, items, num_clients, warmup=0):
+        """Split ``items`` in even contiguous chunks, one for each client
+
+        Items which do not fit in even chunks are left out, for example 11
+        items for 2 clients would result in 5 items each.
+
+        """
+        chunk = len(items) // num_clients
+        return cls(
+            [items[chunk * i:chunk * (i + 1)] for i in range(num_clients)],
+            warmup=warmup,
         )
-        self.repository_id = repository_id
-        self.repository_name = repository_name
+
+    @property
+    def num_clients(self):
+        """The number of clients of the plan"""
+        return len(self.items)
+
+
+class Sample(object):
+    """A single iteration of a client
+
+    :param int client: The client which ran the iteration
+    :param int iteration: The position of the iteration on the plan
+    :param item: The item of the iteration
+    :param float start: When the iteration started
+    :param float end: When the iteration finished
+    :param value: The timing value returned by the client callable. It is
+        either a number or, for callables timing several steps, a tuple of
+        numbers.
+    :param error: The exception raised by the client callable, if any
+
+    """
+
+    def __init__(self, client, iteration, item, start, end, value, error):
+        self.client = client
         self.iteration = iteration
+        self.item = item
+        self.start = start
+        self.end = end
+        self.value = value
+        self.error = error
+
+    @property
+    def elapsed(self):
+        """The wall clock time of the iteration"""
+        return self.end - self.start
+
+
+class ScenarioResult(object):
+    """The samples of a scenario run by :class:`ScenarioRunner`
+
+    :param int num_clients: The number of clients of the scenario
+    :param list samples: All measured samples, warmup samples excluded
+
+    """
+
+    def __init__(self, num_clients, samples):
+        self.num_clients = num_clients
+        self.samples = samples
+
+    @property
+    def errors(self):
+        """The samples whose client callable raised an exception"""
+        return [sample for sample in self.samples if sample.error is not None]
+
+    def _per_client(self, get_value):
+        """Group the values of successful samples by client"""
+        result_dict = {
+            'thread-{0}'.format(i): [] for i in range(self.num_clients)
+        }
+        for sample in self.samples:
+            if sample.error is None:
+                result_dict['thread-{0}'.format(sample.client)].append(
+                    get_value(sample))
+        return result_dict
+
+    def time_result_dict(self, step=None):
+        """Return the timing values of each client
+
+        :param int step: For client callables returning a tuple, the index of
+            the step to return the timing values of
+        :return: The timing values of each client, for example:
+            ``{'thread-0': [...], 'thread-1': [...]}``. Samples whose client
+            callable returned ``None`` are reported with their wall clock
+            time.
+        :rtype: dict
+
+        """
+        def get_value(sample):
+            """Return the timing value of ``step``."""
+            if sample.value is None:
+                return sample.elapsed
+            if step is None:
+                return sample.value
+            return sample.value[step]
+        return self._per_client(get_value)
+
+    def timestamp_dict(self):
+        """Return the start timestamps with the same structure of
+        :meth:`time_result_dict`
+
+        """
+        return self._per_client(lambda sample: sample.start)
+
+    def extend(self, other):
+        """Append the samples of ``other``, renumbering its iterations"""
+        offset = {}
+        for sample in self.samples:
+            offset[sample.client] = max(
+                offset.get(sample.client, 0), sample.iteration + 1)
+        for sample in other.samples:
+            sample.iteration += offset.get(sample.client, 0)
+            self.samples.append(sample)
+
+
+class ScenarioRunner(object):
+    """Run a concurrent scenario on a pool of threads
+
+    :param float start_timeout: How long clients wait for each other on the
+        start barrier, in seconds
+    :param float live_stats_interval: If positive, the percentiles of the
+        wall clock time of the iterations measured so far are logged at most
+        once every ``live_stats_interval`` seconds while the scenario runs
+
+    """
+
+    def __init__(self, start_timeout=60, live_stats_interval=0):
+        self.start_timeout = start_timeout
+        self.live_stats_interval = live_stats_interval
+        self.logger = LOGGER
+
+    def _run_client(self, client, function, items, warmup, clock, wait, emit):
+        """Run all iterations of a client
+
+        :param wait: A callable blocking until all clients are ready
+        :param emit: A callable receiving each measured :class:`Sample`
+
+        """
+        wait()
+        self.logger.debug('Start timing in client {0}'.format(client))
+        for iteration, item in enumerate(items):
+            value = error = None
+            start = clock.now()
+            try:
+                value = function(item)
+            except Exception as err:  # pylint:disable=broad-except
+                self.logger.error(
+                    'Iteration {0} of client {1} failed: {2}'
+                    .format(iteration, client, err))
+                error = err
+            end = clock.now()
+            if iteration >= warmup:
+                emit(Sample(
+                    client, iteration - warmup, item, start, end, value,
+                    error))
+
+    def _check_plan(self, clients, plan):
+        """Check if the plan has one client per callable"""
+        if len(clients) != plan.num_clients:
+            raise ValueError(
+                'The plan has {0} clients but {1} callables were given.'
+                .format(plan.num_clients, len(clients)))
+
+    def _live_stats(self, plan):
+        """Return a callable recording each successful sample of ``plan`` on
+        :class:`LiveStatistics`, or ``None`` if live statistics are disabled
 
-    def run(self):
-        LOGGER.debug(
-            "{0}: synchronize repository {1} attempt {2}"
-            .format(self.thread_name, self.repository_name, self.iteration)
+        """
+        if self.live_stats_interval <= 0:
+            return None
+        live_stats = LiveStatistics(
+            plan.num_clients,
+            max([len(items) for items in plan.items] or [0]) - plan.warmup,
+            self.live_stats_interval,
         )
 
-        time_point = Pulp.repository_single_sync(
-            self.repository_id,
-            self.repository_name,
-            self.thread_id,
+        def record(sample):
+            """Record the wall clock time of a successful sample."""
+            if sample.error is None:
+                live_stats.add(sample.client, sample.elapsed)
+        return record
+
+    def run(self, clients, plan):
+        """Run the scenario and wait for all clients to complete
+
+        :param list clients: One callable per client, called with each item
+            of the client on the plan. It should return the timing value of
+            the item or ``None`` to use the wall clock time.
+        :param IterationPlan plan: The items of each client
+        :return: The measured samples
+        :rtype: ScenarioResult
+
+        """
+        self._check_plan(clients, plan)
+        barrier = Barrier(len(clients), self.start_timeout)
+        clock = Clock()
+        samples = [[] for _ in clients]
+        record = self._live_stats(plan)
+
+        def emitter(client):
+            """Return the callable receiving the samples of ``client``."""
+            if record is None:
+                return samples[client].append
+
+            def emit(sample):
+                """Keep the sample and record it on the live statistics."""
+                samples[client].append(sample)
+                record(sample)
+            return emit
+
+        with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+            futures = [
+                executor.submit(
+                    self._run_client, client, function, items, plan.warmup,
+                    clock, barrier.wait, emitter(client))
+                for client, (function, items)
+                in enumerate(zip(clients, plan.items))
+            ]
+            for future in futures:
+                future.result()
+        return ScenarioResult(
+            len(clients),
+            [sample for client_samples in samples for sample in client_samples]
         )
 
-        # append sync timing to each thread
-        self.time_result_dict.get(self.thread_name).append(time_point)
+
+class ProcessScenarioRunner(ScenarioRunner):
+    """Run a concurrent scenario on several processes
+
+    Clients are sharded across worker processes, each one running its
+    clients on threads, so hundreds of clients are not serialized on a
+    single interpreter lock. Samples are streamed back to the parent process
+    over a queue as they are measured and merged into one result. Client
+    callables and their items are inherited by the forked processes, but
+    sample values must be picklable. Exceptions raised by client callables
+    are reported by their representation. A worker process exiting without
+    completing its clients, for example when it is killed, fails the run.
+
+    :param int num_processes: The number of worker processes. If ``None``,
+        the number of CPUs is used.
+    :param float start_timeout: How long clients wait for each other to be
+        ready, in seconds
+
+    """
+
+    #: How often the worker processes are checked to be alive while no
+    #: sample is received, in seconds
+    poll_interval = 1.0
+
+    def __init__(self, num_processes=None, start_timeout=60,
+                 live_stats_interval=0):
+        super(ProcessScenarioRunner, self).__init__(
+            start_timeout, live_stats_interval)
+        self.num_processes = num_processes or multiprocessing.cpu_count()
+
+    def _run_shard(self, shard, clients, plan, clock, queue, start_event):
+        """Run the clients of a shard on threads of a worker process"""
+        def wait():
+            """Report the client is ready and wait for the others."""
+            queue.put(('ready', None))
+            if not start_event.wait(self.start_timeout):
+                raise RuntimeError('Timed out waiting for the other clients.')
+
+        def emit(sample):
+            """Send the sample to the parent process."""
+            if sample.error is not None:
+                sample.error = repr(sample.error)
+            queue.put(('sample', sample))
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(shard)) as executor:
+                futures = [
+                    executor.submit(
+                        self._run_client, client, clients[client],
+                        plan.items[client], plan.warmup, clock, wait, emit)
+                    for client in shard
+                ]
+                for future in futures:
+                    future.result()
+        except Exception as err:  # pylint:disable=broad-except
+            queue.put(('error', repr(err)))
+        finally:
+            queue.put(('done', os.getpid()))
+
+    def run(self, clients, plan):
+        """Run the scenario and wait for all clients to complete
+
+        See :meth:`ScenarioRunner.run`.
+
+        """
+        self._check_plan(clients, plan)
+        shards = [
+            shard
+            for shard in (
+                range(len(clients))[i::self.num_processes]
+                for i in range(self.num_processes)
+            )
+            if shard
+        ]
+        clock = Clock()
+        queue = multiprocessing.Queue()
+        start_event = multiprocessing.Event()
+        processes = [
+            multiprocessing.Process(
+                target=self._run_shard,
+                args=(shard, clients, plan, clock, queue, start_event),
+            )
+            for shard in shards
+        ]
+        for process in processes:
+            process.daemon = True
+            process.start()
+
+        samples = []
+        errors = []
+        record = self._live_stats(plan)
+        ready = 0
+        done = set()
+        exited = set()
+        start_deadline = monotonic() + self.start_timeout
+        try:
+            while len(done) < len(processes):
+                try:
+                    kind, payload = queue.get(timeout=self.poll_interval)
+                except Empty:
+                    if (not start_event.is_set() and
+                            monotonic() > start_deadline):
+                        raise RuntimeError(
+                            'Timed out waiting for {0} of {1} clients.'
+                            .format(len(clients) - ready, len(clients)))
+                    # The messages of a worker which just exited may still be
+                    # on their way, so it must be found exited twice
+                    dead = [
+                        process for process in processes
+                        if process.pid in exited and process.pid not in done
+                    ]
+                    if dead:
+                        raise RuntimeError(
+                            'Worker processes exited without completing '
+                            'their clients: {0}'.format(', '.join(
+                                'pid {0} (exit code {1})'.format(
+                                    process.pid, process.exitcode)
+                                for process in dead)))
+                    exited.update(
+                        process.pid for process in processes
+                        if not process.is_alive())
+                    continue
+                if kind == 'sample':
+                    samples.append(payload)
+                    if record is not None:
+                        record(payload)
+                elif kind == 'ready':
+                    ready += 1
+                    if ready == len(clients):
+                        start_event.set()
+                elif kind == 'error':
+                    errors.append(payload)
+                else:
+                    done.add(payload)
+        finally:
+            for process in processes:
+                if len(done) < len(processes):
+                    process.terminate()
+                process.join()
+        if errors:
+            raise RuntimeError(
+                'Worker processes failed: {0}'.format(', '.join(errors)))
+        samples.sort(key=lambda sample: (sample.client, sample.iteration))
+        return ScenarioResult(len(clients), samples)
+
+
+def delete_clients(num_clients):
+    """Return the client callables of the concurrent deletion scenario
+
+    Each item of the plan is the uuid of a system to be deleted.
+
+    """
+    return [
+        lambda uuid, client=client: Candlepin.single_delete(uuid, client)
+        for client in range(num_clients)
+    ]
+
+
+def subscribe_ak_clients(ak_name, default_org, vm_list):
+    """Return the client callables of the concurrent subscription by
+    activation key scenario, one for each virtual machine
+
+    """
+    return [
+        lambda _, vm_ip=vm_ip: Candlepin.single_register_activation_key(
+            ak_name, default_org, vm_ip)
+        for vm_ip in vm_list
+    ]
+
+
+def subscribe_attach_clients(sub_id, default_org, environment, vm_list):
+    """Return the client callables of the concurrent register and attach
+    scenario, one for each virtual machine
+
+    Each iteration returns a tuple with the register and attach timings.
+
+    """
+    return [
+        lambda _, vm_ip=vm_ip: Candlepin.single_register_attach(
+            sub_id, default_org, environment, vm_ip)
+        for vm_ip in vm_list
+    ]
+
+
+def sync_clients(repositories):
+    """Return the client callables of the concurrent synchronization
+    scenario
+
+    :param list repositories: A list of ``(repository_id, repository_name)``
+        tuples, one for each client
+
+    """
+    def make_client(client, repository_id, repository_name):
+        """Synchronize a single repository."""
+        def sync(iteration):
+            """Synchronize the repository and return its timing."""
+            LOGGER.debug(
+                'thread-{0}: synchronize repository {1} attempt {2}'
+                .format(client, repository_name, iteration))
+            if repository_id is None:
+                raise ValueError(
+                    'Invalid repository name: {0}'.format(repository_name))
+            return Pulp.repository_single_sync(
+                repository_id, repository_name, client)
+        return sync
+    return [
+        make_client(client, repository_id, repository_name)
+        for client, (repository_id, repository_name)
+        in enumerate(repositories)
+    ]
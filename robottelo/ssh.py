@@ -1,26 +1,108 @@
 """Utility module to handle the shared ssh connection."""
 import json
 import logging
+import select
 from contextlib import contextmanager
 
 import paramiko
 import re
 
 from robottelo.cli import hammer
+from robottelo.clock import monotonic
 from robottelo.config import conf
 
 logger = logging.getLogger(__name__)
 
+#: Marker of the stderr line reporting the remote timing of a command
+REMOTE_TIME_MARKER = 'ROBOTTELO-TIME'
+
+
+class SSHTiming(object):
+    """Timing of the phases of an ssh command
+
+    All local timestamps are read from the monotonic clock, in seconds. The
+    remote timestamps are read from the server wall clock and are only
+    available if the command was run with ``time_remote``.
+
+    :ivar float start: When the connection started
+    :ivar float connected: When the connection was established
+    :ivar float exec_started: When the command was sent to the server
+    :ivar float first_byte: When the first byte of output or the end of the
+        command was received, ``None`` if it timed out
+    :ivar float exit: When the exit status was received
+    :ivar float remote_start: When the command started on the server
+    :ivar float remote_end: When the command finished on the server
+
+    """
+
+    def __init__(self):
+        self.start = None
+        self.connected = None
+        self.exec_started = None
+        self.first_byte = None
+        self.exit = None
+        self.remote_start = None
+        self.remote_end = None
+
+    @property
+    def connect_time(self):
+        """The time taken to connect and authenticate"""
+        return self.connected - self.start
+
+    @property
+    def exec_time(self):
+        """The time taken to open a channel and send the command"""
+        return self.exec_started - self.connected
+
+    @property
+    def first_byte_time(self):
+        """The time from sending the command until the first byte"""
+        if self.first_byte is None:
+            return None
+        return self.first_byte - self.exec_started
+
+    @property
+    def total(self):
+        """The time from connecting until the exit status was received"""
+        return self.exit - self.start
+
+    @property
+    def remote_time(self):
+        """The time the command ran on the server"""
+        if self.remote_start is None or self.remote_end is None:
+            return None
+        return self.remote_end - self.remote_start
+
+    @property
+    def overhead(self):
+        """The time spent on ssh around the command run on the server"""
+        if self.remote_time is None:
+            return None
+        return self.total - self.remote_time
+
+    def as_dict(self):
+        """Return the duration of all phases, in seconds"""
+        return {
+            'connect': self.connect_time,
+            'exec': self.exec_time,
+            'first_byte': self.first_byte_time,
+            'total': self.total,
+            'remote': self.remote_time,
+            'overhead': self.overhead,
+        }
+
 
 class SSHCommandResult(object):
     """Structure that returns in all ssh commands results."""
 
     def __init__(
-            self, stdout=None, stderr=None, return_code=0, output_format=None):
+            self, stdout=None, stderr=None, return_code=0, output_format=None,
+            timing=None):
         self.stdout = stdout
         self.stderr = stderr
         self.return_code = return_code
         self.output_format = output_format
+        self.timing = timing
         #  Does not make sense to return suspicious output if ($? <> 0)
         if output_format and self.return_code == 0:
             if output_format == 'csv':
@@ -110,6 +192,23 @@ def upload_file(local_file, remote_file=None, hostname=None):
             sftp.close()
 
 
+def upload_files(files, hostname=None):
+    """Upload several local files to a remote machine using a single
+    connection. If ``hostname`` is not provided will be used the
+    server.hostname from the cofiguration.
+
+    :param list files: A list of ``(local_file, remote_file)`` tuples.
+
+    """
+    with _get_connection(hostname=hostname) as connection:
+        sftp = connection.open_sftp()
+        try:
+            for local_file, remote_file in files:
+                sftp.put(local_file, remote_file)
+        finally:
+            sftp.close()
+
+
 def download_file(remote_file, local_file=None, hostname=None):
     """Download a remote file to the local machine. If ``hostname`` is not
     provided will be used the server.
@@ -125,10 +224,56 @@ def download_file(remote_file, local_file=None, hostname=None):
             sftp.close()
 
 
-def command(cmd, hostname=None, output_format=None, timeout=None):
+def _time_remote_command(cmd):
+    """Wrap ``cmd`` to report when it started and finished on the server
+
+    The timestamps are written to stderr on a line starting with
+    ``REMOTE_TIME_MARKER`` and the exit status of ``cmd`` is kept.
+
+    """
+    return (
+        '__robottelo_start=$(date +%s.%N); ( {0}\n); __robottelo_rc=$?; '
+        'echo "{1} $__robottelo_start $(date +%s.%N)" >&2; '
+        'exit $__robottelo_rc'.format(cmd, REMOTE_TIME_MARKER)
+    )
+
+
+def _parse_remote_time(stderr, timing):
+    """Remove the remote timing line from ``stderr`` and record it on
+    ``timing``
+
+    :return: ``stderr`` without the remote timing line
+
+    """
+    lines = []
+    for line in stderr.split('\n'):
+        fields = line.split()
+        if len(fields) == 3 and fields[0] == REMOTE_TIME_MARKER:
+            timing.remote_start = float(fields[1])
+            timing.remote_end = float(fields[2])
+        else:
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def _wait_first_byte(channel, timeout):
+    """Wait until ``channel`` has output to be read or is closed"""
+    try:
+        select.select([channel], [], [], timeout)
+    except (TypeError, ValueError, select.error) as err:
+        logger.debug('Can not wait for the first byte: %s', err)
+
+
+def command(cmd, hostname=None, output_format=None, timeout=None,
+            time_remote=False):
     """
     Executes SSH command(s) on remote hostname.
     Defaults to main.server.hostname.
+
+    The timing of each phase of the command is recorded on the ``timing``
+    attribute of the result, see :class:`SSHTiming`. If ``time_remote`` is
+    ``True``, the command is wrapped to also report how long it ran on the
+    server.
     """
 
     # Set a default timeout of 120 seconds
@@ -145,9 +290,22 @@ def command(cmd, hostname=None, output_format=None, timeout=None):
 
     logger.debug('>>> [%s] %s', hostname, cmd)
 
+    if time_remote:
+        cmd = _time_remote_command(cmd)
+
+    timing = SSHTiming()
+    timing.start = monotonic()
     with _get_connection(hostname=hostname) as connection:
+        timing.connected = monotonic()
         _, stdout, stderr = connection.exec_command(cmd, timeout)
-        errorcode = stdout.channel.recv_exit_status()
+        timing.exec_started = monotonic()
+        channel = stdout.channel
+        _wait_first_byte(channel, timeout)
+        if (channel.recv_ready() or channel.recv_stderr_ready() or
+                channel.exit_status_ready()):
+            timing.first_byte = monotonic()
+        errorcode = channel.recv_exit_status()
+        timing.exit = monotonic()
         stdout = stdout.read()
         stderr = stderr.read()
 
@@ -158,7 +316,10 @@ def command(cmd, hostname=None, output_format=None, timeout=None):
     if stderr:
         # Convert to unicode string and remove all color codes characters
         stderr = regex.sub('', stderr.decode('utf-8'))
+        if time_remote:
+            stderr = _parse_remote_time(stderr, timing)
         logger.debug('<<< stderr\n%s', stderr)
+    logger.debug('<<< timing %s', timing.as_dict())
 
     if stdout and output_format != 'json':
         # For output we don't really want to see all of Rails traffic
@@ -171,4 +332,4 @@ def command(cmd, hostname=None, output_format=None, timeout=None):
         ]
 
     return SSHCommandResult(
-        stdout, stderr, errorcode, output_format)
+        stdout, stderr, errorcode, output_format, timing)
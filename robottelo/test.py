@@ -6,13 +6,9 @@ to help writing API, CLI and UI tests.
 """
 import csv
 import logging
-import os
-import signal
 import sys
 import unittest2
 
-from datetime import datetime
-from robottelo import ssh
 from robottelo.cli.base import CLIReturnCodeError
 from robottelo.cli.metatest import MetaCLITest
 from robottelo.cli.org import Org as OrgCli
@@ -28,15 +24,27 @@ from robottelo.performance.graph import(
     generate_line_chart_raw_candlepin,
     generate_line_chart_stat_bucketized_candlepin,
 )
-from robottelo.performance.stat import generate_stat_for_concurrent_thread
+from robottelo.performance.pulp import Pulp
+from robottelo.performance.savepoint import restore_savepoint
+from robottelo.performance.stat import write_concurrent_stat
+from robottelo.performance.store import (
+    ResultsStore,
+    get_satellite_version,
+    operation_from_test_case_name,
+)
 from robottelo.performance.thread import (
-    DeleteThread,
-    SyncThread,
-    SubscribeAKThread,
-    SubscribeAttachThread
+    IterationPlan,
+    ProcessScenarioRunner,
+    ScenarioRunner,
+    delete_clients,
+    subscribe_ak_clients,
+    subscribe_attach_clients,
+    sync_clients,
 )
 from robottelo.ui.activationkey import ActivationKey
 from robottelo.ui.architecture import Architecture
+from robottelo.ui.artifacts import get_artifact_collector
+from robottelo.ui.browser import create_browser, make_pool
 from robottelo.ui.computeprofile import ComputeProfile
 from robottelo.ui.computeresource import ComputeResource
 from robottelo.ui.configgroups import ConfigGroups
@@ -53,11 +61,18 @@ from robottelo.ui.hostgroup import Hostgroup
 from robottelo.ui.hosts import Hosts
 from robottelo.ui.ldapauthsource import LdapAuthSource
 from robottelo.ui.location import Location
+from robottelo.ui.locators import write_locator_report_on_exit
 from robottelo.ui.login import Login
 from robottelo.ui.medium import Medium
 from robottelo.ui.navigator import Navigator
 from robottelo.ui.operatingsys import OperatingSys
 from robottelo.ui.org import Org
+from robottelo.ui.parallel import (
+    VirtualDisplay,
+    get_worker_display,
+    is_parallel,
+    worker_screenshots_dir,
+)
 from robottelo.ui.oscapcontent import OpenScapContent
 from robottelo.ui.oscappolicy import OpenScapPolicy
 from robottelo.ui.oscapreports import OpenScapReports
@@ -78,8 +93,7 @@ from robottelo.ui.template import Template
 from robottelo.ui.trend import Trend
 from robottelo.ui.usergroup import UserGroup
 from robottelo.ui.user import User
-from selenium import webdriver
-from selenium_factory.SeleniumFactory import SeleniumFactory
+from robottelo.ui.wait import write_wait_times_on_exit
 
 SAUCE_URL = "http://%s:%s@ondemand.saucelabs.com:80/wd/hub"
 
@@ -144,64 +158,51 @@ class UITestCase(TestCase):
         cls.verbosity = int(conf.properties['main.verbosity'])
         cls.remote = int(conf.properties['main.remote'])
         cls.server_name = conf.properties.get('main.server.hostname')
-        cls.screenshots_dir = conf.properties.get('main.screenshots.base_path')
-
+        cls.parallel = is_parallel()
+        cls.screenshots_dir = worker_screenshots_dir(
+            conf.properties.get('main.screenshots.base_path'))
+        cls.artifact_collector = None
+        if cls.screenshots_dir:
+            cls.artifact_collector = get_artifact_collector(
+                cls.screenshots_dir)
+        cls.grid_url = conf.properties.get('main.grid_url')
+
+        cls.browser_pool = make_pool(
+            lambda: create_browser(
+                cls.driver_name, cls.remote, cls.__name__, cls.grid_url),
+            get_server_url(),
+            default='process' if cls.parallel else 'none',
+        )
+        cls.display = None
         if int(conf.properties.get('main.virtual_display', '0')):
-            # Import from optional requirements
-            from pyvirtualdisplay import Display
-            from easyprocess import EasyProcess, EasyProcessError
-            cls.display = Display(size=(1920, 1080))
-            cls.display.start()
-            cls.logger.debug(
-                'Virtual display started (pid=%d, display="%s")',
-                cls.display.pid,
-                cls.display.display
-            )
-
             window_manager_cmd = conf.properties.get(
                 'main.window_manager_command', '')
-
-            try:
-                cls.window_manager = EasyProcess(window_manager_cmd)
-                cls.window_manager.start()
-                cls.logger.debug(
-                    'Window manager started (pid=%d, cmd="%s")',
-                    cls.window_manager.pid,
-                    cls.window_manager.cmd_as_string
-                )
-            except EasyProcessError as err:
-                cls.window_manager = None
-                cls.logger.warning(
-                    'Window manager could not be started. '
-                    'Command: "%s". Error: %s',
-                    window_manager_cmd,
-                    err
-                )
-        else:
-            cls.display = None
+            if (cls.browser_pool is not None and
+                    cls.browser_pool.scope == 'process'):
+                # The display lives as long as the browsers of the process
+                get_worker_display(window_manager_cmd)
+            else:
+                cls.display = VirtualDisplay(window_manager_cmd)
+                cls.display.start()
+        wait_times_path = conf.properties.get('main.ui_wait_times')
+        if wait_times_path:
+            write_wait_times_on_exit(wait_times_path)
+        locator_report_path = conf.properties.get('main.ui_locator_report')
+        if locator_report_path:
+            write_locator_report_on_exit(locator_report_path)
 
     def setUp(self):  # noqa
-        """We do want a new browser instance for every test."""
-        if not self.remote:
-            if self.driver_name.lower() == 'firefox':
-                self.browser = webdriver.Firefox()
-            elif self.driver_name.lower() == 'chrome':
-                self.browser = webdriver.Chrome()
-            elif self.driver_name.lower() == 'ie':
-                self.browser = webdriver.Ie()
-            elif self.driver_name.lower() == 'phantomjs':
-                service_args = ['--ignore-ssl-errors=true']
-                self.browser = webdriver.PhantomJS(
-                    service_args=service_args
-                )
-            else:
-                self.browser = webdriver.Remote()
-        else:
-            self.browser = SeleniumFactory().createWebDriver(
-                job_name=self.id(), show_session_id=True)
+        """Get a browser for the test, either a new one or one handed over
+        by the browser pool.
 
-        self.browser.maximize_window()
-        self.browser.get(get_server_url())
+        """
+        if self.browser_pool is None:
+            self.browser = create_browser(
+                self.driver_name, self.remote, self.id(), self.grid_url)
+            self.browser.maximize_window()
+            self.browser.get(get_server_url())
+        else:
+            self.browser = self.browser_pool.acquire()
 
         # Library methods
         self.activationkey = ActivationKey(self.browser)
@@ -249,9 +250,10 @@ class UITestCase(TestCase):
         self.user = User(self.browser)
         self.usergroup = UserGroup(self.browser)
 
-    def take_screenshot(self, testmethodname):
-        """Takes screenshot of the UI and saves it to the disk by creating
-        a directory same as that of the test method name.
+    def collect_artifacts(self, testmethodname):
+        """Takes screenshot, page source and console logs of the UI and
+        queues them to be saved to the disk, in a directory same as that of
+        the test method name, see :mod:`robottelo.ui.artifacts`.
 
         """
         # testmethodname varies so trying to handle various scenarios.
@@ -274,56 +276,31 @@ class UITestCase(TestCase):
             testmethodname = testmethodname.split('_')
             testmethodname.pop()
         testmethodname = "_".join(testmethodname)
-        # Creates dir_structure depending upon the testmethodname.
-        directory = testmethodname
-        dir_structure = os.path.join(
-            self.screenshots_dir,
-            datetime.now().strftime('%Y-%m-%d'),
-            directory,
-        )
-        if not os.path.exists(dir_structure):
-            os.makedirs(dir_structure)
-        filename = 'screenshot-{0}.png'.format(
-            datetime.now().strftime('%Y-%m-%d_%H_%M_%S')
-        )
-        self.browser.save_screenshot(os.path.join(dir_structure, filename))
+        self.artifact_collector.collect(
+            self.browser, self.id(), directory=testmethodname)
 
     def tearDown(self):  # noqa
-        """Make sure to close the browser after each test."""
-        if sys.exc_info()[0] is not None:
-            self.take_screenshot(self._testMethodName)
-        self.browser.quit()
+        """Make sure to close the browser, or hand it back to the browser
+        pool, after each test.
+
+        """
+        if (sys.exc_info()[0] is not None and
+                self.artifact_collector is not None):
+            self.collect_artifacts(self._testMethodName)
+        if self.browser_pool is None:
+            self.browser.quit()
+        else:
+            self.browser_pool.release(self.browser)
         self.browser = None
 
     @classmethod
     def tearDownClass(cls):  # noqa
+        # Browsers can not outlive the display they were started on
+        if cls.browser_pool is not None and (
+                cls.browser_pool.scope == 'class' or cls.display is not None):
+            cls.browser_pool.close()
         if cls.display is not None:
-            if (cls.window_manager is not None and
-                    cls.window_manager.is_started):
-                cls.logger.debug(
-                    'Killing window manager (pid=%d, cmd="%s")',
-                    cls.window_manager.pid,
-                    cls.window_manager.cmd_as_string
-                )
-                os.kill(cls.window_manager.pid, signal.SIGKILL)
-                _, return_code = os.waitpid(cls.window_manager.pid, 0)
-                cls.logger.debug(
-                    'Window manager killed (pid=%d, cmd="%s", rcode=%d)',
-                    cls.window_manager.pid,
-                    cls.window_manager.cmd_as_string,
-                    return_code
-                )
-            cls.logger.debug(
-                'Stopping virtual display (pid=%d, display="%s"',
-                cls.display.pid,
-                cls.display.display
-            )
             cls.display.stop()
-            cls.logger.debug(
-                'Virtual display stopped (pid=%d, display="%s"',
-                cls.display.pid,
-                cls.display.display
-            )
 
 
 class ConcurrentTestCase(TestCase):
@@ -350,6 +327,17 @@ class ConcurrentTestCase(TestCase):
         cls.sub_id = ''
         cls.num_iterations = 0     # depend on # of threads or clients
         cls.bucket_size = 0        # depend on # of iterations on each thread
+        cls.warmup = int(conf.properties.get('performance.test.warmup', 0))
+        num_processes = int(
+            conf.properties.get('performance.test.num_processes', 0))
+        live_stats_interval = float(
+            conf.properties.get('performance.test.live_stats_interval', 0))
+        if num_processes > 0:
+            cls.scenario_runner = ProcessScenarioRunner(
+                num_processes, live_stats_interval=live_stats_interval)
+        else:
+            cls.scenario_runner = ScenarioRunner(
+                live_stats_interval=live_stats_interval)
 
         cls._convert_to_numbers()  # read in string type, convert to numbers
         cls._get_vm_list()         # read in list of virtual machines
@@ -357,6 +345,19 @@ class ConcurrentTestCase(TestCase):
         # read default organization from constant module
         cls.default_org = DEFAULT_ORG
 
+        # record all timing values of this run on the results store
+        cls.results_store = ResultsStore()
+        cls.run_id = cls.results_store.create_run(
+            satellite_version=get_satellite_version(),
+            description=cls.__name__,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        """Close the results store."""
+        cls.results_store.close()
+        super(ConcurrentTestCase, cls).tearDownClass()
+
     @classmethod
     def _convert_to_numbers(cls):
         """read in string type series, convert to numbers"""
@@ -425,11 +426,7 @@ class ConcurrentTestCase(TestCase):
 
     def _restore_from_savepoint(self, savepoint):
         """Restore from savepoint"""
-        if savepoint == '':
-            self.logger.warning('No savepoint while continuing test!')
-            return
-        self.logger.info('Reset db from /home/backup/{0}'.format(savepoint))
-        ssh.command('./reset-db.sh /home/backup/{0}'.format(savepoint))
+        restore_savepoint(savepoint)
 
     def _get_subscription_id(self):
         """Get subscription id"""
@@ -475,11 +472,6 @@ class ConcurrentTestCase(TestCase):
         else:
             self.bucket_size = 1
 
-    def _join_all_threads(self, thread_list):
-        """Wait for all threads to complete"""
-        for thread in thread_list:
-            thread.join()
-
     def _get_output_filename(self, file_name):
         """Get type of test: ak/att/del/reg as output file name
 
@@ -496,12 +488,57 @@ class ConcurrentTestCase(TestCase):
         split_file_name = file_name.split('.')
         return split_file_name[0]
 
+    def _store_samples(
+            self,
+            test_case_name,
+            time_result_dict,
+            current_num_threads,
+            timestamp_dict=None):
+        """Record the timing values of a test case on the results store
+
+        :param str test_case_name: The type of test case, for example
+            ``raw-ak-10-clients``, from which the operation is read
+        :param dict time_result_dict: The storage of all timing values
+        :param int current_num_threads: The number of threads/clients
+        :param dict timestamp_dict: The start time of each timing value
+
+        """
+        self.results_store.add_samples(
+            self.run_id,
+            operation_from_test_case_name(test_case_name),
+            current_num_threads,
+            time_result_dict,
+            timestamp_dict,
+        )
+
+    def _store_errors(self, operation, current_num_threads, result):
+        """Record the failed iterations of a scenario on the results store
+
+        :param str operation: The operation timed, for example ``ak``
+        :param int current_num_threads: The number of threads/clients
+        :param result: The
+            :class:`robottelo.performance.thread.ScenarioResult` of the
+            scenario
+
+        """
+        self.results_store.add_errors(
+            self.run_id,
+            operation,
+            current_num_threads,
+            [
+                (sample.client, sample.iteration, sample.start,
+                 str(sample.error))
+                for sample in result.errors
+            ]
+        )
+
     def _write_raw_csv_file(
             self,
             raw_file_name,
             time_result_dict,
             current_num_threads,
-            test_case_name):
+            test_case_name,
+            timestamp_dict=None):
         """Write csv and chart for raw data of Candlepin Tests ak/att/del/reg
 
         Common method shared by three test cases:
@@ -520,10 +557,17 @@ class ConcurrentTestCase(TestCase):
         :param int current_num_threads: The number of threads/clients
         :param str test_case_name: The type of test case, set by function
             ``_get_output_filename`` defined in this module
+        :param dict timestamp_dict: The start time of each timing value
 
         """
         self.logger.debug(
             'Timing result is: {0}'.format(time_result_dict))
+        self._store_samples(
+            test_case_name,
+            time_result_dict,
+            current_num_threads,
+            timestamp_dict
+        )
 
         with open(raw_file_name, 'a') as handler:
             writer = csv.writer(handler)
@@ -573,74 +617,20 @@ class ConcurrentTestCase(TestCase):
 
         """
         with open(stat_file_name, 'a') as handler:
-            writer = csv.writer(handler)
-            writer.writerow([test_case_name])
-
-            # 1. write stat-per-client-bucketized result of ak/del/att/reg
-            writer.writerow(['stat-per-client-bucketized'])
-            self._write_stat_per_client_bucketized(
-                stat_file_name,
-                time_result_dict,
-                current_num_threads,
-            )
-            writer.writerow([])
-
-            # 2. write stat-per-test-bucketized result of ak/del/att/reg
-            writer.writerow(['stat-per-test-bucketized'])
-            self._write_stat_per_test_bucketized(
-                stat_file_name,
-                time_result_dict,
-            )
-            writer.writerow([])
-
-            # 3. write stat-per-client result of ak/del/att
-            writer.writerow(['stat-per-client'])
-            self._write_stat_per_client(
-                stat_file_name,
-                time_result_dict,
-                current_num_threads,
-            )
-            writer.writerow([])
-
-            # 4. write stat-per-test result of ak/del/att
-            writer.writerow(['stat-per-test'])
-            self._write_stat_per_test(
-                stat_file_name,
+            stat_dicts = write_concurrent_stat(
+                csv.writer(handler),
+                test_case_name,
                 time_result_dict,
+                self.bucket_size,
+                self.num_buckets,
             )
-            writer.writerow([])
 
-    def _write_stat_per_client_bucketized(
-            self,
-            stat_file_name,
-            time_result_dict,
-            current_num_threads):
-        """Write bucketized stat of per-client results to csv file
-
-        note: each bucket is just a split of a client i. For example::
-
-            Input: # of clients = 1
-            {thread-i: [(50 data) | (50 data)|...]}
-            Output:
-            line chart of statistics on these buckets.
-
-        """
         test_category = self._get_output_filename(stat_file_name)
 
+        # 1. create line chart with each client being grouped by buckets
         for i in range(current_num_threads):
-            time_list = time_result_dict.get('thread-{0}'.format(i))
-            thread_name = 'client-{0}'.format(i)
-            stat_dict = generate_stat_for_concurrent_thread(
-                thread_name,
-                time_list,
-                stat_file_name,
-                self.bucket_size,
-                self.num_buckets
-            )
-
-            # create line chart with each client being grouped by buckets
             generate_line_chart_stat_bucketized_candlepin(
-                stat_dict,
+                stat_dicts['client_bucketized'][i],
                 'Concurrent Subscription Statistics - per client bucketized: '
                 'Client-{0} by {1}-{2}-clients'
                 .format(i, test_category, current_num_threads),
@@ -650,58 +640,9 @@ class ConcurrentTestCase(TestCase):
                 self.num_buckets
             )
 
-    def _write_stat_per_test_bucketized(
-            self,
-            stat_file_name,
-            time_result_dict):
-        """Write bucketized stat of per-test to csv file
-
-        note: each bucket of all clients would merge into a chunk;
-        generate stat for each such chunk. For example::
-
-            Input: # of clients = 10
-            thread-0: [(50 data) | (50 data)|...]
-            thread-1: [(50 data) | (50 data)|...]
-            ...
-            thread-9: [(50 data) | (50 data)|...]
-            Output:
-            sublist [500 data grouped from all clients' first buckets],
-                    [500 data grouped from all clients' next buckets],
-                    ...
-                    [500 data grouped from all clients' last buckets];
-            line chart of statistics on these chunks.
-
-        """
-        # parameters for generating bucketized line chart
-        stat_dict = {}
-        return_stat = {}
-        current_num_threads = len(time_result_dict)
-        test_category = self._get_output_filename(stat_file_name)
-
-        for i in range(self.num_buckets):
-            chunks_bucket_i = []
-            for j in range(len(time_result_dict)):
-                time_list = time_result_dict.get('thread-{0}'.format(j))
-                # slice out bucket-size from each client's result and merge
-                chunks_bucket_i += time_list[
-                    i * self.bucket_size: (i + 1) * self.bucket_size
-                ]
-
-            # for each chunk i, compute and output its stat
-            return_stat = generate_stat_for_concurrent_thread(
-                'bucket-{0}'.format(i),
-                chunks_bucket_i,
-                stat_file_name,
-                len(chunks_bucket_i),
-                1
-            )
-
-            # for each chunk i, add stat into final return_dict
-            stat_dict.update({i: return_stat.get(0, (0, 0, 0, 0))})
-
-        # create line chart with all clients grouped by a chunk of buckets
+        # 2. create line chart with all clients grouped by a chunk of buckets
         generate_line_chart_stat_bucketized_candlepin(
-            stat_dict,
+            stat_dicts['test_bucketized'],
             'Concurrent Subscription Statistics - per test bucketized: '
             '({0}-{1}-clients)'
             .format(test_category, current_num_threads),
@@ -711,41 +652,9 @@ class ConcurrentTestCase(TestCase):
             self.num_buckets
         )
 
-    def _write_stat_per_client(
-            self,
-            stat_file_name,
-            time_result_dict,
-            current_num_threads):
-        """Write stat of per-client results to csv file
-
-        note: take the full list of a client i; calculate stat on the list
-
-        """
-        # parameters for generating bucketized line chart
-        stat_dict = {}
-        return_stat = {}
-        current_num_threads = len(time_result_dict)
-        test_category = self._get_output_filename(stat_file_name)
-
-        for i in range(current_num_threads):
-            time_list = time_result_dict.get('thread-{0}'.format(i))
-            thread_name = 'client-{0}'.format(i)
-
-            # for each client i, compute and output its stat
-            return_stat = generate_stat_for_concurrent_thread(
-                thread_name,
-                time_list,
-                stat_file_name,
-                len(time_list),
-                1
-            )
-
-            # for each chunk i, add stat into final return_dict
-            stat_dict.update({i: return_stat.get(0, (0, 0, 0, 0))})
-
-        # create graph based on stats of all clients
+        # 3. create graph based on stats of all clients
         generate_bar_chart_stat(
-            stat_dict,
+            stat_dicts['client'],
             'Concurrent Subscription Statistics - per client: '
             '({0}-{1}-clients)'
             .format(test_category, current_num_threads),
@@ -754,30 +663,9 @@ class ConcurrentTestCase(TestCase):
             'client'
         )
 
-    def _write_stat_per_test(self, stat_file_name, time_result_dict):
-        """Write stat of per-test results to csv file
-
-        note: take the full dictionary of test and calculate overall stat
-
-        """
-        full_list = []  # list containing 1st to 5kth data point
-        current_num_threads = len(time_result_dict)
-        test_category = self._get_output_filename(stat_file_name)
-
-        for i in range(len(time_result_dict)):
-            time_list = time_result_dict.get('thread-{0}'.format(i))
-            full_list += time_list
-
-        stat_dict = generate_stat_for_concurrent_thread(
-            'test-{0}'.format(len(time_result_dict)),
-            full_list,
-            stat_file_name,
-            len(full_list),
-            1
-        )
-
+        # 4. create graph based on stats of the whole test
         generate_bar_chart_stat(
-            stat_dict,
+            stat_dicts['test'],
             'Concurrent Subscription Statistics - per test: '
             '({0}-{1}-clients)'
             .format(test_category, current_num_threads),
@@ -801,36 +689,23 @@ class ConcurrentTestCase(TestCase):
         self._set_num_iterations(total_iterations, current_num_threads)
         self._set_bucket_size()
 
-        # Create a list to store all threads
-        thread_list = []
-        # Create a dictionary to store all timing results from each client
-        time_result_dict_ak = {}
-
-        # Create new threads and start each thread mapped with a vm
-        for i in range(current_num_threads):
-            thread_name = 'thread-{0}'.format(i)
-            time_result_dict_ak[thread_name] = []
-            thread = SubscribeAKThread(
-                i,
-                thread_name,
-                time_result_dict_ak,
-                self.num_iterations,
-                self.ak_name,
-                self.default_org,
-                current_vm_list[i]
-            )
-            thread.start()
-            thread_list.append(thread)
-
-        # wait all threads in thread list
-        self._join_all_threads(thread_list)
+        # run one client mapped with each vm
+        result = self.scenario_runner.run(
+            subscribe_ak_clients(
+                self.ak_name, self.default_org, current_vm_list),
+            IterationPlan.repeat(
+                current_num_threads, self.num_iterations, self.warmup),
+        )
+        time_result_dict_ak = result.time_result_dict()
+        self._store_errors('ak', current_num_threads, result)
 
         # write raw result of activation-key
         self._write_raw_csv_file(
             self.raw_file_name,
             time_result_dict_ak,
             current_num_threads,
-            'raw-ak-{0}-clients'.format(current_num_threads)
+            'raw-ak-{0}-clients'.format(current_num_threads),
+            result.timestamp_dict()
         )
 
         # write stat result of ak and generate charts
@@ -856,43 +731,32 @@ class ConcurrentTestCase(TestCase):
         self._set_num_iterations(total_iterations, current_num_threads)
         self._set_bucket_size()
 
-        # Create a list to store all threads
-        thread_list = []
-        # Create a dictionary to store register timings from each client
-        time_result_dict_register = {}
-        # Create a dictionary to store attach timings from each client
-        time_result_dict_attach = {}
-
-        # Create new threads and start each thread mapped with a vm
-        for i in range(current_num_threads):
-            thread_name = 'thread-{0}'.format(i)
-            time_result_dict_register[thread_name] = []
-            time_result_dict_attach[thread_name] = []
-
-            thread = SubscribeAttachThread(
-                i,
-                thread_name,
-                {},
-                time_result_dict_register,
-                time_result_dict_attach,
-                self.num_iterations,
+        # run one client mapped with each vm, each iteration times both
+        # register and attach steps
+        result = self.scenario_runner.run(
+            subscribe_attach_clients(
                 self.sub_id,
                 self.default_org,
                 self.environment,
-                current_vm_list[i]
-            )
-            thread.start()
-            thread_list.append(thread)
-
-        # wait all threads in thread list
-        self._join_all_threads(thread_list)
+                current_vm_list
+            ),
+            IterationPlan.repeat(
+                current_num_threads, self.num_iterations, self.warmup),
+        )
+        time_result_dict_register = result.time_result_dict(0)
+        time_result_dict_attach = result.time_result_dict(1)
+        timestamp_dict = result.timestamp_dict()
+        # A failed iteration can not be told apart by step, record it once
+        # for the scenario
+        self._store_errors('att', current_num_threads, result)
 
         # write raw result of register
         self._write_raw_csv_file(
             self.reg_raw_file_name,
             time_result_dict_register,
             current_num_threads,
-            'raw-reg-{0}-clients'.format(current_num_threads)
+            'raw-reg-{0}-clients'.format(current_num_threads),
+            timestamp_dict
         )
 
         # write raw result of attach
@@ -928,7 +792,8 @@ class ConcurrentTestCase(TestCase):
         # Get list of all uuids of registered systems
 
         self.logger.info('Retrieve list of uuids of all registered systems:')
-        uuid_list = self._get_registered_uuids()
+        # Leave out empty uuids, such as the one after a trailing newline
+        uuid_list = [uuid for uuid in self._get_registered_uuids() if uuid]
 
         # Parameter for statistics files
         total_iterations = len(uuid_list)
@@ -936,34 +801,21 @@ class ConcurrentTestCase(TestCase):
         self._set_num_iterations(total_iterations, current_num_threads)
         self._set_bucket_size()
 
-        # Create a list to store all threads
-        thread_list = []
-        # Create a dictionary to store all timing results from each thread
-        time_result_dict_del = {}
-
-        # Create new threads and start the thread which has sublist of uuids
-        for i in range(current_num_threads):
-            time_result_dict_del['thread-{0}'.format(i)] = []
-            thread = DeleteThread(
-                i,
-                'thread-{0}'.format(i),
-                uuid_list[
-                    self.num_iterations * i: self.num_iterations * (i + 1)
-                ],
-                time_result_dict_del
-            )
-            thread.start()
-            thread_list.append(thread)
-
-        # wait all threads in thread list
-        self._join_all_threads(thread_list)
+        # run clients which delete each a sublist of uuids
+        result = self.scenario_runner.run(
+            delete_clients(current_num_threads),
+            IterationPlan.split(uuid_list, current_num_threads),
+        )
+        time_result_dict_del = result.time_result_dict()
+        self._store_errors('del', current_num_threads, result)
 
         # write raw result of del
         self._write_raw_csv_file(
             self.raw_file_name,
             time_result_dict_del,
             current_num_threads,
-            'raw-del-{0}-clients'.format(current_num_threads)
+            'raw-del-{0}-clients'.format(current_num_threads),
+            result.timestamp_dict()
         )
 
         # write stat result of del
@@ -997,50 +849,38 @@ class ConcurrentTestCase(TestCase):
             .format(repo_names_list)
         )
 
-        # Create a list to store all threads
-        thread_list = []
-        # Create a dictionary to store all timing results from each thread
-        time_result_dict = {}
-        for thread_id in range(current_num_threads):
-            time_result_dict['thread-{0}'.format(thread_id)] = []
+        repositories = [
+            (self.map_repo_name_id.get(repo_name, None), repo_name)
+            for repo_name in repo_names_list
+        ]
+        if getattr(self, 'sync_async', False):
+            return self._kick_off_async_sync(
+                repositories, current_num_threads, is_initial_sync)
+
+        # for each client, sync a single repository
+        clients = sync_clients(repositories)
 
         # sync all specified repositories and repeate X times
+        result = None
         for iteration in range(self.sync_iterations):
-            # for each thread, sync a single repository
-            for tid in range(current_num_threads):
-                repo_name = repo_names_list[tid]
-                repo_id = self.map_repo_name_id.get(repo_name, None)
-
-                if repo_id is None:
-                    self.logger.warning('Invalid repository name!')
-                    continue
-
-                self.logger.debug(
-                    '{0} repository {1} attempt {2} '
-                    'on {3}-repo test case starts:'
-                    .format(
-                        'Initially sync' if is_initial_sync else 'Resync',
-                        repo_name,
-                        iteration,
-                        current_num_threads
-                    )
-                )
-
-                thread = SyncThread(
-                    tid,
-                    "thread-{0}".format(tid),
-                    time_result_dict,
-                    repo_id,
-                    repo_name,
+            self.logger.debug(
+                '{0} attempt {1} on {2}-repo test case starts:'
+                .format(
+                    'Initially sync' if is_initial_sync else 'Resync',
                     iteration,
+                    current_num_threads
                 )
-                thread.start()
-                thread_list.append(thread)
-
-            # wait all threads in thread list
-            self._join_all_threads(thread_list)
+            )
+            iteration_result = self.scenario_runner.run(
+                clients,
+                IterationPlan([[iteration]] * len(clients)),
+            )
+            if result is None:
+                result = iteration_result
+            else:
+                result.extend(iteration_result)
 
-            # Once all threads have completed syncs,
+            # Once all clients have completed syncs,
             # reset database before next iteration, if initial sync test
             if is_initial_sync:
                 self.logger.debug(
@@ -1055,4 +895,67 @@ class ConcurrentTestCase(TestCase):
                     .format(current_num_threads, iteration)
                 )
 
+        self._store_errors('sync', current_num_threads, result)
+        return result.time_result_dict()
+
+    def _kick_off_async_sync(
+            self,
+            repositories,
+            current_num_threads,
+            is_initial_sync):
+        """Trigger all repository syncs at once and poll their tasks
+
+        :param list repositories: A list of ``(repo_id, repo_name)`` tuples
+        :param int current_num_threads: The number of repositories
+        :param bool is_initial_sync: Decide whether resync or initial sync
+        :return dict time_result_dict: Contain a list of X # of timings
+
+        """
+        time_result_dict = {
+            'thread-{0}'.format(i): [] for i in range(len(repositories))
+        }
+        self.sync_tasks = []
+        errors = []
+        for iteration in range(self.sync_iterations):
+            self.logger.debug(
+                '{0} asynchronously attempt {1} on {2}-repo test case '
+                'starts:'.format(
+                    'Initially sync' if is_initial_sync else 'Resync',
+                    iteration,
+                    current_num_threads
+                )
+            )
+            valid = [
+                (i, repository)
+                for i, repository in enumerate(repositories)
+                if repository[0] is not None
+            ]
+            if len(valid) < len(repositories):
+                self.logger.warning('Invalid repository name!')
+            tasks = Pulp.repositories_async_sync(
+                [repository for _, repository in valid],
+                poll_interval=self.sync_poll_interval,
+            )
+            for (i, _), task in zip(valid, tasks):
+                if task.result == 'success' and task.duration is not None:
+                    time_result_dict['thread-{0}'.format(i)].append(
+                        task.duration)
+                else:
+                    self.logger.error(
+                        'Sync of {0} in task {1} ended with {2}'
+                        .format(task.repo_name, task.task_id, task.result))
+                    errors.append(
+                        (i, iteration, task.triggered, str(task.result)))
+            self.sync_tasks.extend(tasks)
+
+            if is_initial_sync:
+                self.logger.debug(
+                    'Reset database for Initial Sync test '
+                    'on {0}-repo test case attempt {1}'
+                    .format(current_num_threads, iteration)
+                )
+                self._restore_from_savepoint(self.savepoint)
+
+        self.results_store.add_errors(
+            self.run_id, 'sync', current_num_threads, errors)
         return time_result_dict
@@ -0,0 +1,197 @@
+# -*- encoding: utf-8 -*-
+"""Collect the artifacts of failed UI tests off the critical path
+
+When a UI test fails, :meth:`robottelo.test.UITestCase.tearDown` hands the
+browser over to :meth:`ArtifactCollector.collect`, which only grabs what the
+browser has to give while it still shows the failed page: the screenshot, as
+base64 encoded by the driver, the page source and the console logs. Decoding
+the screenshot, compressing the page source and logs and writing them to the
+disk are done by a background thread, so the browser is released right away.
+
+Artifacts are written under ``main.screenshots.base_path``, in a directory by
+day and test::
+
+    2016-01-31/test_positive_create/screenshot-2016-01-31_10_20_30.png
+    2016-01-31/test_positive_create/page-2016-01-31_10_20_30.html.gz
+    2016-01-31/test_positive_create/console-2016-01-31_10_20_30.log.gz
+
+Each artifact is listed by the index of the run, ``index-<run>.csv``, with the
+test it belongs to. Artifacts still queued are written before the process
+exits.
+
+"""
+import base64
+import csv
+import gzip
+import json
+import logging
+import os
+import Queue
+import threading
+
+from datetime import datetime
+from robottelo.ui.parallel import at_exit
+from selenium.common.exceptions import WebDriverException
+
+LOGGER = logging.getLogger(__name__)
+
+#: Artifact collectors created by :func:`get_artifact_collector`, by process
+#: id and base path
+_COLLECTORS = {}
+
+
+class Artifacts(object):
+    """What a browser had to give about a failed test
+
+    :param str test: The name of the test
+    :param str directory: The directory of the test, relative to the base path
+        of the collector
+    :param datetime captured: When the artifacts were grabbed
+
+    """
+
+    def __init__(self, test, directory, captured):
+        self.test = test
+        self.directory = directory
+        self.captured = captured
+        self.screenshot = None
+        self.page_source = None
+        self.console_logs = None
+
+
+class ArtifactCollector(object):
+    """Write the artifacts of failed tests from a background thread
+
+    :param str base_path: The directory artifacts are written to
+    :param str run: The name of the run, naming its index file. The time the
+        collector is created at if ``None``.
+
+    """
+
+    #: The columns of the index file
+    FIELDS = ('test', 'captured', 'kind', 'path')
+
+    def __init__(self, base_path, run=None):
+        self.base_path = base_path
+        if run is None:
+            run = datetime.now().strftime('%Y-%m-%d_%H_%M_%S')
+        self.index_path = os.path.join(
+            base_path, 'index-{0}.csv'.format(run))
+        self._queue = Queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def collect(self, browser, test, directory=None):
+        """Grab the artifacts of ``browser`` and queue them to be written
+
+        Only the calls to the browser are made by the calling thread. It does
+        not wait for the artifacts to be written.
+
+        :param browser: The WebDriver browser showing the failed test
+        :param str test: The name of the test
+        :param str directory: The directory of the artifacts, under a
+            directory by day. ``test`` if ``None``.
+
+        """
+        artifacts = Artifacts(test, directory or test, datetime.now())
+        for attribute, grab in (
+                ('screenshot', browser.get_screenshot_as_base64),
+                ('page_source', lambda: browser.page_source),
+                ('console_logs', lambda: browser.get_log('browser'))):
+            try:
+                setattr(artifacts, attribute, grab())
+            except WebDriverException as err:
+                # Not every driver can give console logs
+                LOGGER.debug('Could not grab the %s of %s: %s',
+                             attribute, test, err)
+        self.start()
+        self._queue.put(artifacts)
+
+    def start(self):
+        """Start the background thread writing the artifacts"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def flush(self):
+        """Wait for all the queued artifacts to be written"""
+        self._queue.join()
+
+    def _run(self):
+        """Write the queued artifacts"""
+        while True:
+            artifacts = self._queue.get()
+            try:
+                self.write(artifacts)
+            except Exception as err:  # pylint:disable=broad-except
+                LOGGER.warning('Could not write the artifacts of %s: %s',
+                               artifacts.test, err)
+            finally:
+                self._queue.task_done()
+
+    def write(self, artifacts):
+        """Write ``artifacts`` to the disk and list them in the index
+
+        :return: The paths written, by kind of artifact
+        :rtype: dict
+
+        """
+        directory = os.path.join(
+            self.base_path,
+            artifacts.captured.strftime('%Y-%m-%d'),
+            artifacts.directory,
+        )
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        suffix = artifacts.captured.strftime('%Y-%m-%d_%H_%M_%S')
+        paths = {}
+        if artifacts.screenshot is not None:
+            paths['screenshot'] = os.path.join(
+                directory, 'screenshot-{0}.png'.format(suffix))
+            with open(paths['screenshot'], 'wb') as handler:
+                handler.write(base64.b64decode(artifacts.screenshot))
+        if artifacts.page_source is not None:
+            paths['page_source'] = os.path.join(
+                directory, 'page-{0}.html.gz'.format(suffix))
+            with gzip.open(paths['page_source'], 'wb') as handler:
+                handler.write(artifacts.page_source.encode('utf-8'))
+        if artifacts.console_logs:
+            paths['console_logs'] = os.path.join(
+                directory, 'console-{0}.log.gz'.format(suffix))
+            with gzip.open(paths['console_logs'], 'wb') as handler:
+                for entry in artifacts.console_logs:
+                    handler.write(json.dumps(entry) + '\n')
+        self._index(artifacts, paths)
+        return paths
+
+    def _index(self, artifacts, paths):
+        """Add the ``paths`` of ``artifacts`` to the index of the run"""
+        new = not os.path.exists(self.index_path)
+        with open(self.index_path, 'ab') as handler:
+            writer = csv.DictWriter(handler, self.FIELDS)
+            if new:
+                writer.writeheader()
+            for kind, path in sorted(paths.items()):
+                writer.writerow({
+                    'test': artifacts.test,
+                    'captured': artifacts.captured.isoformat(),
+                    'kind': kind,
+                    'path': os.path.relpath(path, self.base_path),
+                })
+
+
+def get_artifact_collector(base_path):
+    """Return the artifact collector of the current process for ``base_path``
+
+    Artifacts still queued are written when the process exits.
+
+    """
+    key = (os.getpid(), base_path)
+    collector = _COLLECTORS.get(key)
+    if collector is None:
+        collector = _COLLECTORS[key] = ArtifactCollector(base_path)
+        at_exit(collector.flush)
+    return collector
@@ -2,16 +2,18 @@
 """Base class for all UI operations"""
 
 import logging
+import time
 
+from robottelo.config import conf
 from robottelo.helpers import escape_search
-from robottelo.ui.locators import locators, common_locators
+from robottelo.ui.locators import common_locators, format_locator, locators
+from robottelo.ui.probe import can_probe, probe
+from robottelo.ui.wait import AdaptiveWait, wait_times
 from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import TimeoutException
-from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.select import Select
-from selenium.webdriver.support.ui import WebDriverWait
 
 
 LOGGER = logging.getLogger(__name__)
@@ -43,6 +45,16 @@ class Base(object):
         element in the web page.
 
         """
+        if can_probe(locator):
+            state = probe(self.browser, locator, self.track_requests)
+            if state.element is None:
+                self.logger.debug(
+                    'NoSuchElementException: Could not locate element %s.',
+                    locator[1]
+                )
+                return None
+            if state.idle:
+                return state.element if state.displayed else None
         try:
             _webelement = self.browser.find_element(*locator)
             self.wait_for_ajax()
@@ -87,7 +99,7 @@ class Base(object):
             search_key, escape_search(element_name)))
         self.click(search_button_locator)
         element = self.wait_until_element(
-            (element_locator[0], element_locator[1] % element_name),
+            format_locator(element_locator, element_name),
             timeout=result_timeout,
         )
         return element
@@ -111,16 +123,15 @@ class Base(object):
         for entity in entity_list:
             # Scroll to top
             self.browser.execute_script('window.scroll(0, 0)')
-            strategy, value = common_locators['filter']
-            txt_field = self.wait_until_element((strategy, value % filter_key))
+            txt_field = self.wait_until_element(
+                common_locators.format('filter', filter_key))
             if txt_field:
                 txt_field.clear()
                 txt_field.send_keys(entity)
-                strategy, value = loc
-                self.click((strategy, value % entity))
+                self.click(format_locator(loc, entity))
             else:
-                strategy, value = common_locators['entity_checkbox']
-                self.click((strategy, value % entity))
+                self.click(
+                    common_locators.format('entity_checkbox', entity))
 
     def configure_entity(self, entity_list, filter_key, tab_locator=None,
                          new_entity_list=None, entity_select=True):
@@ -155,10 +166,8 @@ class Base(object):
         if not searched:
             raise UIError('Could not search the entity "{0}"'.format(name))
         if drop_locator:
-            strategy, value = drop_locator
-            self.click((strategy, value % name))
-        strategy, value = del_locator
-        self.click((strategy, value % name), wait_for_ajax=False)
+            self.click(format_locator(drop_locator, name))
+        self.click(format_locator(del_locator, name), wait_for_ajax=False)
         self.handle_alert(really)
         # Make sure that element is really removed from UI. It is necessary to
         # verify that fact few times as sometimes 1 second is not enough for
@@ -179,6 +188,63 @@ class Base(object):
                 'Delete functionality works improperly for "{0}" entity'
                 .format(name))
 
+    def _wait_until(self, locator, timeout, poll_frequency, check,
+                    condition):
+        """Wait until the element described by ``locator`` is in the expected
+        state and then for AJAX calls to complete.
+
+        The element and the pending AJAX calls are probed together, in a
+        single round trip, see :func:`robottelo.ui.probe.probe`. Locators the
+        probe can not find elements with are waited for with Selenium's
+        ``condition`` instead. The time spent waiting is recorded by
+        :data:`robottelo.ui.wait.wait_times`.
+
+        :param check: A callable receiving the
+            :class:`robottelo.ui.probe.PageState` of the page and returning
+            whether the element is in the expected state
+        :param condition: The equivalent Selenium expected condition
+        :param poll_frequency: The longest interval between two checks, see
+            :class:`robottelo.ui.wait.AdaptiveWait`
+        :return: The element, or ``True`` if it is not in the page
+        :raise: TimeoutException if the element is not in the expected state
+            after ``timeout`` seconds
+
+        """
+        started = time.time()
+        try:
+            result = self._wait_for_state(
+                locator, timeout, poll_frequency, check, condition)
+        except TimeoutException:
+            wait_times.record(
+                locator[1], time.time() - started, timed_out=True)
+            raise
+        wait_times.record(locator[1], time.time() - started)
+        return result
+
+    def _wait_for_state(self, locator, timeout, poll_frequency, check,
+                        condition):
+        """Wait for an element without recording the wait time, see
+        :meth:`_wait_until`.
+
+        """
+        if not can_probe(locator):
+            result = AdaptiveWait(
+                self.browser, timeout, poll_frequency
+            ).until(condition(locator))
+            self.wait_for_ajax(poll_frequency=poll_frequency)
+            return result
+
+        def probe_state(browser):
+            """Return the page state if the element is as expected."""
+            state = probe(browser, locator, self.track_requests)
+            return state if check(state) else False
+
+        state = AdaptiveWait(
+            self.browser, timeout, poll_frequency).until(probe_state)
+        if not state.idle:
+            self.wait_for_ajax(poll_frequency=poll_frequency)
+        return state.element or True
+
     def wait_until_element_exists(
             self, locator, timeout=12, poll_frequency=0.5):
         """Wrapper around Selenium's WebDriver that allows you to pause your
@@ -186,11 +252,13 @@ class Base(object):
 
         """
         try:
-            element = WebDriverWait(
-                self.browser, timeout, poll_frequency
-            ).until(expected_conditions.presence_of_element_located(locator))
-            self.wait_for_ajax(poll_frequency=poll_frequency)
-            return element
+            return self._wait_until(
+                locator,
+                timeout,
+                poll_frequency,
+                lambda state: state.element is not None,
+                expected_conditions.presence_of_element_located,
+            )
         except TimeoutException as err:
             self.logger.debug(
                 "%s: Timed out waiting for element '%s' to exists.",
@@ -205,11 +273,13 @@ class Base(object):
 
         """
         try:
-            element = WebDriverWait(
-                self.browser, timeout, poll_frequency
-            ).until(expected_conditions.visibility_of_element_located(locator))
-            self.wait_for_ajax(poll_frequency=poll_frequency)
-            return element
+            return self._wait_until(
+                locator,
+                timeout,
+                poll_frequency,
+                lambda state: state.displayed,
+                expected_conditions.visibility_of_element_located,
+            )
         except TimeoutException as err:
             self.logger.debug(
                 "%s: Timed out waiting for element '%s' to display.",
@@ -225,10 +295,13 @@ class Base(object):
 
         """
         try:
-            element = WebDriverWait(
-                self.browser, timeout, poll_frequency
-            ).until(expected_conditions.element_to_be_clickable(locator))
-            self.wait_for_ajax(poll_frequency=poll_frequency)
+            element = self._wait_until(
+                locator,
+                timeout,
+                poll_frequency,
+                lambda state: state.displayed and state.enabled,
+                expected_conditions.element_to_be_clickable,
+            )
             if element.get_attribute('disabled') == u'true':
                 return None
             return element
@@ -257,9 +330,13 @@ class Base(object):
 
         """
         try:
-            WebDriverWait(self.browser, timeout, poll_frequency).until(
-                expected_conditions.invisibility_of_element_located(locator))
-            self.wait_for_ajax(poll_frequency=poll_frequency)
+            self._wait_until(
+                locator,
+                timeout,
+                poll_frequency,
+                lambda state: not state.displayed,
+                expected_conditions.invisibility_of_element_located,
+            )
             return True
         except TimeoutException as err:
             self.logger.debug(
@@ -269,31 +346,31 @@ class Base(object):
             )
             return None
 
+    @property
+    def track_requests(self):
+        """Whether to count all requests sent by pages while waiting for
+        AJAX calls, not only those sent through jQuery or Angular
+
+        Set by ``main.ui_track_requests`` on the configuration file.
+
+        """
+        return conf.properties.get('main.ui_track_requests', '0') == '1'
+
     def ajax_complete(self, driver):
         """
         Checks whether an ajax call is completed.
         """
+        return probe(driver, track=self.track_requests).idle
 
-        jquery_active = False
-        angular_active = False
-
-        try:
-            jquery_active = driver.execute_script('return jQuery.active') > 0
-        except WebDriverException:
-            pass
-
-        try:
-            angular_active = driver.execute_script(
-                'return angular.element(document).injector().get("$http")'
-                '.pendingRequests.length') > 0
-        except WebDriverException:
-            pass
+    def wait_for_ajax(self, timeout=30, poll_frequency=0.5):
+        """Waits for an ajax call to complete until timeout.
 
-        return not (jquery_active or angular_active)
+        The page is probed first, so no time is spent waiting when no request
+        is pending. ``poll_frequency`` is the longest interval between two
+        probes, see :class:`robottelo.ui.wait.AdaptiveWait`.
 
-    def wait_for_ajax(self, timeout=30, poll_frequency=0.5):
-        """Waits for an ajax call to complete until timeout."""
-        WebDriverWait(
+        """
+        AdaptiveWait(
             self.browser, timeout, poll_frequency
         ).until(
             self.ajax_complete, 'Timeout waiting for page to load'
@@ -351,8 +428,7 @@ class Base(object):
 
         """
         self.click(common_locators['parameter_tab'])
-        strategy, value = common_locators['parameter_remove']
-        self.click((strategy, value % param_name))
+        self.click(common_locators.format('parameter_remove', param_name))
         self.click(common_locators['submit'])
 
     def edit_entity(self, edit_loc, edit_text_loc, entity_value, save_loc):
@@ -375,17 +451,16 @@ class Base(object):
 
         """
         go_to_page()
-        strategy1, value1 = entity_locator
         searchbox = self.wait_until_element(common_locators['search'])
         if searchbox is None:
             raise UINoSuchElementError('Search box not found.')
         searchbox.clear()
         searchbox.send_keys(search_key + " = " + partial_name)
         self.wait_for_ajax()
-        strategy, value = common_locators['auto_search']
-        self.click((strategy, value % name))
+        self.click(common_locators.format('auto_search', name))
         self.click(common_locators['search_button'])
-        entity_elem = self.wait_until_element((strategy1, value1 % name))
+        entity_elem = self.wait_until_element(
+            format_locator(entity_locator, name))
         return entity_elem
 
     def check_all_values(self, go_to_page, entity_name, entity_locator,
@@ -409,9 +484,8 @@ class Base(object):
             raise UINoSuchElementError('Entity not found via search.')
         searched.click()
         self.click(tab_locator)
-        strategy, value = common_locators['all_values']
         selected = self.find_element(
-            (strategy, value % context)).is_selected()
+            common_locators.format('all_values', context)).is_selected()
         return selected
 
     def submit_and_validate(self, locator, validation=True):
@@ -437,7 +511,6 @@ class Base(object):
         element = self.wait_until_element(locator)
         if element is None:
             return False
-        self.wait_for_ajax()
         return element.is_enabled()
 
     def is_element_visible(self, locator):
@@ -450,7 +523,6 @@ class Base(object):
         element = self.wait_until_element_exists(locator)
         if element is None:
             return False
-        self.wait_for_ajax()
         return element.is_displayed()
 
     def click(self, locator, wait_for_ajax=True,
@@ -0,0 +1,223 @@
+# -*- encoding: utf-8 -*-
+"""Create WebDriver browsers and keep them open across UI tests
+
+Starting a browser takes several seconds, so instead of starting one for
+every test, :class:`BrowserPool` hands the same browsers over to one test
+after the other. Between tests the state of each browser is reset: cookies,
+local and session storage are cleared and the browser is sent back to a
+known page. A browser is replaced after a number of tests or when it crashes.
+
+The scope of the pool is set by ``main.browser_reuse`` on the configuration
+file:
+
+* ``none``: start a new browser for each test (default)
+* ``class``: share browsers across the tests of each test case class
+* ``process``: share browsers across all tests of a process, for example each
+  worker process of ``nosetests --processes``
+
+Browsers can not outlive the virtual display of ``main.virtual_display`` they
+are started on, so the display lives as long as the pool: one display is kept
+for each process when the scope is ``process`` and one is started for each
+test case class otherwise. Parallel workers share browsers across all their
+tests by default, see :mod:`robottelo.ui.parallel`.
+
+When ``main.grid_url`` is set, browsers are started on that Selenium Grid.
+
+"""
+import logging
+import os
+
+from robottelo.config import conf
+from robottelo.ui.parallel import at_exit
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+LOGGER = logging.getLogger(__name__)
+
+#: Per process pools created by :func:`get_process_pool`, by process id
+_PROCESS_POOLS = {}
+
+#: Desired capabilities of Selenium Grid browsers, by driver name
+GRID_CAPABILITIES = {
+    'chrome': webdriver.DesiredCapabilities.CHROME,
+    'firefox': webdriver.DesiredCapabilities.FIREFOX,
+    'ie': webdriver.DesiredCapabilities.INTERNETEXPLORER,
+    'phantomjs': webdriver.DesiredCapabilities.PHANTOMJS,
+}
+
+#: Script clearing the web storage of the current page
+CLEAR_STORAGE_SCRIPT = (
+    'try { window.localStorage.clear(); window.sessionStorage.clear(); } '
+    'catch (err) {}'
+)
+
+
+def create_browser(driver_name, remote=False, job_name=None, grid_url=None):
+    """Start a WebDriver browser
+
+    :param str driver_name: ``firefox``, ``chrome``, ``ie`` or ``phantomjs``.
+        Any other value starts a ``webdriver.Remote`` browser.
+    :param bool remote: Whether to start the browser on SauceLabs
+    :param str job_name: The SauceLabs job name of a remote browser
+    :param str grid_url: The URL of a Selenium Grid hub to start the browser
+        on, for example ``http://localhost:4444/wd/hub``
+    :return: The browser
+
+    """
+    if remote:
+        # Only needed to run tests on SauceLabs
+        from selenium_factory.SeleniumFactory import SeleniumFactory
+        return SeleniumFactory().createWebDriver(
+            job_name=job_name, show_session_id=True)
+    driver_name = driver_name.lower()
+    if grid_url:
+        capabilities = GRID_CAPABILITIES.get(
+            driver_name, {'browserName': driver_name})
+        return webdriver.Remote(
+            command_executor=grid_url,
+            desired_capabilities=dict(capabilities),
+        )
+    if driver_name == 'firefox':
+        return webdriver.Firefox()
+    elif driver_name == 'chrome':
+        return webdriver.Chrome()
+    elif driver_name == 'ie':
+        return webdriver.Ie()
+    elif driver_name == 'phantomjs':
+        service_args = ['--ignore-ssl-errors=true']
+        return webdriver.PhantomJS(service_args=service_args)
+    return webdriver.Remote()
+
+
+class BrowserPool(object):
+    """Hand browsers over to tests, one test after the other
+
+    :param factory: A callable returning a new browser
+    :param str start_url: The page browsers are sent to when handed over
+    :param int max_uses: The number of tests a browser runs before it is
+        replaced. If ``None`` or 0, browsers are only replaced when they
+        crash.
+    :param str scope: ``class`` or ``process``, the tests sharing the pool
+
+    """
+
+    def __init__(self, factory, start_url, max_uses=None, scope='class'):
+        self.factory = factory
+        self.start_url = start_url
+        self.max_uses = max_uses
+        self.scope = scope
+        self.logger = LOGGER
+        self._idle = []
+        self._uses = {}
+
+    def _start(self):
+        """Start a new browser and send it to the start page"""
+        browser = self.factory()
+        self._uses[id(browser)] = 0
+        browser.maximize_window()
+        browser.get(self.start_url)
+        self.logger.debug('Started browser %s', id(browser))
+        return browser
+
+    def _quit(self, browser):
+        """Quit a browser, ignoring browsers which already crashed"""
+        self._uses.pop(id(browser), None)
+        try:
+            browser.quit()
+        except Exception as err:  # pylint:disable=broad-except
+            self.logger.debug('Browser %s did not quit: %s', id(browser), err)
+
+    def _reset(self, browser):
+        """Clear the state a test left on a browser
+
+        :return: Whether the browser could be reset. A browser which could
+            not be reset crashed or is unusable.
+
+        """
+        try:
+            browser.delete_all_cookies()
+            browser.get(self.start_url)
+            browser.execute_script(CLEAR_STORAGE_SCRIPT)
+        except WebDriverException as err:
+            self.logger.warning(
+                'Browser %s could not be reset: %s', id(browser), err)
+            return False
+        return True
+
+    def acquire(self):
+        """Return a browser on the start page for a test"""
+        while self._idle:
+            browser = self._idle.pop()
+            try:
+                # any command fails once the browser crashed
+                browser.current_url  # pylint:disable=pointless-statement
+            except WebDriverException:
+                self.logger.warning('Replacing crashed browser %s',
+                                    id(browser))
+                self._quit(browser)
+                continue
+            return browser
+        return self._start()
+
+    def release(self, browser):
+        """Hand a browser back once a test is done with it
+
+        The browser is reset for the next test or quit if it ran
+        ``max_uses`` tests or can not be reset.
+
+        """
+        self._uses[id(browser)] = self._uses.get(id(browser), 0) + 1
+        if self.max_uses and self._uses[id(browser)] >= self.max_uses:
+            self.logger.debug('Recycling browser %s after %d tests',
+                              id(browser), self._uses[id(browser)])
+            self._quit(browser)
+        elif self._reset(browser):
+            self._idle.append(browser)
+        else:
+            self._quit(browser)
+
+    def close(self):
+        """Quit all idle browsers"""
+        while self._idle:
+            self._quit(self._idle.pop())
+
+
+def get_process_pool(factory, start_url, max_uses=None):
+    """Return the browser pool of the current process
+
+    The pool is created on the first call of each process, forked worker
+    processes included, and its browsers are quit when the process exits.
+    New browsers are started by the ``factory`` of the last call, so they are
+    named after the test case class starting them.
+
+    """
+    pool = _PROCESS_POOLS.get(os.getpid())
+    if pool is None:
+        pool = _PROCESS_POOLS[os.getpid()] = BrowserPool(
+            factory, start_url, max_uses, scope='process')
+        at_exit(pool.close)
+    pool.factory = factory
+    return pool
+
+
+def make_pool(factory, start_url, default='none'):
+    """Return a browser pool for ``main.browser_reuse`` or ``None`` if
+    browsers are not reused
+
+    The number of tests each browser runs is read from
+    ``main.browser_max_tests``.
+
+    :param str default: The scope of the pool when ``main.browser_reuse`` is
+        not set
+
+    """
+    reuse = conf.properties.get('main.browser_reuse', default)
+    max_uses = int(conf.properties.get('main.browser_max_tests', 0))
+    if reuse == 'class':
+        return BrowserPool(factory, start_url, max_uses)
+    elif reuse == 'process':
+        return get_process_pool(factory, start_url, max_uses)
+    elif reuse != 'none':
+        raise ValueError(
+            'Unknown main.browser_reuse value: {0}'.format(reuse))
+    return None
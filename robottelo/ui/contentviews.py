@@ -1,8 +1,6 @@
 # -*- encoding: utf-8 -*-
 """Implements Content Views UI"""
 
-import time
-
 from robottelo.helpers import escape_search
 from robottelo.ui.base import Base, UIError, UINoSuchElementError
 from robottelo.ui.locators import common_locators, locators, tab_locators
@@ -213,19 +211,11 @@ class ContentViews(Base):
         CV to next environment
 
         """
-        timer = time.time() + 60 * 10
         strategy, value = locators['contentviews.publish_progress']
-        check_progress = self.wait_until_element(
-            (strategy, value % version),
-            timeout=6,
-            poll_frequency=2,
-        )
-        while check_progress and time.time() <= timer:
-            check_progress = self.wait_until_element(
-                (strategy, value % version),
-                timeout=6,
-                poll_frequency=2,
-            )
+        progress_bar = (strategy, value % version)
+        if self.wait_until_element(progress_bar, timeout=6, poll_frequency=2):
+            self.wait_until_element_is_not_visible(
+                progress_bar, timeout=60 * 10, poll_frequency=2)
 
     def publish(self, cv_name, comment=None):
         """Publishes to create new version of CV and promotes the contents to
@@ -23,6 +23,16 @@ from robottelo.ui.operatingsys import OperatingSys
 from robottelo.ui.org import Org
 from robottelo.ui.oscappolicy import OpenScapPolicy
 from robottelo.ui.partitiontable import PartitionTable
+from robottelo.ui.prerequisites import (
+    create_contentview,
+    create_gpgkey,
+    create_lifecycle_environment,
+    create_location,
+    create_organization,
+    create_product,
+    create_repository,
+    use_api,
+)
 from robottelo.ui.products import Products
 from robottelo.ui.puppetclasses import PuppetClasses
 from robottelo.ui.registry import Registry
@@ -62,25 +72,66 @@ def core_factory(create_args, kwargs, session, page, org=None, loc=None,
     page()
 
 
+def prerequisite_factory(create_args, kwargs, create, *args):
+    """Creates an entity through the API instead of the UI.
+
+    Updates the ``create_args`` dictionary and passes it to ``create``, see
+    :mod:`robottelo.ui.prerequisites`.
+
+    :param dict create_args: Default entities arguments.
+    :param kwargs: Arbitrary keyword arguments to update create_args.
+    :param create: The function creating the entity through the API.
+    :param args: Positional arguments of ``create``, like the organization.
+    :return: The created nailgun entity.
+
+    """
+    update_dictionary(create_args, kwargs)
+    return create(*args, **create_args)
+
+
+def set_prerequisite_context(session, org=None, loc=None,
+                             force_context=True):
+    """Selects the context of an entity created through the API.
+
+    The steps under test go through the UI next, so the organization and
+    location of the prerequisite are selected on the browser, like the UI
+    factories do before filling the form.
+
+    :param session: The browser session.
+    :param str org: The organization context to set.
+    :param str loc: The location context to set.
+    :param bool force_context: If True set the context again.
+    :return: None.
+
+    """
+    if org or loc:
+        set_context(session, org=org, loc=loc, force_context=force_context)
+
+
 def check_context(session):
     """Checks whether the org and loc context is set.
 
+    The context menu is only read when the context selected on the browser is
+    unknown, see :func:`robottelo.ui.navigator.browser_context`.
+
     :param session: The browser session.
     :return: Returns a value to set context after checking whether the
         org and loc context is set.
     :rtype: dict
 
     """
-    current_text = session.nav.wait_until_element(
-        menu_locators['menu.current_text'])
-    ActionChains(session.browser).move_to_element(current_text).perform()
-    current_org_text = session.nav.wait_until_element(
-        menu_locators['menu.fetch_org']).text
-    current_loc_text = session.nav.wait_until_element(
-        menu_locators['menu.fetch_loc']).text
+    context = session.nav.context
+    if context['org'] is None or context['loc'] is None:
+        current_text = session.nav.wait_until_element(
+            menu_locators['menu.current_text'])
+        ActionChains(session.browser).move_to_element(current_text).perform()
+        context['org'] = session.nav.wait_until_element(
+            menu_locators['menu.fetch_org']).text
+        context['loc'] = session.nav.wait_until_element(
+            menu_locators['menu.fetch_loc']).text
     return {
-        'org': current_org_text == 'Any Organization',
-        'loc': current_loc_text == 'Any Location',
+        'org': context['org'] == 'Any Organization',
+        'loc': context['loc'] == 'Any Location',
     }
 
 
@@ -90,7 +141,8 @@ def set_context(session, org=None, loc=None, force_context=False):
     When configuring the context, use ``org`` and ``loc``. If ``force_context``
     is ``True``, set the ``org`` and ``loc`` context again. This method is
     useful when, for example, creating entities with the same name but
-    different organizations.
+    different organizations. An ``org`` or ``loc`` already selected on the
+    browser is not selected again.
 
     :param session: The browser session.
     :param str org: The organization context to set.
@@ -102,14 +154,20 @@ def set_context(session, org=None, loc=None, force_context=False):
     select_context = check_context(session)
     # Change context only if required or when force_context is set to True
     if select_context['org'] or select_context['loc'] or force_context:
-        if org:
+        if org and session.nav.context['org'] != org:
             session.nav.go_to_select_org(org)
-        if loc:
+        if loc and session.nav.context['loc'] != loc:
             session.nav.go_to_select_loc(loc)
 
 
-def make_org(session, **kwargs):
-    """Creates an organization"""
+def make_org(session, prerequisite=False, **kwargs):
+    """Creates an organization
+
+    :return: The created nailgun entity if ``prerequisite`` is set and
+        ``main.ui_api_prerequisites`` is enabled, ``None`` if the entity is
+        created on the UI.
+
+    """
 
     create_args = {
         u'org_name': None,
@@ -128,13 +186,22 @@ def make_org(session, **kwargs):
         u'locations': None,
         u'select': True,
     }
+    if use_api(prerequisite):
+        return prerequisite_factory(
+            create_args, kwargs, create_organization)
     page = session.nav.go_to_org
     core_factory(create_args, kwargs, session, page)
     Org(session.browser).create(**create_args)
 
 
-def make_loc(session, **kwargs):
-    """Creates a location"""
+def make_loc(session, prerequisite=False, **kwargs):
+    """Creates a location
+
+    :return: The created nailgun entity if ``prerequisite`` is set and
+        ``main.ui_api_prerequisites`` is enabled, ``None`` if the entity is
+        created on the UI.
+
+    """
 
     create_args = {
         u'name': None,
@@ -151,20 +218,36 @@ def make_loc(session, **kwargs):
         u'organizations': None,
         u'select': True,
     }
+    if use_api(prerequisite):
+        return prerequisite_factory(
+            create_args, kwargs, create_location)
     page = session.nav.go_to_loc
     core_factory(create_args, kwargs, session, page)
     Location(session.browser).create(**create_args)
 
 
 def make_lifecycle_environment(session, org=None, loc=None,
-                               force_context=True, **kwargs):
-    """Creates Life-cycle Environment"""
+                               force_context=True, prerequisite=False,
+                               **kwargs):
+    """Creates Life-cycle Environment
+
+    :return: The created nailgun entity if ``prerequisite`` is set and
+        ``main.ui_api_prerequisites`` is enabled, ``None`` if the entity is
+        created on the UI.
+
+    """
 
     create_args = {
         u'name': None,
         u'description': None,
         u'prior': None,
     }
+    if use_api(prerequisite):
+        entity = prerequisite_factory(
+            create_args, kwargs, create_lifecycle_environment, org)
+        set_prerequisite_context(
+            session, org=org, loc=loc, force_context=force_context)
+        return entity
     page = session.nav.go_to_life_cycle_environments
     core_factory(create_args, kwargs, session, page,
                  org=org, loc=loc, force_context=force_context)
@@ -188,8 +271,15 @@ def make_activationkey(session, org=None, loc=None,
     ActivationKey(session.browser).create(**create_args)
 
 
-def make_product(session, org=None, loc=None, force_context=True, **kwargs):
-    """Creates a product"""
+def make_product(session, org=None, loc=None, force_context=True,
+                 prerequisite=False, **kwargs):
+    """Creates a product
+
+    :return: The created nailgun entity if ``prerequisite`` is set and
+        ``main.ui_api_prerequisites`` is enabled, ``None`` if the entity is
+        created on the UI.
+
+    """
 
     create_args = {
         u'name': None,
@@ -200,6 +290,12 @@ def make_product(session, org=None, loc=None, force_context=True, **kwargs):
         u'gpg_key': None,
         u'sync_interval': None,
     }
+    if use_api(prerequisite):
+        entity = prerequisite_factory(
+            create_args, kwargs, create_product, org)
+        set_prerequisite_context(
+            session, org=org, loc=loc, force_context=force_context)
+        return entity
     page = session.nav.go_to_products
     core_factory(create_args, kwargs, session, page,
                  org=org, loc=loc, force_context=force_context)
@@ -207,8 +303,15 @@ def make_product(session, org=None, loc=None, force_context=True, **kwargs):
 
 
 def make_repository(session, org=None, loc=None,
-                    force_context=True, **kwargs):
-    """Creates a repository"""
+                    force_context=True, prerequisite=False,
+                    **kwargs):
+    """Creates a repository
+
+    :return: The created nailgun entity if ``prerequisite`` is set and
+        ``main.ui_api_prerequisites`` is enabled, ``None`` if the entity is
+        created on the UI.
+
+    """
 
     create_args = {
         u'name': None,
@@ -220,6 +323,12 @@ def make_repository(session, org=None, loc=None,
         u'repo_checksum': CHECKSUM_TYPE['default'],
         u'upstream_repo_name': None,
     }
+    if use_api(prerequisite):
+        entity = prerequisite_factory(
+            create_args, kwargs, create_repository, org)
+        set_prerequisite_context(
+            session, org=org, loc=loc, force_context=force_context)
+        return entity
     page = session.nav.go_to_products
     core_factory(create_args, kwargs, session, page,
                  org=org, loc=loc, force_context=force_context)
@@ -227,8 +336,15 @@ def make_repository(session, org=None, loc=None,
 
 
 def make_contentview(session, org=None, loc=None,
-                     force_context=True, **kwargs):
-    """Creates a content-view"""
+                     force_context=True, prerequisite=False,
+                     **kwargs):
+    """Creates a content-view
+
+    :return: The created nailgun entity if ``prerequisite`` is set and
+        ``main.ui_api_prerequisites`` is enabled, ``None`` if the entity is
+        created on the UI.
+
+    """
 
     create_args = {
         u'name': None,
@@ -236,14 +352,27 @@ def make_contentview(session, org=None, loc=None,
         u'description': None,
         u'is_composite': False,
     }
+    if use_api(prerequisite):
+        entity = prerequisite_factory(
+            create_args, kwargs, create_contentview, org)
+        set_prerequisite_context(
+            session, org=org, loc=loc, force_context=force_context)
+        return entity
     page = session.nav.go_to_content_views
     core_factory(create_args, kwargs, session, page,
                  org=org, loc=loc, force_context=force_context)
     ContentViews(session.browser).create(**create_args)
 
 
-def make_gpgkey(session, org=None, loc=None, force_context=True, **kwargs):
-    """Creates a gpgkey"""
+def make_gpgkey(session, org=None, loc=None, force_context=True,
+                prerequisite=False, **kwargs):
+    """Creates a gpgkey
+
+    :return: The created nailgun entity if ``prerequisite`` is set and
+        ``main.ui_api_prerequisites`` is enabled, ``None`` if the entity is
+        created on the UI.
+
+    """
 
     create_args = {
         u'name': None,
@@ -251,6 +380,12 @@ def make_gpgkey(session, org=None, loc=None, force_context=True, **kwargs):
         u'key_path': None,
         u'key_content': None,
     }
+    if use_api(prerequisite):
+        entity = prerequisite_factory(
+            create_args, kwargs, create_gpgkey, org)
+        set_prerequisite_context(
+            session, org=org, loc=loc, force_context=force_context)
+        return entity
     page = session.nav.go_to_gpg_keys
     core_factory(create_args, kwargs, session, page,
                  org=org, loc=loc, force_context=force_context)
@@ -3,7 +3,7 @@
 from robottelo.constants import FILTER
 from robottelo.ui.base import Base, UINoSuchElementError
 from robottelo.ui.locators import common_locators, locators, tab_locators
-from robottelo.ui.navigator import Navigator
+from robottelo.ui.navigator import Navigator, forget_context
 from selenium.webdriver.support.select import Select
 
 
@@ -79,6 +79,7 @@ class Location(Base):
                domains=None, envs=None, hostgroups=None, organizations=None,
                select=True):
         """Creates new Location from UI."""
+        forget_context(self.browser)
         self.click(locators['location.new'])
         if self.wait_until_element(locators['location.name']) is None:
             raise UINoSuchElementError('Could not create new location.')
@@ -117,6 +118,7 @@ class Location(Base):
                new_domains=None, new_envs=None, new_hostgroups=None,
                select=False):
         """Update Location in UI."""
+        forget_context(self.browser)
         org_object = self.search(loc_name)
         self.wait_for_ajax()
         if org_object is None:
@@ -147,6 +149,7 @@ class Location(Base):
 
     def delete(self, name, really=True):
         """Deletes a location."""
+        forget_context(self.browser)
         self.delete_entity(
             name,
             really,
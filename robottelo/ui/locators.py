@@ -1,14 +1,188 @@
 # -*- encoding: utf-8 -*-
-"""Implements different locators for UI"""
+"""Implements different locators for UI
+
+Locators are looked up by name in :class:`LocatorDict` instances, all of them
+registered in :data:`registry`. Templated locators, holding ``%s``
+placeholders, are formatted by :func:`format_locator`, which compiles each
+template once into a callable caching the most recently formatted locators.
+
+The registry counts how many times each locator is looked up and maps the
+locators waited for by :data:`robottelo.ui.wait.wait_times` back to their
+names, reporting the unused and the slowest locators. The report is written
+to ``main.ui_locator_report`` on the configuration file, if set, when the
+tests are done. Formatted locators are only mapped back to their template
+when the report is enabled.
+
+"""
 
 import collections
 import logging
+import os
+import threading
 
+from robottelo.ui.parallel import at_exit
 from selenium.webdriver.common.by import By
 
 
 LOGGER = logging.getLogger(__name__)
 
+#: The number of formatted locators cached by each template
+TEMPLATE_CACHE_SIZE = 32
+
+
+class LocatorRegistry(object):
+    """Compile templated locators and report how locators are used
+
+    :param int cache_size: The number of formatted locators cached by each
+        template
+
+    """
+
+    def __init__(self, cache_size=TEMPLATE_CACHE_SIZE):
+        self.dicts = []
+        self.cache_size = cache_size
+        #: Whether formatted locators are mapped back to their template, for
+        #: :meth:`name`
+        self.track_origins = False
+        self._templates = {}
+        self._origins = {}
+
+    def add(self, locator_dict):
+        """Register a :class:`LocatorDict`"""
+        self.dicts.append(locator_dict)
+
+    def template(self, locator):
+        """Return a callable formatting the templated ``locator``
+
+        The callable is compiled on the first call for each template and
+        caches the last :attr:`cache_size` locators it formats, by arguments.
+
+        """
+        template = self._templates.get(locator)
+        if template is None:
+            template = self._templates[locator] = self._compile(locator)
+        return template
+
+    def _compile(self, locator):
+        """Return a callable formatting ``locator`` and caching the result"""
+        strategy, value = locator
+        cache = collections.OrderedDict()
+        lock = threading.Lock()
+
+        def format_template(*args):
+            """Return the locator formatted with ``args``"""
+            with lock:
+                formatted = cache.pop(args, None)
+                if formatted is None:
+                    formatted = (strategy, value % args)
+                    if len(cache) >= self.cache_size:
+                        cache.popitem(last=False)
+                    if self.track_origins:
+                        self._origins[formatted[1]] = value
+                # the most recently used locators are last
+                cache[args] = formatted
+            return formatted
+        return format_template
+
+    def name(self, value):
+        """Return the name of the locator with ``value``, the value of a
+        formatted locator included if :attr:`track_origins` was set when it
+        was formatted, or ``None`` if it is unknown
+
+        """
+        value = self._origins.get(value, value)
+        for locator_dict in self.dicts:
+            for key, item in locator_dict.store.items():
+                if item[1] == value:
+                    return key
+        return None
+
+    def unused(self):
+        """Return the sorted names of the locators never looked up"""
+        return sorted(
+            key
+            for locator_dict in self.dicts
+            for key in locator_dict.store
+            if not locator_dict.accessed[key]
+        )
+
+    def slowest(self, wait_times, count=None):
+        """Return the locators waited for the longest in total
+
+        :param wait_times: The :class:`robottelo.ui.wait.WaitTimes` recording
+            the waits
+        :param int count: The number of locators to return, all of them if
+            ``None``
+        :return: A list of dicts with the keys of
+            :data:`robottelo.ui.wait.WaitTimes.FIELDS`, summed up by locator
+            name, sorted by descending total wait time. Locators without name
+            are reported by value.
+
+        """
+        rows = collections.OrderedDict()
+        for row in wait_times.slowest():
+            name = self.name(row['locator']) or row['locator']
+            if name not in rows:
+                rows[name] = dict(row, locator=name)
+                continue
+            total = rows[name]
+            for field in ('waits', 'timeouts', 'total'):
+                total[field] += row[field]
+            total['longest'] = max(total['longest'], row['longest'])
+        result = sorted(
+            rows.values(), key=lambda row: row['total'], reverse=True)
+        return result[:count] if count is not None else result
+
+    def write_report(self, path, wait_times, count=50):
+        """Write the ``count`` slowest locators and the unused ones to the
+        text file ``path``
+
+        """
+        with open(path, 'w') as handler:
+            handler.write('Slowest locators (total, waits, timeouts):\n')
+            for row in self.slowest(wait_times, count):
+                handler.write('{total:10.3f} {waits:6d} {timeouts:6d} '
+                              '{locator}\n'.format(**row))
+            unused = self.unused()
+            handler.write(
+                '\nUnused locators ({0}):\n'.format(len(unused)))
+            for name in unused:
+                handler.write('{0}\n'.format(name))
+
+
+#: The registry of all locators
+registry = LocatorRegistry()  # pylint:disable=invalid-name
+
+#: Process ids which already write the report on exit
+_REGISTERED = set()
+
+
+def format_locator(locator, *args):
+    """Return the templated ``locator`` formatted with ``args``
+
+    ``format_locator(locator, name)`` is the cached equivalent of
+    ``(locator[0], locator[1] % name)``.
+
+    """
+    return registry.template(locator)(*args)
+
+
+def write_locator_report_on_exit(path):
+    """Write the locator report of the current process to ``path`` when it
+    exits, see :meth:`LocatorRegistry.write_report`
+
+    ``{pid}`` in ``path`` is replaced by the process id.
+
+    """
+    # Imported here as robottelo.ui.wait is only needed for the report
+    from robottelo.ui.wait import wait_times
+    registry.track_origins = True
+    if os.getpid() in _REGISTERED:
+        return
+    _REGISTERED.add(os.getpid())
+    at_exit(
+        registry.write_report, path.format(pid=os.getpid()), wait_times)
+
 
 class LocatorDict(collections.Mapping):
     """This class will log every time an item is selected
@@ -21,15 +195,22 @@ class LocatorDict(collections.Mapping):
         >>> dict(a='b')
         {'a': 'b'}
 
+    Each instance is added to :data:`registry`, which reports how many times
+    its locators are looked up.
+
     """
     def __init__(self, *args, **kwargs):
         self.store = dict(*args, **kwargs)
+        self.accessed = collections.defaultdict(int)
+        registry.add(self)
 
     def __getitem__(self, key):
         item = self.store[key]
-        LOGGER.debug(
-            'Accessing locator "%s" by %s: "%s"', key, item[0], item[1]
-        )
+        self.accessed[key] += 1
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                'Accessing locator "%s" by %s: "%s"', key, item[0], item[1]
+            )
         return item
 
     def __len__(self):
@@ -38,6 +219,13 @@ class LocatorDict(collections.Mapping):
     def __iter__(self):
         return iter(self.store)
 
+    def format(self, key, *args):
+        """Return the templated locator ``key`` formatted with ``args``, see
+        :func:`format_locator`
+
+        """
+        return format_locator(self[key], *args)
+
 
 menu_locators = LocatorDict({
     # Menus
@@ -1,12 +1,94 @@
 # -*- encoding: utf-8 -*-
 """Implements Login UI"""
 
+import re
 import requests
 
 from robottelo.helpers import get_server_url
 from robottelo.ui.base import Base, UINoSuchElementError
 from robottelo.ui.locators import common_locators, locators
-from robottelo.ui.navigator import Navigator
+from robottelo.ui.navigator import Navigator, forget_context
+
+#: The name of the Foreman session cookie
+SESSION_COOKIE = '_session_id'
+
+#: Session cookies of each user, by server URL and username
+_SESSION_COOKIES = {}
+
+AUTHENTICITY_TOKEN_REGEX = re.compile(
+    r'<input[^>]*name="authenticity_token"[^>]*value="([^"]*)"')
+
+
+def http_login(username, password):
+    """Log in to the server over HTTP, without a browser
+
+    :return: The value of the session cookie, or ``None`` if the login was
+        rejected
+    :rtype: str
+
+    """
+    login_url = get_server_url() + '/users/login'
+    session = requests.Session()
+    session.verify = False
+    response = session.get(login_url)
+    response.raise_for_status()
+    match = AUTHENTICITY_TOKEN_REGEX.search(response.text)
+    response = session.post(
+        login_url,
+        data={
+            'authenticity_token': match.group(1) if match else '',
+            'login[login]': username,
+            'login[password]': password,
+        },
+        allow_redirects=False,
+    )
+    if (response.status_code != 302 or
+            response.headers['location'].endswith('/users/login')):
+        return None
+    return session.cookies.get(SESSION_COOKIE)
+
+
+def get_session_cookie(username, password):
+    """Return the cached session cookie of a user, logging in over HTTP the
+    first time
+
+    :return: The value of the session cookie, or ``None`` if the login was
+        rejected
+    :rtype: str
+
+    """
+    key = (get_server_url(), username)
+    if key not in _SESSION_COOKIES:
+        cookie = http_login(username, password)
+        if cookie is None:
+            return None
+        _SESSION_COOKIES[key] = cookie
+    return _SESSION_COOKIES[key]
+
+
+def clear_context(cookie):
+    """Reset the organization and location of a session to any context
+
+    Sessions are shared through the cookie cache, so each one is reset before
+    it is handed over to a browser.
+
+    :return: Whether the context was cleared. ``False`` if the server failed
+        or rejected the session, redirecting to the login page.
+    :rtype: bool
+
+    """
+    for path in ('/organizations/clear', '/locations/clear'):
+        response = requests.get(
+            get_server_url() + path,
+            verify=False,
+            allow_redirects=False,
+            cookies={SESSION_COOKIE: cookie},
+        )
+        if (not 200 <= response.status_code < 400 or
+                response.headers.get('location', '').endswith(
+                    '/users/login')):
+            return False
+    return True
 
 
 class Login(Base):
@@ -14,6 +96,7 @@ class Login(Base):
 
     def login(self, username, password, organization=None, location=None):
         """Logins user from UI"""
+        forget_context(self.browser)
         if self.wait_until_element(locators['login.username']):
             self.field_update('login.username', username)
             self.field_update('login.password', password)
@@ -22,15 +105,63 @@ class Login(Base):
 
             if self.find_element(common_locators['notif.error']):
                 return
-            if location:
-                nav = Navigator(self.browser)
-                nav.go_to_select_loc(location)
-            if organization:
-                nav = Navigator(self.browser)
-                nav.go_to_select_org(organization)
+            self._select_context(organization, location)
+
+    def _select_context(self, organization=None, location=None):
+        """Select the organization and location of a logged in user"""
+        if location:
+            nav = Navigator(self.browser)
+            nav.go_to_select_loc(location)
+        if organization:
+            nav = Navigator(self.browser)
+            nav.go_to_select_org(organization)
+
+    def cookie_login(self, username, password, organization=None,
+                     location=None):
+        """Logins user by handing a session cookie over to the browser
+
+        The session cookie of each user is obtained over HTTP the first time
+        and cached. If the server rejects it, for example because the session
+        expired or was logged out, or its context can not be cleared, the
+        login form is used instead and the session cookie it sets is cached.
+
+        """
+        # The context of the session is cleared before it is handed over
+        forget_context(self.browser)
+        key = (get_server_url(), username)
+        cookie = get_session_cookie(username, password)
+        if cookie is not None and not clear_context(cookie):
+            self.logger.debug(
+                'Could not clear the context of the session of %s', username)
+            _SESSION_COOKIES.pop(key, None)
+            cookie = None
+        if cookie is not None:
+            # cookies can only be set for the domain of the current page
+            if not self.browser.current_url.startswith(get_server_url()):
+                self.browser.get(get_server_url())
+            self.browser.delete_cookie(SESSION_COOKIE)
+            self.browser.add_cookie({
+                'name': SESSION_COOKIE,
+                'value': cookie,
+                'path': '/',
+                'secure': get_server_url().startswith('https'),
+            })
+            self.browser.get(get_server_url())
+            if not self.browser.current_url.endswith('/users/login'):
+                self._select_context(organization, location)
+                return
+            self.logger.debug('Session cookie of %s rejected', username)
+            _SESSION_COOKIES.pop(key, None)
+
+        self.login(username, password, organization, location)
+        cookie = self.browser.get_cookie(SESSION_COOKIE)
+        if cookie is not None and not self.browser.current_url.endswith(
+                '/users/login'):
+            _SESSION_COOKIES[key] = cookie['value']
 
     def logout(self):
         """Logout user from UI"""
+        forget_context(self.browser)
         # Scroll to top
         self.browser.execute_script('window.scroll(0, 0)')
         if self.wait_until_element(locators['login.gravatar']) is None:
@@ -1,11 +1,100 @@
 # -*- encoding: utf-8 -*-
-"""Implements Navigator UI."""
+"""Implements Navigator UI.
+
+Each ``go_to_*`` method with a URL path in :data:`ROUTES` opens its page
+directly in direct navigation mode, skipping the menus. Direct navigation is
+enabled by ``main.ui_direct_navigation`` on the configuration file. The
+menus themselves are covered by ``tests/foreman/ui/test_navigator.py``.
+
+The organization and location selected on each browser are tracked by
+:func:`browser_context`, so they are only selected again when they change.
+
+"""
+import weakref
+
+from functools import wraps
+from robottelo.config import conf
+from robottelo.helpers import get_server_url
 from robottelo.ui.base import Base, UIError
 from robottelo.ui.locators import menu_locators
 
+#: URL paths of the pages opened by ``go_to_*`` methods, by method name
+ROUTES = {}
+
+#: The organization and location selected on each browser
+_CONTEXTS = weakref.WeakKeyDictionary()
+
+
+def browser_context(browser):
+    """Return the organization and location selected on ``browser``
+
+    :return: A dict with the ``org`` and ``loc`` names shown by the context
+        menu, like ``Any Organization``, each ``None`` while unknown. Selecting
+        an organization or a location through :class:`Navigator` updates it.
+    :rtype: dict
+
+    """
+    return _CONTEXTS.setdefault(browser, {'org': None, 'loc': None})
+
+
+def forget_context(browser):
+    """Mark the organization and location selected on ``browser`` unknown
+
+    Called whenever they may change without :class:`Navigator`, like when
+    logging in or changing organizations and locations.
+
+    """
+    _CONTEXTS.pop(browser, None)
+
+
+def route(path):
+    """Register the URL path of the page opened by a ``go_to_*`` method
+
+    The decorated method opens the page through the menus unless direct
+    navigation is enabled on the navigator.
+
+    """
+    def decorator(func):
+        """Register ``func`` in :data:`ROUTES`"""
+        ROUTES[func.__name__] = path
+
+        @wraps(func)
+        def wrapper(self):
+            """Open the page directly or through the menus"""
+            if self.direct:
+                self.go_to_path(path)
+            else:
+                func(self)
+        return wrapper
+    return decorator
+
 
 class Navigator(Base):
-    """Quickly navigate through menus and tabs."""
+    """Quickly navigate through menus and tabs.
+
+    :param browser: The WebDriver browser
+    :param bool direct: Whether to open pages by URL instead of through the
+        menus. Read from ``main.ui_direct_navigation`` if ``None``.
+
+    """
+
+    def __init__(self, browser, direct=None):
+        super(Navigator, self).__init__(browser)
+        if direct is None:
+            direct = conf.properties.get(
+                'main.ui_direct_navigation', '0') == '1'
+        self.direct = direct
+
+    @property
+    def context(self):
+        """The organization and location selected on the browser, see
+        :func:`browser_context`"""
+        return browser_context(self.browser)
+
+    def go_to_path(self, path):
+        """Open the page at ``path`` on the server directly"""
+        self.browser.get(get_server_url() + path)
+        self.wait_for_ajax()
 
     def menu_click(self, top_menu_locator, sub_menu_locator,
                    tertiary_menu_locator=None):
@@ -22,6 +111,7 @@ class Navigator(Base):
             )
         self.wait_for_ajax()
 
+    @route('/dashboard')
     def go_to_dashboard(self):
         self.menu_click(
             menu_locators['menu.monitor'], menu_locators['menu.dashboard'],
@@ -33,37 +123,44 @@ class Navigator(Base):
             menu_locators['menu.content_dashboard'],
         )
 
+    @route('/reports')
     def go_to_reports(self):
         self.menu_click(
             menu_locators['menu.monitor'], menu_locators['menu.reports'],
         )
 
+    @route('/fact_values')
     def go_to_facts(self):
         self.menu_click(
             menu_locators['menu.monitor'], menu_locators['menu.facts'],
         )
 
+    @route('/statistics')
     def go_to_statistics(self):
         self.menu_click(
             menu_locators['menu.monitor'], menu_locators['menu.statistics'],
         )
 
+    @route('/trends')
     def go_to_trends(self):
         self.menu_click(
             menu_locators['menu.monitor'], menu_locators['menu.trends'],
         )
 
+    @route('/audits')
     def go_to_audits(self):
         self.menu_click(
             menu_locators['menu.monitor'], menu_locators['menu.audits'],
         )
 
+    @route('/lifecycle_environments')
     def go_to_life_cycle_environments(self):
         self.menu_click(
             menu_locators['menu.content'],
             menu_locators['menu.life_cycle_environments'],
         )
 
+    @route('/subscriptions')
     def go_to_red_hat_subscriptions(self):
         self.menu_click(
             menu_locators['menu.content'],
@@ -76,33 +173,39 @@ class Navigator(Base):
             menu_locators['menu.subscription_manager_applications'],
         )
 
+    @route('/activation_keys')
     def go_to_activation_keys(self):
         self.menu_click(
             menu_locators['menu.content'],
             menu_locators['menu.activation_keys'],
         )
 
+    @route('/redhat_provider')
     def go_to_red_hat_repositories(self):
         self.menu_click(
             menu_locators['menu.content'],
             menu_locators['menu.red_hat_repositories'],
         )
 
+    @route('/products')
     def go_to_products(self):
         self.menu_click(
             menu_locators['menu.content'], menu_locators['menu.products'],
         )
 
+    @route('/gpg_keys')
     def go_to_gpg_keys(self):
         self.menu_click(
             menu_locators['menu.content'], menu_locators['menu.gpg_keys'],
         )
 
+    @route('/katello/sync_management')
     def go_to_sync_status(self):
         self.menu_click(
             menu_locators['menu.content'], menu_locators['menu.sync_status'],
         )
 
+    @route('/sync_plans')
     def go_to_sync_plans(self):
         self.menu_click(
             menu_locators['menu.content'], menu_locators['menu.sync_plans'],
@@ -114,12 +217,14 @@ class Navigator(Base):
             menu_locators['menu.sync_schedules'],
         )
 
+    @route('/content_views')
     def go_to_content_views(self):
         self.menu_click(
             menu_locators['menu.content'],
             menu_locators['menu.content_views'],
         )
 
+    @route('/content_search')
     def go_to_content_search(self):
         self.menu_click(
             menu_locators['menu.content'],
@@ -132,86 +237,101 @@ class Navigator(Base):
             menu_locators['menu.registries'],
         )
 
+    @route('/hosts')
     def go_to_hosts(self):
         self.menu_click(
             menu_locators['menu.hosts'], menu_locators['menu.all_hosts'],
         )
 
+    @route('/discovered_hosts')
     def go_to_discovered_hosts(self):
         self.menu_click(
             menu_locators['menu.hosts'],
             menu_locators['menu.discovered_hosts'],
         )
 
+    @route('/content_hosts')
     def go_to_content_hosts(self):
         self.menu_click(
             menu_locators['menu.hosts'],
             menu_locators['menu.content_hosts'],
         )
 
+    @route('/host_collections')
     def go_to_host_collections(self):
         self.menu_click(
             menu_locators['menu.hosts'],
             menu_locators['menu.host_collections'],
         )
 
+    @route('/operatingsystems')
     def go_to_operating_systems(self):
         self.menu_click(
             menu_locators['menu.hosts'],
             menu_locators['menu.operating_systems'],
         )
 
+    @route('/config_templates')
     def go_to_provisioning_templates(self):
         self.menu_click(
             menu_locators['menu.hosts'],
             menu_locators['menu.provisioning_templates'],
         )
 
+    @route('/ptables')
     def go_to_partition_tables(self):
         self.menu_click(
             menu_locators['menu.hosts'],
             menu_locators['menu.partition_tables'],
         )
 
+    @route('/media')
     def go_to_installation_media(self):
         self.menu_click(
             menu_locators['menu.hosts'],
             menu_locators['menu.installation_media'],
         )
 
+    @route('/models')
     def go_to_hardware_models(self):
         self.menu_click(
             menu_locators['menu.hosts'], menu_locators['menu.hardware_models'],
         )
 
+    @route('/architectures')
     def go_to_architectures(self):
         self.menu_click(
             menu_locators['menu.hosts'], menu_locators['menu.architectures'],
         )
 
+    @route('/hostgroups')
     def go_to_host_groups(self):
         self.menu_click(
             menu_locators['menu.configure'], menu_locators['menu.host_groups'],
         )
 
+    @route('/discovery_rules')
     def go_to_discovery_rules(self):
         self.menu_click(
             menu_locators['menu.configure'],
             menu_locators['menu.discovery_rules'],
         )
 
+    @route('/common_parameters')
     def go_to_global_parameters(self):
         self.menu_click(
             menu_locators['menu.configure'],
             menu_locators['menu.global_parameters'],
         )
 
+    @route('/environments')
     def go_to_environments(self):
         self.menu_click(
             menu_locators['menu.configure'],
             menu_locators['menu.environments'],
         )
 
+    @route('/puppetclasses')
     def go_to_puppet_classes(self):
         self.menu_click(
             menu_locators['menu.configure'],
@@ -224,73 +344,86 @@ class Navigator(Base):
             menu_locators['menu.smart_variables'],
         )
 
+    @route('/config_groups')
     def go_to_config_groups(self):
         self.menu_click(
             menu_locators['menu.configure'],
             menu_locators['menu.configure_groups']
         )
 
+    @route('/smart_proxies')
     def go_to_smart_proxies(self):
         self.menu_click(
             menu_locators['menu.infrastructure'],
             menu_locators['menu.smart_proxies'],
         )
 
+    @route('/compute_resources')
     def go_to_compute_resources(self):
         self.menu_click(
             menu_locators['menu.infrastructure'],
             menu_locators['menu.compute_resources'],
         )
 
+    @route('/compute_profiles')
     def go_to_compute_profiles(self):
         self.menu_click(
             menu_locators['menu.infrastructure'],
             menu_locators['menu.compute_profiles'],
         )
 
+    @route('/subnets')
     def go_to_subnets(self):
         self.menu_click(
             menu_locators['menu.infrastructure'],
             menu_locators['menu.subnets'],
         )
 
+    @route('/domains')
     def go_to_domains(self):
         self.menu_click(
             menu_locators['menu.infrastructure'],
             menu_locators['menu.domains'],
         )
 
+    @route('/auth_source_ldaps')
     def go_to_ldap_auth(self):
         self.menu_click(
             menu_locators['menu.administer'], menu_locators['menu.ldap_auth'],
         )
 
+    @route('/users')
     def go_to_users(self):
         self.menu_click(
             menu_locators['menu.administer'], menu_locators['menu.users'],
         )
 
+    @route('/usergroups')
     def go_to_user_groups(self):
         self.menu_click(
             menu_locators['menu.administer'],
             menu_locators['menu.user_groups'],
         )
 
+    @route('/roles')
     def go_to_roles(self):
         self.menu_click(
             menu_locators['menu.administer'], menu_locators['menu.roles'],
         )
 
+    @route('/bookmarks')
     def go_to_bookmarks(self):
         self.menu_click(
             menu_locators['menu.administer'], menu_locators['menu.bookmarks'],
         )
 
+    @route('/settings')
     def go_to_settings(self):
         self.menu_click(
             menu_locators['menu.administer'], menu_locators['menu.settings'],
         )
 
+    @route('/about')
     def go_to_about(self):
         self.menu_click(
             menu_locators['menu.administer'], menu_locators['menu.about'],
@@ -306,11 +439,13 @@ class Navigator(Base):
             menu_locators['menu.account'], menu_locators['menu.my_account'],
         )
 
+    @route('/organizations')
     def go_to_org(self):
         self.menu_click(
             menu_locators['menu.any_context'], menu_locators['org.manage_org'],
         )
 
+    @route('/locations')
     def go_to_loc(self):
         self.menu_click(
             menu_locators['menu.any_context'], menu_locators['loc.manage_loc'],
@@ -321,6 +456,7 @@ class Navigator(Base):
             menu_locators['menu.account'], menu_locators['menu.sign_out'],
         )
 
+    @route('/redhat_access/insights')
     def go_to_insights_overview(self):
         """Navigates to Red Hat Access Insights Overview"""
         self.menu_click(
@@ -328,6 +464,7 @@ class Navigator(Base):
             menu_locators['insights.overview']
         )
 
+    @route('/redhat_access/insights/rules/')
     def go_to_insights_rules(self):
         """Navigates to Red Hat Access Insights Rules"""
         self.menu_click(
@@ -335,6 +472,7 @@ class Navigator(Base):
             menu_locators['insights.rules'],
         )
 
+    @route('/redhat_access/insights/systems/')
     def go_to_insights_systems(self):
         """ Navigates to Red Hat Access Insights Systems"""
         self.menu_click(
@@ -342,6 +480,7 @@ class Navigator(Base):
             menu_locators['insights.systems'],
         )
 
+    @route('/redhat_access/insights/manage')
     def go_to_insights_manage(self):
         """ Navigates to Red Hat Access Insights Manage Systems"""
         self.menu_click(
@@ -349,6 +488,7 @@ class Navigator(Base):
             menu_locators['insights.manage'],
         )
 
+    @route('/compliance/policies')
     def go_to_oscap_policy(self):
         """ Navigates to Oscap Policy"""
         self.menu_click(
@@ -356,6 +496,7 @@ class Navigator(Base):
             menu_locators['menu.oscap_policy'],
         )
 
+    @route('/compliance/scap_contents')
     def go_to_oscap_content(self):
         """Navigates to Oscap Content"""
         self.menu_click(
@@ -363,6 +504,7 @@ class Navigator(Base):
             menu_locators['menu.oscap_content'],
         )
 
+    @route('/compliance/arf_reports')
     def go_to_oscap_reports(self):
         """Navigates to Oscap Reports"""
         self.menu_click(
@@ -378,11 +520,12 @@ class Navigator(Base):
         :rtype: str
 
         """
-        strategy, value = menu_locators['org.select_org']
+        # Unknown until the organization is shown as selected
+        self.context['org'] = None
         self.menu_click(
             menu_locators['menu.any_context'],
             menu_locators['org.nav_current_org'],
-            (strategy, value % org),
+            menu_locators.format('org.select_org', org),
         )
         self.perform_action_chain_move(menu_locators['menu.current_text'])
         if self.wait_until_element(
@@ -390,6 +533,7 @@ class Navigator(Base):
             raise UIError(
                 u'Could not select the organization: {0}'.format(org)
             )
+        self.context['org'] = org
         self.wait_for_ajax()
         return org
 
@@ -401,11 +545,12 @@ class Navigator(Base):
         :rtype: str
 
         """
-        strategy, value = menu_locators['loc.select_loc']
+        # Unknown until the location is shown as selected
+        self.context['loc'] = None
         self.menu_click(
             menu_locators['menu.any_context'],
             menu_locators['loc.nav_current_loc'],
-            (strategy, value % loc),
+            menu_locators.format('loc.select_loc', loc),
         )
         self.perform_action_chain_move(menu_locators['menu.current_text'])
         if self.wait_until_element(
@@ -413,5 +558,6 @@ class Navigator(Base):
             raise UIError(
                 u'Could not select the location: {0}'.format(loc)
             )
+        self.context['loc'] = loc
         self.wait_for_ajax()
         return loc
@@ -4,7 +4,7 @@
 from robottelo.constants import FILTER
 from robottelo.ui.base import Base, UINoSuchElementError
 from robottelo.ui.locators import locators, common_locators, tab_locators
-from robottelo.ui.navigator import Navigator
+from robottelo.ui.navigator import Navigator, forget_context
 from selenium.webdriver.support.select import Select
 
 
@@ -79,6 +79,7 @@ class Org(Base):
                medias=None, templates=None, domains=None, envs=None,
                hostgroups=None, locations=None, select=True):
         """Create Organization in UI."""
+        forget_context(self.browser)
         self.click(locators['org.new'])
         if parent_org:
             type_element = self.wait_until_element(locators['org.parent'])
@@ -115,6 +116,7 @@ class Org(Base):
                new_domains=None, new_envs=None, new_hostgroups=None,
                select=False, new_desc=None):
         """Update Organization in UI."""
+        forget_context(self.browser)
         org_object = self.search(org_name)
         self.wait_for_ajax()
         if org_object is None:
@@ -153,6 +155,7 @@ class Org(Base):
 
     def remove(self, org_name, really=True):
         """Remove Organization in UI."""
+        forget_context(self.browser)
         Navigator(self.browser).go_to_org()
         self.delete_entity(
             org_name,
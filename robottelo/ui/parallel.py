@@ -0,0 +1,172 @@
+# -*- encoding: utf-8 -*-
+"""Run UI tests in parallel worker processes
+
+UI tests can be spread over several processes, by ``nosetests --processes``
+together with the ``--with-ui-workers`` plugin of
+:mod:`robottelo.ui.plugin`, or by ``py.test -n`` of pytest-xdist. Each worker
+process then gets:
+
+* its own virtual display, when ``main.virtual_display`` is set, started on
+  the first test case class the worker runs and stopped when it exits, see
+  :func:`get_worker_display`, as long as browsers are shared across the tests
+  of the worker;
+* its own screenshot directory under ``main.screenshots.base_path``, see
+  :func:`worker_screenshots_dir`;
+* its own browser pool, browsers being shared by all the tests the worker
+  runs unless ``main.browser_reuse`` is set, see
+  :mod:`robottelo.ui.browser`.
+
+Browsers are started on the worker display, or on the Selenium Grid of
+``main.grid_url`` when it is set.
+
+"""
+import logging
+import os
+import signal
+
+from multiprocessing.util import Finalize
+
+LOGGER = logging.getLogger(__name__)
+
+#: The environment variable holding the number of nose worker processes
+WORKERS_ENV = 'ROBOTTELO_UI_WORKERS'
+
+#: Virtual displays created by :func:`get_worker_display`, by process id
+_WORKER_DISPLAYS = {}
+
+
+def at_exit(func, *args, **kwargs):
+    """Call ``func`` when the current process exits
+
+    Unlike ``atexit``, it is also called when worker processes started by
+    ``multiprocessing``, like those of ``nosetests --processes``, exit.
+
+    :param int priority: Functions with a higher priority are called first.
+        Functions with the same priority are called in the reverse order they
+        were registered in.
+
+    """
+    Finalize(None, func, args, exitpriority=kwargs.get('priority', 10))
+
+
+def is_parallel():
+    """Check if the current process is one of several UI test workers"""
+    if os.environ.get('PYTEST_XDIST_WORKER'):
+        return True
+    return int(os.environ.get(WORKERS_ENV) or 0) > 1
+
+
+def worker_id():
+    """Return a name unique to the current worker process"""
+    return (
+        os.environ.get('PYTEST_XDIST_WORKER') or
+        'worker-{0}'.format(os.getpid())
+    )
+
+
+def worker_screenshots_dir(base_path):
+    """Return the screenshot directory of the current worker process
+
+    Each worker of a parallel run gets a subdirectory of ``base_path``.
+
+    """
+    if not base_path or not is_parallel():
+        return base_path
+    return os.path.join(base_path, worker_id())
+
+
+class VirtualDisplay(object):
+    """A virtual display, with an optional window manager running on it
+
+    Requires ``pyvirtualdisplay`` and ``easyprocess`` from the optional
+    requirements.
+
+    :param str window_manager_command: The command starting the window manager
+        once the display is started. No window manager is started if empty.
+    :param tuple size: The width and height of the display
+
+    """
+
+    def __init__(self, window_manager_command=None, size=(1920, 1080)):
+        self.window_manager_command = window_manager_command
+        self.size = size
+        self.display = None
+        self.window_manager = None
+
+    def start(self):
+        """Start the display and the window manager"""
+        # Import from optional requirements
+        from pyvirtualdisplay import Display
+        from easyprocess import EasyProcess, EasyProcessError
+        self.display = Display(size=self.size)
+        self.display.start()
+        LOGGER.debug(
+            'Virtual display started (pid=%d, display="%s")',
+            self.display.pid,
+            self.display.display
+        )
+        if not self.window_manager_command:
+            return
+        try:
+            self.window_manager = EasyProcess(self.window_manager_command)
+            self.window_manager.start()
+            LOGGER.debug(
+                'Window manager started (pid=%d, cmd="%s")',
+                self.window_manager.pid,
+                self.window_manager.cmd_as_string
+            )
+        except EasyProcessError as err:
+            self.window_manager = None
+            LOGGER.warning(
+                'Window manager could not be started. '
+                'Command: "%s". Error: %s',
+                self.window_manager_command,
+                err
+            )
+
+    def stop(self):
+        """Stop the window manager and the display"""
+        if self.window_manager is not None and self.window_manager.is_started:
+            LOGGER.debug(
+                'Killing window manager (pid=%d, cmd="%s")',
+                self.window_manager.pid,
+                self.window_manager.cmd_as_string
+            )
+            os.kill(self.window_manager.pid, signal.SIGKILL)
+            _, return_code = os.waitpid(self.window_manager.pid, 0)
+            LOGGER.debug(
+                'Window manager killed (pid=%d, cmd="%s", rcode=%d)',
+                self.window_manager.pid,
+                self.window_manager.cmd_as_string,
+                return_code
+            )
+            self.window_manager = None
+        if self.display is not None:
+            LOGGER.debug(
+                'Stopping virtual display (pid=%d, display="%s")',
+                self.display.pid,
+                self.display.display
+            )
+            self.display.stop()
+            LOGGER.debug(
+                'Virtual display stopped (pid=%d, display="%s")',
+                self.display.pid,
+                self.display.display
+            )
+            self.display = None
+
+
+def get_worker_display(window_manager_command=None):
+    """Return the virtual display of the current worker process
+
+    The display is started on the first call of each process and stopped
+    when the process exits, after the browsers of the process pool quit.
+
+    """
+    display = _WORKER_DISPLAYS.get(os.getpid())
+    if display is None:
+        display = _WORKER_DISPLAYS[os.getpid()] = VirtualDisplay(
+            window_manager_command)
+        display.start()
+        at_exit(display.stop, priority=0)
+    return display
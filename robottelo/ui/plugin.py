@@ -0,0 +1,41 @@
+# -*- encoding: utf-8 -*-
+"""Nose plugin running UI tests in parallel workers
+
+Tests are scheduled over worker processes by the multiprocess plugin of nose,
+the ``--with-ui-workers`` plugin telling the UI tests each of them runs in a
+worker, see :mod:`robottelo.ui.parallel`::
+
+    nosetests --with-ui-workers --processes=4 --process-timeout=1800 \\
+        tests/foreman/ui
+
+The plugin is registered with nose by the ``nose.plugins.0.10`` entry point
+of ``setup.py``. Test case classes are never split across workers, so each
+one logs in and shares its browsers once.
+
+"""
+import os
+
+from nose.plugins import Plugin
+from robottelo.ui.parallel import WORKERS_ENV
+
+
+class UIWorkers(Plugin):
+    """Isolate the UI tests of each worker process of a parallel run"""
+
+    name = 'ui-workers'
+
+    def configure(self, options, conf):
+        """Tell worker processes how many of them run in parallel"""
+        super(UIWorkers, self).configure(options, conf)
+        if not self.enabled or conf.worker:
+            return
+        try:
+            workers = int(getattr(options, 'multiprocess_workers', 0))
+        except (TypeError, ValueError):
+            workers = 0
+        if workers < 0:
+            # Nose runs a worker by CPU when given a negative number
+            import multiprocessing
+            workers = multiprocessing.cpu_count()
+        # Workers are forked from this process, inheriting its environment
+        os.environ[WORKERS_ENV] = str(workers)
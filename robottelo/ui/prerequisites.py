@@ -0,0 +1,234 @@
+# -*- encoding: utf-8 -*-
+"""Create the prerequisites of UI tests through the API
+
+Most UI tests create a few entities, like an organization, a product and its
+repositories, before reaching the page they test. Creating them on the UI
+takes a page load, a form and a few AJAX waits each, one after the other.
+When ``main.ui_api_prerequisites`` is set on the configuration file, the
+factories of :mod:`robottelo.ui.factory` called with ``prerequisite=True``
+create their entity through the API with the functions of this module and
+select its organization and location on the browser, so only the step under
+test goes through the UI::
+
+    make_product(session, org=org_name, name=product_name, prerequisite=True)
+
+Independent entities can also be created at once, in parallel, by
+:func:`create_entities`::
+
+    org, loc = create_entities([
+        entities.Organization(name=org_name),
+        entities.Location(name=loc_name),
+    ])
+
+The API functions take the arguments of the matching UI factory and raise
+``ValueError`` for any argument they can not honour, so a prerequisite is
+never silently created differently than on the UI.
+
+"""
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+from nailgun import entities
+from robottelo.config import conf
+
+LOGGER = logging.getLogger(__name__)
+
+#: The number of entities :func:`create_entities` creates at the same time by
+#: default, unless ``main.ui_prerequisite_workers`` is set
+DEFAULT_WORKERS = 8
+
+
+def use_api(prerequisite):
+    """Check if a prerequisite entity should be created through the API
+
+    :param bool prerequisite: Whether the entity is only a prerequisite of
+        the test, as opposed to the entity under test.
+
+    """
+    return bool(prerequisite) and conf.properties.get(
+        'main.ui_api_prerequisites', '0') == '1'
+
+
+def create_entities(unsaved, max_workers=None):
+    """Create nailgun entities in parallel
+
+    :param list unsaved: Nailgun entities which are not created yet. They must
+        not depend on each other.
+    :param int max_workers: The number of entities created at the same time,
+        ``main.ui_prerequisite_workers`` or :data:`DEFAULT_WORKERS` if
+        ``None``.
+    :return: The created entities, in the order of ``unsaved``.
+    :raise: The first error raised when creating an entity.
+
+    """
+    if not unsaved:
+        return []
+    if max_workers is None:
+        max_workers = int(conf.properties.get(
+            'main.ui_prerequisite_workers', DEFAULT_WORKERS))
+    max_workers = max(1, min(max_workers, len(unsaved)))
+    LOGGER.debug('Creating %d entities with %d workers',
+                 len(unsaved), max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda entity: entity.create(), unsaved))
+
+
+def _reject(kind, unsupported):
+    """Raise ``ValueError`` if UI arguments can not be honoured by the API"""
+    given = sorted(key for key, value in unsupported.items() if value)
+    if given:
+        raise ValueError(
+            'Can not create {0} through the API with: {1}'.format(
+                kind, ', '.join(given))
+        )
+
+
+def _values(**values):
+    """Return the ``values`` which are not ``None``"""
+    return dict(
+        (key, value) for key, value in values.items() if value is not None)
+
+
+def find_entity(entity):
+    """Return the created entity named like ``entity``
+
+    The name is searched for with a ``search`` query, as some index
+    endpoints, like the organizations and locations ones, ignore a ``name``
+    parameter and list every entity. Only an entity with the exact name is
+    returned.
+
+    :param entity: An unsaved nailgun entity holding the values to search by,
+        like ``entities.Product(name=name, organization=org)``.
+    :raise: ``ValueError`` if no entity matches.
+
+    """
+    results = entity.search(
+        query={'search': u'name="{0}"'.format(entity.name)})
+    for result in results:
+        if result.name == entity.name:
+            return result
+    raise ValueError('Unable to find the {0} "{1}"'.format(
+        type(entity).__name__, entity.name))
+
+
+def find_organization(name):
+    """Return the organization named ``name``
+
+    :raise: ``ValueError`` if ``name`` is empty or no organization matches.
+
+    """
+    if not name:
+        raise ValueError('An organization is required')
+    return find_entity(entities.Organization(name=name))
+
+
+def create_organization(org_name=None, label=None, desc=None, select=True,
+                        **unsupported):
+    """Create an organization with the arguments of
+    :func:`robottelo.ui.factory.make_org`
+
+    ``select`` is ignored, the organization context being set by the UI
+    factories called next.
+
+    """
+    _reject('an organization', unsupported)
+    return entities.Organization(**_values(
+        name=org_name, label=label, description=desc)).create()
+
+
+def create_location(name=None, parent=None, select=True, **unsupported):
+    """Create a location with the arguments of
+    :func:`robottelo.ui.factory.make_loc`"""
+    _reject('a location', unsupported)
+    if parent:
+        parent = find_entity(entities.Location(name=parent))
+    return entities.Location(**_values(
+        name=name, parent=parent)).create()
+
+
+def create_lifecycle_environment(org, name=None, description=None,
+                                 prior=None):
+    """Create a lifecycle environment with the arguments of
+    :func:`robottelo.ui.factory.make_lifecycle_environment`
+
+    The environment follows Library unless ``prior`` is given.
+
+    """
+    org = find_organization(org)
+    if prior:
+        prior = find_entity(entities.LifecycleEnvironment(
+            name=prior, organization=org))
+    return entities.LifecycleEnvironment(**_values(
+        organization=org, name=name, description=description, prior=prior
+    )).create()
+
+
+def create_product(org, name=None, description=None, gpg_key=None,
+                   **unsupported):
+    """Create a product with the arguments of
+    :func:`robottelo.ui.factory.make_product`
+
+    Sync plans are not supported.
+
+    """
+    _reject('a product', unsupported)
+    org = find_organization(org)
+    if gpg_key:
+        gpg_key = find_entity(entities.GPGKey(name=gpg_key, organization=org))
+    return entities.Product(**_values(
+        organization=org, name=name, description=description, gpg_key=gpg_key
+    )).create()
+
+
+def create_repository(org, name=None, product=None, gpg_key=None,
+                      http=False, url=None, repo_type=None,
+                      repo_checksum=None, upstream_repo_name=None):
+    """Create a repository with the arguments of
+    :func:`robottelo.ui.factory.make_repository`"""
+    org = find_organization(org)
+    product = find_entity(entities.Product(name=product, organization=org))
+    if gpg_key:
+        gpg_key = find_entity(entities.GPGKey(name=gpg_key, organization=org))
+    if repo_checksum == 'Default':
+        # The UI default, leaving the checksum type unset
+        repo_checksum = None
+    return entities.Repository(**_values(
+        product=product,
+        name=name,
+        url=url,
+        content_type=repo_type,
+        checksum_type=repo_checksum,
+        docker_upstream_name=upstream_repo_name,
+        gpg_key=gpg_key,
+        unprotected=http or None,
+    )).create()
+
+
+def create_contentview(org, name=None, label=None, description=None,
+                       is_composite=False):
+    """Create a content view with the arguments of
+    :func:`robottelo.ui.factory.make_contentview`"""
+    org = find_organization(org)
+    return entities.ContentView(**_values(
+        organization=org,
+        name=name,
+        label=label,
+        description=description,
+        composite=is_composite or None,
+    )).create()
+
+
+def create_gpgkey(org, name=None, upload_key=False, key_path=None,
+                  key_content=None):
+    """Create a GPG key with the arguments of
+    :func:`robottelo.ui.factory.make_gpgkey`
+
+    The content of the key is read from ``key_path`` when uploaded.
+
+    """
+    org = find_organization(org)
+    if upload_key and key_path:
+        with open(key_path) as handler:
+            key_content = handler.read()
+    return entities.GPGKey(**_values(
+        organization=org, name=name, content=key_content)).create()
@@ -0,0 +1,135 @@
+# -*- encoding: utf-8 -*-
+"""Probe the state of a page in a single WebDriver round trip
+
+Waiting for a page used to take one round trip to find an element, one to
+check whether it is displayed, and two more to check jQuery and Angular for
+pending requests, repeated on every poll. :func:`probe` runs a single script
+returning all of it: pending jQuery and Angular requests, the document ready
+state and, given a locator, the element with whether it is displayed and
+enabled.
+
+When ``track`` is set, the script also installs a hook on
+``XMLHttpRequest``, counting every request the page sends, including those not
+sent through jQuery or Angular. The count survives until the page is
+unloaded.
+
+"""
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+#: Locator strategies the probe can find elements with
+PROBE_STRATEGIES = (By.ID, By.NAME, By.XPATH, By.CSS_SELECTOR)
+
+PROBE_SCRIPT = '''
+var strategy = arguments[0], value = arguments[1], track = arguments[2];
+var state = {ready: document.readyState, jquery: 0, angular: 0,
+             tracked: 0, found: false, element: null, displayed: false,
+             enabled: false};
+if (track && window.__robotteloPending === undefined) {
+    window.__robotteloPending = 0;
+    var open = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function () {
+        this.addEventListener('loadend', function () {
+            window.__robotteloPending = Math.max(
+                0, window.__robotteloPending - 1);
+        });
+        return open.apply(this, arguments);
+    };
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__robotteloPending += 1;
+        return send.apply(this, arguments);
+    };
+}
+if (window.__robotteloPending !== undefined) {
+    state.tracked = window.__robotteloPending;
+}
+try { state.jquery = window.jQuery ? jQuery.active : 0; } catch (err) {}
+try {
+    state.angular = window.angular ? angular.element(document).injector()
+        .get('$http').pendingRequests.length : 0;
+} catch (err) {}
+if (strategy) {
+    var element = null;
+    try {
+        if (strategy === 'xpath') {
+            element = document.evaluate(
+                value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE,
+                null
+            ).singleNodeValue;
+        } else if (strategy === 'id') {
+            element = document.getElementById(value);
+        } else if (strategy === 'name') {
+            element = document.getElementsByName(value)[0] || null;
+        } else {
+            element = document.querySelector(value);
+        }
+    } catch (err) {}
+    if (element) {
+        var style = window.getComputedStyle(element);
+        state.found = true;
+        state.element = element;
+        state.displayed = !!(
+            element.offsetWidth || element.offsetHeight ||
+            element.getClientRects().length
+        ) && style.visibility !== 'hidden' && style.opacity !== '0';
+        state.enabled = !element.disabled;
+    }
+}
+return state;
+'''
+
+
+class PageState(object):
+    """The state of a page returned by :func:`probe`
+
+    :ivar str ready: The ``document.readyState`` of the page
+    :ivar int pending: The number of pending requests
+    :ivar element: The element found by the locator, or ``None``
+    :ivar bool displayed: Whether the element is displayed
+    :ivar bool enabled: Whether the element is enabled
+
+    """
+
+    def __init__(self, state):
+        self.ready = state.get('ready')
+        self.pending = max(
+            state.get('jquery') or 0,
+            state.get('angular') or 0,
+            state.get('tracked') or 0,
+        )
+        self.element = state.get('element') if state.get('found') else None
+        self.displayed = bool(state.get('displayed'))
+        self.enabled = bool(state.get('enabled'))
+
+    @property
+    def idle(self):
+        """Whether the page is loaded and no request is pending"""
+        return self.ready == 'complete' and self.pending == 0
+
+
+def can_probe(locator):
+    """Check if :func:`probe` can find elements with ``locator``"""
+    return locator is None or locator[0] in PROBE_STRATEGIES
+
+
+def probe(browser, locator=None, track=False):
+    """Return the state of the current page in a single round trip
+
+    :param browser: The WebDriver browser
+    :param locator: The locator of an element to look for. Its strategy must
+        be one of :data:`PROBE_STRATEGIES`.
+    :param bool track: Whether to count all requests sent by the page
+    :return: A :class:`PageState`. If the script can not run, for example
+        while an alert is open, the page is reported idle without element, as
+        nothing can be waited for.
+
+    """
+    strategy, value = locator if locator is not None else (None, None)
+    try:
+        state = browser.execute_script(PROBE_SCRIPT, strategy, value, track)
+    except WebDriverException:
+        state = None
+    if not isinstance(state, dict):
+        state = {'ready': 'complete'}
+    return PageState(state)
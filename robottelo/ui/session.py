@@ -1,17 +1,26 @@
 # -*- encoding: utf-8 -*-
 
 from robottelo.config import conf
-from robottelo.ui.login import Login
+from robottelo.ui.login import Login, SESSION_COOKIE
 from robottelo.ui.navigator import Navigator
 
 
 class Session(object):
-    """A session context manager that manages login and logout"""
+    """A session context manager that manages login and logout
+
+    When ``main.fast_login`` is set to 1, users are logged in by handing a
+    cached session cookie over to the browser instead of filling the login
+    form, see :meth:`robottelo.ui.login.Login.cookie_login`. Leaving such a
+    session only removes the cookie from the browser, so the server session
+    can be used again by the next one.
+
+    """
 
     def __init__(self, browser, user=None, password=None):
         self.browser = browser
         self._login = Login(browser)
         self.nav = Navigator(browser)
+        self.fast_login = conf.properties.get('main.fast_login', '0') == '1'
 
         if user is None:
             self.user = conf.properties['foreman.admin.username']
@@ -29,11 +38,17 @@ class Session(object):
 
     def __exit__(self, exc_type, exc_value, traceback):
         if exc_type is None:
-            self.logout()
+            if self.fast_login:
+                self.browser.delete_cookie(SESSION_COOKIE)
+            else:
+                self.logout()
 
     def login(self):
         """Utility funtion to call Login instance login method"""
-        self._login.login(self.user, self.password)
+        if self.fast_login:
+            self._login.cookie_login(self.user, self.password)
+        else:
+            self._login.login(self.user, self.password)
 
     def logout(self):
         """Utility function to call Login instance logout method"""
@@ -2,8 +2,6 @@
 Implements Synchronization for the Repos in the UI
 """
 
-import time
-
 from collections import defaultdict
 from functools import partial
 from robottelo.constants import PRDS, REPOSET
@@ -34,22 +32,13 @@ class Sync(Base):
         if product:
             self.click((strategy3, value3 % product))
         for repo in repos:
-            timeout = time.time() + 60 * 10
-            sync_cancel = self.wait_until_element(
-                (strategy2, value2 % repo),
-                timeout=6,
-                poll_frequency=2,
-            )
-            # Waits until sync 'cancel' is visible on the UI or times out
+            sync_cancel = (strategy2, value2 % repo)
+            # Waits while sync 'cancel' is visible on the UI or times out
             # after 10 mins
-            while sync_cancel:
-                if time.time() > timeout:
-                    break
-                sync_cancel = self.wait_until_element(
-                    (strategy2, value2 % repo),
-                    timeout=6,
-                    poll_frequency=2,
-                )
+            if self.wait_until_element(
+                    sync_cancel, timeout=6, poll_frequency=2):
+                self.wait_until_element_is_not_visible(
+                    sync_cancel, timeout=60 * 10, poll_frequency=2)
             result = self.wait_until_element(
                 (strategy1, value1 % repo), 5).text
             # Updates the result of every sync repo to the repos_result list.
@@ -150,22 +139,13 @@ class Sync(Base):
                 elif rs_cb:
                     rs_cb.click()
                     # Selecting a rs checkbox takes time and spinner is visible
-                    # the below code loops for over 2 mins till the spinner is
-                    # visible.
-                    rs_spinner = self.wait_until_element(
-                        (strategy4, value4 % REPOSET[reposet]),
-                        timeout=6,
-                        poll_frequency=2,
-                    )
-                    timeout = time.time() + 60 * 2
-                    while rs_spinner:
-                        if time.time() > timeout:
-                            break
-                        rs_spinner = self.wait_until_element(
-                            (strategy4, value4 % REPOSET[reposet]),
-                            timeout=6,
-                            poll_frequency=2,
-                        )
+                    # the below code waits for up to 2 mins while the spinner
+                    # is visible.
+                    rs_spinner = (strategy4, value4 % REPOSET[reposet])
+                    if self.wait_until_element(
+                            rs_spinner, timeout=6, poll_frequency=2):
+                        self.wait_until_element_is_not_visible(
+                            rs_spinner, timeout=60 * 2, poll_frequency=2)
                 for repo in repos_tree[prd][reposet]:
                     repo_values = repos_tree[prd][reposet][repo]
                     repo_name = repo_values['repo_name']
@@ -173,20 +153,11 @@ class Sync(Base):
                     self.click(
                         (strategy3, value3 % repo_name), waiter_timeout=120)
                     # Similar to above reposet checkbox spinner
-                    repo_spinner = self.wait_until_element(
-                        (strategy5, value5 % repo_name),
-                        timeout=6,
-                        poll_frequency=2,
-                    )
-                    timeout = time.time() + 60
-                    while repo_spinner:
-                        if time.time() > timeout:
-                            break
-                        repo_spinner = self.wait_until_element(
-                            (strategy5, value5 % repo_name),
-                            timeout=6,
-                            poll_frequency=2,
-                        )
+                    repo_spinner = (strategy5, value5 % repo_name)
+                    if self.wait_until_element(
+                            repo_spinner, timeout=6, poll_frequency=2):
+                        self.wait_until_element_is_not_visible(
+                            repo_spinner, timeout=60, poll_frequency=2)
 
     def sync_noversion_rh_repos(self, prd, repos):
         """Syncs RedHat repositories which do not have version.
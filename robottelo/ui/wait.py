@@ -0,0 +1,157 @@
+# -*- encoding: utf-8 -*-
+"""Wait for pages with adaptive polling intervals
+
+Polling a page every half second makes each wait last at least half a second
+more than needed when the page is not ready on the first check, while polling
+as fast as possible floods the browser for waits lasting minutes.
+:class:`AdaptiveWait` starts polling every :data:`INITIAL_INTERVAL` seconds
+and doubles the interval after each poll up to a ceiling, so short waits end
+soon after the page is ready and long waits poll at the ceiling.
+
+The time spent waiting for each locator is recorded by :data:`wait_times`,
+finding the slowest pages. It is written to ``main.ui_wait_times`` on the
+configuration file, if set, when the tests are done.
+
+"""
+import csv
+import logging
+import os
+import threading
+import time
+
+from robottelo.ui.parallel import at_exit
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    TimeoutException,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+#: The first polling interval of a wait, in seconds
+INITIAL_INTERVAL = 0.05
+
+#: The factor the polling interval grows by after each poll
+BACKOFF = 2
+
+
+class AdaptiveWait(object):
+    """A drop-in replacement of Selenium's ``WebDriverWait`` polling with
+    exponentially growing intervals
+
+    :param driver: The WebDriver browser passed to conditions
+    :param timeout: How long to wait for the condition, in seconds
+    :param ceiling: The longest polling interval, in seconds
+    :param initial: The first polling interval, in seconds
+    :param ignored_exceptions: Exceptions raised by conditions which are
+        handled as the condition being false. ``NoSuchElementException`` is
+        always ignored.
+
+    """
+
+    def __init__(self, driver, timeout, ceiling=0.5,
+                 initial=INITIAL_INTERVAL, ignored_exceptions=None):
+        self.driver = driver
+        self.timeout = timeout
+        self.ceiling = ceiling
+        self.initial = min(initial, ceiling)
+        self.ignored_exceptions = (NoSuchElementException,) + tuple(
+            ignored_exceptions or ())
+
+    def until(self, method, message=''):
+        """Call ``method`` with the driver until it returns a true value
+
+        :return: The value returned by ``method``
+        :raise: TimeoutException if ``method`` did not return a true value
+            after ``timeout`` seconds
+
+        """
+        end = time.time() + self.timeout
+        interval = self.initial
+        while True:
+            try:
+                value = method(self.driver)
+                if value:
+                    return value
+            except self.ignored_exceptions:
+                pass
+            remaining = end - time.time()
+            if remaining <= 0:
+                break
+            time.sleep(min(interval, remaining))
+            interval = min(interval * BACKOFF, self.ceiling)
+        raise TimeoutException(message)
+
+
+class WaitTimes(object):
+    """Record the time spent waiting for each locator"""
+
+    #: The columns written by :meth:`write`
+    FIELDS = ('locator', 'waits', 'timeouts', 'total', 'longest')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._times = {}
+
+    def record(self, locator, elapsed, timed_out=False):
+        """Add a wait of ``elapsed`` seconds for ``locator``"""
+        with self._lock:
+            waits, timeouts, total, longest = self._times.get(
+                locator, (0, 0, 0.0, 0.0))
+            self._times[locator] = (
+                waits + 1,
+                timeouts + int(timed_out),
+                total + elapsed,
+                max(longest, elapsed),
+            )
+        LOGGER.debug('Waited %.3f seconds for "%s"%s', elapsed, locator,
+                     ' (timed out)' if timed_out else '')
+
+    def slowest(self, count=None):
+        """Return the locators waited for the longest in total
+
+        :param int count: The number of locators to return, all of them if
+            ``None``
+        :return: A list of dicts with the keys of :data:`FIELDS`, sorted by
+            descending total wait time
+
+        """
+        with self._lock:
+            rows = [
+                dict(zip(self.FIELDS, (locator,) + times))
+                for locator, times in self._times.items()
+            ]
+        rows.sort(key=lambda row: row['total'], reverse=True)
+        return rows[:count] if count is not None else rows
+
+    def write(self, path):
+        """Write the wait times as CSV to ``path``, slowest locators first"""
+        with open(path, 'wb') as handler:
+            writer = csv.DictWriter(handler, self.FIELDS)
+            writer.writeheader()
+            for row in self.slowest():
+                writer.writerow(row)
+
+    def clear(self):
+        """Forget all recorded wait times"""
+        with self._lock:
+            self._times.clear()
+
+
+#: Wait times of the current process
+wait_times = WaitTimes()  # pylint:disable=invalid-name
+
+#: Process ids which already write the wait times on exit
+_REGISTERED = set()
+
+
+def write_wait_times_on_exit(path):
+    """Write the wait times of the current process to ``path`` when it exits
+
+    ``{pid}`` in ``path`` is replaced by the process id, so worker processes
+    running tests at the same time write distinct files.
+
+    """
+    if os.getpid() in _REGISTERED:
+        return
+    _REGISTERED.add(os.getpid())
+    at_exit(wait_times.write, path.format(pid=os.getpid()))
@@ -25,6 +25,9 @@ BASE_IMAGES = (
     'rhel71',
 )
 
+#: Prefix of the lines that delimit each step output on a bootstrap script.
+BOOTSTRAP_MARKER = 'ROBOTTELO-BOOTSTRAP'
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +35,34 @@ class VirtualMachineError(Exception):
     """Exception raised for failed virtual machine management operations"""
 
 
+class BootstrapStepResult(object):
+    """Structure that holds the result of a single :meth:`bootstrap` step.
+
+    ``start`` and ``end`` are the epoch timestamps taken on the virtual
+    machine right before and after running the step. ``return_code`` is
+    ``None`` if the step was not run because a previous step failed.
+
+    """
+
+    def __init__(self, name, stdout=None, return_code=None, start=None,
+                 end=None):
+        self.name = name
+        self.stdout = [] if stdout is None else stdout
+        self.return_code = return_code
+        self.start = start
+        self.end = end
+
+    @property
+    def elapsed(self):
+        """Time, in seconds, that the step took to run or ``None`` if the
+        step was not run.
+
+        """
+        if self.start is None or self.end is None:
+            return None
+        return self.end - self.start
+
+
 class VirtualMachine(object):
     """Manages a virtual machine to allow client provisioning for robottelo
 
@@ -200,7 +231,7 @@ class VirtualMachine(object):
         :return: None.
 
         """
-        self.run(u'subscription-manager repos --enable {0}'.format(repo))
+        self.run(self._get_step_commands('enable_repo', {'repo': repo})[0])
 
     def install_katello_agent(self):
         """Installs katello agent on the virtual machine.
@@ -210,8 +241,9 @@ class VirtualMachine(object):
             installed.
 
         """
-        self.run('yum install -y katello-agent')
-        result = self.run('rpm -q katello-agent')
+        install, verify = self._get_step_commands('install_katello_agent', {})
+        self.run(install)
+        result = self.run(verify)
         if result.return_code != 0:
             raise VirtualMachineError('Failed to install katello-agent')
 
@@ -223,16 +255,12 @@ class VirtualMachine(object):
             installed.
 
         """
-        result = self.run(
-            u'rpm -Uvh {0}'.format(get_server_cert_rpm_url())
-        )
+        install, verify = self._get_step_commands('install_katello_cert', {})
+        result = self.run(install)
         if result.return_code != 0:
             raise VirtualMachineError(
                 'Failed to download and install the katello-ca rpm')
-        result = self.run(
-            u'rpm -q katello-ca-consumer-{0}'
-            .format(conf.properties['main.server.hostname'])
-        )
+        result = self.run(verify)
         if result.return_code != 0:
             raise VirtualMachineError('Failed to find the katello-ca rpm')
 
@@ -246,14 +274,11 @@ class VirtualMachine(object):
             registration.
 
         """
-        cmd = (
-            u'subscription-manager register --activationkey {0} --org {1}'
-            .format(activation_key, org)
-        )
-        if releasever is not None:
-            cmd += u' --release {0}'.format(releasever)
-        cmd = cmd + u' --force'
-        result = self.run(cmd)
+        result = self.run(self._get_step_commands('register_contenthost', {
+            'activation_key': activation_key,
+            'org': org,
+            'releasever': releasever,
+        })[0])
         if result.return_code == 0:
             self._subscribed = True
         return result
@@ -286,6 +311,142 @@ class VirtualMachine(object):
 
         return ssh.command(cmd, hostname=self.ip_addr)
 
+    def _get_step_commands(self, name, options):
+        """Build the shell commands of a client setup step.
+
+        The commands are shared by the single step methods, like
+        :meth:`install_katello_cert`, and by :meth:`bootstrap`.
+
+        :param str name: The step name.
+        :param dict options: The step options.
+        :return: The commands that run and verify the step, in order.
+        :rtype: list
+        :raises robottelo.vm.VirtualMachineError: If the step is unknown or
+            a required option is missing.
+
+        """
+        try:
+            if name == 'install_katello_cert':
+                return [
+                    u'rpm -Uvh {0}'.format(get_server_cert_rpm_url()),
+                    u'rpm -q katello-ca-consumer-{0}'
+                    .format(conf.properties['main.server.hostname']),
+                ]
+            if name == 'register_contenthost':
+                cmd = (
+                    u'subscription-manager register --activationkey {0} '
+                    u'--org {1}'
+                    .format(options['activation_key'], options['org'])
+                )
+                if options.get('releasever') is not None:
+                    cmd += u' --release {0}'.format(options['releasever'])
+                return [cmd + u' --force']
+            if name == 'enable_repo':
+                return [
+                    u'subscription-manager repos --enable {0}'
+                    .format(options['repo'])
+                ]
+            if name == 'install_katello_agent':
+                return [
+                    u'yum install -y katello-agent',
+                    u'rpm -q katello-agent',
+                ]
+        except KeyError as err:
+            raise VirtualMachineError(
+                u'Missing option {0} for bootstrap step {1}'
+                .format(err, name)
+            )
+        raise VirtualMachineError(
+            u'{0} is not a supported bootstrap step'.format(name))
+
+    def _get_bootstrap_command(self, name, options):
+        """Build the shell command for a :meth:`bootstrap` step.
+
+        :param str name: The step name.
+        :param dict options: The step options.
+        :return: The command that runs and verifies the step.
+        :raises robottelo.vm.VirtualMachineError: If the step is unknown or
+            a required option is missing.
+
+        """
+        return u' && '.join(self._get_step_commands(name, options))
+
+    def bootstrap(self, steps):
+        """Runs a sequence of client setup steps as a single remote script.
+
+        Each step is the name of one of the supported steps or a ``(name,
+        options)`` tuple. The supported steps and their options are:
+
+        * ``install_katello_cert``
+        * ``register_contenthost``: ``activation_key``, ``org`` and
+          optionally ``releasever``
+        * ``enable_repo``: ``repo``
+        * ``install_katello_agent``
+
+        All steps are run over one ssh session and the script stops on the
+        first failing step. For example::
+
+            results = vm.bootstrap(steps=[
+                'install_katello_cert',
+                ('register_contenthost', {
+                    'activation_key': ak_name,
+                    'org': org_label,
+                }),
+                ('enable_repo', {'repo': REPOS['rhst7']['id']}),
+                'install_katello_agent',
+            ])
+
+        :param list steps: The steps to run, in order.
+        :return: A list of :class:`BootstrapStepResult`, one per step.
+        :raises robottelo.vm.VirtualMachineError: If the virtual machine is not
+            created or an unknown step is requested.
+
+        """
+        results = []
+        script = []
+        for step in steps:
+            if isinstance(step, basestring):
+                name, options = step, {}
+            else:
+                name, options = step
+            script.append(
+                u'echo "{marker} start {name} $(date +%s.%N)"; '
+                u'({command}) 2>&1; rc=$?; '
+                u'echo "{marker} end {name} $rc $(date +%s.%N)"; '
+                u'[ $rc -eq 0 ] || exit $rc'
+                .format(
+                    marker=BOOTSTRAP_MARKER,
+                    name=name,
+                    command=self._get_bootstrap_command(name, options),
+                )
+            )
+            results.append(BootstrapStepResult(name))
+
+        start = time.time()
+        result = self.run(u'; '.join(script))
+        logger.debug(
+            'Bootstrap of %s took %.3fs', self.hostname, time.time() - start)
+
+        current = None
+        pending = iter(results)
+        for line in result.stdout or []:
+            if not line.startswith(BOOTSTRAP_MARKER):
+                if current is not None:
+                    current.stdout.append(line)
+                continue
+            fields = line.split()
+            if fields[1] == 'start':
+                current = next(pending)
+                current.start = float(fields[3])
+            else:
+                current.return_code = int(fields[3])
+                current.end = float(fields[4])
+                if (current.name == 'register_contenthost' and
+                        current.return_code == 0):
+                    self._subscribed = True
+                current = None
+        return results
+
     def get(self, remote_path, local_path=None):
         """Get a remote file from the virtual machine."""
         if not self._created:
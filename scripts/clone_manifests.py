@@ -0,0 +1,55 @@
+#!/usr/bin/env python2
+"""Generate a set of unique cloned manifests.
+
+Clone the manifest template configured on ``main.manifest.fake_url`` (or the
+one passed with ``--template``) as many times as requested, using a pool of
+processes, and write the cloned manifests to a directory. Once done, print
+how long it took and the cloning and signing throughput::
+
+    scripts/clone_manifests.py -n 500 -w 8 -o /tmp/manifests
+
+"""
+from __future__ import print_function
+import argparse
+import os
+import time
+from robottelo import manifests
+
+
+def main():
+    """Parse the command line arguments and clone the manifests."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '-n', '--number', type=int, default=100,
+        help='number of manifests to clone (default: %(default)s)')
+    parser.add_argument(
+        '-w', '--workers', type=int, default=None,
+        help='number of worker processes (default: number of CPUs)')
+    parser.add_argument(
+        '-o', '--output', default='.',
+        help='directory to write the manifests to (default: %(default)s)')
+    parser.add_argument(
+        '--key', default=None,
+        help='path of the signing key (default: main.manifest.key_url)')
+    parser.add_argument(
+        '--template', default=None,
+        help='path of the manifest template (default: main.manifest.fake_url)')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.output):
+        os.makedirs(args.output)
+    start = time.time()
+    paths = manifests.clone_many(
+        args.number,
+        workers=args.workers,
+        directory=args.output,
+        key_path=args.key,
+        old_path=args.template,
+    )
+    elapsed = time.time() - start
+    print('Cloned {0} manifests into {1} in {2:.2f}s ({3:.1f} manifests/s)'
+          .format(len(paths), args.output, elapsed, len(paths) / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python2
+"""Compare the performance results of two runs.
+
+Each run is either a raw csv file written by the performance tests or, when
+``--db`` is given, the id of a run recorded on that results store. For each
+operation and number of concurrent threads, print the p50, p90 and p99
+latencies and the throughput of both runs and flag regressions::
+
+    scripts/compare_performance.py perf-raw-ak-6.0.csv perf-raw-ak-6.1.csv
+    scripts/compare_performance.py --db perf-results.db 1a2b3c 4d5e6f
+
+Exit with status 1 if any regression is found.
+
+"""
+from __future__ import print_function
+import argparse
+import sys
+from robottelo.performance import compare
+
+
+def main():
+    """Parse the command line arguments and compare both runs."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('baseline', help='baseline raw csv file or run id')
+    parser.add_argument('current', help='current raw csv file or run id')
+    parser.add_argument(
+        '--db', default=None,
+        help='results store database to load the runs from')
+    parser.add_argument(
+        '-t', '--threshold', type=float, default=None,
+        help='change, in percent, from which a worse metric is a regression '
+             '(default: performance.compare.threshold or 10)')
+    parser.add_argument(
+        '-a', '--alpha', type=float, default=None,
+        help='significance level of regressions '
+             '(default: performance.compare.alpha or 0.05)')
+    args = parser.parse_args()
+
+    if args.db is None:
+        baseline = compare.load_raw_csv(args.baseline)
+        current = compare.load_raw_csv(args.current)
+    else:
+        baseline = compare.load_store(args.baseline, args.db)
+        current = compare.load_store(args.current, args.db)
+    deltas = compare.compare(baseline, current, args.threshold, args.alpha)
+
+    print('{0:<20} {1:<10} {2:>12} {3:>12} {4:>9} {5:>8}'.format(
+        'test case', 'metric', 'baseline', 'current', 'change', 'p-value'))
+    for delta in deltas:
+        print('{0:<20} {1:<10} {2:>12.4f} {3:>12.4f} {4:>8.1f}% {5:>8.4f}'
+              '{6}'.format(
+                  '{0}-{1}-clients'.format(delta.operation, delta.num_threads),
+                  delta.metric,
+                  delta.baseline,
+                  delta.current,
+                  delta.change,
+                  delta.p_value,
+                  '  REGRESSION' if delta.regression else '',
+              ))
+    regressions = [delta for delta in deltas if delta.regression]
+    print('{0} regression(s) found'.format(len(regressions)))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
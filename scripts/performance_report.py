@@ -0,0 +1,60 @@
+#!/usr/bin/env python2
+"""Generate the HTML performance report of a run.
+
+The run is read from the results store, so nothing is re-run. When a baseline
+run is given, its results are charted next to the ones of the run and
+regressions are flagged::
+
+    scripts/performance_report.py 4d5e6f
+    scripts/performance_report.py --db perf-results.db -b 1a2b3c 4d5e6f
+
+"""
+from __future__ import print_function
+import argparse
+import sys
+from robottelo.performance import report
+
+
+def main():
+    """Parse the command line arguments and write the report."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('run_id', help='id of the run to report')
+    parser.add_argument(
+        '-b', '--baseline', default=None,
+        help='id of a run to compare against')
+    parser.add_argument(
+        '--db', default=None,
+        help='results store database to load the runs from '
+             '(default: performance.results.db or perf-results.db)')
+    parser.add_argument(
+        '-o', '--output', default=None,
+        help='path of the HTML report (default: perf-report-RUN_ID.html)')
+    parser.add_argument(
+        '-t', '--threshold', type=float, default=None,
+        help='change, in percent, from which a worse metric is a regression '
+             '(default: performance.compare.threshold or 10)')
+    parser.add_argument(
+        '-a', '--alpha', type=float, default=None,
+        help='significance level of regressions '
+             '(default: performance.compare.alpha or 0.05)')
+    args = parser.parse_args()
+
+    output = args.output or 'perf-report-{0}.html'.format(args.run_id)
+    try:
+        report.write_report(
+            output,
+            args.run_id,
+            args.baseline,
+            path=args.db,
+            threshold=args.threshold,
+            alpha=args.alpha,
+        )
+    except ValueError as err:
+        print(err, file=sys.stderr)
+        return 1
+    print('Report written to {0}'.format(output))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
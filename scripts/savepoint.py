@@ -0,0 +1,68 @@
+#!/usr/bin/env python2
+"""Create, list, verify and restore database savepoints of the server.
+
+Savepoints are used by the performance tests to reset the databases between
+test cases and iterations::
+
+    scripts/savepoint.py create savepoint2_enabled_repos
+    scripts/savepoint.py list
+    scripts/savepoint.py verify savepoint2_enabled_repos
+    scripts/savepoint.py restore savepoint2_enabled_repos
+
+"""
+from __future__ import print_function
+import argparse
+import datetime
+import sys
+from robottelo.performance.savepoint import SavepointError, SavepointManager
+
+
+def main():
+    """Parse the command line arguments and run the action."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        'action', choices=('create', 'list', 'verify', 'restore'))
+    parser.add_argument('name', nargs='?', help='name of the savepoint')
+    parser.add_argument(
+        '-f', '--force', action='store_true',
+        help='overwrite an existing savepoint when creating it, restore even '
+             'if the databases already match the savepoint')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help='parallel jobs of each pg_restore '
+             '(default: performance.savepoint.jobs or 4)')
+    args = parser.parse_args()
+    if args.action != 'list' and args.name is None:
+        parser.error('a savepoint name is required to {0}'.format(args.action))
+
+    manager = SavepointManager(jobs=args.jobs)
+    try:
+        if args.action == 'list':
+            for savepoint in manager.list():
+                print('{0}  {1}'.format(
+                    datetime.datetime.utcfromtimestamp(
+                        savepoint['created']).strftime('%Y-%m-%d %H:%M:%S'),
+                    savepoint['name']))
+        elif args.action == 'verify':
+            if not manager.verify(args.name):
+                print('Savepoint {0} is corrupted'.format(args.name))
+                return 1
+            print('Savepoint {0} is intact'.format(args.name))
+        elif args.action == 'create':
+            timings = manager.create(args.name, overwrite=args.force)
+            for step, value in sorted(timings.items()):
+                print('{0:<30} {1:>10.2f}s'.format(step, value))
+        else:
+            report = manager.restore(args.name, force=args.force)
+            for step, value in sorted(report.timings.items()):
+                print('{0:<30} {1:>10.2f}s'.format(step, value))
+            print('{0} in {1:.2f}s'.format(
+                'Skipped' if report.skipped else 'Restored', report.total))
+    except SavepointError as err:
+        print(err, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
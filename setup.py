@@ -19,6 +19,7 @@ setup(
         'SeleniumFactory',
         'ddt',
         'fauxfactory',
+        'futures',
         'inflector',
         'nailgun',
         'numpy',
@@ -29,6 +30,11 @@ setup(
         'selenium',
         'unittest2',
     ],
+    entry_points={
+        'nose.plugins.0.10': [
+            'ui-workers = robottelo.ui.plugin:UIWorkers',
+        ],
+    },
     license='GNU GPL v3.0',
     # See https://pypi.python.org/pypi?%3Aaction=list_classifiers
     classifiers=(
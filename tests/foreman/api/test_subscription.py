@@ -23,7 +23,8 @@ class SubscriptionsTestCase(APITestCase):
 
         """
         org = entities.Organization().create()
-        with open(manifests.clone(), 'rb') as manifest:
+        manifest_path = manifests.get_manifest_pool().take(remote=False)
+        with open(manifest_path, 'rb') as manifest:
             upload_manifest(org.id, manifest)
 
     def test_positive_delete_1(self):
@@ -36,7 +37,8 @@ class SubscriptionsTestCase(APITestCase):
         """
         org = entities.Organization().create()
         sub = entities.Subscription(organization=org)
-        with open(manifests.clone(), 'rb') as manifest:
+        manifest_path = manifests.get_manifest_pool().take(remote=False)
+        with open(manifest_path, 'rb') as manifest:
             upload_manifest(org.id, manifest)
         self.assertGreater(len(sub.search()), 0)
         sub.delete_manifest(data={'organization_id': org.id})
@@ -51,7 +53,8 @@ class SubscriptionsTestCase(APITestCase):
 
         """
         orgs = [entities.Organization().create() for _ in range(2)]
-        with open(manifests.clone(), 'rb') as manifest:
+        manifest_path = manifests.get_manifest_pool().take(remote=False)
+        with open(manifest_path, 'rb') as manifest:
             upload_manifest(orgs[0].id, manifest)
             with self.assertRaises(TaskFailedError):
                 upload_manifest(orgs[1].id, manifest)
@@ -434,14 +434,19 @@ class TestCHKatelloAgent(CLITestCase):
         # Create VM and register content host
         self.client = VirtualMachine(distro='rhel71')
         self.client.create()
-        self.client.install_katello_cert()
-        # Register content host, install katello-agent
-        self.client.register_contenthost(
-            TestCHKatelloAgent.activation_key['name'],
-            TestCHKatelloAgent.org['label']
-        )
-        self.client.enable_repo(REPOS['rhst7']['id'])
-        self.client.install_katello_agent()
+        # Install katello-ca, register content host and install katello-agent
+        # using a single ssh session
+        results = self.client.bootstrap(steps=[
+            'install_katello_cert',
+            ('register_contenthost', {
+                'activation_key': TestCHKatelloAgent.activation_key['name'],
+                'org': TestCHKatelloAgent.org['label'],
+            }),
+            ('enable_repo', {'repo': REPOS['rhst7']['id']}),
+            'install_katello_agent',
+        ])
+        for result in results:
+            self.assertEqual(result.return_code, 0, result.stdout)
 
     def tearDown(self):
         self.client.destroy()
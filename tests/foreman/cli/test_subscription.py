@@ -17,12 +17,19 @@ class TestSubscription(CLITestCase):
         """Tests for content-view via Hammer CLI"""
         super(TestSubscription, self).setUp()
         self.org = make_org()
-        self.manifest = manifests.clone()
 
     # pylint: disable=no-self-use
-    def _upload_manifest(self, manifest, org_id):
-        """Uploads a manifest file and import it into an organization"""
-        upload_file(manifest, remote_file=manifest)
+    def _upload_manifest(self, org_id, manifest=None):
+        """Uploads a manifest file and import it into an organization
+
+        A cloned manifest already on the server is taken from the manifest
+        pool, unless the path of a local ``manifest`` is given.
+
+        """
+        if manifest is None:
+            manifest = manifests.get_manifest_pool().take()
+        else:
+            upload_file(manifest, remote_file=manifest)
         Subscription.upload({
             'file': manifest,
             'organization-id': org_id,
@@ -36,7 +43,7 @@ class TestSubscription(CLITestCase):
         @Assert: Manifest are uploaded properly
 
         """
-        self._upload_manifest(self.manifest, self.org['id'])
+        self._upload_manifest(self.org['id'])
         Subscription.list(
             {'organization-id': self.org['id']},
             per_page=False,
@@ -50,7 +57,7 @@ class TestSubscription(CLITestCase):
         @Assert: Manifest are deleted properly
 
         """
-        self._upload_manifest(self.manifest, self.org['id'])
+        self._upload_manifest(self.org['id'])
         Subscription.list(
             {'organization-id': self.org['id']},
             per_page=False,
@@ -72,7 +79,7 @@ class TestSubscription(CLITestCase):
         repository contained in a manifest
 
         """
-        self._upload_manifest(self.manifest, self.org['id'])
+        self._upload_manifest(self.org['id'])
         Subscription.list(
             {'organization-id': self.org['id']},
             per_page=False,
@@ -105,7 +112,7 @@ class TestSubscription(CLITestCase):
         @Assert: Manifest history is shown properly
 
         """
-        self._upload_manifest(self.manifest, self.org['id'])
+        self._upload_manifest(self.org['id'])
         Subscription.list(
             {'organization-id': self.org['id']},
             per_page=None,
@@ -127,7 +134,7 @@ class TestSubscription(CLITestCase):
 
         """
         self._upload_manifest(
-            manifests.download_manifest_template(), self.org['id'])
+            self.org['id'], manifests.download_manifest_template())
         Subscription.list(
             {'organization-id': self.org['id']},
             per_page=False,
@@ -150,7 +157,7 @@ class TestSubscription(CLITestCase):
         @BZ: 1226425
 
         """
-        self._upload_manifest(self.manifest, self.org['id'])
+        self._upload_manifest(self.org['id'])
         Subscription.list(
             {'organization-id': self.org['id']},
             per_page=False,
@@ -69,6 +69,14 @@ class ConcurrentSyncTestCase(ConcurrentTestCase):
         )
         cls.is_initial_sync = True if sync_parameter == 'sync' else False
 
+        # get whether to trigger syncs asynchronously and poll their tasks
+        cls.sync_async = conf.properties.get(
+            'performance.test.sync_async', '0') == '1'
+        cls.sync_poll_interval = float(conf.properties.get(
+            'performance.test.sync_poll_interval',
+            '5'
+        ))
+
     def setUp(self):
         super(ConcurrentSyncTestCase, self).setUp()
 
@@ -183,6 +191,8 @@ class ConcurrentSyncTestCase(ConcurrentTestCase):
         self.logger.debug(
             'Timing result is: {0}'.format(time_result_dict)
         )
+        self._store_samples(
+            test_case_name, time_result_dict, current_num_threads)
 
         with open(raw_file_name, 'a') as handler:
             writer = csv.writer(handler)
@@ -8,6 +8,7 @@ from robottelo.cli.repository_set import RepositorySet
 from robottelo.cli.subscription import Subscription
 from robottelo.config import conf
 from robottelo.performance.constants import MANIFEST_FILE_NAME
+from robottelo.performance.savepoint import restore_savepoint
 from robottelo.test import TestCase
 
 
@@ -74,11 +75,7 @@ class StandardPrepTestCase(TestCase):
 
     def _restore_from_savepoint(self, savepoint):
         """Restore from a given savepoint"""
-        if savepoint == '':
-            self.logger.warning('No savepoint while continuing test!')
-            return
-        self.logger.info('Reset db from /home/backup/{0}'.format(savepoint))
-        ssh.command('./reset-db.sh /home/backup/{0}'.format(savepoint))
+        restore_savepoint(savepoint)
 
     def _download_manifest(self):
         """Utility function to download manifest from given URL"""
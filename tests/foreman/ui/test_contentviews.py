@@ -744,10 +744,17 @@ class TestContentViewsUI(UITestCase):
         cv_name = gen_string('alpha')
         strategy, value = locators['content_env.select_name']
         with Session(self.browser) as session:
-            make_lifecycle_environment(
-                session, org=self.organization.name, name=env_name)
-            self.assertIsNotNone(session.nav.wait_until_element
-                                 ((strategy, value % env_name)))
+            # The environment is only a prerequisite of the promotion
+            env = make_lifecycle_environment(
+                session,
+                org=self.organization.name,
+                name=env_name,
+                prerequisite=True,
+            )
+            if env is None:
+                # created on the UI
+                self.assertIsNotNone(session.nav.wait_until_element(
+                    (strategy, value % env_name)))
             self.setup_to_create_cv(repo_name=repo_name)
             # Create content-view
             make_contentview(session, org=self.organization.name, name=cv_name)
@@ -23,6 +23,7 @@ from robottelo.ui.factory import (
     make_resource,
 )
 from robottelo.ui.locators import common_locators, locators
+from robottelo.ui.prerequisites import create_entities
 from robottelo.ui.session import Session
 # (too-many-public-methods) pylint:disable=R0904
 
@@ -859,12 +860,14 @@ class DockerActivationKeyTestCase(UITestCase):
         """Create an organization and product which can be re-used in tests."""
         super(DockerActivationKeyTestCase, cls).setUpClass()
         cls.organization = entities.Organization().create()
-        cls.lce = entities.LifecycleEnvironment(
-            organization=cls.organization).create()
+        cls.lce, product = create_entities([
+            entities.LifecycleEnvironment(organization=cls.organization),
+            entities.Product(organization=cls.organization),
+        ])
         cls.repo = entities.Repository(
             content_type=u'docker',
             docker_upstream_name=u'busybox',
-            product=entities.Product(organization=cls.organization).create(),
+            product=product,
             url=DOCKER_REGISTRY_HUB,
         ).create()
         content_view = entities.ContentView(
@@ -237,6 +237,7 @@ class GPGKey(UITestCase):
                 name=name,
                 org=self.organization.name,
                 upload_key=True,
+                prerequisite=True,
             )
             self.assertIsNotNone(self.gpgkey.search(name))
             self.gpgkey.delete(name, True)
@@ -258,6 +259,7 @@ class GPGKey(UITestCase):
                 key_content=self.key_content,
                 name=name,
                 org=self.organization.name,
+                prerequisite=True,
             )
             self.assertIsNotNone(self.gpgkey.search(name))
             self.gpgkey.delete(name, True)
@@ -283,6 +285,7 @@ class GPGKey(UITestCase):
                 name=name,
                 org=self.organization.name,
                 upload_key=True,
+                prerequisite=True,
             )
             self.assertIsNotNone(self.gpgkey.search(name))
             self.gpgkey.update(name, new_name)
@@ -311,6 +314,7 @@ class GPGKey(UITestCase):
                 name=name,
                 org=self.organization.name,
                 upload_key=True,
+                prerequisite=True,
             )
             self.assertIsNotNone(self.gpgkey.search(name))
             self.gpgkey.update(name, new_key=new_key_path)
@@ -335,6 +339,7 @@ class GPGKey(UITestCase):
                 key_content=self.key_content,
                 name=name,
                 org=self.organization.name,
+                prerequisite=True,
             )
             self.assertIsNotNone(self.gpgkey.search(name))
             self.gpgkey.update(name, new_name)
@@ -362,6 +367,7 @@ class GPGKey(UITestCase):
                 key_content=self.key_content,
                 name=name,
                 org=self.organization.name,
+                prerequisite=True,
             )
             self.assertIsNotNone(self.gpgkey.search(name))
             self.gpgkey.update(name, new_key=new_key_path)
@@ -389,6 +395,7 @@ class GPGKey(UITestCase):
                 name=name,
                 org=self.organization.name,
                 upload_key=True,
+                prerequisite=True,
             )
             self.assertIsNotNone(self.gpgkey.search(name))
             self.gpgkey.update(name, new_name)
@@ -414,6 +421,7 @@ class GPGKey(UITestCase):
                 key_content=self.key_content,
                 name=name,
                 org=self.organization.name,
+                prerequisite=True,
             )
             self.assertIsNotNone(self.gpgkey.search(name))
             self.gpgkey.update(name, new_name)
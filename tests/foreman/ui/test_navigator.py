@@ -0,0 +1,31 @@
+# -*- encoding: utf-8 -*-
+"""Test class for Navigator UI"""
+
+from ddt import ddt
+from robottelo.decorators import data
+from robottelo.test import UITestCase
+from robottelo.ui.navigator import Navigator, ROUTES
+from robottelo.ui.session import Session
+from urlparse import urlparse
+
+
+@ddt
+class NavigatorTestCase(UITestCase):
+    """Implements tests for the menus opened by Navigator"""
+
+    @data(*sorted(ROUTES))
+    def test_menu_route(self, method):
+        """@Test: Open a page through the menus
+
+        @Feature: Navigator - Menus
+
+        @Assert: The menus open the page of the route used by direct
+        navigation
+
+        """
+        with Session(self.browser):
+            getattr(Navigator(self.browser, direct=False), method)()
+            self.assertEqual(
+                urlparse(self.browser.current_url).path.rstrip('/'),
+                ROUTES[method].rstrip('/'),
+            )
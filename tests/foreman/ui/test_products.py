@@ -8,6 +8,7 @@ from robottelo.helpers import generate_strings_list
 from robottelo.test import UITestCase
 from robottelo.ui.factory import make_product
 from robottelo.ui.locators import common_locators
+from robottelo.ui.prerequisites import create_entities
 from robottelo.ui.session import Session
 
 
@@ -17,8 +18,8 @@ class Products(UITestCase):
 
     @classmethod
     def setUpClass(cls):  # noqa
-        cls.organization = entities.Organization().create()
-        cls.loc = entities.Location().create()
+        cls.organization, cls.loc = create_entities(
+            [entities.Organization(), entities.Location()])
 
         super(Products, cls).setUpClass()
 
@@ -21,6 +21,7 @@ from robottelo.helpers import generate_strings_list, read_data_file
 from robottelo.test import UITestCase
 from robottelo.ui.factory import make_repository
 from robottelo.ui.locators import common_locators, locators, tab_locators
+from robottelo.ui.prerequisites import create_entities
 from robottelo.ui.session import Session
 
 
@@ -30,8 +31,8 @@ class Repos(UITestCase):
 
     @classmethod
     def setUpClass(cls):  # noqa
-        cls.organization = entities.Organization().create()
-        cls.loc = entities.Location().create()
+        cls.organization, cls.loc = create_entities(
+            [entities.Organization(), entities.Location()])
 
         super(Repos, cls).setUpClass()
 
@@ -5,7 +5,6 @@ from nailgun import entities
 from robottelo import manifests
 from robottelo.constants import DEFAULT_SUBSCRIPTION_NAME
 from robottelo.decorators import skipRemote
-from robottelo.ssh import upload_file
 from robottelo.test import UITestCase
 from robottelo.ui.locators import common_locators, locators
 from robottelo.ui.session import Session
@@ -30,9 +29,8 @@ class SubscriptionTestCase(UITestCase):
         @Assert: Manifest is uploaded
 
         """
-        manifest_path = manifests.clone()
-        # upload_file function should take care of uploading to sauce labs.
-        upload_file(manifest_path, remote_file=manifest_path)
+        # The browser reads the manifest from the local machine
+        manifest_path = manifests.get_manifest_pool().take(remote=False)
         with Session(self.browser) as session:
             session.nav.go_to_select_org(self.organization.name)
             session.nav.go_to_red_hat_subscriptions()
@@ -49,9 +47,8 @@ class SubscriptionTestCase(UITestCase):
         @Assert: Manifest is deleted successfully
 
         """
-        manifest_path = manifests.clone()
-        # upload_file function should take care of uploading to sauce labs.
-        upload_file(manifest_path, remote_file=manifest_path)
+        # The browser reads the manifest from the local machine
+        manifest_path = manifests.get_manifest_pool().take(remote=False)
         with Session(self.browser) as session:
             session.nav.go_to_select_org(self.organization.name)
             session.nav.go_to_red_hat_subscriptions()
@@ -70,9 +67,8 @@ class SubscriptionTestCase(UITestCase):
         is asserted
 
         """
-        manifest_path = manifests.clone()
-        # upload_file function should take care of uploading to sauce labs.
-        upload_file(manifest_path, remote_file=manifest_path)
+        # The browser reads the manifest from the local machine
+        manifest_path = manifests.get_manifest_pool().take(remote=False)
         with Session(self.browser) as session:
             session.nav.go_to_select_org(self.organization.name)
             session.nav.go_to_red_hat_subscriptions()
@@ -0,0 +1,29 @@
+"""Tests for Robottelo itself."""
+import logging
+
+from mock import patch
+
+
+class LogCapture(logging.Handler):
+    """Keep the records of a logger instead of writing them out."""
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        """Keep ``record``."""
+        self.records.append(record)
+
+
+def capture_logs(test_case, logger):
+    """Capture the records of ``logger`` until ``test_case`` is cleaned up
+
+    :return: The :class:`LogCapture` keeping the records.
+
+    """
+    capture = LogCapture()
+    patcher = patch.multiple(logger, handlers=[capture], propagate=False)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    return capture
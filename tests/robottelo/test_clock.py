@@ -0,0 +1,18 @@
+"""Tests for :mod:`robottelo.clock`."""
+import time
+import unittest2
+
+from robottelo import clock
+
+
+class ClockTestCase(unittest2.TestCase):
+    """Tests for :mod:`robottelo.clock`."""
+
+    def test_monotonic(self):
+        """Check if the monotonic clock does not go backwards"""
+        first = clock.monotonic()
+        self.assertLessEqual(first, clock.monotonic())
+
+    def test_clock(self):
+        """Check if the clock is aligned to the wall clock"""
+        self.assertAlmostEqual(clock.Clock().now(), time.time(), delta=0.1)
@@ -0,0 +1,346 @@
+"""Tests for :mod:`robottelo.manifests`."""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import unittest2
+import zipfile
+
+from Crypto.Hash import SHA256
+from Crypto.PublicKey import RSA
+from Crypto.Signature import PKCS1_v1_5
+from io import BytesIO
+from mock import Mock, patch
+from robottelo import manifests, ssh
+from robottelo.config import conf
+
+
+def make_manifest():
+    """Build the binary contents of a minimal manifest."""
+    consumer_export = BytesIO()
+    with zipfile.ZipFile(consumer_export, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(
+            'export/consumer.json', json.dumps({'uuid': 'old', 'name': 'c'}))
+        zf.writestr('export/meta.json', '{"version": "0.3.1"}')
+    manifest = BytesIO()
+    with zipfile.ZipFile(manifest, 'w') as zf:
+        zf.writestr('consumer_export.zip', consumer_export.getvalue())
+        zf.writestr('signature', 'old signature')
+    return manifest.getvalue()
+
+
+class ManifestsTestCase(unittest2.TestCase):
+    """Tests for manifest cloning."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.key = RSA.generate(1024)
+        cls.template = make_manifest()
+
+    def setUp(self):
+        manifests._CACHE.clear()
+        self.properties_backup = conf.properties.copy()
+
+    def tearDown(self):
+        manifests._CACHE.clear()
+        conf.properties = self.properties_backup
+
+    def assert_valid_clone(self, data):
+        """Check that ``data`` is a signed clone of the template."""
+        with zipfile.ZipFile(BytesIO(data)) as newzip:
+            self.assertEqual(
+                sorted(newzip.namelist()),
+                ['consumer_export.zip', 'signature']
+            )
+            consumer_export = newzip.read('consumer_export.zip')
+            signature = newzip.read('signature')
+        self.assertTrue(PKCS1_v1_5.new(self.key.publickey()).verify(
+            SHA256.new(consumer_export), signature))
+        with zipfile.ZipFile(BytesIO(consumer_export)) as consumer_zip:
+            consumer = json.loads(consumer_zip.read('export/consumer.json'))
+            meta = consumer_zip.read('export/meta.json')
+        self.assertNotEqual(consumer['uuid'], 'old')
+        self.assertEqual(consumer['name'], 'c')
+        self.assertEqual(meta, '{"version": "0.3.1"}')
+        return consumer['uuid']
+
+    def test_clone_data(self):
+        """Check if clone_data generates unique signed manifests"""
+        first = self.assert_valid_clone(
+            manifests.clone_data(self.key, self.template))
+        second = self.assert_valid_clone(
+            manifests.clone_data(self.key, self.template))
+        self.assertNotEqual(first, second)
+
+    def test_clone_data_caches_downloads(self):
+        """Check if the template and key are fetched only once"""
+        key_path = self.write_tempfile(self.key.exportKey())
+        old_path = self.write_tempfile(self.template)
+        self.addCleanup(os.remove, key_path)
+        self.addCleanup(os.remove, old_path)
+        conf.properties['main.manifest.key_url'] = 'http://example.com/key'
+        conf.properties['main.manifest.fake_url'] = 'http://example.com/zip'
+        paths = {
+            'http://example.com/key': key_path,
+            'http://example.com/zip': old_path,
+        }
+        with patch.object(
+                manifests, 'fetch', side_effect=paths.get) as fetch:
+            first = self.assert_valid_clone(manifests.clone_data())
+            second = self.assert_valid_clone(manifests.clone_data())
+        self.assertNotEqual(first, second)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_clone(self):
+        """Check if clone writes the cloned manifest to a file"""
+        key_path = self.write_tempfile(self.key.exportKey())
+        old_path = self.write_tempfile(self.template)
+        try:
+            new_path = manifests.clone(key_path, old_path)
+            try:
+                with open(new_path, 'rb') as handle:
+                    self.assert_valid_clone(handle.read())
+            finally:
+                os.remove(new_path)
+        finally:
+            os.remove(key_path)
+            os.remove(old_path)
+
+    def write_tempfile(self, content):
+        """Write ``content`` to a temporary file and return its path."""
+        path = manifests.get_tempfile()
+        with open(path, 'wb') as handle:
+            handle.write(content)
+        return path
+
+
+class DownloadCacheTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.manifests.DownloadCache`."""
+
+    url = 'http://example.com/manifest.zip'
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def make_response(self, status_code, content='', headers=None):
+        """Create a mock ``requests`` response."""
+        response = Mock(status_code=status_code, content=content)
+        response.ok = status_code < 400
+        response.headers = headers or {}
+        return response
+
+    @patch('requests.get')
+    def test_fetch_revalidates(self, get):
+        """Check if fetch downloads the file once and revalidates it"""
+        get.side_effect = [
+            self.make_response(200, 'manifest', {
+                'ETag': '"abc"',
+                'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT',
+            }),
+            self.make_response(304),
+        ]
+        cache = manifests.DownloadCache(self.directory, 1024)
+        path = cache.fetch(self.url)
+        with open(path) as handle:
+            self.assertEqual(handle.read(), 'manifest')
+        self.assertEqual(
+            os.path.basename(path), hashlib.sha256('manifest').hexdigest())
+        self.assertEqual(cache.fetch(self.url), path)
+        get.assert_called_with(self.url, headers={
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT',
+        })
+
+    @patch('requests.get')
+    def test_fetch_changed(self, get):
+        """Check if fetch downloads the file again if it has changed"""
+        get.side_effect = [
+            self.make_response(200, 'old', {'ETag': '"old"'}),
+            self.make_response(200, 'new', {'ETag': '"new"'}),
+        ]
+        cache = manifests.DownloadCache(self.directory, 1024)
+        old_path = cache.fetch(self.url)
+        new_path = cache.fetch(self.url)
+        self.assertNotEqual(old_path, new_path)
+        with open(new_path) as handle:
+            self.assertEqual(handle.read(), 'new')
+
+    @patch('requests.get')
+    def test_evict(self, get):
+        """Check if the least recently used files are evicted"""
+        get.side_effect = [
+            self.make_response(200, 'a' * 10),
+            self.make_response(200, 'b' * 10),
+            self.make_response(200, 'c' * 10),
+        ]
+        cache = manifests.DownloadCache(self.directory, 25)
+        first = cache.fetch('http://example.com/a')
+        os.utime(first, (0, 0))
+        second = cache.fetch('http://example.com/b')
+        os.utime(second, (1, 1))
+        third = cache.fetch('http://example.com/c')
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.exists(second))
+        self.assertTrue(os.path.exists(third))
+
+
+class ManifestPoolTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.manifests.ManifestPool`."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        patcher = patch.object(
+            manifests, 'clone_data', return_value='manifest')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def make_pool(self, depth):
+        """Create a pool on the test directory."""
+        return manifests.ManifestPool(
+            depth=depth,
+            directory=self.directory,
+            remote_directory='/tmp/manifests',
+            hostname='example.com',
+        )
+
+    def test_fill(self):
+        """Check if fill clones manifests up to the pool depth"""
+        pool = self.make_pool(3)
+        self.assertEqual(pool.fill(), 3)
+        self.assertEqual(pool.fill(), 0)
+        self.assertEqual(
+            len(os.listdir(os.path.join(self.directory, 'ready'))), 3)
+
+    @patch('robottelo.ssh.command')
+    @patch('robottelo.ssh.upload_files')
+    def test_stage(self, upload_files, ssh_command):
+        """Check if stage uploads all ready manifests at once"""
+        pool = self.make_pool(2)
+        pool.fill()
+        self.assertEqual(pool.stage(), 2)
+        self.assertEqual(pool.stage(), 0)
+        self.assertEqual(upload_files.call_count, 1)
+        self.assertEqual(ssh_command.call_count, 1)
+        files = upload_files.call_args[0][0]
+        self.assertEqual(len(files), 2)
+        for local_file, remote_file in files:
+            self.assertEqual(
+                remote_file,
+                '/tmp/manifests/{0}'.format(os.path.basename(local_file))
+            )
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.directory, 'staged'))),
+            sorted(os.path.basename(local) for local, _ in files)
+        )
+
+    @patch('robottelo.ssh.command')
+    @patch('robottelo.ssh.upload_files')
+    def test_take(self, upload_files, ssh_command):
+        """Check if take hands out each staged manifest once"""
+        pool = self.make_pool(2)
+        pool.fill()
+        pool.stage()
+        staged = os.listdir(os.path.join(self.directory, 'staged'))
+        with patch.object(pool, 'start'):
+            taken = [pool.take(), pool.take()]
+        self.assertEqual(
+            sorted(taken),
+            sorted('/tmp/manifests/{0}'.format(name) for name in staged)
+        )
+        self.assertEqual(os.listdir(os.path.join(self.directory, 'taken')), [])
+
+    @patch('robottelo.ssh.command')
+    @patch('robottelo.ssh.upload_files')
+    def test_take_local(self, upload_files, ssh_command):
+        """Check if local takes fall back to staged manifests"""
+        pool = self.make_pool(2)
+        pool.fill()
+        pool.stage()
+        pool.depth = 3
+        pool.fill()
+        ready = os.listdir(os.path.join(self.directory, 'ready'))
+        staged = os.listdir(os.path.join(self.directory, 'staged'))
+        with patch.object(pool, 'start'):
+            taken = [pool.take(remote=False) for _ in range(3)]
+        self.assertEqual(
+            taken,
+            [os.path.join(self.directory, 'taken', name)
+             for name in ready + sorted(staged)]
+        )
+        for path in taken:
+            self.assertTrue(os.path.isfile(path))
+
+    @patch('robottelo.ssh.command')
+    @patch('robottelo.ssh.upload_files')
+    def test_reconcile(self, upload_files, ssh_command):
+        """Check if stale uploads and manifests missing from the server go
+        back to ready"""
+        pool = self.make_pool(3)
+        pool.fill()
+        pool.stage()
+        staged = sorted(os.listdir(os.path.join(self.directory, 'staged')))
+        os.rename(
+            os.path.join(self.directory, 'staged', staged[0]),
+            os.path.join(self.directory, 'uploading', staged[0]),
+        )
+        # A new run, on a server which only kept one manifest
+        pool = self.make_pool(3)
+        ssh_command.reset_mock()
+        ssh_command.return_value = ssh.SSHCommandResult(
+            stdout=[staged[1], ''])
+        pool.reconcile()
+        pool.reconcile()
+        ssh_command.assert_called_once_with(
+            'ls -1 /tmp/manifests', hostname='example.com')
+        self.assertEqual(
+            os.listdir(os.path.join(self.directory, 'staged')), [staged[1]])
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.directory, 'ready'))),
+            [staged[0], staged[2]]
+        )
+        self.assertEqual(
+            os.listdir(os.path.join(self.directory, 'uploading')), [])
+
+    @patch('robottelo.ssh.upload_file')
+    def test_take_disabled(self, upload_file):
+        """Check if take clones and uploads a manifest if pool is disabled"""
+        pool = self.make_pool(0)
+        with patch.object(manifests, 'clone', return_value='/tmp/m.zip'):
+            self.assertEqual(pool.take(), '/tmp/m.zip')
+        upload_file.assert_called_once_with(
+            '/tmp/m.zip', '/tmp/m.zip', hostname='example.com')
+
+
+class CloneManyTestCase(unittest2.TestCase):
+    """Tests for :func:`robottelo.manifests.clone_many`."""
+
+    def test_clone_many(self):
+        """Check if clone_many generates unique signed manifests"""
+        key = RSA.generate(1024)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        key_path = os.path.join(directory, 'key.pem')
+        old_path = os.path.join(directory, 'template.zip')
+        with open(key_path, 'w') as handle:
+            handle.write(key.exportKey())
+        with open(old_path, 'wb') as handle:
+            handle.write(make_manifest())
+        paths = manifests.clone_many(
+            4, workers=2, directory=directory, key_path=key_path,
+            old_path=old_path
+        )
+        self.assertEqual(len(set(paths)), 4)
+        uuids = set()
+        for path in paths:
+            self.assertEqual(os.path.dirname(path), directory)
+            with zipfile.ZipFile(path) as newzip:
+                consumer_export = newzip.read('consumer_export.zip')
+                self.assertTrue(PKCS1_v1_5.new(key.publickey()).verify(
+                    SHA256.new(consumer_export), newzip.read('signature')))
+            with zipfile.ZipFile(BytesIO(consumer_export)) as consumer_zip:
+                uuids.add(json.loads(
+                    consumer_zip.read('export/consumer.json'))['uuid'])
+        self.assertEqual(len(uuids), 4)
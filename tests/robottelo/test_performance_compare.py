@@ -0,0 +1,102 @@
+"""Tests for :mod:`robottelo.performance.compare`."""
+import os
+import random
+import shutil
+import tempfile
+import unittest2
+
+from robottelo.performance import compare
+from robottelo.performance.store import ResultsStore
+
+
+class LoadTestCase(unittest2.TestCase):
+    """Tests for loading results of a run."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.time_result_dict = {
+            'thread-0': [1.0, 2.0, 3.0],
+            'thread-1': [4.0, 5.0],
+        }
+
+    def test_load_raw_csv_and_store(self):
+        """Check if raw csv files and results stores load the same results"""
+        path = os.path.join(self.directory, 'results.db')
+        raw_file_name = os.path.join(self.directory, 'raw.csv')
+        store = ResultsStore(path)
+        run_id = store.create_run('abc')
+        store.add_samples(run_id, 'ak', 2, self.time_result_dict)
+        store.add_samples(run_id, 'del', 1, {'thread-0': [6.0]})
+        store.export_raw_csv(run_id, 'ak', raw_file_name)
+        store.export_raw_csv(run_id, 'del', raw_file_name)
+        store.close()
+        expected = {
+            ('ak', 2): self.time_result_dict,
+            ('del', 1): {'thread-0': [6.0]},
+        }
+        self.assertEqual(compare.load_raw_csv(raw_file_name), expected)
+        self.assertEqual(compare.load_store(run_id, path), expected)
+
+    def test_load_failed_client(self):
+        """Check if the empty row of a client whose iterations all failed
+        does not end its test case"""
+        raw_file_name = os.path.join(self.directory, 'raw.csv')
+        with open(raw_file_name, 'w') as handler:
+            handler.write(
+                'raw-del-3-clients\r\n1.0,2.0\r\n\r\n3.0\r\n\r\n'
+                'raw-del-1-clients\r\n4.0\r\n\r\n'
+            )
+        self.assertEqual(compare.load_raw_csv(raw_file_name), {
+            ('del', 3): {
+                'thread-0': [1.0, 2.0], 'thread-1': [], 'thread-2': [3.0]},
+            ('del', 1): {'thread-0': [4.0]},
+        })
+
+
+class CompareTestCase(unittest2.TestCase):
+    """Tests for :func:`robottelo.performance.compare.compare`."""
+
+    def make_run(self, mean):
+        """Create the results of a run with normally distributed timings."""
+        return {('ak', 2): {
+            'thread-{0}'.format(i): [
+                abs(random.gauss(mean, 0.1)) for _ in range(200)]
+            for i in range(2)
+        }}
+
+    def test_throughput(self):
+        """Check if the throughput is limited by the slowest thread"""
+        self.assertEqual(
+            compare.throughput({'thread-0': [1, 1], 'thread-1': [2, 2]}), 1)
+
+    def test_mann_whitney(self):
+        """Check if shifted samples are significantly different"""
+        first = [random.gauss(1, 0.1) for _ in range(200)]
+        self.assertLess(
+            compare.mann_whitney(first, [x + 0.1 for x in first]), 0.001)
+        self.assertEqual(compare.mann_whitney(first, first), 1.0)
+        self.assertEqual(compare.mann_whitney([1, 1, 1], [1, 1]), 1.0)
+
+    def test_compare_regression(self):
+        """Check if slower latencies and throughput are regressions"""
+        deltas = compare.compare(
+            self.make_run(1), self.make_run(1.5), threshold=10, alpha=0.05)
+        self.assertEqual(
+            [delta.metric for delta in deltas],
+            ['p50', 'p90', 'p99', 'throughput']
+        )
+        self.assertTrue(all(delta.regression for delta in deltas))
+        self.assertLess(deltas[-1].change, 0)
+
+    def test_compare_improvement(self):
+        """Check if faster runs have no regressions"""
+        deltas = compare.compare(
+            self.make_run(1.5), self.make_run(1), threshold=10, alpha=0.05)
+        self.assertFalse(any(delta.regression for delta in deltas))
+
+    def test_compare_threshold(self):
+        """Check if changes below the threshold are not regressions"""
+        deltas = compare.compare(
+            self.make_run(1), self.make_run(1.05), threshold=10, alpha=0.05)
+        self.assertFalse(any(delta.regression for delta in deltas))
@@ -0,0 +1,103 @@
+"""Tests for :mod:`robottelo.performance.openloop`."""
+import logging
+import time
+import unittest2
+
+from mock import patch
+from robottelo.config import conf
+from tests.robottelo import capture_logs
+
+PROPERTIES = {
+    'foreman.admin.username': 'admin',
+    'foreman.admin.password': 'changeme',
+    'main.server.hostname': 'example.com',
+}
+
+# Candlepin reads the server credentials when it is imported
+with patch.dict(conf.properties, PROPERTIES):
+    from robottelo.performance import openloop
+
+
+class ArrivalOffsetsTestCase(unittest2.TestCase):
+    """Tests for :func:`robottelo.performance.openloop.arrival_offsets`."""
+
+    def test_constant(self):
+        """Check if constant arrivals are evenly spaced"""
+        self.assertEqual(
+            openloop.arrival_offsets(4, 3, 'constant'), [0, 0.25, 0.5])
+
+    def test_poisson(self):
+        """Check if Poisson arrivals are reproducible and match the rate"""
+        offsets = openloop.arrival_offsets(10, 5000, seed=42)
+        self.assertEqual(offsets, openloop.arrival_offsets(10, 5000, seed=42))
+        self.assertEqual(offsets, sorted(offsets))
+        self.assertAlmostEqual(len(offsets) / offsets[-1], 10, delta=0.5)
+
+    def test_invalid(self):
+        """Check if invalid rates and distributions are rejected"""
+        with self.assertRaises(ValueError):
+            openloop.arrival_offsets(0, 1)
+        with self.assertRaises(ValueError):
+            openloop.arrival_offsets(1, 1, 'burst')
+
+
+class OpenLoopDriverTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.performance.openloop.OpenLoopDriver`."""
+
+    def test_queueing_is_measured(self):
+        """Check if requests waiting for a worker include the wait"""
+        driver = openloop.OpenLoopDriver(
+            lambda worker_id, item: time.sleep(0.05),
+            100,
+            'constant',
+            num_workers=1,
+        )
+        samples = driver.run(range(5))
+        self.assertEqual([sample.index for sample in samples], range(5))
+        for previous, sample in zip(samples, samples[1:]):
+            self.assertAlmostEqual(
+                sample.intended - previous.intended, 0.01, delta=0.001)
+            self.assertGreaterEqual(sample.actual, previous.end)
+        # the last request waited for the four before it
+        self.assertGreater(samples[-1].queue_delay, 0.15)
+        self.assertGreater(samples[-1].latency, 0.2)
+        self.assertLess(samples[-1].service_time, 0.1)
+
+    def test_errors(self):
+        """Check if failed requests are recorded and left out of results"""
+        def operation(worker_id, item):
+            """Fail on odd items."""
+            if item % 2:
+                raise ValueError(item)
+            return item
+
+        capture = capture_logs(self, openloop.LOGGER)
+        samples = openloop.OpenLoopDriver(
+            operation, 1000, num_workers=2).run(range(4))
+        self.assertEqual(
+            [sample.result for sample in samples], [0, None, 2, None])
+        self.assertIsInstance(samples[1].error, ValueError)
+        self.assertEqual(
+            len(openloop.to_time_result_dict(samples)['thread-0']), 2)
+        self.assertEqual(
+            sorted(record.getMessage().split(' on ')[0]
+                   for record in capture.records
+                   if record.levelno == logging.ERROR),
+            ['Request 1', 'Request 3'],
+        )
+
+
+class SystemsStandInTestCase(unittest2.TestCase):
+    """Tests for deleting systems on a local stand-in."""
+
+    @patch.dict('robottelo.config.conf.properties', PROPERTIES)
+    def test_delete_systems(self):
+        """Check if all systems are deleted through single_delete"""
+        uuids = ['uuid-{0}'.format(i) for i in range(10)]
+        with openloop.SystemsStandIn(service_time=0.01) as stand_in:
+            samples = openloop.delete_systems(
+                uuids, 200, num_workers=4, server_url=stand_in.url)
+        self.assertEqual(sorted(stand_in.deleted), sorted(uuids))
+        for sample in samples:
+            self.assertIsNone(sample.error)
+            self.assertGreaterEqual(sample.latency, sample.result)
@@ -0,0 +1,96 @@
+"""Tests for :mod:`robottelo.performance.pulp`."""
+import unittest2
+
+from mock import Mock, patch
+from robottelo.cli.base import CLIReturnCodeError
+from robottelo.cli.repository import Repository
+from robottelo.performance import pulp
+from robottelo.performance.pulp import Pulp
+
+TASK_ID = '2bd0f2f7-7a85-4a43-a8b8-1ad7e9a3e5b1'
+
+
+class SynchronizeAsyncTestCase(unittest2.TestCase):
+    """Tests for :meth:`robottelo.cli.repository.Repository.synchronize_async`.
+
+    """
+
+    @patch.object(Repository, 'execute')
+    def test_synchronize_async(self, execute):
+        """Check if the task id is read from the hammer output"""
+        execute.return_value = Mock(return_code=0, stdout=[
+            u'Repository is being synchronized in task {0}'.format(TASK_ID),
+            u'',
+        ])
+        self.assertEqual(Repository.synchronize_async({'id': 1}), TASK_ID)
+        self.assertIn('--async', execute.call_args[0][0])
+
+    @patch.object(Repository, 'execute')
+    def test_synchronize_async_failure(self, execute):
+        """Check if a failed command raises an error"""
+        execute.return_value = Mock(return_code=65, stdout=[], stderr=u'no')
+        with self.assertRaises(CLIReturnCodeError):
+            Repository.synchronize_async({'id': 1})
+
+
+class AsyncSyncTestCase(unittest2.TestCase):
+    """Tests for :meth:`robottelo.performance.pulp.Pulp.repositories_async_sync`.
+
+    """
+
+    def test_parse_task_time(self):
+        """Check if the task timestamp formats are parsed"""
+        self.assertEqual(
+            pulp.parse_task_time('1970-01-01 00:01:00 UTC'), 60)
+        self.assertEqual(
+            pulp.parse_task_time('1970-01-01T00:01:00.000Z'), 60)
+        self.assertIsNone(pulp.parse_task_time(None))
+
+    @patch.object(pulp, 'poll_tasks')
+    @patch.object(Repository, 'synchronize_async')
+    def test_repositories_async_sync(self, synchronize_async, poll_tasks):
+        """Check if all tasks are polled together until they stop"""
+        synchronize_async.side_effect = ['task-1', 'task-2']
+        poll_tasks.side_effect = [
+            {
+                'task-1': {'state': 'running'},
+                'task-2': {'state': 'planned'},
+            },
+            {
+                'task-1': {
+                    'state': 'stopped',
+                    'result': 'success',
+                    'started_at': '2015-10-21 07:28:00 UTC',
+                    'ended_at': '2015-10-21 07:29:30 UTC',
+                },
+                'task-2': {'state': 'running'},
+            },
+            {
+                'task-2': {
+                    'state': 'stopped',
+                    'result': 'error',
+                    'started_at': '2015-10-21 07:28:00 UTC',
+                    'ended_at': '2015-10-21 07:28:10 UTC',
+                },
+            },
+        ]
+        tasks = Pulp.repositories_async_sync(
+            [(1, 'repo-1'), (2, 'repo-2')], poll_interval=0)
+        self.assertEqual(
+            [set(call[0][0]) for call in poll_tasks.call_args_list],
+            [{'task-1', 'task-2'}, {'task-1', 'task-2'}, {'task-2'}]
+        )
+        self.assertEqual(
+            [task.task_id for task in tasks], ['task-1', 'task-2'])
+        self.assertEqual(tasks[0].duration, 90)
+        self.assertEqual(tasks[1].result, 'error')
+        self.assertGreaterEqual(tasks[0].queue_time, 0)
+        self.assertGreaterEqual(tasks[1].running, tasks[0].running)
+
+    @patch.object(pulp, 'poll_tasks', return_value={})
+    @patch.object(Repository, 'synchronize_async', return_value='task-1')
+    def test_repositories_async_sync_timeout(self, *_):
+        """Check if waiting for the tasks times out"""
+        with self.assertRaises(RuntimeError):
+            Pulp.repositories_async_sync(
+                [(1, 'repo-1')], poll_interval=0.01, timeout=0)
@@ -0,0 +1,96 @@
+"""Tests for :mod:`robottelo.performance.report`."""
+import codecs
+import os
+import shutil
+import tempfile
+import unittest2
+
+from robottelo.performance import report
+from robottelo.performance.store import ResultsStore
+
+
+class ReportTestCase(unittest2.TestCase):
+    """Tests for :mod:`robottelo.performance.report`."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'results.db')
+        store = ResultsStore(self.path)
+        self.addCleanup(store.close)
+        store.create_run('abc', '6.1.0-1', 'baseline', run_id='baseline')
+        store.create_run('def', '6.1.1-1', 'current', run_id='current')
+        for run_id, latency in (('baseline', 1.0), ('current', 3.0)):
+            for num_threads in (1, 2):
+                store.add_samples(
+                    run_id,
+                    'ak',
+                    num_threads,
+                    {
+                        'thread-{0}'.format(i): [
+                            latency + j / 100.0 for j in range(30)]
+                        for i in range(num_threads)
+                    },
+                    {
+                        'thread-{0}'.format(i): [
+                            1000.0 + j for j in range(30)]
+                        for i in range(num_threads)
+                    },
+                )
+        store.add_errors(
+            'current', 'ak', 2, [(1, 30, 1030.0, 'timeout <5s>')])
+        self.store = store
+
+    def test_percentiles(self):
+        """Check if percentiles are computed on all threads"""
+        values = report.percentiles(
+            {'thread-0': [1.0, 2.0], 'thread-1': [3.0]})
+        self.assertAlmostEqual(values[50], 2.0)
+        self.assertAlmostEqual(values[90], 2.8)
+        self.assertAlmostEqual(values[99], 2.98)
+        self.assertEqual(
+            report.percentiles({'thread-0': []}),
+            {50: None, 90: None, 99: None}
+        )
+
+    def test_error_rates(self):
+        """Check if errors are counted against all iterations"""
+        results = {('ak', 1): {'thread-0': [1.0] * 30},
+                   ('ak', 2): {'thread-0': [1.0] * 30,
+                               'thread-1': [1.0] * 29}}
+        self.assertEqual(report.error_rates(self.store, 'current', results), [
+            ('ak', 1, 30, 0, 0.0),
+            ('ak', 2, 59, 1, 100.0 / 60),
+        ])
+
+    def test_build_report(self):
+        """Check if the report holds all charts and flags regressions"""
+        html = report.build_report('current', 'baseline', self.path)
+        self.assertEqual(html.count(u'<svg'), 3)
+        self.assertIn(u'ak: latency over time', html)
+        self.assertIn(u'p99 (baseline)', html)
+        self.assertIn(u'<td>1</td><td>1.64</td>', html)
+        self.assertIn(u'<tr class="regression">', html)
+        self.assertIn(u'8 regression(s) found', html)
+        # the report must not load anything from the network
+        self.assertNotIn(u'href=', html)
+
+    def test_build_report_without_baseline(self):
+        """Check if a report is built without comparison"""
+        html = report.build_report('current', path=self.path)
+        self.assertNotIn(u'Comparison to baseline', html)
+        self.assertNotIn(u'baseline', html.split(u'</table>', 1)[1])
+
+    def test_unknown_run(self):
+        """Check if an unknown run is rejected"""
+        with self.assertRaises(ValueError):
+            report.build_report('missing', path=self.path)
+        with self.assertRaises(ValueError):
+            report.build_report('current', 'missing', self.path)
+
+    def test_write_report(self):
+        """Check if the report is written as a single HTML file"""
+        report_file_name = os.path.join(self.directory, 'report.html')
+        report.write_report(report_file_name, 'current', path=self.path)
+        with codecs.open(report_file_name, encoding='utf-8') as handler:
+            self.assertTrue(handler.read().startswith(u'<!DOCTYPE html>'))
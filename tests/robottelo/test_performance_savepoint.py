@@ -0,0 +1,175 @@
+"""Tests for :mod:`robottelo.performance.savepoint`."""
+import subprocess
+import threading
+import unittest2
+
+from mock import Mock, patch
+from robottelo.performance import savepoint
+from robottelo.performance.savepoint import SavepointError, SavepointManager
+
+
+class FakeServer(object):
+    """Answer the commands of :class:`SavepointManager` like a server."""
+
+    def __init__(self, exists=True, checksums=('abc', 'abc'), fail=None):
+        self.exists = exists
+        self.checksums = checksums
+        self.fail = fail
+        self.commands = []
+        self.lock = threading.Lock()
+
+    def __call__(self, cmd, **kwargs):
+        with self.lock:
+            self.commands.append(cmd)
+        return_code = 0
+        stdout = []
+        if cmd.startswith('test -f'):
+            return_code = 0 if self.exists else 1
+        elif cmd.startswith('set -o pipefail'):
+            stdout = list(self.checksums)
+        elif cmd.startswith('find'):
+            stdout = [
+                u'1445412540.5 /home/backup/second',
+                u'1445412480.0 /home/backup/first',
+                u'',
+            ]
+        if self.fail and self.fail in cmd:
+            return_code = 1
+        return Mock(
+            return_code=return_code,
+            stdout=stdout,
+            stderr=u'',
+            timing=Mock(remote_time=2.0, total=2.5),
+        )
+
+    def ran(self, fragment):
+        """Return the commands containing ``fragment``."""
+        return [cmd for cmd in self.commands if fragment in cmd]
+
+
+class SavepointManagerTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.performance.savepoint.SavepointManager`.
+
+    """
+
+    def setUp(self):
+        self.manager = SavepointManager(
+            directory='/home/backup/',
+            postgres_databases=['foreman', 'candlepin'],
+            mongo_databases=['pulp_database'],
+            jobs=8,
+            skip_unchanged=True,
+            timeout=60,
+        )
+
+    def run_on(self, server, method, *args, **kwargs):
+        """Call a method of the manager with ``server`` answering ssh."""
+        with patch('robottelo.ssh.command', side_effect=server):
+            return getattr(self.manager, method)(*args, **kwargs)
+
+    def test_restore_skipped(self):
+        """Check if nothing is restored when the checksums match"""
+        server = FakeServer()
+        report = self.run_on(server, 'restore', 'clean')
+        self.assertTrue(report.skipped)
+        self.assertEqual(report.timings, {'checksum': 2.0})
+        self.assertEqual(server.ran('pg_restore'), [])
+        self.assertEqual(len(server.ran('/home/backup/clean/checksum')), 1)
+
+    def test_restore(self):
+        """Check if all databases are restored at the same time"""
+        server = FakeServer(checksums=('abc', 'def'))
+        report = self.run_on(server, 'restore', 'clean')
+        self.assertFalse(report.skipped)
+        self.assertEqual(set(report.timings), {
+            'checksum', 'stop', 'start', 'postgres foreman',
+            'postgres candlepin', 'mongo pulp_database'})
+        # checksum, stop, the slowest restore and start
+        self.assertEqual(report.total, 8.0)
+        # the restores run in parallel, in any order
+        restores = server.ran('pg_restore --jobs 8')
+        self.assertEqual(len(restores), 2)
+        self.assertEqual(
+            len(server.ran('/home/backup/clean/postgres/foreman.dump')), 1)
+        self.assertEqual(len(server.ran('mongorestore --drop')), 1)
+        self.assertLess(
+            server.commands.index(server.ran('katello-service stop')[0]),
+            min(server.commands.index(restore) for restore in restores))
+        self.assertIn('katello-service start', server.commands[-1])
+
+    def test_restore_forced(self):
+        """Check if a forced restore does not compare checksums"""
+        server = FakeServer()
+        report = self.run_on(server, 'restore', 'clean', force=True)
+        self.assertFalse(report.skipped)
+        self.assertEqual(server.ran('set -o pipefail'), [])
+
+    def test_restore_failure(self):
+        """Check if services are started again when a restore fails"""
+        server = FakeServer(checksums=('abc', 'def'), fail='mongorestore')
+        with self.assertRaises(SavepointError):
+            self.run_on(server, 'restore', 'clean')
+        self.assertIn('katello-service start', server.commands[-1])
+
+    def test_restore_legacy(self):
+        """Check if older savepoints are restored by the legacy script"""
+        server = FakeServer(exists=False)
+        report = self.run_on(server, 'restore', 'old')
+        self.assertEqual(report.timings, {'legacy': 2.0})
+        self.assertIn('./reset-db.sh /home/backup/old', server.commands[-1])
+
+    def test_create(self):
+        """Check if databases, checksum and md5sums are saved"""
+        server = FakeServer(exists=False)
+        timings = self.run_on(server, 'create', 'clean')
+        self.assertEqual(set(timings), {
+            'stop', 'start', 'checksum', 'postgres foreman',
+            'postgres candlepin', 'mongo pulp_database'})
+        self.assertEqual(len(server.ran('pg_dump -Fc')), 2)
+        self.assertEqual(len(server.ran('mongodump --db pulp_database')), 1)
+        self.assertIn('> /home/backup/clean/checksum', server.ran('md5sum')[0])
+        self.assertIn('MD5SUMS', server.commands[-2])
+
+    def test_create_existing(self):
+        """Check if existing savepoints are kept unless overwritten"""
+        server = FakeServer()
+        with self.assertRaises(SavepointError):
+            self.run_on(server, 'create', 'clean')
+        self.assertEqual(server.ran('rm -rf'), [])
+        self.run_on(server, 'create', 'clean', overwrite=True)
+        self.assertEqual(len(server.ran('rm -rf')), 1)
+
+    def test_list(self):
+        """Check if savepoints are listed oldest first"""
+        self.assertEqual(self.run_on(FakeServer(), 'list'), [
+            {'name': 'first', 'created': 1445412480.0},
+            {'name': 'second', 'created': 1445412540.5},
+        ])
+
+    def test_verify(self):
+        """Check if the md5sums of the dump files are checked"""
+        server = FakeServer()
+        self.assertTrue(self.run_on(server, 'verify', 'clean'))
+        self.assertIn('md5sum --check', server.commands[-1])
+        server = FakeServer(fail='md5sum --check')
+        self.assertFalse(self.run_on(server, 'verify', 'clean'))
+
+    def test_invalid_name(self):
+        """Check if names escaping the savepoint directory are rejected"""
+        for name in ('', '../etc', '.hidden'):
+            with self.assertRaises(SavepointError):
+                self.manager.path(name)
+
+    def test_checksum_command(self):
+        """Check if the checksum command is valid shell"""
+        process = subprocess.Popen(['bash', '-n'], stdin=subprocess.PIPE)
+        process.communicate(self.manager._checksum_command())
+        self.assertEqual(process.returncode, 0)
+
+    @patch.object(SavepointManager, 'restore')
+    def test_restore_savepoint(self, restore):
+        """Check if an empty savepoint name restores nothing"""
+        self.assertIsNone(savepoint.restore_savepoint(''))
+        self.assertFalse(restore.called)
+        savepoint.restore_savepoint('clean')
+        restore.assert_called_once_with('clean')
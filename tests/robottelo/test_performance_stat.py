@@ -0,0 +1,169 @@
+"""Tests for :mod:`robottelo.performance.stat`."""
+import csv
+import numpy
+import os
+import random
+import shutil
+import tempfile
+import unittest2
+
+from mock import patch
+from robottelo.performance.stat import (
+    LatencyHistogram,
+    LiveStatistics,
+    TimingSamples,
+    compute_stat,
+    generate_stat_for_concurrent_thread,
+)
+
+
+def reference_stat(time_list):
+    """Compute statistics one by one, as the performance tests used to."""
+    return [
+        numpy.amin(time_list),
+        numpy.median(time_list),
+        numpy.mean(time_list),
+        numpy.amax(time_list),
+        numpy.std(time_list),
+        numpy.percentile(time_list, 90),
+        numpy.percentile(time_list, 95),
+        numpy.percentile(time_list, 99),
+    ]
+
+
+class ComputeStatTestCase(unittest2.TestCase):
+    """Tests for :func:`robottelo.performance.stat.compute_stat`."""
+
+    def test_compute_stat(self):
+        """Check if all statistics match their numpy counterparts"""
+        time_list = [random.uniform(0, 10) for _ in range(100)]
+        numpy.testing.assert_allclose(
+            compute_stat(time_list), reference_stat(time_list))
+
+    def test_compute_stat_ignores_nan(self):
+        """Check if missing values are ignored"""
+        numpy.testing.assert_allclose(
+            compute_stat([[1, 2, 3, numpy.nan], [4, 5, 6, 7]]),
+            [reference_stat([1, 2, 3]), reference_stat([4, 5, 6, 7])]
+        )
+
+
+class TimingSamplesTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.performance.stat.TimingSamples`."""
+
+    def setUp(self):
+        self.time_result_dict = {
+            'thread-0': [random.uniform(0, 10) for _ in range(20)],
+            'thread-1': [random.uniform(0, 10) for _ in range(17)],
+        }
+        self.samples = TimingSamples.from_dict(self.time_result_dict)
+
+    def test_from_dict(self):
+        """Check if the timings are stored on a single array"""
+        self.assertEqual(self.samples.samples.shape, (2, 20))
+        self.assertEqual(list(self.samples.counts), [20, 17])
+        self.assertTrue(numpy.isnan(self.samples.samples[1, 17:]).all())
+
+    def test_compute(self):
+        """Check if all aggregations match slicing and merging lists"""
+        thread_0 = self.time_result_dict['thread-0']
+        thread_1 = self.time_result_dict['thread-1']
+        stat = self.samples.compute(5, 4)
+        self.assertEqual(stat['client_bucketized'].shape, (2, 4, 8))
+        numpy.testing.assert_allclose(
+            stat['client_bucketized'][0][1], reference_stat(thread_0[5:10]))
+        numpy.testing.assert_allclose(
+            stat['client_bucketized'][1][3], reference_stat(thread_1[15:17]))
+        numpy.testing.assert_allclose(
+            stat['test_bucketized'][2],
+            reference_stat(thread_0[10:15] + thread_1[10:15])
+        )
+        self.assertEqual(list(stat['test_bucketized_counts']), [10, 10, 10, 7])
+        numpy.testing.assert_allclose(
+            stat['client'][1], reference_stat(thread_1))
+        numpy.testing.assert_allclose(
+            stat['test'], reference_stat(thread_0 + thread_1))
+
+    def test_add(self):
+        """Check if values are recorded on the array and the histogram"""
+        samples = TimingSamples(2, 3, histogram=True)
+        samples.add(0, 1.0)
+        samples.add(1, 2.0)
+        samples.add(0, 3.0)
+        self.assertEqual(list(samples.counts), [2, 1])
+        self.assertEqual(samples.samples[0, 1], 3.0)
+        self.assertEqual(samples.percentile(100), 3.0)
+
+    def test_percentile_requires_histogram(self):
+        """Check if streaming percentiles require a histogram"""
+        with self.assertRaises(ValueError):
+            TimingSamples(1, 1).percentile(50)
+
+
+class LatencyHistogramTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.performance.stat.LatencyHistogram`."""
+
+    def test_percentile(self):
+        """Check if percentiles are within the histogram precision"""
+        histogram = LatencyHistogram(precision=0.01)
+        time_list = [random.uniform(0.01, 100) for _ in range(10000)]
+        for value in time_list:
+            histogram.add(value)
+        for percent in (50, 90, 95, 99):
+            expected = numpy.percentile(time_list, percent)
+            self.assertAlmostEqual(
+                histogram.percentile(percent) / expected, 1, delta=0.02)
+        self.assertEqual(histogram.count, 10000)
+        self.assertEqual(histogram.min, min(time_list))
+        self.assertEqual(histogram.max, max(time_list))
+        self.assertAlmostEqual(histogram.mean, numpy.mean(time_list))
+
+    def test_empty(self):
+        """Check if an empty histogram has no percentiles"""
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.percentile(50))
+        self.assertIsNone(histogram.mean)
+
+
+class LiveStatisticsTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.performance.stat.LiveStatistics`."""
+
+    @patch('robottelo.performance.stat.LOGGER')
+    @patch('robottelo.performance.stat.time')
+    def test_add(self, time, logger):
+        """Check if percentiles are logged at most once per interval"""
+        time.time.return_value = 100.0
+        live_stats = LiveStatistics(2, 2, interval=10)
+        live_stats.add(0, 1.0)
+        live_stats.add(1, 2.0)
+        logger.info.assert_not_called()
+        time.time.return_value = 110.0
+        live_stats.add(0, 3.0)
+        self.assertEqual(logger.info.call_count, 1)
+        self.assertEqual(logger.info.call_args[0][1], 3)
+        live_stats.add(1, 4.0)
+        self.assertEqual(logger.info.call_count, 1)
+        self.assertEqual(live_stats.timing_samples.counts.tolist(), [2, 2])
+
+
+class GenerateStatTestCase(unittest2.TestCase):
+    """Tests for the csv statistics writers."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_generate_stat_for_concurrent_thread(self):
+        """Check if each full bucket is written to the csv file"""
+        stat_file_name = os.path.join(self.directory, 'stat.csv')
+        time_list = [float(i) for i in range(1, 12)]
+        return_stat = generate_stat_for_concurrent_thread(
+            'client-0', time_list, stat_file_name, 5, 10)
+        with open(stat_file_name) as handler:
+            rows = list(csv.reader(handler))
+        self.assertEqual(rows[1], ['client-0'])
+        self.assertEqual([row[0] for row in rows[3:]], ['1-5', '6-10'])
+        self.assertEqual(return_stat, {
+            0: (1.0, 3.0, 5.0, numpy.std([1, 2, 3, 4, 5])),
+            1: (6.0, 8.0, 10.0, numpy.std([6, 7, 8, 9, 10])),
+        })
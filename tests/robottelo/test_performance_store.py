@@ -0,0 +1,135 @@
+"""Tests for :mod:`robottelo.performance.store`."""
+import csv
+import os
+import shutil
+import tempfile
+import unittest2
+
+from mock import Mock, patch
+from robottelo.performance import store
+from robottelo.performance.store import ResultsStore
+
+
+class ResultsStoreTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.performance.store.ResultsStore`."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store = ResultsStore(os.path.join(self.directory, 'results.db'))
+        self.addCleanup(self.store.close)
+        self.time_result_dict = {
+            'thread-0': [1.0, 2.0, 3.0],
+            'thread-1': [4.0, 5.0],
+        }
+
+    def test_create_run(self):
+        """Check if runs are recorded with their information"""
+        run_id = self.store.create_run('abc', '6.1.0-1', 'baseline')
+        runs = self.store.runs()
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(runs[0]['run_id'], run_id)
+        self.assertEqual(runs[0]['git_revision'], 'abc')
+        self.assertEqual(runs[0]['satellite_version'], '6.1.0-1')
+        self.assertEqual(runs[0]['description'], 'baseline')
+
+    def test_add_samples(self):
+        """Check if samples are recorded and queried back"""
+        run_id = self.store.create_run('abc', run_id='run')
+        self.store.add_samples(
+            run_id, 'ak', 2, self.time_result_dict,
+            {'thread-0': [10.0, 11.0, 12.0]}
+        )
+        self.store.add_samples(run_id, 'att', 1, {'thread-0': [6.0]})
+        self.assertEqual(self.store.operations(run_id), ['ak', 'att'])
+        self.assertEqual(self.store.thread_counts(run_id, 'ak'), [2])
+        self.assertEqual(
+            self.store.latencies(run_id, 'ak', 2), self.time_result_dict)
+        samples = self.store.samples(run_id, 'ak')
+        self.assertEqual(len(samples), 5)
+        self.assertEqual(samples[1]['timestamp'], 11.0)
+        self.assertIsNone(samples[3]['timestamp'])
+        self.assertEqual(len(self.store.samples(run_id)), 6)
+
+    def test_add_errors(self):
+        """Check if failed iterations are recorded and queried back"""
+        run_id = self.store.create_run('abc', run_id='run')
+        self.store.add_errors(run_id, 'ak', 2, [(1, 3, 10.0, 'timeout')])
+        self.store.add_errors(run_id, 'del', 1, [(0, 0, None, 'gone')])
+        errors = self.store.errors(run_id, 'ak', 2)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['client'], 1)
+        self.assertEqual(errors[0]['iteration'], 3)
+        self.assertEqual(errors[0]['message'], 'timeout')
+        self.assertEqual(len(self.store.errors(run_id)), 2)
+        self.assertEqual(self.store.errors(run_id, 'att'), [])
+
+    def test_export_raw_csv(self):
+        """Check if the raw csv file matches the performance tests format"""
+        run_id = self.store.create_run('abc')
+        self.store.add_samples(run_id, 'ak', 2, self.time_result_dict)
+        raw_file_name = os.path.join(self.directory, 'raw.csv')
+        self.store.export_raw_csv(run_id, 'ak', raw_file_name)
+        with open(raw_file_name) as handler:
+            rows = list(csv.reader(handler))
+        self.assertEqual(rows, [
+            ['raw-ak-2-clients'],
+            ['1.0', '2.0', '3.0'],
+            ['4.0', '5.0'],
+            [],
+        ])
+
+    def test_export_stat_csv(self):
+        """Check if the statistics csv file is written for each test case"""
+        run_id = self.store.create_run('abc')
+        self.store.add_samples(run_id, 'ak', 2, self.time_result_dict)
+        self.store.add_samples(run_id, 'ak', 1, {'thread-0': [1.0, 2.0]})
+        stat_file_name = os.path.join(self.directory, 'stat.csv')
+        self.store.export_stat_csv(run_id, 'ak', stat_file_name, 1)
+        with open(stat_file_name) as handler:
+            rows = list(csv.reader(handler))
+        titles = [row[0] for row in rows if row and row[0].endswith('clients')]
+        self.assertEqual(titles, ['stat-ak-1-clients', 'stat-ak-2-clients'])
+
+    def test_export_failed_client(self):
+        """Check if a client whose iterations all failed is exported empty"""
+        run_id = self.store.create_run('abc')
+        self.store.add_samples(run_id, 'del', 3, {
+            'thread-0': [1.0, 2.0], 'thread-1': [], 'thread-2': [3.0, 4.0]})
+        self.assertEqual(self.store.latencies(run_id, 'del', 3)['thread-1'],
+                         [])
+        raw_file_name = os.path.join(self.directory, 'raw.csv')
+        self.store.export_raw_csv(run_id, 'del', raw_file_name)
+        with open(raw_file_name) as handler:
+            rows = list(csv.reader(handler))
+        self.assertEqual(rows, [
+            ['raw-del-3-clients'],
+            ['1.0', '2.0'],
+            [],
+            ['3.0', '4.0'],
+            [],
+        ])
+        stat_file_name = os.path.join(self.directory, 'stat.csv')
+        self.store.export_stat_csv(run_id, 'del', stat_file_name, 2)
+        with open(stat_file_name) as handler:
+            rows = list(csv.reader(handler))
+        self.assertIn(['test-3'], rows)
+
+
+class SatelliteVersionTestCase(unittest2.TestCase):
+    """Tests for :func:`robottelo.performance.store.get_satellite_version`."""
+
+    @patch('robottelo.ssh.command')
+    def test_get_satellite_version(self, command):
+        """Check if the version of the satellite package is returned"""
+        command.return_value = Mock(return_code=0, stdout=[u'6.1.0-1', u''])
+        self.assertEqual(store.get_satellite_version(), u'6.1.0-1')
+
+    @patch('robottelo.ssh.command')
+    def test_get_satellite_version_failure(self, command):
+        """Check if an unknown version is ``None``"""
+        command.side_effect = Exception('no connection')
+        self.assertIsNone(store.get_satellite_version())
+        command.side_effect = None
+        command.return_value = Mock(return_code=1, stdout=[])
+        self.assertIsNone(store.get_satellite_version())
@@ -0,0 +1,176 @@
+"""Tests for :mod:`robottelo.performance.thread`."""
+import logging
+import os
+import threading
+import time
+import unittest2
+
+from mock import patch
+from robottelo.config import conf
+from tests.robottelo import capture_logs
+
+# Candlepin reads the server credentials when it is imported
+with patch.dict(conf.properties, {
+        'foreman.admin.username': 'admin',
+        'foreman.admin.password': 'changeme',
+        'main.server.hostname': 'example.com'}):
+    from robottelo.performance import thread
+
+
+class IterationPlanTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.performance.thread.IterationPlan`."""
+
+    def test_repeat(self):
+        """Check if warmup iterations are added to each client"""
+        plan = thread.IterationPlan.repeat(2, 3, warmup=1)
+        self.assertEqual(plan.items, [[0, 1, 2, 3], [0, 1, 2, 3]])
+        self.assertEqual(plan.num_clients, 2)
+
+    def test_split(self):
+        """Check if items are split in even contiguous chunks"""
+        plan = thread.IterationPlan.split(range(11), 2)
+        self.assertEqual(plan.items, [[0, 1, 2, 3, 4], [5, 6, 7, 8, 9]])
+
+
+class ScenarioRunnerTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.performance.thread.ScenarioRunner`."""
+
+    def test_run(self):
+        """Check if clients start together and warmup samples are discarded"""
+        capture = capture_logs(self, thread.LOGGER)
+        started = []
+        lock = threading.Lock()
+
+        def make_client(client):
+            """Return the timing of each item."""
+            def run(item):
+                """Record when the first item starts."""
+                if item == 0:
+                    with lock:
+                        started.append(time.time())
+                if client == 1 and item == 2:
+                    raise ValueError(item)
+                return float(item)
+            return run
+
+        result = thread.ScenarioRunner().run(
+            [make_client(0), make_client(1)],
+            thread.IterationPlan.repeat(2, 3, warmup=1),
+        )
+        self.assertLess(max(started) - min(started), 0.1)
+        self.assertEqual(result.time_result_dict(), {
+            'thread-0': [1.0, 2.0, 3.0],
+            'thread-1': [1.0, 3.0],
+        })
+        self.assertEqual(len(result.errors), 1)
+        self.assertEqual(result.errors[0].iteration, 1)
+        self.assertEqual(
+            [record.getMessage().split(':')[0]
+             for record in capture.records
+             if record.levelno == logging.ERROR],
+            ['Iteration 2 of client 1 failed'],
+        )
+        timestamps = result.timestamp_dict()
+        self.assertEqual(len(timestamps['thread-1']), 2)
+        self.assertEqual(
+            timestamps['thread-0'], sorted(timestamps['thread-0']))
+
+    def test_steps_and_wall_clock(self):
+        """Check if tuple values are split and ``None`` uses wall clock"""
+        result = thread.ScenarioRunner().run(
+            [lambda item: (1.0, 2.0), lambda item: None],
+            thread.IterationPlan([[0], [0]]),
+        )
+        self.assertEqual(result.time_result_dict(1)['thread-0'], [2.0])
+        self.assertLess(result.time_result_dict(0)['thread-1'][0], 0.1)
+
+    def test_extend(self):
+        """Check if iterations of extended results are renumbered"""
+        runner = thread.ScenarioRunner()
+        plan = thread.IterationPlan([[0]])
+        result = runner.run([lambda item: 1.0], plan)
+        result.extend(runner.run([lambda item: 2.0], plan))
+        self.assertEqual(
+            [sample.iteration for sample in result.samples], [0, 1])
+        self.assertEqual(result.time_result_dict(), {'thread-0': [1.0, 2.0]})
+
+    @patch('robottelo.performance.thread.LiveStatistics')
+    def test_live_stats(self, live_statistics):
+        """Check if successful samples are recorded while the scenario runs"""
+        capture = capture_logs(self, thread.LOGGER)
+        thread.ScenarioRunner(live_stats_interval=5).run(
+            [lambda item: 1.0, timed_client],
+            thread.IterationPlan.repeat(2, 3, warmup=1),
+        )
+        live_statistics.assert_called_once_with(2, 3, 5)
+        self.assertEqual(
+            sorted(args[0][0] for args in
+                   live_statistics.return_value.add.call_args_list),
+            [0, 0, 0, 1, 1],
+        )
+        self.assertEqual(
+            len([record for record in capture.records
+                 if record.levelno == logging.ERROR]),
+            1,
+        )
+
+    def test_mismatch(self):
+        """Check if the plan must have one client per callable"""
+        with self.assertRaises(ValueError):
+            thread.ScenarioRunner().run(
+                [lambda item: None], thread.IterationPlan([[0], [0]]))
+
+    def test_barrier_timeout(self):
+        """Check if a barrier times out if clients do not arrive"""
+        with self.assertRaises(RuntimeError):
+            thread.Barrier(2, timeout=0.01).wait()
+
+
+def timed_client(item):
+    """Return the item as its timing value, failing on item 2."""
+    if item == 2:
+        raise ValueError(item)
+    return float(item)
+
+
+def crashing_client(item):
+    """Kill the worker process on item 1, like the OOM killer would."""
+    if item == 1:
+        os._exit(3)  # pylint:disable=protected-access
+    return float(item)
+
+
+class ProcessScenarioRunnerTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.performance.thread.ProcessScenarioRunner`.
+
+    """
+
+    def test_run(self):
+        """Check if samples of all processes are merged in one result"""
+        # Worker processes inherit the captured logger and report their
+        # errors back through the result
+        capture_logs(self, thread.LOGGER)
+        runner = thread.ProcessScenarioRunner(num_processes=2)
+        result = runner.run(
+            [timed_client] * 3, thread.IterationPlan.repeat(3, 3, warmup=1))
+        self.assertEqual(result.time_result_dict(), {
+            'thread-0': [1.0, 3.0],
+            'thread-1': [1.0, 3.0],
+            'thread-2': [1.0, 3.0],
+        })
+        self.assertEqual(len(result.errors), 3)
+        self.assertIn('ValueError', result.errors[0].error)
+        # all clients started together on the same clock
+        starts = [sample.start for sample in result.samples]
+        self.assertLess(max(starts) - min(starts), 1)
+        self.assertLess(abs(min(starts) - time.time()), 10)
+
+    def test_worker_exited(self):
+        """Check if a worker process exiting without completing its clients
+        fails the run instead of blocking it"""
+        runner = thread.ProcessScenarioRunner(num_processes=2)
+        runner.poll_interval = 0.05
+        with self.assertRaises(RuntimeError) as context:
+            runner.run([timed_client, crashing_client],
+                       thread.IterationPlan.repeat(2, 3))
+        self.assertIn('exit code 3', str(context.exception))
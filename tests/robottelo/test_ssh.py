@@ -2,6 +2,7 @@
 # (too-many-public-methods) pylint: disable=R0904
 import os
 
+from mock import Mock, patch
 from robottelo import ssh
 from robottelo.config import conf, get_app_root
 from unittest2 import TestCase
@@ -87,3 +88,70 @@ class SSHTestCase(TestCase):
         self.assertEqual(connection.close_, 1)
 
         conf.properties = backup
+
+
+class FakeChannel(object):
+    """A fake ``paramiko.Channel`` of a command which already exited."""
+    def __init__(self, return_code):
+        self.return_code = return_code
+
+    def recv_ready(self):  # pylint:disable=R0201
+        """The output is ready."""
+        return True
+
+    def recv_stderr_ready(self):  # pylint:disable=R0201
+        """The error output is ready."""
+        return True
+
+    def exit_status_ready(self):  # pylint:disable=R0201
+        """The command exited."""
+        return True
+
+    def recv_exit_status(self):
+        """Return the exit status of the command."""
+        return self.return_code
+
+
+class SSHCommandTestCase(TestCase):
+    """Tests for the timing of ``ssh.command``."""
+
+    def run_command(self, stdout, stderr, **kwargs):
+        """Run a command on a fake connection and return its result."""
+        channel = FakeChannel(0)
+        connection = Mock()
+        connection.exec_command.return_value = (
+            None,
+            Mock(channel=channel, read=Mock(return_value=stdout)),
+            Mock(read=Mock(return_value=stderr)),
+        )
+        get_connection = Mock()
+        get_connection.return_value.__enter__ = Mock(return_value=connection)
+        get_connection.return_value.__exit__ = Mock(return_value=False)
+        with patch.object(ssh, '_get_connection', get_connection):
+            result = ssh.command('ls', hostname='example.com', **kwargs)
+        return connection.exec_command.call_args[0][0], result
+
+    def test_command_timing(self):
+        """Check if all phases of the command are timed"""
+        cmd, result = self.run_command('out', '')
+        self.assertEqual(cmd, 'ls')
+        timing = result.timing
+        self.assertLessEqual(timing.start, timing.connected)
+        self.assertLessEqual(timing.connected, timing.exec_started)
+        self.assertLessEqual(timing.exec_started, timing.first_byte)
+        self.assertLessEqual(timing.first_byte, timing.exit)
+        self.assertIsNone(timing.remote_time)
+        self.assertIsNone(timing.as_dict()['overhead'])
+
+    def test_command_time_remote(self):
+        """Check if the remote timing is parsed out of stderr"""
+        cmd, result = self.run_command(
+            'out', 'real 1.00\nROBOTTELO-TIME 10.25 11.75\n',
+            time_remote=True
+        )
+        self.assertIn('ROBOTTELO-TIME', cmd)
+        self.assertIn('( ls\n)', cmd)
+        self.assertEqual(result.stderr, 'real 1.00\n')
+        self.assertEqual(result.timing.remote_time, 1.5)
+        self.assertEqual(
+            result.timing.overhead, result.timing.total - 1.5)
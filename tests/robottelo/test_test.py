@@ -0,0 +1,105 @@
+"""Tests for :mod:`robottelo.test`."""
+import unittest2
+
+from mock import Mock, patch
+from robottelo.config import conf
+
+# Candlepin reads the server credentials when it is imported
+with patch.dict(conf.properties, {
+        'foreman.admin.username': 'admin',
+        'foreman.admin.password': 'changeme',
+        'main.server.hostname': 'example.com'}):
+    from robottelo import test
+
+
+class ConcurrentTestCaseTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.test.ConcurrentTestCase`."""
+
+    def setUp(self):  # noqa
+        self.test_case = test.ConcurrentTestCase('kick_off_del_test')
+        self.test_case.logger = Mock()
+        self.test_case.scenario_runner = Mock()
+        self.test_case.raw_file_name = 'raw'
+        self.test_case.stat_file_name = 'stat'
+        for name in ('_set_bucket_size', '_set_num_iterations',
+                     '_store_errors', '_write_raw_csv_file',
+                     '_write_stat_csv_chart'):
+            patcher = patch.object(self.test_case, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_del_empty_uuids(self):
+        """Check if empty uuids are not planned for deletion"""
+        with patch.object(
+                self.test_case, '_get_registered_uuids', create=True,
+                return_value=['uuid-0', 'uuid-1', 'uuid-2', 'uuid-3', '']):
+            self.test_case.kick_off_del_test(2)
+        self.test_case._set_num_iterations.assert_called_once_with(4, 2)
+        plan = self.test_case.scenario_runner.run.call_args[0][1]
+        self.assertEqual(plan.items, [['uuid-0', 'uuid-1'],
+                                      ['uuid-2', 'uuid-3']])
+
+    def test_att_errors(self):
+        """Check if register and attach errors are recorded once"""
+        self.test_case.vm_list = ['vm-0', 'vm-1']
+        self.test_case.num_iterations = 1
+        self.test_case.warmup = 0
+        for name in ('sub_id', 'default_org', 'environment',
+                     'reg_raw_file_name', 'reg_stat_file_name'):
+            setattr(self.test_case, name, name)
+        self.test_case.kick_off_att_test(2, 2)
+        self.test_case._store_errors.assert_called_once_with(
+            'att', 2, self.test_case.scenario_runner.run.return_value)
+
+
+class UITestCaseTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.test.UITestCase`."""
+
+    def set_up_class(self, pool):
+        """Run ``setUpClass`` of a new UI test case class with ``pool``"""
+        class Case(test.UITestCase):
+            """A UI test case class"""
+        properties = {
+            'foreman.admin.username': 'admin',
+            'foreman.admin.password': 'changeme',
+            'saucelabs.driver': 'firefox',
+            'main.locale': 'en_US',
+            'main.verbosity': '1',
+            'main.remote': '0',
+            'main.virtual_display': '1',
+        }
+        with patch.dict(conf.properties, properties), patch.multiple(
+                'robottelo.test', get_server_url=Mock(),
+                get_worker_display=Mock(), make_pool=Mock(return_value=pool),
+                is_parallel=Mock(return_value=False), VirtualDisplay=Mock()):
+            Case.setUpClass()
+            return Case, test.get_worker_display, test.VirtualDisplay
+
+    def test_display(self):
+        """Check if the display lives as long as the browser pool"""
+        for pool in (None, Mock(scope='class')):
+            case, worker_display, virtual_display = self.set_up_class(pool)
+            worker_display.assert_not_called()
+            self.assertIs(case.display, virtual_display.return_value)
+            case.display.start.assert_called_once_with()
+        case, worker_display, virtual_display = self.set_up_class(
+            Mock(scope='process'))
+        worker_display.assert_called_once_with('')
+        virtual_display.assert_not_called()
+        self.assertIsNone(case.display)
+
+    def test_display_closes_pool(self):
+        """Check if the browsers of a pool do not outlive a class display"""
+        for scope in ('class', 'process'):
+            pool = Mock(scope=scope)
+            display = Mock()
+            with patch.multiple(test.UITestCase, create=True,
+                                browser_pool=pool, display=display):
+                test.UITestCase.tearDownClass()
+            pool.close.assert_called_once_with()
+            display.stop.assert_called_once_with()
+        pool = Mock(scope='process')
+        with patch.multiple(test.UITestCase, create=True,
+                            browser_pool=pool, display=None):
+            test.UITestCase.tearDownClass()
+        pool.close.assert_not_called()
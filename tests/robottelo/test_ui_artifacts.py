@@ -0,0 +1,91 @@
+"""Tests for :mod:`robottelo.ui.artifacts`."""
+import base64
+import csv
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+import unittest2
+
+from mock import Mock, PropertyMock, patch
+from robottelo.ui import artifacts
+from robottelo.ui.artifacts import ArtifactCollector
+from selenium.common.exceptions import WebDriverException
+
+PNG = b'\x89PNG\r\n\x1a\n'
+
+
+class ArtifactCollectorTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.ui.artifacts.ArtifactCollector`."""
+
+    def setUp(self):  # noqa
+        self.base_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base_path)
+        self.collector = ArtifactCollector(self.base_path, run='run')
+        self.browser = Mock()
+        self.browser.get_screenshot_as_base64.return_value = (
+            base64.b64encode(PNG))
+        self.browser.page_source = u'<html>\u2603</html>'
+        self.browser.get_log.return_value = [
+            {'level': 'SEVERE', 'message': 'error'}]
+
+    def read_index(self):
+        """Return the rows of the index of the run"""
+        with open(os.path.join(self.base_path, 'index-run.csv')) as handler:
+            return list(csv.DictReader(handler))
+
+    def test_collect(self):
+        """Check if the artifacts are written and indexed"""
+        self.collector.collect(self.browser, 'tests.Case.test_name',
+                               directory='test_name')
+        self.collector.flush()
+        rows = self.read_index()
+        self.assertEqual(
+            [row['kind'] for row in rows],
+            ['console_logs', 'page_source', 'screenshot'],
+        )
+        paths = dict(
+            (row['kind'], os.path.join(self.base_path, row['path']))
+            for row in rows
+        )
+        self.assertEqual(rows[0]['test'], 'tests.Case.test_name')
+        self.assertIn('test_name', paths['screenshot'])
+        with open(paths['screenshot'], 'rb') as handler:
+            self.assertEqual(handler.read(), PNG)
+        with gzip.open(paths['page_source']) as handler:
+            self.assertEqual(
+                handler.read().decode('utf-8'), self.browser.page_source)
+        with gzip.open(paths['console_logs']) as handler:
+            self.assertIn('SEVERE', handler.read())
+        self.browser.get_log.assert_called_once_with('browser')
+
+    def test_missing_logs(self):
+        """Check if drivers without console logs are supported"""
+        self.browser.get_log.side_effect = WebDriverException()
+        type(self.browser).page_source = PropertyMock(
+            side_effect=WebDriverException())
+        self.collector.collect(self.browser, 'test_name')
+        self.collector.flush()
+        self.assertEqual(
+            [row['kind'] for row in self.read_index()], ['screenshot'])
+
+    def test_background(self):
+        """Check if collecting does not wait for the artifacts to be
+        written"""
+        written = threading.Event()
+        with patch.object(self.collector, 'write',
+                          side_effect=lambda _: written.wait(5)):
+            self.collector.collect(self.browser, 'test_name')
+            self.assertFalse(written.is_set())
+            written.set()
+            self.collector.flush()
+
+    @patch('robottelo.ui.artifacts.at_exit')
+    @patch.object(artifacts, '_COLLECTORS', {})
+    def test_get_artifact_collector(self, at_exit):
+        """Check if each base path gets one collector, flushed on exit"""
+        collector = artifacts.get_artifact_collector(self.base_path)
+        self.assertIs(
+            artifacts.get_artifact_collector(self.base_path), collector)
+        at_exit.assert_called_once_with(collector.flush)
@@ -0,0 +1,114 @@
+"""Tests for :mod:`robottelo.ui.browser`."""
+import unittest2
+
+from mock import Mock, patch
+from robottelo.ui import browser
+from robottelo.ui.browser import BrowserPool
+from selenium.common.exceptions import WebDriverException
+
+START_URL = 'https://example.com'
+
+
+class BrowserPoolTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.ui.browser.BrowserPool`."""
+
+    def setUp(self):
+        self.browsers = []
+        self.pool = BrowserPool(self.factory, START_URL)
+
+    def factory(self):
+        """Return a new mock browser."""
+        self.browsers.append(Mock(name='browser-{0}'.format(
+            len(self.browsers))))
+        return self.browsers[-1]
+
+    def test_reuse(self):
+        """Check if a released browser is reset and handed over again"""
+        first = self.pool.acquire()
+        first.maximize_window.assert_called_once_with()
+        first.get.assert_called_once_with(START_URL)
+        self.pool.release(first)
+        first.delete_all_cookies.assert_called_once_with()
+        first.execute_script.assert_called_once_with(
+            browser.CLEAR_STORAGE_SCRIPT)
+        self.assertIs(self.pool.acquire(), first)
+        self.assertEqual(len(self.browsers), 1)
+        self.assertFalse(first.quit.called)
+
+    def test_busy(self):
+        """Check if browsers in use are never handed over twice"""
+        first = self.pool.acquire()
+        second = self.pool.acquire()
+        self.assertIsNot(first, second)
+        self.pool.release(first)
+        self.pool.release(second)
+        self.pool.close()
+        first.quit.assert_called_once_with()
+        second.quit.assert_called_once_with()
+
+    def test_max_uses(self):
+        """Check if a browser is replaced after running max_uses tests"""
+        self.pool.max_uses = 2
+        first = self.pool.acquire()
+        self.pool.release(first)
+        self.assertIs(self.pool.acquire(), first)
+        self.pool.release(first)
+        first.quit.assert_called_once_with()
+        self.assertIsNot(self.pool.acquire(), first)
+
+    def test_crashed(self):
+        """Check if crashed browsers are replaced"""
+        first = self.pool.acquire()
+        first.delete_all_cookies.side_effect = WebDriverException('crash')
+        self.pool.release(first)
+        first.quit.assert_called_once_with()
+
+        second = self.pool.acquire()
+        self.pool.release(second)
+        type(second).current_url = property(Mock(
+            side_effect=WebDriverException('crash')))
+        third = self.pool.acquire()
+        self.assertIsNot(third, second)
+        second.quit.assert_called_once_with()
+
+
+class MakePoolTestCase(unittest2.TestCase):
+    """Tests for :func:`robottelo.ui.browser.make_pool`."""
+
+    def make_pool(self, reuse):
+        """Make a pool with ``main.browser_reuse`` set to ``reuse``."""
+        with patch.dict('robottelo.config.conf.properties', {
+                'main.browser_reuse': reuse,
+                'main.browser_max_tests': '5'}):
+            return browser.make_pool(Mock, START_URL)
+
+    def test_none(self):
+        """Check if browsers are not reused by default"""
+        self.assertIsNone(self.make_pool('none'))
+
+    def test_class(self):
+        """Check if each class gets its own pool"""
+        pool = self.make_pool('class')
+        self.assertEqual(pool.scope, 'class')
+        self.assertEqual(pool.max_uses, 5)
+        self.assertIsNot(pool, self.make_pool('class'))
+
+    @patch.dict(browser._PROCESS_POOLS, clear=True)
+    @patch('robottelo.ui.browser.at_exit')
+    def test_process(self, at_exit):
+        """Check if the pool is shared by all classes of a process"""
+        pool = self.make_pool('process')
+        self.assertEqual(pool.scope, 'process')
+        self.assertIs(pool, self.make_pool('process'))
+        at_exit.assert_called_once_with(pool.close)
+        # new browsers are started by the factory of the last class
+        factory = Mock()
+        with patch.dict('robottelo.config.conf.properties',
+                        {'main.browser_reuse': 'process'}):
+            browser.make_pool(factory, START_URL)
+        self.assertIs(pool.factory, factory)
+
+    def test_invalid(self):
+        """Check if unknown scopes are rejected"""
+        with self.assertRaises(ValueError):
+            self.make_pool('suite')
@@ -0,0 +1,118 @@
+"""Tests for :mod:`robottelo.ui.locators`."""
+import logging
+import os
+import shutil
+import tempfile
+import unittest2
+
+from mock import patch
+from robottelo.ui import locators
+from robottelo.ui.locators import LocatorDict, LocatorRegistry
+from robottelo.ui.wait import WaitTimes
+from selenium.webdriver.common.by import By
+
+
+class LocatorRegistryTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.ui.locators.LocatorRegistry`."""
+
+    def setUp(self):  # noqa
+        self.registry = LocatorRegistry()
+        self.registry.track_origins = True
+        patcher = patch.object(locators, 'registry', self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.locators = LocatorDict({
+            'entity.name': (By.XPATH, "//a[contains(., '%s')]"),
+            'entity.submit': (By.ID, 'submit'),
+            'entity.unused': (By.ID, 'unused'),
+        })
+
+    def test_format(self):
+        """Check if templated locators are formatted once by arguments"""
+        first = self.locators.format('entity.name', 'foo')
+        self.assertEqual(first, (By.XPATH, "//a[contains(., 'foo')]"))
+        self.assertIs(self.locators.format('entity.name', 'foo'), first)
+        self.assertIs(
+            locators.format_locator(self.locators['entity.name'], 'foo'),
+            first
+        )
+        self.assertEqual(
+            self.locators.format('entity.name', 'bar'),
+            (By.XPATH, "//a[contains(., 'bar')]")
+        )
+
+    def test_cache_size(self):
+        """Check if only the most recently formatted locators are cached"""
+        self.registry.cache_size = 2
+        foo = self.locators.format('entity.name', 'foo')
+        bar = self.locators.format('entity.name', 'bar')
+        self.assertIs(self.locators.format('entity.name', 'foo'), foo)
+        self.locators.format('entity.name', 'baz')
+        # bar was the least recently used locator
+        self.assertIs(self.locators.format('entity.name', 'foo'), foo)
+        self.assertIsNot(self.locators.format('entity.name', 'bar'), bar)
+
+    def test_origins_not_tracked(self):
+        """Check if formatted locators are only named for the report"""
+        self.registry.track_origins = False
+        locator = self.locators.format('entity.name', 'foo')
+        self.assertIsNone(self.registry.name(locator[1]))
+
+    def test_unused(self):
+        """Check if locators never looked up are reported unused"""
+        self.locators['entity.submit']  # pylint:disable=pointless-statement
+        self.locators.format('entity.name', 'foo')
+        self.assertEqual(self.registry.unused(), ['entity.unused'])
+
+    def test_name(self):
+        """Check if formatted locators are named by their template"""
+        locator = self.locators.format('entity.name', 'foo')
+        self.assertEqual(self.registry.name(locator[1]), 'entity.name')
+        self.assertEqual(self.registry.name('submit'), 'entity.submit')
+        self.assertIsNone(self.registry.name('//unknown'))
+
+    def test_slowest(self):
+        """Check if wait times are summed up by locator name"""
+        wait_times = WaitTimes()
+        for name in ('foo', 'bar'):
+            locator = self.locators.format('entity.name', name)
+            wait_times.record(locator[1], 2.0)
+        wait_times.record('submit', 3.0, timed_out=True)
+        wait_times.record('//unknown', 0.5)
+        self.assertEqual(self.registry.slowest(wait_times), [
+            {'locator': 'entity.name', 'waits': 2, 'timeouts': 0,
+             'total': 4.0, 'longest': 2.0},
+            {'locator': 'entity.submit', 'waits': 1, 'timeouts': 1,
+             'total': 3.0, 'longest': 3.0},
+            {'locator': '//unknown', 'waits': 1, 'timeouts': 0,
+             'total': 0.5, 'longest': 0.5},
+        ])
+
+    def test_write_report(self):
+        """Check if the report lists slow and unused locators"""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'locators.txt')
+        wait_times = WaitTimes()
+        wait_times.record('submit', 3.0)
+        self.locators['entity.submit']  # pylint:disable=pointless-statement
+        self.registry.write_report(path, wait_times)
+        with open(path) as handler:
+            report = handler.read()
+        self.assertIn('entity.submit', report)
+        self.assertIn('Unused locators (2)', report)
+        self.assertIn('entity.unused', report)
+
+
+class LocatorDictTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.ui.locators.LocatorDict`."""
+
+    @patch('robottelo.ui.locators.LOGGER')
+    def test_logging_disabled(self, logger):
+        """Check if nothing is logged unless debug logging is enabled"""
+        logger.isEnabledFor.return_value = False
+        locator_dict = LocatorDict({'submit': (By.ID, 'submit')})
+        self.assertEqual(locator_dict['submit'], (By.ID, 'submit'))
+        logger.isEnabledFor.assert_called_once_with(logging.DEBUG)
+        logger.debug.assert_not_called()
+        self.assertEqual(locator_dict.accessed['submit'], 1)
@@ -0,0 +1,174 @@
+"""Tests for :mod:`robottelo.ui.login`."""
+import unittest2
+
+from mock import Mock, call, patch
+from robottelo.ui import login
+from robottelo.ui.login import Login, SESSION_COOKIE
+from robottelo.ui.session import Session
+
+SERVER_URL = 'https://example.com'
+
+LOGIN_PAGE = (
+    u'<form action="/users/login" method="post">'
+    u'<input name="authenticity_token" type="hidden" value="t0k3n" />'
+    u'<input id="login_login" name="login[login]" type="text" />'
+)
+
+
+def http_session(location):
+    """Return a mock ``requests.Session`` redirected to ``location`` after
+    posting the login form.
+
+    """
+    session = Mock()
+    session.get.return_value = Mock(text=LOGIN_PAGE)
+    session.post.return_value = Mock(
+        status_code=302, headers={'location': location})
+    session.cookies = {SESSION_COOKIE: 'abc'}
+    return session
+
+
+@patch('robottelo.ui.login.get_server_url', return_value=SERVER_URL)
+@patch.dict(login._SESSION_COOKIES, clear=True)
+class HTTPLoginTestCase(unittest2.TestCase):
+    """Tests for :func:`robottelo.ui.login.http_login`."""
+
+    @patch('requests.Session')
+    def test_http_login(self, session_class, _):
+        """Check if the login form is posted with its token"""
+        session = session_class.return_value = http_session(
+            SERVER_URL + '/')
+        self.assertEqual(login.http_login('admin', 'changeme'), 'abc')
+        session.post.assert_called_once_with(
+            SERVER_URL + '/users/login',
+            data={
+                'authenticity_token': u't0k3n',
+                'login[login]': 'admin',
+                'login[password]': 'changeme',
+            },
+            allow_redirects=False,
+        )
+
+    @patch('requests.Session')
+    def test_http_login_rejected(self, session_class, _):
+        """Check if a rejected login returns no cookie"""
+        session_class.return_value = http_session(
+            SERVER_URL + '/users/login')
+        self.assertIsNone(login.http_login('admin', 'wrong'))
+
+    @patch('robottelo.ui.login.http_login', return_value='abc')
+    def test_get_session_cookie(self, http_login, _):
+        """Check if each user logs in over HTTP only once"""
+        self.assertEqual(login.get_session_cookie('admin', 'changeme'), 'abc')
+        self.assertEqual(login.get_session_cookie('admin', 'changeme'), 'abc')
+        http_login.assert_called_once_with('admin', 'changeme')
+
+    @patch('requests.get')
+    def test_clear_context(self, get, _):
+        """Check if the context is cleared only if the server accepts it"""
+        get.return_value = Mock(status_code=302, headers={'location': '/'})
+        self.assertTrue(login.clear_context('abc'))
+        get.assert_called_with(
+            SERVER_URL + '/locations/clear',
+            verify=False,
+            allow_redirects=False,
+            cookies={SESSION_COOKIE: 'abc'},
+        )
+        get.return_value = Mock(status_code=500, headers={})
+        self.assertFalse(login.clear_context('abc'))
+        get.return_value = Mock(
+            status_code=302, headers={'location': '/users/login'})
+        self.assertFalse(login.clear_context('abc'))
+
+
+@patch('robottelo.ui.login.clear_context', return_value=True)
+@patch('robottelo.ui.login.get_server_url', return_value=SERVER_URL)
+@patch.dict(login._SESSION_COOKIES, clear=True)
+class CookieLoginTestCase(unittest2.TestCase):
+    """Tests for :meth:`robottelo.ui.login.Login.cookie_login`."""
+
+    def setUp(self):
+        self.browser = Mock(current_url=SERVER_URL + '/users/login')
+
+        def get(url):
+            """Log the browser in if it has the current cookie."""
+            cookies = [
+                args[0]['value']
+                for args, _ in self.browser.add_cookie.call_args_list
+            ]
+            if cookies and cookies[-1] == self.valid_cookie:
+                self.browser.current_url = url + '/'
+            else:
+                self.browser.current_url = SERVER_URL + '/users/login'
+
+        self.browser.get.side_effect = get
+        self.valid_cookie = 'abc'
+
+    @patch('robottelo.ui.login.http_login', return_value='abc')
+    def test_cookie_login(self, http_login, _, clear_context):
+        """Check if the cookie is handed over without filling the form"""
+        with patch.object(Login, 'login') as form_login:
+            Login(self.browser).cookie_login('admin', 'changeme')
+            Login(self.browser).cookie_login('admin', 'changeme')
+        self.assertFalse(form_login.called)
+        http_login.assert_called_once_with('admin', 'changeme')
+        clear_context.assert_has_calls([call('abc'), call('abc')])
+        self.browser.add_cookie.assert_called_with({
+            'name': SESSION_COOKIE,
+            'value': 'abc',
+            'path': '/',
+            'secure': True,
+        })
+        self.assertEqual(self.browser.current_url, SERVER_URL + '/')
+
+    @patch('robottelo.ui.login.http_login', return_value='expired')
+    def test_cookie_rejected(self, http_login, *_):
+        """Check if the form is filled when the cookie is rejected"""
+        self.browser.get_cookie.return_value = {'value': 'new'}
+
+        def form_login(*args):
+            """Log the browser in."""
+            self.browser.current_url = SERVER_URL + '/'
+
+        with patch.object(Login, 'login', side_effect=form_login) as login_:
+            Login(self.browser).cookie_login('admin', 'changeme')
+        login_.assert_called_once_with('admin', 'changeme', None, None)
+        # the cookie set by the login form is cached
+        self.assertEqual(
+            login._SESSION_COOKIES, {(SERVER_URL, 'admin'): 'new'})
+
+    @patch('robottelo.ui.login.http_login', return_value='abc')
+    def test_context_not_cleared(self, http_login, _, clear_context):
+        """Check if the form is filled when the context can not be cleared"""
+        clear_context.return_value = False
+        self.browser.get_cookie.return_value = {'value': 'new'}
+
+        def form_login(*args):
+            """Log the browser in."""
+            self.browser.current_url = SERVER_URL + '/'
+
+        with patch.object(Login, 'login', side_effect=form_login) as login_:
+            Login(self.browser).cookie_login('admin', 'changeme')
+        login_.assert_called_once_with('admin', 'changeme', None, None)
+        self.assertFalse(self.browser.add_cookie.called)
+        self.assertEqual(
+            login._SESSION_COOKIES, {(SERVER_URL, 'admin'): 'new'})
+
+
+class SessionTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.ui.session.Session`."""
+
+    @patch.dict('robottelo.config.conf.properties', {
+        'foreman.admin.username': 'admin',
+        'foreman.admin.password': 'changeme',
+        'main.fast_login': '1',
+    })
+    @patch.object(Login, 'logout')
+    @patch.object(Login, 'cookie_login')
+    def test_fast_login(self, cookie_login, logout):
+        """Check if fast sessions keep the server session alive"""
+        browser = Mock()
+        with Session(browser):
+            cookie_login.assert_called_once_with('admin', 'changeme')
+        self.assertFalse(logout.called)
+        browser.delete_cookie.assert_called_once_with(SESSION_COOKIE)
@@ -0,0 +1,121 @@
+"""Tests for :mod:`robottelo.ui.navigator`."""
+import unittest2
+
+from mock import Mock, patch
+from robottelo.ui.factory import set_context
+from robottelo.ui.navigator import (
+    Navigator,
+    ROUTES,
+    browser_context,
+    forget_context,
+)
+
+SERVER_URL = 'https://example.com'
+
+
+@patch('robottelo.ui.navigator.get_server_url', return_value=SERVER_URL)
+class NavigatorTestCase(unittest2.TestCase):
+    """Tests for the direct navigation of
+    :class:`robottelo.ui.navigator.Navigator`.
+
+    """
+
+    def setUp(self):  # noqa
+        self.browser = Mock()
+        self.browser.execute_script.return_value = {'ready': 'complete'}
+
+    def test_routes(self, _):
+        """Check if every route belongs to a navigator method"""
+        for name, path in ROUTES.items():
+            self.assertTrue(callable(getattr(Navigator, name)))
+            self.assertTrue(path.startswith('/'))
+
+    def test_direct(self, _):
+        """Check if pages are opened by URL in direct navigation mode"""
+        navigator = Navigator(self.browser, direct=True)
+        with patch.object(navigator, 'menu_click') as menu_click:
+            navigator.go_to_products()
+        menu_click.assert_not_called()
+        self.browser.get.assert_called_once_with(SERVER_URL + '/products')
+
+    def test_menu(self, _):
+        """Check if pages are opened through the menus by default"""
+        navigator = Navigator(self.browser, direct=False)
+        with patch.object(navigator, 'menu_click') as menu_click:
+            navigator.go_to_products()
+        self.assertEqual(menu_click.call_count, 1)
+        self.browser.get.assert_not_called()
+
+    def test_no_route(self, _):
+        """Check if pages without a route are opened through the menus"""
+        navigator = Navigator(self.browser, direct=True)
+        with patch.object(navigator, 'menu_click') as menu_click:
+            navigator.go_to_sign_out()
+        self.assertEqual(menu_click.call_count, 1)
+        self.browser.get.assert_not_called()
+
+    @patch.dict(
+        'robottelo.config.conf.properties',
+        {'main.ui_direct_navigation': '1'}
+    )
+    def test_configuration(self, _):
+        """Check if direct navigation is enabled by the configuration"""
+        self.assertTrue(Navigator(self.browser).direct)
+        self.assertFalse(Navigator(self.browser, direct=False).direct)
+
+
+class ContextTestCase(unittest2.TestCase):
+    """Tests for the context tracked by
+    :class:`robottelo.ui.navigator.Navigator`.
+
+    """
+
+    def setUp(self):  # noqa
+        self.browser = Mock()
+        self.browser.execute_script.return_value = {'ready': 'complete'}
+        self.session = Mock(browser=self.browser)
+        self.session.nav = Navigator(self.browser, direct=False)
+        patcher = patch.object(self.session.nav, 'menu_click')
+        self.menu_click = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(self.session.nav, 'wait_until_element')
+        self.wait_until_element = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.multiple(
+            'robottelo.ui.factory', ActionChains=Mock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(forget_context, self.browser)
+
+    def test_select(self):
+        """Check if the selected organization is tracked by browser"""
+        self.wait_until_element.return_value.text = 'org'
+        self.session.nav.go_to_select_org('org')
+        self.assertEqual(browser_context(self.browser)['org'], 'org')
+        self.assertIsNone(browser_context(self.browser)['loc'])
+        self.assertIsNone(browser_context(Mock())['org'])
+        forget_context(self.browser)
+        self.assertIsNone(browser_context(self.browser)['org'])
+
+    def test_set_context(self):
+        """Check if the context menu is only read while it is unknown"""
+        self.wait_until_element.side_effect = [
+            Mock(), Mock(text='Any Organization'), Mock(text='loc'),
+            Mock(), Mock(text='org'),
+        ]
+        set_context(self.session, org='org', loc='loc', force_context=True)
+        self.assertEqual(self.menu_click.call_count, 1)
+        self.assertEqual(
+            browser_context(self.browser), {'org': 'org', 'loc': 'loc'})
+        set_context(self.session, org='org', loc='loc', force_context=True)
+        self.assertEqual(self.menu_click.call_count, 1)
+        self.assertEqual(self.wait_until_element.call_count, 5)
+
+    def test_set_other_context(self):
+        """Check if another organization is selected"""
+        context = browser_context(self.browser)
+        context.update({'org': 'org', 'loc': 'loc'})
+        self.wait_until_element.return_value.text = 'other'
+        set_context(self.session, org='other', force_context=True)
+        self.assertEqual(self.menu_click.call_count, 1)
+        self.assertEqual(context, {'org': 'other', 'loc': 'loc'})
@@ -0,0 +1,104 @@
+"""Tests for :mod:`robottelo.ui.parallel` and :mod:`robottelo.ui.plugin`."""
+import optparse
+import os
+import unittest2
+
+from mock import Mock, patch
+from robottelo.ui import browser, parallel
+from robottelo.ui.parallel import WORKERS_ENV
+from robottelo.ui.plugin import UIWorkers
+
+
+class ParallelTestCase(unittest2.TestCase):
+    """Tests for :mod:`robottelo.ui.parallel`."""
+
+    @patch.dict(os.environ, {WORKERS_ENV: '4'})
+    def test_nose_worker(self):
+        """Check if nose workers get their own screenshot directory"""
+        self.assertTrue(parallel.is_parallel())
+        self.assertEqual(
+            parallel.worker_screenshots_dir('/tmp/screenshots'),
+            '/tmp/screenshots/worker-{0}'.format(os.getpid())
+        )
+
+    @patch.dict(os.environ, {'PYTEST_XDIST_WORKER': 'gw1'})
+    def test_xdist_worker(self):
+        """Check if pytest-xdist workers are named by xdist"""
+        self.assertTrue(parallel.is_parallel())
+        self.assertEqual(parallel.worker_id(), 'gw1')
+        self.assertEqual(
+            parallel.worker_screenshots_dir('/tmp/screenshots'),
+            '/tmp/screenshots/gw1'
+        )
+
+    @patch.dict(os.environ, {WORKERS_ENV: '1'})
+    def test_serial(self):
+        """Check if a single worker keeps the screenshot directory"""
+        os.environ.pop('PYTEST_XDIST_WORKER', None)
+        self.assertFalse(parallel.is_parallel())
+        self.assertEqual(
+            parallel.worker_screenshots_dir('/tmp/screenshots'),
+            '/tmp/screenshots'
+        )
+
+    @patch.dict(parallel._WORKER_DISPLAYS, clear=True)
+    @patch('robottelo.ui.parallel.at_exit')
+    @patch('robottelo.ui.parallel.VirtualDisplay')
+    def test_worker_display(self, display_class, at_exit):
+        """Check if each worker starts a single display"""
+        display = parallel.get_worker_display('wm')
+        self.assertIs(display, parallel.get_worker_display('wm'))
+        display_class.assert_called_once_with('wm')
+        display.start.assert_called_once_with()
+        at_exit.assert_called_once_with(display.stop, priority=0)
+
+
+class UIWorkersTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.ui.plugin.UIWorkers`."""
+
+    def configure(self, workers, worker=False):
+        """Configure an enabled plugin for ``workers`` processes."""
+        plugin = UIWorkers()
+        parser = optparse.OptionParser()
+        plugin.addOptions(parser, {})
+        options, _ = parser.parse_args(['--with-ui-workers'])
+        options.multiprocess_workers = workers
+        plugin.configure(options, Mock(worker=worker))
+        return plugin
+
+    @patch.dict(os.environ, clear=True)
+    def test_configure(self):
+        """Check if the number of workers is passed to the workers"""
+        self.assertTrue(self.configure('3').enabled)
+        self.assertEqual(os.environ[WORKERS_ENV], '3')
+
+    @patch.dict(os.environ, clear=True)
+    def test_worker(self):
+        """Check if worker processes leave the environment unchanged"""
+        self.configure('3', worker=True)
+        self.assertNotIn(WORKERS_ENV, os.environ)
+
+
+class GridTestCase(unittest2.TestCase):
+    """Tests for the Selenium Grid browsers of
+    :func:`robottelo.ui.browser.create_browser`.
+
+    """
+
+    @patch('robottelo.ui.browser.webdriver.Remote')
+    def test_grid(self, remote):
+        """Check if browsers are started on the grid when given its URL"""
+        browser.create_browser(
+            'Chrome', grid_url='http://grid:4444/wd/hub')
+        remote.assert_called_once_with(
+            command_executor='http://grid:4444/wd/hub',
+            desired_capabilities=browser.GRID_CAPABILITIES['chrome'],
+        )
+
+    def test_default_scope(self):
+        """Check if parallel workers reuse browsers by default"""
+        with patch.dict('robottelo.config.conf.properties', {}):
+            with patch('robottelo.ui.browser.get_process_pool') as get_pool:
+                pool = browser.make_pool(Mock, 'https://example.com',
+                                         default='process')
+        self.assertIs(pool, get_pool.return_value)
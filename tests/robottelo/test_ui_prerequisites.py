@@ -0,0 +1,164 @@
+"""Tests for :mod:`robottelo.ui.prerequisites`."""
+import threading
+import unittest2
+
+from mock import Mock, patch
+from robottelo.ui import prerequisites
+from robottelo.ui.factory import make_contentview, make_product
+
+
+class UseApiTestCase(unittest2.TestCase):
+    """Tests for :func:`robottelo.ui.prerequisites.use_api`."""
+
+    def test_use_api(self):
+        """Check if only prerequisites are created through the API"""
+        with patch.dict('robottelo.config.conf.properties',
+                        {'main.ui_api_prerequisites': '1'}):
+            self.assertTrue(prerequisites.use_api(True))
+            self.assertFalse(prerequisites.use_api(False))
+        with patch.dict('robottelo.config.conf.properties',
+                        {'main.ui_api_prerequisites': '0'}):
+            self.assertFalse(prerequisites.use_api(True))
+
+
+class CreateEntitiesTestCase(unittest2.TestCase):
+    """Tests for :func:`robottelo.ui.prerequisites.create_entities`."""
+
+    def test_order(self):
+        """Check if created entities are returned in order"""
+        unsaved = [Mock() for _ in range(5)]
+        created = prerequisites.create_entities(unsaved, max_workers=3)
+        self.assertEqual(
+            created, [entity.create.return_value for entity in unsaved])
+        for entity in unsaved:
+            entity.create.assert_called_once_with()
+
+    def test_parallel(self):
+        """Check if entities are created at the same time"""
+        started = []
+        condition = threading.Condition()
+
+        def create():
+            """Wait for the other entity to be created too"""
+            with condition:
+                started.append(threading.current_thread().name)
+                condition.notify_all()
+                while len(started) < 2:
+                    condition.wait(5)
+            return threading.current_thread().name
+
+        unsaved = [Mock(), Mock()]
+        for entity in unsaved:
+            entity.create.side_effect = create
+        with patch.dict('robottelo.config.conf.properties',
+                        {'main.ui_prerequisite_workers': '2'}):
+            names = prerequisites.create_entities(unsaved)
+        self.assertEqual(len(set(names)), 2)
+
+    def test_error(self):
+        """Check if creation errors are raised"""
+        failing = Mock()
+        failing.create.side_effect = ValueError()
+        with self.assertRaises(ValueError):
+            prerequisites.create_entities([Mock(), failing])
+
+    def test_empty(self):
+        """Check if nothing is created for no entities"""
+        self.assertEqual(prerequisites.create_entities([]), [])
+
+
+def named(name):
+    """Return a mock entity named ``name``."""
+    entity = Mock()
+    entity.name = name
+    return entity
+
+
+@patch('robottelo.ui.prerequisites.entities')
+class CreateTestCase(unittest2.TestCase):
+    """Tests for the API functions of :mod:`robottelo.ui.prerequisites`."""
+
+    def test_product(self, entities):
+        """Check if products are created in the organization found by name"""
+        entities.Organization.return_value = named('org')
+        org = named('org')
+        entities.Organization.return_value.search.return_value = [
+            named('Default Organization'), org]
+        product = prerequisites.create_product(
+            'org', name='product', description=None, sync_plan=None,
+            create_sync_plan=False)
+        entities.Organization.assert_called_once_with(name='org')
+        entities.Organization.return_value.search.assert_called_once_with(
+            query={'search': u'name="org"'})
+        entities.Product.assert_called_once_with(
+            organization=org, name='product')
+        self.assertEqual(
+            product, entities.Product.return_value.create.return_value)
+
+    def test_unsupported(self, entities):
+        """Check if UI arguments the API can not honour are rejected"""
+        with self.assertRaises(ValueError):
+            prerequisites.create_product(
+                'org', name='product', sync_plan='daily')
+        entities.Product.assert_not_called()
+
+    def test_missing_organization(self, entities):
+        """Check if an organization is required and must exist"""
+        with self.assertRaises(ValueError):
+            prerequisites.create_contentview(None, name='view')
+        entities.Organization.return_value = named('org')
+        entities.Organization.return_value.search.return_value = [
+            named('Default Organization')]
+        with self.assertRaises(ValueError):
+            prerequisites.create_contentview('org', name='view')
+        entities.ContentView.assert_not_called()
+
+    def test_repository(self, entities):
+        """Check if UI repository arguments are translated"""
+        entities.Organization.return_value = named('org')
+        entities.Organization.return_value.search.return_value = [
+            named('org')]
+        product = named('product')
+        entities.Product.return_value = named('product')
+        entities.Product.return_value.search.return_value = [product]
+        prerequisites.create_repository(
+            'org', name='repo', product='product', url='http://example.com',
+            repo_type='yum', repo_checksum='Default', http=False)
+        entities.Repository.assert_called_once_with(
+            product=product, name='repo', url='http://example.com',
+            content_type='yum')
+
+
+class FactoryTestCase(unittest2.TestCase):
+    """Tests for the prerequisites of :mod:`robottelo.ui.factory`."""
+
+    @patch('robottelo.ui.factory.set_context')
+    @patch('robottelo.ui.factory.create_product')
+    def test_api(self, create_product, set_context):
+        """Check if prerequisites are created without the UI, in the
+        organization then selected on the browser"""
+        session = Mock()
+        with patch.dict('robottelo.config.conf.properties',
+                        {'main.ui_api_prerequisites': '1'}):
+            product = make_product(
+                session, org='org', name='product', prerequisite=True)
+        self.assertEqual(product, create_product.return_value)
+        self.assertEqual(create_product.call_args[0], ('org',))
+        self.assertEqual(create_product.call_args[1]['name'], 'product')
+        session.nav.go_to_products.assert_not_called()
+        set_context.assert_called_once_with(
+            session, org='org', loc=None, force_context=True)
+
+    @patch('robottelo.ui.factory.ContentViews')
+    @patch('robottelo.ui.factory.create_contentview')
+    def test_ui(self, create_contentview, content_views):
+        """Check if prerequisites are created on the UI unless enabled"""
+        session = Mock()
+        with patch.dict('robottelo.config.conf.properties',
+                        {'main.ui_api_prerequisites': '0'}):
+            self.assertIsNone(
+                make_contentview(session, name='view', prerequisite=True))
+        create_contentview.assert_not_called()
+        session.nav.go_to_content_views.assert_called_once_with()
+        content_views.return_value.create.assert_called_once_with(
+            name='view', label=None, description=None, is_composite=False)
@@ -0,0 +1,182 @@
+"""Tests for :mod:`robottelo.ui.probe`."""
+import unittest2
+
+from mock import Mock, patch
+from robottelo.ui.base import Base
+from robottelo.ui.probe import PageState, can_probe, probe
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+LOCATOR = (By.XPATH, "//a[@id='submit']")
+
+
+def page_state(**kwargs):
+    """Return the state of an idle page as returned by the probe script,
+    updated with ``kwargs``.
+
+    """
+    state = {
+        'ready': 'complete',
+        'jquery': 0,
+        'angular': 0,
+        'tracked': 0,
+        'found': False,
+        'element': None,
+        'displayed': False,
+        'enabled': False,
+    }
+    state.update(kwargs)
+    return state
+
+
+class ProbeTestCase(unittest2.TestCase):
+    """Tests for :func:`robottelo.ui.probe.probe`."""
+
+    def test_single_round_trip(self):
+        """Check if the page state is read by a single script"""
+        element = Mock()
+        browser = Mock()
+        browser.execute_script.return_value = page_state(
+            found=True, element=element, displayed=True, enabled=True)
+        state = probe(browser, LOCATOR, track=True)
+        self.assertEqual(browser.execute_script.call_count, 1)
+        self.assertEqual(
+            browser.execute_script.call_args[0][1:],
+            (By.XPATH, "//a[@id='submit']", True)
+        )
+        self.assertIs(state.element, element)
+        self.assertTrue(state.displayed)
+        self.assertTrue(state.enabled)
+        self.assertTrue(state.idle)
+
+    def test_no_locator(self):
+        """Check if the page is probed without looking for an element"""
+        browser = Mock()
+        browser.execute_script.return_value = page_state()
+        state = probe(browser)
+        self.assertEqual(
+            browser.execute_script.call_args[0][1:], (None, None, False))
+        self.assertIsNone(state.element)
+
+    def test_script_error(self):
+        """Check if a page the script can not run on is reported idle"""
+        browser = Mock()
+        browser.execute_script.side_effect = WebDriverException()
+        state = probe(browser, LOCATOR)
+        self.assertTrue(state.idle)
+        self.assertIsNone(state.element)
+        browser.execute_script.side_effect = None
+        browser.execute_script.return_value = None
+        self.assertTrue(probe(browser, LOCATOR).idle)
+
+    def test_can_probe(self):
+        """Check which locators the probe can find elements with"""
+        self.assertTrue(can_probe(None))
+        self.assertTrue(can_probe((By.ID, 'name')))
+        self.assertTrue(can_probe((By.CSS_SELECTOR, 'a.btn')))
+        self.assertFalse(can_probe((By.LINK_TEXT, 'Submit')))
+
+
+class PageStateTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.ui.probe.PageState`."""
+
+    def test_pending(self):
+        """Check if requests pending on any library keep the page busy"""
+        for name in ('jquery', 'angular', 'tracked'):
+            state = PageState(page_state(**{name: 2}))
+            self.assertEqual(state.pending, 2)
+            self.assertFalse(state.idle)
+
+    def test_loading(self):
+        """Check if a page still loading is not idle"""
+        self.assertFalse(PageState(page_state(ready='interactive')).idle)
+
+    def test_not_found(self):
+        """Check if the element is ignored unless it was found"""
+        state = PageState(page_state(element={}, found=False))
+        self.assertIsNone(state.element)
+
+
+class BaseProbeTestCase(unittest2.TestCase):
+    """Tests for the use of the probe by :class:`robottelo.ui.base.Base`."""
+
+    def setUp(self):  # noqa
+        self.browser = Mock()
+        self.element = Mock()
+        self.element.get_attribute.return_value = None
+        self.base = Base(self.browser)
+
+    def test_wait_until_element(self):
+        """Check if waiting for a visible element on an idle page takes a
+        single round trip
+
+        """
+        self.browser.execute_script.return_value = page_state(
+            found=True, element=self.element, displayed=True)
+        self.assertIs(self.base.wait_until_element(LOCATOR), self.element)
+        self.assertEqual(self.browser.execute_script.call_count, 1)
+        self.browser.find_element.assert_not_called()
+
+    def test_wait_until_element_busy(self):
+        """Check if AJAX calls are waited for once the element is visible"""
+        self.browser.execute_script.side_effect = [
+            page_state(jquery=1),
+            page_state(
+                jquery=1, found=True, element=self.element, displayed=True),
+            page_state(jquery=0),
+        ]
+        self.assertIs(
+            self.base.wait_until_element(LOCATOR, poll_frequency=0),
+            self.element
+        )
+        self.assertEqual(self.browser.execute_script.call_count, 3)
+
+    def test_wait_until_element_timeout(self):
+        """Check if ``None`` is returned when the element is not visible"""
+        self.browser.execute_script.return_value = page_state(
+            found=True, element=self.element, displayed=False)
+        self.assertIsNone(self.base.wait_until_element(
+            LOCATOR, timeout=0, poll_frequency=0))
+
+    def test_wait_until_element_is_clickable(self):
+        """Check if disabled elements are not clickable"""
+        self.browser.execute_script.return_value = page_state(
+            found=True, element=self.element, displayed=True, enabled=False)
+        self.assertIsNone(self.base.wait_until_element_is_clickable(
+            LOCATOR, timeout=0, poll_frequency=0))
+        self.browser.execute_script.return_value = page_state(
+            found=True, element=self.element, displayed=True, enabled=True)
+        self.assertIs(
+            self.base.wait_until_element_is_clickable(LOCATOR), self.element)
+
+    def test_wait_until_element_is_not_visible(self):
+        """Check if a missing element is not visible"""
+        self.browser.execute_script.return_value = page_state()
+        self.assertTrue(self.base.wait_until_element_is_not_visible(LOCATOR))
+
+    def test_find_element(self):
+        """Check if elements are found on idle pages by the probe alone"""
+        self.browser.execute_script.return_value = page_state(
+            found=True, element=self.element, displayed=True)
+        self.assertIs(self.base.find_element(LOCATOR), self.element)
+        self.browser.execute_script.return_value = page_state()
+        self.assertIsNone(self.base.find_element(LOCATOR))
+        self.browser.find_element.assert_not_called()
+
+    def test_link_text_fallback(self):
+        """Check if locators the probe can not handle use WebDriver"""
+        self.browser.find_element.return_value = self.element
+        self.browser.execute_script.return_value = page_state()
+        self.element.is_displayed.return_value = True
+        self.assertIs(
+            self.base.find_element((By.LINK_TEXT, 'Submit')), self.element)
+        self.browser.find_element.assert_called_once_with(
+            By.LINK_TEXT, 'Submit')
+
+    @patch.dict(
+        'robottelo.config.conf.properties', {'main.ui_track_requests': '1'})
+    def test_track_requests(self):
+        """Check if all requests are tracked when configured"""
+        self.browser.execute_script.return_value = page_state()
+        self.assertTrue(self.base.ajax_complete(self.browser))
+        self.assertTrue(self.browser.execute_script.call_args[0][3])
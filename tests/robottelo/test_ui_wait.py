@@ -0,0 +1,138 @@
+"""Tests for :mod:`robottelo.ui.wait`."""
+import csv
+import os
+import shutil
+import tempfile
+import unittest2
+
+from mock import Mock, call, patch
+from robottelo.ui import wait
+from robottelo.ui.base import Base
+from robottelo.ui.wait import AdaptiveWait, WaitTimes
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    TimeoutException,
+)
+from selenium.webdriver.common.by import By
+
+
+class Clock(object):
+    """A fake clock moving forward only when slept on."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        """Return the current fake time."""
+        return self.now
+
+    def sleep(self, seconds):
+        """Record the sleep and move the time forward."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class AdaptiveWaitTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.ui.wait.AdaptiveWait`."""
+
+    def setUp(self):  # noqa
+        self.clock = Clock()
+        patcher = patch.multiple(
+            'robottelo.ui.wait.time',
+            time=self.clock.time,
+            sleep=self.clock.sleep,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_backoff(self):
+        """Check if the polling interval doubles up to the ceiling"""
+        method = Mock(side_effect=[False] * 6 + ['done'])
+        driver = Mock()
+        result = AdaptiveWait(driver, 10, ceiling=0.5).until(method)
+        self.assertEqual(result, 'done')
+        self.assertEqual(method.call_args_list, [call(driver)] * 7)
+        self.assertEqual(self.clock.sleeps, [0.05, 0.1, 0.2, 0.4, 0.5, 0.5])
+
+    def test_ready(self):
+        """Check if no time is spent waiting for a ready page"""
+        self.assertTrue(AdaptiveWait(Mock(), 10).until(lambda _: True))
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_timeout(self):
+        """Check if the last poll happens at the timeout"""
+        with self.assertRaises(TimeoutException):
+            AdaptiveWait(Mock(), 1, ceiling=0.5).until(lambda _: False)
+        self.assertAlmostEqual(sum(self.clock.sleeps), 1)
+        self.assertAlmostEqual(self.clock.sleeps[-1], 0.25)
+
+    def test_ignored_exceptions(self):
+        """Check if missing elements are polled again"""
+        method = Mock(side_effect=[NoSuchElementException(), 'element'])
+        self.assertEqual(AdaptiveWait(Mock(), 10).until(method), 'element')
+        method = Mock(side_effect=ValueError())
+        with self.assertRaises(ValueError):
+            AdaptiveWait(Mock(), 10).until(method)
+
+
+class WaitTimesTestCase(unittest2.TestCase):
+    """Tests for :class:`robottelo.ui.wait.WaitTimes`."""
+
+    def setUp(self):  # noqa
+        self.wait_times = WaitTimes()
+        self.wait_times.record('fast', 0.1)
+        self.wait_times.record('slow', 3.0)
+        self.wait_times.record('slow', 12.0, timed_out=True)
+
+    def test_slowest(self):
+        """Check if wait times are summed up by locator"""
+        self.assertEqual(self.wait_times.slowest(), [
+            {'locator': 'slow', 'waits': 2, 'timeouts': 1, 'total': 15.0,
+             'longest': 12.0},
+            {'locator': 'fast', 'waits': 1, 'timeouts': 0, 'total': 0.1,
+             'longest': 0.1},
+        ])
+        self.assertEqual(len(self.wait_times.slowest(1)), 1)
+
+    def test_write(self):
+        """Check if wait times are written as CSV"""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'wait-times.csv')
+        self.wait_times.write(path)
+        with open(path) as handler:
+            rows = list(csv.DictReader(handler))
+        self.assertEqual([row['locator'] for row in rows], ['slow', 'fast'])
+        self.assertEqual(rows[0]['timeouts'], '1')
+
+    @patch('robottelo.ui.wait.at_exit')
+    @patch.object(wait, '_REGISTERED', set())
+    def test_write_on_exit(self, at_exit):
+        """Check if wait times are written once per process"""
+        wait.write_wait_times_on_exit('/tmp/wait-{pid}.csv')
+        wait.write_wait_times_on_exit('/tmp/wait-{pid}.csv')
+        at_exit.assert_called_once_with(
+            wait.wait_times.write, '/tmp/wait-{0}.csv'.format(os.getpid()))
+
+
+class BaseWaitTimesTestCase(unittest2.TestCase):
+    """Tests for the wait times recorded by :class:`robottelo.ui.base.Base`."""
+
+    @patch('robottelo.ui.base.wait_times')
+    def test_record(self, wait_times):
+        """Check if waits for visible and missing elements are recorded"""
+        browser = Mock()
+        browser.execute_script.return_value = {
+            'ready': 'complete', 'found': False}
+        base = Base(browser)
+        self.assertTrue(
+            base.wait_until_element_is_not_visible((By.ID, 'spinner')))
+        self.assertIsNone(base.wait_until_element(
+            (By.ID, 'missing'), timeout=0, poll_frequency=0))
+        self.assertEqual(
+            [args[0][0] for args in wait_times.record.call_args_list],
+            ['spinner', 'missing'],
+        )
+        self.assertEqual(
+            wait_times.record.call_args_list[1][1], {'timed_out': True})
@@ -110,3 +110,96 @@ class VirtualMachineTestCase(unittest2.TestCase):
         ]
 
         self.assertListEqual(ssh_command.call_args_list, ssh_command_args_list)
+
+    @patch('robottelo.vm.get_server_cert_rpm_url',
+           return_value='http://example.com/katello-ca.rpm')
+    @patch('robottelo.ssh.command')
+    def test_bootstrap(self, ssh_command, cert_rpm_url):
+        """Check if bootstrap runs all steps on a single ssh command"""
+        self.configure_provisoning_server()
+        conf.properties['main.server.hostname'] = 'sat.example.com'
+        ssh_command.return_value = ssh.SSHCommandResult(stdout=[
+            'ROBOTTELO-BOOTSTRAP start install_katello_cert 10.5',
+            'katello-ca-consumer-sat.example.com-1.0-1.noarch',
+            'ROBOTTELO-BOOTSTRAP end install_katello_cert 0 11.0',
+            'ROBOTTELO-BOOTSTRAP start register_contenthost 11.0',
+            'The system has been registered',
+            'ROBOTTELO-BOOTSTRAP end register_contenthost 0 13.25',
+            'ROBOTTELO-BOOTSTRAP start enable_repo 13.25',
+            'Error: rhst7 is not a valid repository ID.',
+            'ROBOTTELO-BOOTSTRAP end enable_repo 1 14.0',
+            '',
+        ])
+        vm = VirtualMachine()
+        with patch.multiple(vm, _created=True, ip_addr='192.168.0.1'):
+            results = vm.bootstrap(steps=[
+                'install_katello_cert',
+                ('register_contenthost', {'activation_key': 'ak', 'org': 'o'}),
+                ('enable_repo', {'repo': 'rhst7'}),
+                'install_katello_agent',
+            ])
+
+        self.assertEqual(ssh_command.call_count, 1)
+        script = ssh_command.call_args[0][0]
+        self.assertIn(
+            'rpm -Uvh http://example.com/katello-ca.rpm && '
+            'rpm -q katello-ca-consumer-sat.example.com',
+            script
+        )
+        self.assertIn(
+            'subscription-manager register --activationkey ak --org o --force',
+            script
+        )
+        self.assertEqual(
+            [result.name for result in results],
+            ['install_katello_cert', 'register_contenthost', 'enable_repo',
+             'install_katello_agent']
+        )
+        self.assertEqual(
+            [result.return_code for result in results], [0, 0, 1, None])
+        self.assertEqual(
+            [result.elapsed for result in results], [0.5, 2.25, 0.75, None])
+        self.assertEqual(
+            results[1].stdout, ['The system has been registered'])
+        self.assertTrue(vm._subscribed)
+
+    def test_bootstrap_invalid_step(self):
+        """Check if bootstrap raises an exception for unknown steps"""
+        self.configure_provisoning_server()
+        vm = VirtualMachine()
+        with patch.multiple(vm, _created=True, ip_addr='192.168.0.1'):
+            with self.assertRaises(VirtualMachineError):
+                vm.bootstrap(steps=['invalid_step'])
+            with self.assertRaises(VirtualMachineError):
+                vm.bootstrap(steps=[('enable_repo', {})])
+
+    @patch('robottelo.vm.get_server_cert_rpm_url',
+           return_value='http://example.com/katello-ca.rpm')
+    @patch('robottelo.ssh.command')
+    def test_single_steps_match_bootstrap(self, ssh_command, cert_rpm_url):
+        """Check if single step methods run the commands of bootstrap"""
+        self.configure_provisoning_server()
+        conf.properties['main.server.hostname'] = 'sat.example.com'
+        ssh_command.return_value = ssh.SSHCommandResult()
+        vm = VirtualMachine()
+        with patch.multiple(vm, _created=True, ip_addr='192.168.0.1'):
+            vm.install_katello_cert()
+            vm.register_contenthost('ak', 'o', releasever='7Server')
+            vm.enable_repo('rhst7')
+            vm.install_katello_agent()
+            single = [args[0][0] for args in ssh_command.call_args_list]
+            ssh_command.reset_mock()
+            vm.bootstrap(steps=[
+                'install_katello_cert',
+                ('register_contenthost', {
+                    'activation_key': 'ak',
+                    'org': 'o',
+                    'releasever': '7Server',
+                }),
+                ('enable_repo', {'repo': 'rhst7'}),
+                'install_katello_agent',
+            ])
+        script = ssh_command.call_args[0][0]
+        self.assertEqual(len(single), 6)
+        for command in single:
+            self.assertIn(command, script)